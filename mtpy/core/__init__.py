@@ -4,6 +4,7 @@ from .transfer_function import PhaseTensor
 from .mt_location import MTLocation
 from .mt_stations import MTStations
 from .mt_dataframe import MTDataFrame
+from .mt_data_cube import MTDataCube
 
 __all__ = [
     "Z",
@@ -12,6 +13,7 @@ __all__ = [
     "MTLocation",
     "MTStations",
     "MTDataFrame",
+    "MTDataCube",
 ]
 
 # coordinate reference frames
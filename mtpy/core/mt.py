@@ -576,6 +576,39 @@ class MT(TF, MTLocation):
         :rtype: :class:`mtpy.core.MT`
         """
 
+        new_period = self._validate_interpolation_periods(
+            new_period, bounds_error=bounds_error, f_type=f_type
+        )
+
+        new_z = None
+        new_t = None
+        if self.has_impedance():
+            new_z = self.Z.interpolate(
+                new_period, method=method, log_space=z_log_space, **kwargs
+            )
+        if self.has_tipper():
+            new_t = self.Tipper.interpolate(new_period, method=method, **kwargs)
+
+        return self._from_interpolated(new_z, new_t)
+
+    def _validate_interpolation_periods(
+        self, new_period, bounds_error=True, f_type="period"
+    ):
+        """Validate periods to interpolate on to.
+
+        :param new_period: Periods or frequencies to interpolate on to.
+        :type new_period: np.ndarray, list
+        :param bounds_error: Check for if input frequencies are within the
+            original frequencies, defaults to True.
+        :type bounds_error: boolean, optional
+        :param f_type: Frequency type can be [ 'frequency' | 'period' ],
+            defaults to "period".
+        :type f_type: string, optional
+        :raises ValueError: If input frequencies are out of bounds.
+        :return: New periods.
+        :rtype: np.ndarray
+        """
+
         if f_type not in ["frequency", "freq", "period", "per"]:
             raise ValueError(
                 "f_type must be either 'frequency' or 'period' not {f_type}"
@@ -605,11 +638,22 @@ class MT(TF, MTLocation):
                     "needs to be within the bounds of the old one."
                 )
 
+        return new_period
+
+    def _from_interpolated(self, new_z=None, new_t=None):
+        """Make a new MT object from interpolated transfer functions.
+
+        :param new_z: Interpolated impedance, defaults to None.
+        :type new_z: :class:`mtpy.core.transfer_function.Z`, optional
+        :param new_t: Interpolated tipper, defaults to None.
+        :type new_t: :class:`mtpy.core.transfer_function.Tipper`, optional
+        :return: New MT object with interpolated values.
+        :rtype: :class:`mtpy.core.MT`
+        """
+
         new_m = self.clone_empty()
-        if self.has_impedance():
-            new_m.Z = self.Z.interpolate(
-                new_period, method=method, log_space=z_log_space, **kwargs
-            )
+        if new_z is not None:
+            new_m.Z = new_z
             if new_m.has_impedance():
                 if np.all(np.isnan(new_m.Z.z)):
                     self.logger.warning(
@@ -617,10 +661,8 @@ class MT(TF, MTLocation):
                         "consider an alternative interpolation method. "
                         "See scipy.interpolate.interp1d for more information."
                     )
-        if self.has_tipper():
-            new_m.Tipper = self.Tipper.interpolate(
-                new_period, method=method, **kwargs
-            )
+        if new_t is not None:
+            new_m.Tipper = new_t
             if new_m.has_tipper():
                 if np.all(np.isnan(new_m.Tipper.tipper)):
                     self.logger.warning(
@@ -670,7 +712,9 @@ class MT(TF, MTLocation):
 
         return PlotPenetrationDepth1D(self, **kwargs)
 
-    def to_dataframe(self, utm_crs=None, cols=None, impedance_units="mt"):
+    def to_dataframe(
+        self, utm_crs=None, cols=None, impedance_units="mt", phase_tensor=None
+    ):
         """Create a dataframe from the transfer function for use with plotting
         and modeling.
         :param cols:
@@ -682,34 +726,37 @@ class MT(TF, MTLocation):
         :type eter utm_crs: string, int, :class:`pyproj.CRS`
         :param impedance_units: ["mt" [mV/km/nT] | "ohm" [Ohms] ]
         :type impedance_units: str
+        :param phase_tensor: Precomputed phase tensor arrays for this station,
+         computed from the impedance if None, defaults to None.
+        :type phase_tensor: dict, optional
         """
         if utm_crs is not None:
             self.utm_crs = utm_crs
 
-        n_entries = self.period.size
-        mt_df = MTDataFrame(n_entries=n_entries)
-
-        mt_df.survey = self.survey
-        mt_df.station = self.station
-        mt_df.latitude = self.latitude
-        mt_df.longitude = self.longitude
-        mt_df.elevation = self.elevation
-        mt_df.datum_epsg = self.datum_epsg
-        mt_df.east = self.east
-        mt_df.north = self.north
-        mt_df.utm_epsg = self.utm_epsg
-        mt_df.model_east = self.model_east
-        mt_df.model_north = self.model_north
-        mt_df.model_elevation = self.model_elevation
-        mt_df.profile_offset = self.profile_offset
-
-        mt_df.dataframe.loc[:, "period"] = self.period
+        mt_df = MTDataFrame()
+
+        z_object = None
         if self.has_impedance():
             z_object = self.Z
             z_object.units = impedance_units
-            mt_df.from_z_object(z_object)
+        t_object = None
         if self.has_tipper():
-            mt_df.from_t_object(self.Tipper)
+            t_object = self.Tipper
+
+        mt_df.dataframe = mt_df.get_station_block(
+            self.period,
+            location=dict(
+                [
+                    (key, getattr(self, key))
+                    for key in mt_df._station_location_attrs
+                ]
+            ),
+            z_object=z_object,
+            t_object=t_object,
+            phase_tensor=phase_tensor,
+        )
+        mt_df.working_survey = self.survey
+        mt_df.working_station = self.station
 
         return mt_df
 
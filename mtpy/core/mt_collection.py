@@ -13,6 +13,11 @@ Created on Mon Jan 11 15:36:38 2021
 # =============================================================================
 # Imports
 # =============================================================================
+import pickle
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
 from pathlib import Path
 
 from loguru import logger
@@ -22,6 +27,7 @@ import geopandas as gpd
 
 from mtpy import MT
 from mtpy.core.mt_data import MTData
+from mtpy.core.mt_data_parallel import dumps, get_n_jobs, use_pool
 from mtpy.imaging import (
     PlotStations,
     PlotMultipleResponses,
@@ -37,12 +43,39 @@ from mtpy.imaging import (
 )
 
 from mth5.mth5 import MTH5
+from mth5.helpers import from_numpy_type, validate_name
+
+from mt_metadata.transfer_functions.tf import Run, Electric, Magnetic
 
 # =============================================================================
 #
 # =============================================================================
 
 
+def _read_tf_file(filename):
+    """Read a transfer function file in a worker process.
+
+    :param filename: Transfer function file.
+    :type filename: str or Path
+    :return: Pickled :class:`mtpy.MT` object.
+    :rtype: bytes
+    """
+    mt_object = MT(filename)
+    mt_object.read()
+    return dumps(mt_object)
+
+
+def _attrs_to_dict(attrs):
+    """Convert HDF5 attributes to a dictionary of python types.
+
+    :param attrs: HDF5 attributes.
+    :type attrs: :class:`h5py.AttributeManager`
+    :return: Attributes.
+    :rtype: dict
+    """
+    return {key: from_numpy_type(value) for key, value in attrs.items()}
+
+
 class MTCollection:
     """Collection of transfer functions
 
@@ -68,6 +101,7 @@ class MTCollection:
         self.mth5_collection = MTH5()
 
         self._added = False
+        self.failed_tfs = {}
 
         self.logger = logger
 
@@ -231,16 +265,44 @@ class MTCollection:
         """
         self.mth5_collection.close_mth5()
 
-    def add_tf(self, transfer_function, new_survey=None, tf_id_extra=None):
+    def add_tf(
+        self,
+        transfer_function,
+        new_survey=None,
+        tf_id_extra=None,
+        n_jobs=None,
+        executor=None,
+        queue_size=None,
+        progress=None,
+    ):
         """Transfer_function could be a transfer function object, a file name,
         a list of either.
 
+        If `n_jobs` or `executor` is given files are parsed in a process pool
+        while a single writer thread adds the parsed transfer functions to the
+        MTH5 file through a bounded queue.  Files that fail to read or write
+        are logged and stored in `MTCollection.failed_tfs` instead of
+        stopping the ingest.
+
         :param transfer_function: Transfer function object.
         :type transfer_function: list, tuple, array, MTData, MT
         :param new_survey: New survey name, defaults to None.
         :type new_survey: str, optional
         :param tf_id_extra: Additional text onto existing 'tf_id',, defaults to None.
         :type tf_id_extra: string, optional
+        :param n_jobs: Number of processes to read files with, -1 uses all
+         CPUs, defaults to None which reads and writes one file at a time.
+        :type n_jobs: int, optional
+        :param executor: Executor to read files with instead of making a
+         process pool, defaults to None.
+        :type executor: :class:`concurrent.futures.Executor`, optional
+        :param queue_size: Maximum number of parsed transfer functions waiting
+         to be written, defaults to None which is 4 times the number of
+         workers.
+        :type queue_size: int, optional
+        :param progress: Function called as progress(n_done, n_total, item)
+         after each transfer function is written or fails, defaults to None.
+        :type progress: callable, optional
         :return: DESCRIPTION.
         :rtype: TYPE
         """
@@ -260,28 +322,39 @@ class MTCollection:
                 "Otherwise adding transfer functions one by one will be slow."
             )
 
-        surveys = []
-        for item in transfer_function:
-            if isinstance(item, MT):
-                survey_id = self._from_mt_object(
-                    item,
-                    new_survey=new_survey,
-                    tf_id_extra=tf_id_extra,
-                    update_metadata=False,
-                )
-                if survey_id not in surveys:
-                    surveys.append(survey_id)
-            elif isinstance(item, (str, Path)):
-                survey_id = self._from_file(
-                    item,
-                    new_survey=new_survey,
-                    tf_id_extra=tf_id_extra,
-                    update_metadata=False,
-                )
-                if survey_id not in surveys:
-                    surveys.append(survey_id)
-            else:
-                raise TypeError(f"Not sure want to do with {type(item)}.")
+        if use_pool(n_jobs, executor):
+            surveys = self._add_tf_pipeline(
+                transfer_function,
+                new_survey=new_survey,
+                tf_id_extra=tf_id_extra,
+                n_jobs=n_jobs,
+                executor=executor,
+                queue_size=queue_size,
+                progress=progress,
+            )
+        else:
+            surveys = []
+            for item in transfer_function:
+                if isinstance(item, MT):
+                    survey_id = self._from_mt_object(
+                        item,
+                        new_survey=new_survey,
+                        tf_id_extra=tf_id_extra,
+                        update_metadata=False,
+                    )
+                    if survey_id not in surveys:
+                        surveys.append(survey_id)
+                elif isinstance(item, (str, Path)):
+                    survey_id = self._from_file(
+                        item,
+                        new_survey=new_survey,
+                        tf_id_extra=tf_id_extra,
+                        update_metadata=False,
+                    )
+                    if survey_id not in surveys:
+                        surveys.append(survey_id)
+                else:
+                    raise TypeError(f"Not sure want to do with {type(item)}.")
 
         if self.mth5_collection.file_version in ["0.1.0"]:
             self.mth5_collection.survey_group.update_metadata()
@@ -291,6 +364,158 @@ class MTCollection:
                 survey_group.update_metadata()
         self.mth5_collection.tf_summary.summarize()
 
+    def _add_tf_pipeline(
+        self,
+        transfer_function,
+        new_survey=None,
+        tf_id_extra=None,
+        n_jobs=None,
+        executor=None,
+        queue_size=None,
+        progress=None,
+    ):
+        """Read files in a process pool and write them with a single thread.
+
+        Files are submitted in order with at most `queue_size` reads in
+        flight, the main thread puts read MT objects onto a bounded queue in
+        the same order and a writer thread adds them to the MTH5 file.
+
+        :param transfer_function: File names or MT objects.
+        :type transfer_function: list
+        :param new_survey: New survey name, defaults to None.
+        :type new_survey: str, optional
+        :param tf_id_extra: Additional text onto existing 'tf_id', defaults
+         to None.
+        :type tf_id_extra: string, optional
+        :param n_jobs: Number of processes, defaults to None.
+        :type n_jobs: int, optional
+        :param executor: Executor to read files with, defaults to None.
+        :type executor: :class:`concurrent.futures.Executor`, optional
+        :param queue_size: Maximum number of parsed transfer functions
+         waiting to be written, defaults to None.
+        :type queue_size: int, optional
+        :param progress: Progress function, defaults to None.
+        :type progress: callable, optional
+        :return: Survey IDs that were added to.
+        :rtype: list
+        """
+        if not self.mth5_collection.h5_is_write():
+            raise ValueError("Must initiate an MTH5 file first.")
+        for item in transfer_function:
+            if not isinstance(item, (MT, str, Path)):
+                raise TypeError(f"Not sure want to do with {type(item)}.")
+
+        n_workers = get_n_jobs(n_jobs)
+        if queue_size is None:
+            queue_size = 4 * n_workers
+        queue_size = max(1, queue_size)
+
+        n_total = len(transfer_function)
+        self.failed_tfs = {}
+        surveys = []
+        tf_queue = queue.Queue(maxsize=queue_size)
+        state = {"n_done": 0}
+        log_step = max(1, n_total // 10)
+
+        def finish(item, error=None):
+            """Record a written or failed transfer function."""
+            if error is not None:
+                self.failed_tfs[str(item)] = error
+                self.logger.error(f"Could not add {item}: {error}")
+            state["n_done"] += 1
+            if progress is not None:
+                try:
+                    progress(state["n_done"], n_total, item)
+                except Exception as progress_error:
+                    self.logger.warning(
+                        f"Progress function failed: {progress_error}"
+                    )
+            if state["n_done"] % log_step == 0 or state["n_done"] == n_total:
+                self.logger.info(
+                    f"Added {state['n_done']} of {n_total} transfer functions"
+                )
+
+        def writer():
+            """Write MT objects from the queue until None is received."""
+            while True:
+                entry = tf_queue.get()
+                if entry is None:
+                    break
+                item, mt_object, error = entry
+                if error is None:
+                    try:
+                        survey_id = self._from_mt_object(
+                            mt_object,
+                            new_survey=new_survey,
+                            tf_id_extra=tf_id_extra,
+                            update_metadata=False,
+                        )
+                        if survey_id not in surveys:
+                            surveys.append(survey_id)
+                    except Exception as write_error:
+                        error = f"{type(write_error).__name__}: {write_error}"
+                finish(item, error)
+
+        writer_thread = threading.Thread(
+            target=writer, name="mt_collection_writer", daemon=True
+        )
+        writer_thread.start()
+
+        pool = executor
+        if pool is None:
+            pool = ProcessPoolExecutor(max_workers=n_workers)
+
+        def submit(item):
+            """Submit a file to be read, MT objects are already read."""
+            if isinstance(item, MT):
+                future = Future()
+                future.set_result(item)
+                return item, future
+            return item, pool.submit(_read_tf_file, item)
+
+        pending = deque()
+        try:
+            items = iter(transfer_function)
+            for item in items:
+                pending.append(submit(item))
+                if len(pending) >= queue_size:
+                    break
+
+            while pending:
+                item, future = pending.popleft()
+                try:
+                    mt_object = future.result()
+                    if isinstance(mt_object, bytes):
+                        mt_object = pickle.loads(mt_object)
+                    tf_queue.put((item, mt_object, None))
+                except Exception as read_error:
+                    tf_queue.put(
+                        (
+                            item,
+                            None,
+                            f"{type(read_error).__name__}: {read_error}",
+                        )
+                    )
+                next_item = next(items, None)
+                if next_item is not None:
+                    pending.append(submit(next_item))
+        finally:
+            tf_queue.put(None)
+            writer_thread.join()
+            if executor is None:
+                # cancel by hand, shutdown(cancel_futures=True) needs
+                # python >= 3.9
+                for _, future in pending:
+                    future.cancel()
+                pool.shutdown()
+
+        if len(self.failed_tfs) > 0:
+            self.logger.warning(
+                f"Could not add {len(self.failed_tfs)} of {n_total} transfer "
+                "functions, see MTCollection.failed_tfs."
+            )
+        return surveys
+
     def get_tf(self, tf_id, survey=None):
         """Get transfer function.
 
@@ -338,6 +563,142 @@ class MTCollection:
 
         return mt_object
 
+    def get_tfs(self, dataframe=None, arrays_only=False):
+        """Get the transfer functions of each row in a dataframe.
+
+        All `hdf5_reference` in `dataframe` are resolved in one pass through
+        the open HDF5 file and the estimates are read straight into
+        :class:`mtpy.MT` objects, skipping the look up in
+        :attr:`master_dataframe` and the intermediate transfer function
+        object of :meth:`get_tf`.
+
+        If `arrays_only` is True the survey, station and run attributes are
+        not read.  The MT objects only get the survey, station, tf_id and
+        location from `dataframe` and the transfer function attributes, such
+        as the sign convention and units.  The rest can be filled in later
+        with :meth:`load_metadata`.
+
+        :param dataframe: Rows of :attr:`master_dataframe` to get, defaults
+         to None which uses :attr:`dataframe`.
+        :type dataframe: :class:`pandas.DataFrame`, optional
+        :param arrays_only: Only read the arrays and basic metadata,
+         defaults to False.
+        :type arrays_only: bool, optional
+        :return: Transfer functions in the order of `dataframe`.
+        :rtype: list of :class:`mtpy.MT`
+        """
+        if dataframe is None:
+            dataframe = self.dataframe
+        if dataframe is None:
+            return []
+
+        h5_file = self.mth5_collection.surveys_group.hdf5_group.file
+        mt_list = []
+        for row in dataframe.itertuples():
+            tf_group = h5_file[row.hdf5_reference]
+            mt_object = MT()
+            if arrays_only:
+                mt_object.survey = row.survey
+                mt_object.station = row.station
+                mt_object.tf_id = row.tf_id
+                mt_object.latitude = row.latitude
+                mt_object.longitude = row.longitude
+                mt_object.elevation = row.elevation
+                mt_object.station_metadata.transfer_function.from_dict(
+                    {"transfer_function": _attrs_to_dict(tf_group.attrs)}
+                )
+            else:
+                self._set_metadata(mt_object, tf_group)
+
+            mt_object.period = tf_group["period"][()]
+            for estimate_name in tf_group.keys():
+                if estimate_name in ["period"]:
+                    continue
+                try:
+                    setattr(
+                        mt_object, estimate_name, tf_group[estimate_name][()]
+                    )
+                except AttributeError as error:
+                    self.logger.exception(error)
+
+            if not arrays_only:
+                mt_object.station_metadata.update_time_period()
+                mt_object.survey_metadata.update_time_period()
+            mt_list.append(mt_object)
+
+        return mt_list
+
+    def load_metadata(self, mt_data):
+        """Fill in the full metadata of transfer functions from
+        :meth:`get_tfs` with `arrays_only=True`.
+
+        The transfer functions are found by survey and tf_id, the arrays are
+        left as is.
+
+        :param mt_data: Transfer functions to update in place.
+        :type mt_data: :class:`mtpy.MTData` or list of :class:`mtpy.MT`
+        """
+        if isinstance(mt_data, MTData):
+            mt_data = mt_data.values()
+
+        df = self.master_dataframe
+        references = dict(zip(zip(df.survey, df.tf_id), df.hdf5_reference))
+        h5_file = self.mth5_collection.surveys_group.hdf5_group.file
+        for mt_object in mt_data:
+            key = (mt_object.survey, mt_object.tf_id)
+            try:
+                tf_group = h5_file[references[key]]
+            except KeyError:
+                raise ValueError(
+                    f"Could not find {key[0]}.{key[1]} in collection."
+                )
+            self._set_metadata(mt_object, tf_group)
+            mt_object.station_metadata.update_time_period()
+            mt_object.survey_metadata.update_time_period()
+
+    def _set_metadata(self, mt_object, tf_group):
+        """Set survey, station, transfer function and run metadata from the
+        HDF5 group of a transfer function.
+
+        :param mt_object: Transfer function to update.
+        :type mt_object: :class:`mtpy.MT`
+        :param tf_group: Transfer function group.
+        :type tf_group: :class:`h5py.Group`
+        """
+        station_group = tf_group.parent.parent
+        survey_group = station_group.parent.parent
+
+        mt_object.survey_metadata.from_dict(
+            {"survey": _attrs_to_dict(survey_group.attrs)}
+        )
+        mt_object.station_metadata.from_dict(
+            {"station": _attrs_to_dict(station_group.attrs)}
+        )
+        mt_object.station_metadata.transfer_function.from_dict(
+            {"transfer_function": _attrs_to_dict(tf_group.attrs)}
+        )
+
+        mt_object.station_metadata.runs = []
+        tf_metadata = mt_object.station_metadata.transfer_function
+        for run_id in tf_metadata.runs_processed:
+            if run_id in ["", None, "None"]:
+                continue
+            try:
+                run = station_group[validate_name(run_id)]
+            except KeyError:
+                self.logger.info(
+                    f"Could not get run {run_id} for transfer function"
+                )
+                continue
+            run_obj = Run(**_attrs_to_dict(run.attrs))
+            for channel in run.values():
+                ch_dict = _attrs_to_dict(channel.attrs)
+                if ch_dict["type"] == "electric":
+                    run_obj.add_channel(Electric(**ch_dict))
+                elif ch_dict["type"] == "magnetic":
+                    run_obj.add_channel(Magnetic(**ch_dict))
+            mt_object.station_metadata.add_run(run_obj)
+
     def _from_file(
         self, filename, new_survey=None, tf_id_extra=None, update_metadata=True
     ):
@@ -399,7 +760,7 @@ class MTCollection:
         self.logger.info(f"added {mt_object.survey}.{mt_object.station}")
         return mt_object.survey
 
-    def to_mt_data(self, bounding_box=None, **kwargs):
+    def to_mt_data(self, bounding_box=None, arrays_only=False, **kwargs):
         """Get a list of transfer functions.
 
         :param **kwargs:
@@ -407,6 +768,9 @@ class MTCollection:
         :type tf_ids: TYPE, optional
         :param bounding_box: DESCRIPTION, defaults to None.
         :type bounding_box: TYPE, optional
+        :param arrays_only: Only read the arrays and basic metadata, see
+         :meth:`get_tfs`, defaults to False.
+        :type arrays_only: bool, optional
         :return: DESCRIPTION.
         :rtype: TYPE
         """
@@ -416,9 +780,7 @@ class MTCollection:
 
         mt_data = MTData(**kwargs)
 
-        for row in self.dataframe.itertuples():
-            tf = self.get_tf(row.tf_id, survey=row.survey)
-
+        for tf in self.get_tfs(arrays_only=arrays_only):
             mt_data.add_station(tf, compute_relative_location=False)
 
         # compute locations at the end
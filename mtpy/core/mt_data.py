@@ -21,6 +21,18 @@ import matplotlib.pyplot as plt
 from mtpy.core.transfer_function import IMPEDANCE_UNITS
 from .mt import MT
 from .mt_stations import MTStations
+from .mt_data_cube import MTDataCube
+from mtpy.core.transfer_function.pt import compute_phase_tensor
+from .mt_spatial_index import MTSpatialIndex
+from .mt_data_parallel import (
+    map_stations,
+    use_pool,
+    station_arrays,
+    interpolate_station,
+    rotate_station,
+    model_errors_station,
+    white_noise_station,
+)
 from mtpy.core import MTDataFrame, COORDINATE_REFERENCE_FRAME_OPTIONS
 
 from mtpy.modeling.errors import ModelErrors
@@ -56,11 +68,15 @@ class MTData(OrderedDict, MTStations):
     of stations.
 
     Is not optimized yet for speed, works fine for smaller surveys, but for
-    large can be slow.  Might try using a dataframe as the base.
+    large can be slow.  For large surveys on a common period map use
+    :meth:`MTData.build_cube` to stack all transfer functions into a
+    :class:`mtpy.core.MTDataCube`, the MT objects then view into the cube.
     """
 
     def __init__(self, mt_list=None, **kwargs):
 
+        self._cube = None
+        self._spatial_index = None
         self._coordinate_reference_frame_options = (
             COORDINATE_REFERENCE_FRAME_OPTIONS
         )
@@ -133,6 +149,20 @@ class MTData(OrderedDict, MTStations):
             )
         return mt_obj
 
+    def __setitem__(self, key, value):
+        """Set item, drops the array cube and spatial index because they no
+        longer match."""
+        self._cube = None
+        self._spatial_index = None
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        """Delete item, drops the array cube and spatial index because they
+        no longer match."""
+        self._cube = None
+        self._spatial_index = None
+        super().__delitem__(key)
+
     def __eq__(self, other):
         """Test for other is equal.
 
@@ -221,6 +251,83 @@ class MTData(OrderedDict, MTStations):
 
         return md
 
+    @property
+    def cube(self):
+        """Array backend :class:`mtpy.core.MTDataCube` if one has been built
+        with :meth:`MTData.build_cube` and all MT objects are still views of
+        it, otherwise None.
+        """
+        if self._cube is not None:
+            if not self._cube.is_attached(self):
+                self.logger.debug(
+                    "MT objects no longer view into the cube, dropping cube."
+                )
+                self._cube = None
+        return self._cube
+
+    def build_cube(self):
+        """Stack all transfer functions into a :class:`mtpy.core.MTDataCube`.
+
+        Each MT object is re-bound to a view of the cube, so the MT objects
+        and the cube stay in sync without copying.  All stations must have
+        the same periods, use :meth:`MTData.interpolate` first.
+
+        The cube is dropped when stations are added or removed.
+
+        :return: Array backend.
+        :rtype: :class:`mtpy.core.MTDataCube`
+        """
+
+        self._cube = MTDataCube(self)
+        return self._cube
+
+    def release_cube(self):
+        """Give each MT object its own copy of the data and drop the cube."""
+        if self._cube is not None:
+            self._cube.detach(self)
+        self._cube = None
+
+    @property
+    def spatial_index(self):
+        """KD-tree index of station locations,
+        :class:`mtpy.core.mt_spatial_index.MTSpatialIndex`.
+
+        Built on first use and dropped when stations are added or removed
+        or the UTM CRS changes.  If stations are moved in place call
+        :meth:`MTData.reset_spatial_index`.
+        """
+        if self._spatial_index is None or not self._spatial_index.is_current(
+            self
+        ):
+            self._spatial_index = MTSpatialIndex(self)
+        return self._spatial_index
+
+    def reset_spatial_index(self):
+        """Drop the spatial index, it is rebuilt on next use."""
+        self._spatial_index = None
+
+    def _distance_to_line(self, x1, y1, x2, y2):
+        """Distance of each station to a line using the spatial index."""
+        return self.spatial_index.distance_to_line(x1, y1, x2, y2)
+
+    def compute_phase_tensor(self):
+        """Compute the phase tensor of all stations in one batched pass.
+
+        Uses the cube if one is attached, otherwise only the impedances are
+        stacked first, therefore all stations must have the same periods.
+
+        :raises ValueError: If stations have different periods.
+        :return: Phase tensor, errors and invariants with a leading station
+         axis in the order of `MTData.keys()`, see
+         :func:`mtpy.core.transfer_function.pt.compute_phase_tensor`.
+        :rtype: dict
+        """
+
+        cube = self.cube
+        if cube is not None:
+            return cube.compute_phase_tensor()
+        return compute_phase_tensor(*MTDataCube.stack_impedance(self))
+
     @property
     def coordinate_reference_frame(self):
         """coordinate reference frame ned or enu"""
@@ -559,12 +666,30 @@ class MTData(OrderedDict, MTStations):
         :rtype: TYPE
         """
 
-        df_list = [
-            mt_obj.to_dataframe(
-                utm_crs=utm_crs, cols=cols, impedance_units=impedance_units
-            ).dataframe
-            for mt_obj in self.values()
-        ]
+        # the phase tensor of all stations can be computed in one pass if
+        # they share the same periods.
+        pt_dict = None
+        if self.cube is not None or MTDataCube.check_mt_data(self) is None:
+            pt_dict = self.compute_phase_tensor()
+
+        df_list = []
+        for index, mt_obj in enumerate(self.values()):
+            station_pt = None
+            if pt_dict is not None:
+                station_pt = dict(
+                    [
+                        (key, None if value is None else value[index])
+                        for key, value in pt_dict.items()
+                    ]
+                )
+            df_list.append(
+                mt_obj.to_dataframe(
+                    utm_crs=utm_crs,
+                    cols=cols,
+                    impedance_units=impedance_units,
+                    phase_tensor=station_pt,
+                ).dataframe
+            )
 
         df = pd.concat(df_list)
         df.reset_index(drop=True, inplace=True)
@@ -658,6 +783,8 @@ class MTData(OrderedDict, MTStations):
         f_type="period",
         inplace=True,
         bounds_error=True,
+        n_jobs=None,
+        executor=None,
         **kwargs,
     ):
         """
@@ -670,6 +797,7 @@ class MTData(OrderedDict, MTStations):
             - z_log_space
             - na_method
             - extrapolate
+            - engine, "numpy" is much faster for large surveys
 
         :param new_periods: DESCRIPTION
         :param inplace:
@@ -678,6 +806,12 @@ class MTData(OrderedDict, MTStations):
         :type new_periods: TYPE
         :param f_type: Frequency type can be [ 'frequency' | 'period' ], defaults to "period".
         :type f_type: string, defaults to 'period', optional
+        :param n_jobs: Number of processes to interpolate stations with,
+         -1 uses all CPUs, defaults to None which is serial.
+        :type n_jobs: int, optional
+        :param executor: Executor to send stations to instead of making a
+         process pool, defaults to None.
+        :type executor: :class:`concurrent.futures.Executor`, optional
         :return: DESCRIPTION.
         :rtype: TYPE
         """
@@ -685,6 +819,7 @@ class MTData(OrderedDict, MTStations):
         if not inplace:
             mt_data = self.clone_empty()
 
+        station_periods = []
         for mt_obj in self.values():
             if bounds_error:
                 interp_periods = new_periods[
@@ -695,14 +830,48 @@ class MTData(OrderedDict, MTStations):
                 ]
             else:
                 interp_periods = new_periods
+            station_periods.append(interp_periods)
+
+        if use_pool(n_jobs, executor):
+            arguments = []
+            for mt_obj, interp_periods in zip(self.values(), station_periods):
+                arguments.append(
+                    (
+                        station_arrays(mt_obj),
+                        mt_obj._validate_interpolation_periods(
+                            interp_periods,
+                            bounds_error=bounds_error,
+                            f_type=f_type,
+                        ),
+                        kwargs,
+                    )
+                )
+            new_mt_list = [
+                mt_obj._from_interpolated(new_z, new_t)
+                for mt_obj, (new_z, new_t) in zip(
+                    self.values(),
+                    map_stations(
+                        interpolate_station,
+                        arguments,
+                        n_jobs=n_jobs,
+                        executor=executor,
+                    ),
+                )
+            ]
+        else:
+            new_mt_list = [
+                mt_obj.interpolate(
+                    interp_periods,
+                    f_type=f_type,
+                    bounds_error=bounds_error,
+                    **kwargs,
+                )
+                for mt_obj, interp_periods in zip(
+                    self.values(), station_periods
+                )
+            ]
 
-            new_mt_obj = mt_obj.interpolate(
-                interp_periods,
-                f_type=f_type,
-                bounds_error=bounds_error,
-                **kwargs,
-            )
-
+        for new_mt_obj in new_mt_list:
             if inplace:
                 self.update(
                     {
@@ -716,14 +885,25 @@ class MTData(OrderedDict, MTStations):
         if not inplace:
             return mt_data
 
-    def rotate(self, rotation_angle, inplace=True):
+    def rotate(
+        self, rotation_angle, inplace=True, n_jobs=None, executor=None
+    ):
         """Rotate the data by the given angle assuming positive clockwise with
         north = 0, east = 90.
 
+        If a cube is attached, see :meth:`MTData.build_cube`, and `inplace`
+        is True all stations are rotated in one pass through the cube.
+
         :param inplace:
             Defaults to True.
         :param rotation_angle: DESCRIPTION.
         :type rotation_angle: TYPE
+        :param n_jobs: Number of processes to rotate stations with,
+         -1 uses all CPUs, defaults to None which is serial.
+        :type n_jobs: int, optional
+        :param executor: Executor to send stations to instead of making a
+         process pool, defaults to None.
+        :type executor: :class:`concurrent.futures.Executor`, optional
         :return: DESCRIPTION.
         :rtype: TYPE
         """
@@ -731,12 +911,60 @@ class MTData(OrderedDict, MTStations):
 
         if not inplace:
             mt_data = self.clone_empty()
-        for mt_obj in self.values():
-            if not inplace:
-                rot_mt_obj = mt_obj.rotate(rotation_angle, inplace=False)
-                mt_data.add_station(rot_mt_obj, compute_relative_location=False)
-            else:
-                mt_obj.rotate(rotation_angle)
+
+        if use_pool(n_jobs, executor):
+            results = map_stations(
+                rotate_station,
+                [
+                    (
+                        station_arrays(mt_obj),
+                        rotation_angle,
+                        mt_obj.coordinate_reference_frame,
+                    )
+                    for mt_obj in self.values()
+                ],
+                n_jobs=n_jobs,
+                executor=executor,
+            )
+            for mt_obj, (new_z, new_t) in zip(list(self.values()), results):
+                if inplace:
+                    rot_mt_obj = mt_obj
+                else:
+                    rot_mt_obj = mt_obj.clone_empty()
+                if new_z is not None:
+                    rot_mt_obj.Z = new_z
+                if new_t is not None:
+                    rot_mt_obj.Tipper = new_t
+                rot_mt_obj._rotation_angle += rotation_angle
+                if not inplace:
+                    mt_data.add_station(
+                        rot_mt_obj, compute_relative_location=False
+                    )
+
+        elif inplace and self.cube is not None:
+            # rotate all stations in one pass, the MT objects view into the
+            # cube so they are rotated too.
+            frames = np.array(
+                [mt_obj.coordinate_reference_frame for mt_obj in self.values()]
+            )
+            for frame in np.unique(frames):
+                self._cube.rotate(
+                    rotation_angle,
+                    coordinate_reference_frame=frame,
+                    index=frames == frame,
+                )
+            for mt_obj in self.values():
+                mt_obj._rotation_angle += rotation_angle
+
+        else:
+            for mt_obj in self.values():
+                if not inplace:
+                    rot_mt_obj = mt_obj.rotate(rotation_angle, inplace=False)
+                    mt_data.add_station(
+                        rot_mt_obj, compute_relative_location=False
+                    )
+                else:
+                    mt_obj.rotate(rotation_angle)
 
         if not inplace:
             return mt_data
@@ -778,6 +1006,8 @@ class MTData(OrderedDict, MTStations):
         t_error_value=None,
         t_error_type=None,
         t_floor=None,
+        n_jobs=None,
+        executor=None,
     ):
         """Compute mode errors based on the error type
 
@@ -807,6 +1037,12 @@ class MTData(OrderedDict, MTStations):
         :type t_error_type: TYPE, optional
         :param t_floor: DESCRIPTION, defaults to None.
         :type t_floor: TYPE, optional
+        :param n_jobs: Number of processes to compute errors with if there is
+         no cube, -1 uses all CPUs, defaults to None which is serial.
+        :type n_jobs: int, optional
+        :param executor: Executor to send stations to instead of making a
+         process pool, defaults to None.
+        :type executor: :class:`concurrent.futures.Executor`, optional
         :param: DESCRIPTION.
         :type: TYPE
         :return: DESCRIPTION.
@@ -827,6 +1063,33 @@ class MTData(OrderedDict, MTStations):
         if t_floor is not None:
             self.t_model_error.floor = t_floor
 
+        if self.cube is not None:
+            self._cube.compute_model_errors(
+                self.z_model_error, self.t_model_error
+            )
+            return
+
+        if use_pool(n_jobs, executor):
+            results = map_stations(
+                model_errors_station,
+                [
+                    (
+                        station_arrays(mt_obj),
+                        self.z_model_error.error_parameters,
+                        self.t_model_error.error_parameters,
+                    )
+                    for mt_obj in self.values()
+                ],
+                n_jobs=n_jobs,
+                executor=executor,
+            )
+            for mt_obj, (z_error, t_error) in zip(self.values(), results):
+                if z_error is not None:
+                    mt_obj.impedance_model_error = z_error
+                if t_error is not None:
+                    mt_obj.tipper_model_error = t_error
+            return
+
         for mt_obj in self.values():
             mt_obj.compute_model_z_errors(**self.z_model_error.error_parameters)
             mt_obj.compute_model_t_errors(**self.t_model_error.error_parameters)
@@ -834,40 +1097,24 @@ class MTData(OrderedDict, MTStations):
     def get_nearby_stations(self, station_key, radius, radius_units="m"):
         """Get stations close to a given station.
 
-        :param radius_units:
-            Defaults to "m".
-        :param station_key: DESCRIPTION.
-        :type station_key: TYPE
-        :param radius: DESCRIPTION.
-        :type radius: TYPE
-        :return: DESCRIPTION.
-        :rtype: TYPE
-        """
-        # get the local station
-        local_station = self.get_station(station_key=station_key)
+        Uses the KD-tree in :attr:`MTData.spatial_index`, stations at zero
+        distance are not included.
 
-        sdf = self.station_locations.copy()
-        if radius_units in ["m", "meters", "metres"]:
-            if self.utm_crs is None:
-                raise ValueError(
-                    "Cannot estimate distances in meters without a UTM CRS. Set 'utm_crs' first."
-                )
-            sdf["radius"] = np.sqrt(
-                (local_station.east - sdf.east) ** 2
-                + (local_station.north - sdf.north)
-            )
-        elif radius_units in ["deg", "degrees"]:
-            sdf["radius"] = np.sqrt(
-                (local_station.longitude - sdf.longitude) ** 2
-                + (local_station.latitude - sdf.latitude)
-            )
+        :param radius_units: [ "m" | "deg" ], defaults to "m".
+        :type radius_units: str, optional
+        :param station_key: Station key as {survey}.{station}.
+        :type station_key: str
+        :param radius: Search radius in `radius_units`.
+        :type radius: float
+        :return: Station keys of nearby stations.
+        :rtype: list
+        """
+        if station_key not in self.keys():
+            raise KeyError(f"Could not find {station_key} in MTData.")
 
-        return [
-            f"{row.survey}.{row.station}"
-            for row in sdf.loc[
-                (sdf.radius <= radius) & (sdf.radius > 0)
-            ].itertuples()
-        ]
+        return self.spatial_index.query_radius(
+            station_key, radius, units=radius_units
+        )
 
     def estimate_spatial_static_shift(
         self,
@@ -877,6 +1124,8 @@ class MTData(OrderedDict, MTStations):
         period_max,
         radius_units="m",
         shift_tolerance=0.15,
+        n_jobs=None,
+        executor=None,
     ):
         """Estimate static shift for a station by estimating the median resistivity
         values for nearby stations within a radius given.  Can set the period
@@ -894,6 +1143,12 @@ class MTData(OrderedDict, MTStations):
         :type period_min: TYPE
         :param period_max: DESCRIPTION.
         :type period_max: TYPE
+        :param n_jobs: Number of processes to interpolate nearby stations
+         with, -1 uses all CPUs, defaults to None which is serial.
+        :type n_jobs: int, optional
+        :param executor: Executor to send nearby stations to instead of
+         making a process pool, defaults to None.
+        :type executor: :class:`concurrent.futures.Executor`, optional
         :return: DESCRIPTION.
         :rtype: TYPE
         """
@@ -916,13 +1171,18 @@ class MTData(OrderedDict, MTStations):
         ]
 
         local_site = local_site.interpolate(interp_periods)
-        md.interpolate(interp_periods)
+        md.interpolate(interp_periods, n_jobs=n_jobs, executor=executor)
 
         df = md.to_dataframe()
 
         sx = np.nanmedian(df.res_xy) / np.nanmedian(local_site.Z.res_xy)
         sy = np.nanmedian(df.res_yx) / np.nanmedian(local_site.Z.res_yx)
 
+        return self._apply_shift_tolerance(sx, sy, shift_tolerance)
+
+    @staticmethod
+    def _apply_shift_tolerance(sx, sy, shift_tolerance):
+        """Set static shifts within the given tolerance of 1 to 1."""
         # check to see if the estimated static shift is within given tolerance
         if 1 - shift_tolerance < sx and sx < 1 + shift_tolerance:
             sx = 1.0
@@ -932,6 +1192,99 @@ class MTData(OrderedDict, MTStations):
 
         return sx, sy
 
+    def estimate_spatial_static_shift_all(
+        self,
+        radius,
+        period_min,
+        period_max,
+        radius_units="m",
+        shift_tolerance=0.15,
+        n_jobs=None,
+        executor=None,
+    ):
+        """Estimate static shift for every station in one batch, same as
+        calling :meth:`MTData.estimate_spatial_static_shift` for each
+        station.
+
+        Nearby stations are found with a single query of
+        :attr:`MTData.spatial_index`.  Stations that have the same periods
+        within the period range share one interpolation, so on a common
+        period map each station is interpolated once instead of once for
+        every station it is near.
+
+        :param radius: Search radius in `radius_units`.
+        :type radius: float
+        :param period_min: Minimum period to estimate the shift from.
+        :type period_min: float
+        :param period_max: Maximum period to estimate the shift from.
+        :type period_max: float
+        :param radius_units: [ "m" | "deg" ], defaults to "m".
+        :type radius_units: str, optional
+        :param shift_tolerance: Shifts within this of 1 are set to 1,
+         defaults to 0.15.
+        :type shift_tolerance: float, optional
+        :param n_jobs: Number of processes to interpolate stations with,
+         -1 uses all CPUs, defaults to None which is serial.
+        :type n_jobs: int, optional
+        :param executor: Executor to send stations to instead of making a
+         process pool, defaults to None.
+        :type executor: :class:`concurrent.futures.Executor`, optional
+        :return: (sx, sy) for each station key.
+        :rtype: dict
+        """
+        index = self.spatial_index
+        neighbours = index.query_radius_all(radius, units=radius_units)
+
+        period_groups = {}
+        for ii, mt_obj in enumerate(self.values()):
+            interp_periods = mt_obj.period[
+                np.where(
+                    (mt_obj.period >= period_min)
+                    & (mt_obj.period <= period_max)
+                )
+            ]
+            period_groups.setdefault(tuple(interp_periods), []).append(ii)
+
+        static_shifts = {}
+        for interp_periods, station_index in period_groups.items():
+            needed = set(station_index)
+            for ii in station_index:
+                needed.update(neighbours[ii].tolist())
+            md = self.get_subset(
+                [index.station_keys[ii] for ii in sorted(needed)]
+            )
+            md.interpolate(
+                np.array(interp_periods), n_jobs=n_jobs, executor=executor
+            )
+            res_xy = dict(
+                (key, mt_obj.Z.res_xy.flatten()) for key, mt_obj in md.items()
+            )
+            res_yx = dict(
+                (key, mt_obj.Z.res_yx.flatten()) for key, mt_obj in md.items()
+            )
+
+            for ii in station_index:
+                station_key = index.station_keys[ii]
+                nearby_keys = [index.station_keys[jj] for jj in neighbours[ii]]
+                if len(nearby_keys) == 0:
+                    self.logger.warning(
+                        f"Could not find any nearby stations for {station_key}."
+                    )
+                    static_shifts[station_key] = (1.0, 1.0)
+                    continue
+
+                sx = np.nanmedian(
+                    np.concatenate([res_xy[key] for key in nearby_keys])
+                ) / np.nanmedian(res_xy[station_key])
+                sy = np.nanmedian(
+                    np.concatenate([res_yx[key] for key in nearby_keys])
+                ) / np.nanmedian(res_yx[station_key])
+                static_shifts[station_key] = self._apply_shift_tolerance(
+                    sx, sy, shift_tolerance
+                )
+
+        return dict((key, static_shifts[key]) for key in self.keys())
+
     def estimate_starting_rho(self):
         """Estimate starting resistivity from the data.
 
@@ -1164,13 +1517,21 @@ class MTData(OrderedDict, MTStations):
             occam2d_data.write_data_file(data_filename)
         return occam2d_data
 
-    def add_white_noise(self, value, inplace=True):
+    def add_white_noise(
+        self, value, inplace=True, n_jobs=None, executor=None
+    ):
         """Add white noise to the data, useful for synthetic tests.
 
         :param value: DESCRIPTION.
         :type value: TYPE
         :param inplace: DESCRIPTION, defaults to True.
         :type inplace: TYPE, optional
+        :param n_jobs: Number of processes to add noise with, -1 uses all
+         CPUs, defaults to None which is serial.
+        :type n_jobs: int, optional
+        :param executor: Executor to send stations to instead of making a
+         process pool, defaults to None.
+        :type executor: :class:`concurrent.futures.Executor`, optional
         :return: DESCRIPTION.
         :rtype: TYPE
         """
@@ -1180,12 +1541,47 @@ class MTData(OrderedDict, MTStations):
         if not inplace:
             mt_list = []
 
-        for station, mt_obj in self.items():
-            if inplace:
-                mt_obj.add_white_noise(value)
+        if use_pool(n_jobs, executor):
+            seeds = np.random.randint(0, 2**31 - 1, size=len(self))
+            results = map_stations(
+                white_noise_station,
+                [
+                    (
+                        mt_obj._transfer_function.transfer_function.values,
+                        mt_obj._transfer_function[
+                            "transfer_function_error"
+                        ].values,
+                        value,
+                        seed,
+                    )
+                    for mt_obj, seed in zip(self.values(), seeds)
+                ],
+                n_jobs=n_jobs,
+                executor=executor,
+            )
+            for mt_obj, (tf, tf_error) in zip(self.values(), results):
+                if inplace:
+                    noise_mt_obj = mt_obj
+                else:
+                    noise_mt_obj = mt_obj.clone_empty()
+                    noise_mt_obj._transfer_function = (
+                        mt_obj._transfer_function.copy(deep=True)
+                    )
+                    mt_list.append(noise_mt_obj)
+                noise_mt_obj._transfer_function["transfer_function"][:] = tf
+                noise_mt_obj._transfer_function["transfer_function_error"][
+                    :
+                ] = tf_error
 
-            else:
-                mt_list.append(mt_obj.add_white_noise(value, inplace=False))
+        else:
+            for station, mt_obj in self.items():
+                if inplace:
+                    mt_obj.add_white_noise(value)
+
+                else:
+                    mt_list.append(
+                        mt_obj.add_white_noise(value, inplace=False)
+                    )
 
         if not inplace:
             return_data = self.clone_empty()
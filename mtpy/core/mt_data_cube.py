@@ -0,0 +1,558 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 09:12:40 2026
+
+@author: jpeacock
+
+Array backend for :class:`mtpy.MTData`.
+
+All transfer functions of a survey are stored in single contiguous arrays of
+shape (n_stations, n_periods, n_outputs, n_inputs) using the same channel
+layout as :class:`mt_metadata.transfer_functions.core.TF`.  Each MT object
+in the attached :class:`mtpy.MTData` has its transfer function variables
+replaced by views into these arrays, so changes made through an MT object are
+seen by the cube and changes made to the cube are seen by the MT objects
+without copying any data.
+"""
+
+# =============================================================================
+# Imports
+# =============================================================================
+import numpy as np
+import xarray as xr
+from loguru import logger
+
+from mtpy.core.transfer_function.pt import compute_phase_tensor
+from mtpy.utils.calculator import (
+    rotate_matrix_stack_with_errors,
+    rotate_vector_stack_with_errors,
+)
+
+# =============================================================================
+
+
+class MTDataCube:
+    """Survey wide array container for transfer functions.
+
+    The channel order follows `TF._transfer_function` where outputs and
+    inputs are both [ex, ey, hz, hx, hy], therefore
+
+        - impedance = [..., 0:2, 3:5]
+        - tipper = [..., 2:3, 3:5]
+
+    All stations must have the same periods, interpolate onto a common
+    period map first with :meth:`mtpy.MTData.interpolate`.
+
+    :Build from an MTData object: ::
+
+        >>> md.interpolate(new_periods)
+        >>> cube = md.build_cube()
+        >>> cube.impedance.shape
+        (n_stations, n_periods, 2, 2)
+
+    """
+
+    _tf_keys = [
+        "transfer_function",
+        "transfer_function_error",
+        "transfer_function_model_error",
+    ]
+    _location_keys = [
+        "latitude",
+        "longitude",
+        "elevation",
+        "east",
+        "north",
+        "model_east",
+        "model_north",
+        "model_elevation",
+        "profile_offset",
+    ]
+    _z_index = (slice(0, 2), slice(3, 5))
+    _t_index = (slice(2, 3), slice(3, 5))
+
+    def __init__(self, mt_data=None):
+        self.logger = logger
+
+        self.station_keys = []
+        self.survey = np.array([], dtype=str)
+        self.station = np.array([], dtype=str)
+        self.period = np.array([], dtype=float)
+        self.outputs = []
+        self.inputs = []
+
+        for key in self._tf_keys:
+            setattr(self, key, None)
+        for key in self._location_keys:
+            setattr(self, key, np.array([], dtype=float))
+
+        if mt_data is not None:
+            self.from_mt_data(mt_data)
+
+    def __str__(self):
+        """Str function."""
+        lines = ["MTDataCube", "-" * 30]
+        lines.append(f"\tNumber of stations: {self.n_stations}")
+        lines.append(f"\tNumber of periods:  {self.n_periods}")
+        if self.n_periods > 0:
+            lines.append(
+                f"\tPeriod range:       {self.period.min():.5E} -- "
+                f"{self.period.max():.5E} s"
+            )
+        return "\n".join(lines)
+
+    def __repr__(self):
+        """Repr function."""
+        return self.__str__()
+
+    @property
+    def n_stations(self):
+        """Number of stations in the cube."""
+        return len(self.station_keys)
+
+    @property
+    def n_periods(self):
+        """Number of periods in the cube."""
+        return self.period.size
+
+    @property
+    def frequency(self):
+        """Frequencies in Hz."""
+        return 1.0 / self.period
+
+    def _get_view(self, key, index):
+        """Get a view of a transfer function array for a given index."""
+        array = getattr(self, key)
+        if array is None:
+            return None
+        return array[(Ellipsis,) + index]
+
+    @property
+    def impedance(self):
+        """Impedance view (n_stations, n_periods, 2, 2)."""
+        return self._get_view("transfer_function", self._z_index)
+
+    @property
+    def impedance_error(self):
+        """Impedance error view (n_stations, n_periods, 2, 2)."""
+        return self._get_view("transfer_function_error", self._z_index)
+
+    @property
+    def impedance_model_error(self):
+        """Impedance model error view (n_stations, n_periods, 2, 2)."""
+        return self._get_view("transfer_function_model_error", self._z_index)
+
+    @property
+    def tipper(self):
+        """Tipper view (n_stations, n_periods, 1, 2)."""
+        return self._get_view("transfer_function", self._t_index)
+
+    @property
+    def tipper_error(self):
+        """Tipper error view (n_stations, n_periods, 1, 2)."""
+        return self._get_view("transfer_function_error", self._t_index)
+
+    @property
+    def tipper_model_error(self):
+        """Tipper model error view (n_stations, n_periods, 1, 2)."""
+        return self._get_view("transfer_function_model_error", self._t_index)
+
+    @property
+    def has_impedance(self):
+        """Boolean array of stations that have non-zero impedances."""
+        if self.transfer_function is None:
+            return np.zeros(0, dtype=bool)
+        return (self.impedance != 0).any(axis=(1, 2, 3))
+
+    @property
+    def has_tipper(self):
+        """Boolean array of stations that have non-zero tippers, NaNs are
+        not counted like `MT.has_tipper`."""
+        if self.transfer_function is None:
+            return np.zeros(0, dtype=bool)
+        return (np.nan_to_num(self.tipper) != 0).any(axis=(1, 2, 3))
+
+    def get_index(self, station_key):
+        """Get the station index for a given station key.
+
+        :param station_key: Station key {survey}.{station}.
+        :type station_key: str
+        :raises KeyError: If the station key is not in the cube.
+        :return: Station index.
+        :rtype: int
+        """
+        try:
+            return self.station_keys.index(station_key)
+        except ValueError:
+            raise KeyError(f"Could not find {station_key} in MTDataCube.")
+
+    @staticmethod
+    def check_mt_data(mt_data):
+        """Check if all MT objects can be stacked.
+
+        :param mt_data: MT data.
+        :type mt_data: :class:`mtpy.MTData`
+        :return: Reason the MT objects cannot be stacked, None if they can.
+        :rtype: str or None
+        """
+        if len(mt_data) == 0:
+            return "Cannot build an MTDataCube from empty MTData."
+
+        first = list(mt_data.values())[0]._transfer_function
+        period = first.period.values
+        for key, mt_obj in mt_data.items():
+            ds = mt_obj._transfer_function
+            for channel in ["output", "input"]:
+                if (
+                    ds[channel].values.tolist()
+                    != first[channel].values.tolist()
+                ):
+                    return (
+                        f"Station {key} has {channel} channels "
+                        f"{ds[channel].values.tolist()} not "
+                        f"{first[channel].values.tolist()}, the impedance and "
+                        "tipper views would pick the wrong channels."
+                    )
+            if ds.transfer_function.shape != first.transfer_function.shape:
+                return (
+                    f"Station {key} has transfer function shape "
+                    f"{ds.transfer_function.shape} not "
+                    f"{first.transfer_function.shape}. Interpolate onto a "
+                    "common period map first using MTData.interpolate."
+                )
+            if not np.allclose(ds.period.values, period):
+                return (
+                    f"Station {key} periods do not match the periods of the "
+                    "other stations. Interpolate onto a common period map "
+                    "first using MTData.interpolate."
+                )
+        return None
+
+    def _validate_mt_data(self, mt_data):
+        """Make sure all MT objects can be stacked.
+
+        :param mt_data: MT data.
+        :type mt_data: :class:`mtpy.MTData`
+        :raises ValueError: If empty, or periods or channels do not match.
+        :return: Common periods.
+        :rtype: np.ndarray
+        """
+        msg = self.check_mt_data(mt_data)
+        if msg is not None:
+            raise ValueError(msg)
+        return list(mt_data.values())[0]._transfer_function.period.values
+
+    @classmethod
+    def stack_impedance(cls, mt_data):
+        """Stack only the impedance arrays of all stations without building
+        a cube.
+
+        :param mt_data: MT data.
+        :type mt_data: :class:`mtpy.MTData`
+        :raises ValueError: If empty, or periods or channels do not match.
+        :return: Impedance, impedance error and impedance model error each
+         (n_stations, n_periods, 2, 2).
+        :rtype: tuple
+        """
+        msg = cls.check_mt_data(mt_data)
+        if msg is not None:
+            raise ValueError(msg)
+        index = (Ellipsis,) + cls._z_index
+        return tuple(
+            np.stack(
+                [
+                    mt_obj._transfer_function[key].values[index]
+                    for mt_obj in mt_data.values()
+                ]
+            )
+            for key in cls._tf_keys
+        )
+
+    def from_mt_data(self, mt_data, attach=True):
+        """Fill the cube from an MTData object.
+
+        Data is copied once into the cube, if `attach` is True the MT objects
+        are then re-bound to views of the cube.
+
+        :param mt_data: MT data to stack.
+        :type mt_data: :class:`mtpy.MTData`
+        :param attach: Re-bind MT objects to views of the cube,
+         defaults to True.
+        :type attach: bool, optional
+        """
+
+        self.period = np.array(self._validate_mt_data(mt_data), dtype=float)
+        self.station_keys = list(mt_data.keys())
+        mt_list = list(mt_data.values())
+
+        first = mt_list[0]._transfer_function
+        self.outputs = first.output.values.tolist()
+        self.inputs = first.input.values.tolist()
+
+        for key in self._tf_keys:
+            setattr(
+                self,
+                key,
+                np.stack(
+                    [
+                        mt_obj._transfer_function[key].values
+                        for mt_obj in mt_list
+                    ]
+                ),
+            )
+
+        self.update_locations(mt_data)
+
+        if attach:
+            self.attach(mt_data)
+
+    def update_locations(self, mt_data):
+        """Update station location vectors from MT objects.
+
+        Locations are a snapshot, call this after changing station locations,
+        for example after `MTData.compute_relative_locations`.
+
+        :param mt_data: MT data in the same order as the cube.
+        :type mt_data: :class:`mtpy.MTData`
+        """
+        mt_list = list(mt_data.values())
+        self.survey = np.array([mt_obj.survey for mt_obj in mt_list])
+        self.station = np.array([mt_obj.station for mt_obj in mt_list])
+        for key in self._location_keys:
+            setattr(
+                self,
+                key,
+                np.array(
+                    [getattr(mt_obj, key) for mt_obj in mt_list], dtype=float
+                ),
+            )
+
+    def attach(self, mt_data):
+        """Re-bind transfer function variables of each MT object to views of
+        the cube arrays.
+
+        :param mt_data: MT data in the same order as the cube.
+        :type mt_data: :class:`mtpy.MTData`
+        """
+        if list(mt_data.keys()) != self.station_keys:
+            raise KeyError("Station keys of MTData do not match MTDataCube.")
+
+        for index, mt_obj in enumerate(mt_data.values()):
+            ds = mt_obj._transfer_function
+            for key in self._tf_keys:
+                ds[key] = (ds[key].dims, getattr(self, key)[index])
+
+    def detach(self, mt_data):
+        """Give each MT object its own copy of the transfer function arrays.
+
+        :param mt_data: MT data in the same order as the cube.
+        :type mt_data: :class:`mtpy.MTData`
+        """
+        for index, mt_obj in enumerate(mt_data.values()):
+            if not self._is_station_attached(index, mt_obj):
+                continue
+            ds = mt_obj._transfer_function
+            for key in self._tf_keys:
+                ds[key] = (ds[key].dims, ds[key].values.copy())
+
+    def _is_station_attached(self, index, mt_obj):
+        """Check if an MT object is still a view of the cube."""
+        ds = mt_obj._transfer_function
+        for key in self._tf_keys:
+            if not np.may_share_memory(
+                ds[key].values, getattr(self, key)[index]
+            ):
+                return False
+        return True
+
+    def is_attached(self, mt_data):
+        """Check if all MT objects are still views of the cube.
+
+        Operations that replace the underlying transfer function of an MT
+        object, like `MT.add_white_noise`, will detach that station.
+
+        :param mt_data: MT data.
+        :type mt_data: :class:`mtpy.MTData`
+        :return: True if every MT object is a view of the cube.
+        :rtype: bool
+        """
+        if self.transfer_function is None:
+            return False
+        if list(mt_data.keys()) != self.station_keys:
+            return False
+        for index, mt_obj in enumerate(mt_data.values()):
+            if not self._is_station_attached(index, mt_obj):
+                return False
+        return True
+
+    def compute_model_errors(self, z_model_error, t_model_error):
+        """Compute model errors for all stations in one pass.
+
+        The impedance and tipper stacks are reshaped to (n_stations *
+        n_periods, n, 2) and passed through a single
+        :class:`mtpy.modeling.errors.ModelErrors` call each.  Stations without
+        impedance or tipper are skipped, like `MT.compute_model_z_errors`.
+
+        :param z_model_error: Impedance model error parameters.
+        :type z_model_error: :class:`mtpy.modeling.errors.ModelErrors`
+        :param t_model_error: Tipper model error parameters.
+        :type t_model_error: :class:`mtpy.modeling.errors.ModelErrors`
+        """
+        for model_error, data, error, model, has_data, shape in [
+            (
+                z_model_error,
+                self.impedance,
+                self.impedance_error,
+                self.impedance_model_error,
+                self.has_impedance,
+                (2, 2),
+            ),
+            (
+                t_model_error,
+                self.tipper,
+                self.tipper_error,
+                self.tipper_model_error,
+                self.has_tipper,
+                (1, 2),
+            ),
+        ]:
+            if not has_data.any():
+                continue
+            n_stations = int(has_data.sum())
+            flat_shape = (n_stations * self.n_periods,) + shape
+            model_error.data = data[has_data].reshape(flat_shape)
+            model_error.measurement_error = error[has_data].reshape(flat_shape)
+            err = model_error.compute_error()
+            # reset so the error parameters object does not hold onto data
+            model_error.data = None
+            model_error.measurement_error = None
+
+            if len(err.shape) == 1:
+                err = np.repeat(err[:, np.newaxis, np.newaxis], 2, axis=-1)
+                err = np.repeat(err, shape[0], axis=1)
+
+            model[has_data] = err.reshape((n_stations, self.n_periods) + shape)
+
+    def rotate(
+        self, rotation_angle, coordinate_reference_frame="ned", index=None
+    ):
+        """Rotate impedance and tipper of all stations in one pass, in place.
+
+        Same rotation and error propagation as `TFBase.rotate`, the
+        (n_stations, n_periods) stacks are reshaped to one stack of
+        matrices.  Stations without impedance or tipper are skipped, like
+        `MT.rotate`.
+
+        :param rotation_angle: Angle in degrees clockwise from north, or one
+         angle for each period.
+        :type rotation_angle: float or np.ndarray
+        :param coordinate_reference_frame: One of ["ned", "+", "enu", "-"],
+         defaults to "ned".
+        :type coordinate_reference_frame: str, optional
+        :param index: Boolean array of stations to rotate, defaults to None
+         which rotates all stations.
+        :type index: np.ndarray, optional
+        :raises ValueError: If the reference frame is not understood or the
+         number of angles does not match the number of periods.
+        """
+        if coordinate_reference_frame.lower() in ["ned", "+"]:
+            clockwise = True
+        elif coordinate_reference_frame.lower() in ["enu", "-"]:
+            clockwise = False
+        else:
+            raise ValueError(
+                f"coordinate_reference_frame {coordinate_reference_frame} "
+                "not understood."
+            )
+
+        angle = np.atleast_1d(np.array(rotation_angle, dtype=float)) % 360
+        if angle.size == 1:
+            angle = np.repeat(angle, self.n_periods)
+        elif angle.size != self.n_periods:
+            raise ValueError(
+                "angles must be the same size as periods "
+                f"{self.n_periods} not {angle.size}"
+            )
+        if index is None:
+            index = np.ones(self.n_stations, dtype=bool)
+
+        for rotate_func, data, error, model, has_data in [
+            (
+                rotate_matrix_stack_with_errors,
+                self.impedance,
+                self.impedance_error,
+                self.impedance_model_error,
+                self.has_impedance,
+            ),
+            (
+                rotate_vector_stack_with_errors,
+                self.tipper,
+                self.tipper_error,
+                self.tipper_model_error,
+                self.has_tipper,
+            ),
+        ]:
+            rotate_index = index & has_data
+            n_stations = int(rotate_index.sum())
+            if n_stations == 0:
+                continue
+            shape = (n_stations, self.n_periods) + data.shape[2:]
+            flat_shape = (n_stations * self.n_periods,) + data.shape[2:]
+            rot, (rot_error, rot_model_error) = rotate_func(
+                data[rotate_index].reshape(flat_shape),
+                np.tile(angle, n_stations),
+                np.stack(
+                    [
+                        error[rotate_index].reshape(flat_shape),
+                        model[rotate_index].reshape(flat_shape),
+                    ]
+                ),
+                clockwise=clockwise,
+            )
+            # write into the views so the MT objects stay attached
+            data[rotate_index] = rot.reshape(shape)
+            error[rotate_index] = rot_error.reshape(shape)
+            model[rotate_index] = rot_model_error.reshape(shape)
+
+    def compute_phase_tensor(self):
+        """Compute the phase tensor of every station in one batched pass.
+
+        :return: Phase tensor, errors and invariants with shapes
+         (n_stations, n_periods, 2, 2) or (n_stations, n_periods), see
+         :func:`mtpy.core.transfer_function.pt.compute_phase_tensor`.
+        :rtype: dict
+        """
+        return compute_phase_tensor(
+            self.impedance,
+            self.impedance_error,
+            self.impedance_model_error,
+        )
+
+    def to_xarray(self):
+        """Create an xarray.Dataset that shares memory with the cube.
+
+        :return: Dataset with dimensions (station, period, output, input).
+        :rtype: :class:`xarray.Dataset`
+        """
+        coords = {
+            "station": self.station_keys,
+            "period": self.period,
+            "output": self.outputs,
+            "input": self.inputs,
+        }
+        data_vars = dict(
+            [
+                (
+                    key,
+                    (
+                        ["station", "period", "output", "input"],
+                        getattr(self, key),
+                    ),
+                )
+                for key in self._tf_keys
+            ]
+        )
+        for key in self._location_keys:
+            data_vars[key] = (["station"], getattr(self, key))
+
+        return xr.Dataset(data_vars, coords=coords)
@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 14:20:05 2026
+
+@author: jpeacock
+
+Run station-wise :class:`mtpy.MTData` operations in a process pool.
+
+:class:`mtpy.MT` objects carry full metadata trees and a logger that cannot
+be pickled, so the workers here only receive the transfer function arrays of
+a station, see :func:`station_arrays`, and return new transfer functions.
+The calling :class:`mtpy.MTData` method puts the results back onto the MT
+objects in station order.
+"""
+
+# =============================================================================
+# Imports
+# =============================================================================
+import io
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import loguru
+import numpy as np
+
+from mtpy.core.transfer_function import Z, Tipper
+from mtpy.modeling.errors import ModelErrors
+
+# =============================================================================
+
+
+def get_n_jobs(n_jobs=None):
+    """Get the number of workers.
+
+    Negative values count back from the number of CPUs, so -1 uses all of
+    them and -2 uses all but one.
+
+    :param n_jobs: Number of workers, defaults to None which is 1.
+    :type n_jobs: int, optional
+    :return: Number of workers.
+    :rtype: int
+    """
+    if n_jobs is None or n_jobs == 0:
+        return 1
+    if n_jobs < 0:
+        return max(1, (os.cpu_count() or 1) + 1 + n_jobs)
+    return int(n_jobs)
+
+
+def use_pool(n_jobs=None, executor=None):
+    """Check if work should be sent to a pool.
+
+    :param n_jobs: Number of workers, defaults to None.
+    :type n_jobs: int, optional
+    :param executor: Executor to use, defaults to None.
+    :type executor: :class:`concurrent.futures.Executor`, optional
+    :return: True if an executor is given or more than one worker is asked
+     for.
+    :rtype: bool
+    """
+    return executor is not None or get_n_jobs(n_jobs) > 1
+
+
+def map_stations(function, arguments, n_jobs=None, executor=None):
+    """Apply `function` to the arguments of each station.
+
+    Results are returned in the same order as `arguments`.  If `executor` is
+    given it is used as is and left open, otherwise a
+    :class:`concurrent.futures.ProcessPoolExecutor` with `n_jobs` workers is
+    made for the call.  With one worker everything is run in this process.
+
+    :param function: Picklable function to apply.
+    :type function: callable
+    :param arguments: Positional arguments for each station.
+    :type arguments: list of tuple
+    :param n_jobs: Number of workers, defaults to None.
+    :type n_jobs: int, optional
+    :param executor: Executor to use, defaults to None.
+    :type executor: :class:`concurrent.futures.Executor`, optional
+    :return: Result for each station.
+    :rtype: list
+    """
+    arguments = list(arguments)
+    if len(arguments) == 0:
+        return []
+
+    if executor is not None:
+        return list(executor.map(function, *zip(*arguments)))
+
+    n_workers = min(get_n_jobs(n_jobs), len(arguments))
+    if n_workers == 1:
+        return [function(*args) for args in arguments]
+
+    chunksize = max(1, len(arguments) // (4 * n_workers))
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        return list(pool.map(function, *zip(*arguments), chunksize=chunksize))
+
+
+def _get_logger():
+    """Get the loguru logger, used when unpickling MT objects."""
+    return loguru.logger
+
+
+class _MTPickler(pickle.Pickler):
+    """Pickler that swaps loguru loggers for a reference to the logger of the
+    receiving process, loggers hold on to their sinks which cannot be
+    pickled.
+    """
+
+    def reducer_override(self, obj):
+        if isinstance(obj, type(loguru.logger)):
+            return _get_logger, ()
+        return NotImplemented
+
+
+def dumps(obj):
+    """Pickle an object that holds on to a loguru logger.
+
+    Use this for objects like :class:`mtpy.MT` or processing configurations
+    that are sent between processes, load with :func:`pickle.loads`.
+
+    :param obj: Object to pickle.
+    :type obj: object
+    :return: Pickled object.
+    :rtype: bytes
+    """
+    buffer = io.BytesIO()
+    _MTPickler(buffer, protocol=pickle.HIGHEST_PROTOCOL).dump(obj)
+    return buffer.getvalue()
+
+
+def station_arrays(mt_obj):
+    """Get the transfer function arrays of a station.
+
+    :param mt_obj: Station.
+    :type mt_obj: :class:`mtpy.MT`
+    :return: Frequency, impedance units and tuples of (data, error, model
+     error) for the impedance and tipper, which are None if the station has
+     no impedance or tipper.
+    :rtype: dict
+    """
+    arrays = {
+        "frequency": mt_obj.frequency,
+        "impedance_units": mt_obj.impedance_units,
+        "impedance": None,
+        "tipper": None,
+    }
+    if mt_obj.has_impedance():
+        arrays["impedance"] = (
+            mt_obj.impedance.to_numpy(),
+            mt_obj.impedance_error.to_numpy(),
+            mt_obj.impedance_model_error.to_numpy(),
+        )
+    if mt_obj.has_tipper():
+        arrays["tipper"] = (
+            mt_obj.tipper.to_numpy(),
+            mt_obj.tipper_error.to_numpy(),
+            mt_obj.tipper_model_error.to_numpy(),
+        )
+    return arrays
+
+
+def transfer_function_objects(arrays):
+    """Make impedance and tipper objects from :func:`station_arrays`.
+
+    :param arrays: Station arrays.
+    :type arrays: dict
+    :return: Impedance and tipper objects, None if there is no data.
+    :rtype: tuple
+    """
+    z_object = None
+    t_object = None
+    if arrays["impedance"] is not None:
+        z, z_error, z_model_error = arrays["impedance"]
+        z_object = Z(
+            z=z,
+            z_error=z_error,
+            frequency=arrays["frequency"],
+            z_model_error=z_model_error,
+        )
+        z_object.units = arrays["impedance_units"]
+    if arrays["tipper"] is not None:
+        t, t_error, t_model_error = arrays["tipper"]
+        t_object = Tipper(
+            tipper=t,
+            tipper_error=t_error,
+            frequency=arrays["frequency"],
+            tipper_model_error=t_model_error,
+        )
+    return z_object, t_object
+
+
+def interpolate_station(arrays, new_period, kwargs):
+    """Interpolate the impedance and tipper of a station.
+
+    :param arrays: Station arrays, see :func:`station_arrays`.
+    :type arrays: dict
+    :param new_period: Periods to interpolate on to.
+    :type new_period: np.ndarray
+    :param kwargs: Keyword arguments for :meth:`mtpy.MT.interpolate`.
+    :type kwargs: dict
+    :return: Interpolated impedance and tipper.
+    :rtype: tuple
+    """
+    z_object, t_object = transfer_function_objects(arrays)
+    kwargs = dict(kwargs)
+    method = kwargs.pop("method", "slinear")
+    z_log_space = kwargs.pop("z_log_space", False)
+
+    if z_object is not None:
+        z_object = z_object.interpolate(
+            new_period, method=method, log_space=z_log_space, **kwargs
+        )
+    if t_object is not None:
+        t_object = t_object.interpolate(new_period, method=method, **kwargs)
+    return z_object, t_object
+
+
+def rotate_station(arrays, rotation_angle, coordinate_reference_frame):
+    """Rotate the impedance and tipper of a station.
+
+    :param arrays: Station arrays, see :func:`station_arrays`.
+    :type arrays: dict
+    :param rotation_angle: Angle in degrees.
+    :type rotation_angle: float
+    :param coordinate_reference_frame: Coordinate reference frame.
+    :type coordinate_reference_frame: string
+    :return: Rotated impedance and tipper.
+    :rtype: tuple
+    """
+    z_object, t_object = transfer_function_objects(arrays)
+    if z_object is not None:
+        z_object = z_object.rotate(
+            rotation_angle,
+            inplace=False,
+            coordinate_reference_frame=coordinate_reference_frame,
+        )
+    if t_object is not None:
+        t_object = t_object.rotate(
+            rotation_angle,
+            inplace=False,
+            coordinate_reference_frame=coordinate_reference_frame,
+        )
+    return z_object, t_object
+
+
+def _model_error(data, error, parameters, mode):
+    """Compute a model error array with the same shape as `data`."""
+    err = ModelErrors(
+        data=data, measurement_error=error, mode=mode, **parameters
+    ).compute_error()
+
+    if len(err.shape) == 1:
+        model_error = np.zeros_like(data, dtype=float)
+        model_error[:] = err[:, np.newaxis, np.newaxis]
+        return model_error
+    return err
+
+
+def model_errors_station(arrays, z_parameters, t_parameters):
+    """Compute impedance and tipper model errors of a station.
+
+    :param arrays: Station arrays, see :func:`station_arrays`.
+    :type arrays: dict
+    :param z_parameters: Impedance error parameters, see
+     :attr:`mtpy.modeling.errors.ModelErrors.error_parameters`.
+    :type z_parameters: dict
+    :param t_parameters: Tipper error parameters.
+    :type t_parameters: dict
+    :return: Impedance and tipper model errors, None if no data.
+    :rtype: tuple
+    """
+    z_model_error = None
+    t_model_error = None
+    if arrays["impedance"] is not None:
+        z_model_error = _model_error(
+            *arrays["impedance"][0:2], z_parameters, "impedance"
+        )
+    if arrays["tipper"] is not None:
+        t_model_error = _model_error(
+            *arrays["tipper"][0:2], t_parameters, "tipper"
+        )
+    return z_model_error, t_model_error
+
+
+def white_noise_station(tf, tf_error, value, seed):
+    """Add white noise to a transfer function.
+
+    Each station gets its own seed so forked workers do not share the same
+    random state.
+
+    :param tf: Transfer function.
+    :type tf: np.ndarray
+    :param tf_error: Transfer function error.
+    :type tf_error: np.ndarray
+    :param value: Noise level as a fraction.
+    :type value: float
+    :param seed: Seed for the random generator.
+    :type seed: int
+    :return: Noisy transfer function and error.
+    :rtype: tuple
+    """
+    rng = np.random.default_rng(seed)
+    noise_real = 1 + rng.random(tf.shape) * value * (-1) ** (
+        rng.integers(0, 3, tf.shape)
+    )
+    noise_imag = 1 + rng.random(tf.shape) * value * (-1) ** (
+        rng.integers(0, 3, tf.shape)
+    )
+    return (
+        tf.real * noise_real + 1j * tf.imag * noise_imag,
+        tf_error + value,
+    )
@@ -13,6 +13,7 @@ import pandas as pd
 from scipy.spatial.distance import pdist
 
 from . import Z, Tipper
+from .transfer_function.pt import compute_phase_tensor
 
 # =============================================================================
 
@@ -264,7 +265,7 @@ class MTDataFrame:
     def _get_initial_df(self, n_entries=0):
         """Get initial df."""
         return pd.DataFrame(
-            np.empty(n_entries, dtype=np.dtype(self._dtype_list))
+            np.zeros(n_entries, dtype=np.dtype(self._dtype_list))
         )
 
     def _has_data(self):
@@ -627,50 +628,67 @@ class MTDataFrame:
                     column,
                 ] = data_array[:, index["ii"], index["jj"]]
 
-    def from_z_object(self, z_object):
-        """Fill impedance.
-        :param z_object:
-        :param impedance: DESCRIPTION.
-        :type impedance: TYPE
-        :param index: DESCRIPTION.
-        :type index: TYPE
-        :return: DESCRIPTION.
-        :rtype: TYPE
+    def _fill_columns(self, columns):
+        """Fill many data frame columns for the working station at once.
+
+        The station mask is computed once instead of once per column.  If the
+        dataframe only contains the working station the columns are assigned
+        directly.
+
+        :param columns: Column name and 1-D array of values.
+        :type columns: dict
         """
 
-        self.dataframe.loc[self.dataframe.station == self.station, "period"] = (
-            z_object.period
-        )
+        mask = (self.dataframe.station == self.station).values
+        if mask.all():
+            for column, data_array in columns.items():
+                self.dataframe[column] = np.array(
+                    data_array, dtype=self.dataframe[column].dtype
+                )
+        else:
+            for column, data_array in columns.items():
+                self.dataframe.loc[mask, column] = data_array
+
+    def _z_object_columns(self, z_object, phase_tensor=None):
+        """Get the impedance, resistivity, phase and phase tensor columns
+        from a Z object.
+
+        :param z_object: Impedance object.
+        :type z_object: :class:`mtpy.core.transfer_function.z.Z`
+        :param phase_tensor: Phase tensor arrays for this station as returned
+         by :func:`mtpy.core.transfer_function.pt.compute_phase_tensor`,
+         calculated from `z_object` if None, defaults to None.
+        :type phase_tensor: dict, optional
+        :return: Column name and 1-D array of values.
+        :rtype: dict
+        """
 
-        # should make a copy of the phase tensor otherwise it gets calculated
-        # multiple times and becomes a time sink.
-        pt_object = z_object.phase_tensor.copy()
+        columns = {"period": z_object.period}
+
+        if phase_tensor is None:
+            phase_tensor = compute_phase_tensor(
+                z_object.z, z_object.z_error, z_object.z_model_error
+            )
 
         for error in ["", "_error", "_model_error"]:
             if getattr(z_object, f"_has_tf{error}")():
                 for key in ["z", "res", "phase"]:
                     obj_key = self._key_dict[key]
-                    data_array = getattr(z_object, f"{obj_key}{error}").copy()
+                    data_array = getattr(z_object, f"{obj_key}{error}")
                     for comp in ["xx", "xy", "yx", "yy"]:
                         index = self._get_index(comp)
-                        # if key in ["pt"]:
-                        #     data_array = self._get_data_array(
-                        #         obj, f"{key}{error}"
-                        #     )
-                        # else:
-                        #     data_array = self._get_data_array(
-                        #         z_object, f"{obj_key}{error}"
-                        #     )
-
-                        self._fill_data(
-                            data_array, f"{key}_{comp}{error}", index
-                        )
+                        columns[f"{key}_{comp}{error}"] = data_array[
+                            :, index["ii"], index["jj"]
+                        ]
 
                 ## phase tensor
-                data_array = getattr(pt_object, f"pt{error}")
-                for comp in ["xx", "xy", "yx", "yy"]:
-                    index = self._get_index(comp)
-                    self._fill_data(data_array, f"pt_{comp}{error}", index)
+                data_array = phase_tensor[f"pt{error}"]
+                if data_array is not None:
+                    for comp in ["xx", "xy", "yx", "yy"]:
+                        index = self._get_index(comp)
+                        columns[f"pt_{comp}{error}"] = data_array[
+                            :, index["ii"], index["jj"]
+                        ]
                 # PT attributes
                 for pt_attr in [
                     "phimin",
@@ -680,36 +698,34 @@ class MTDataFrame:
                     "ellipticity",
                     "det",
                 ]:
-                    data_array = self._get_data_array(
-                        pt_object, f"{pt_attr}{error}"
-                    )
-                    self._fill_data(data_array, f"pt_{pt_attr}{error}", None)
+                    data_array = phase_tensor[f"{pt_attr}{error}"]
+                    if data_array is not None:
+                        columns[f"pt_{pt_attr}{error}"] = data_array
+        return columns
 
-    def from_t_object(self, t_object):
-        """Fill tipper.
-        :param t_object:
-        :param tipper: DESCRIPTION.
-        :type tipper: TYPE
-        :param tipper_error: DESCRIPTION.
-        :type tipper_error: TYPE
-        :param index: DESCRIPTION.
-        :type index: TYPE
-        :return: DESCRIPTION.
-        :rtype: TYPE
+    def _t_object_columns(self, t_object):
+        """Get the tipper columns from a Tipper object.
+
+        :param t_object: Tipper object.
+        :type t_object: :class:`mtpy.core.transfer_function.tipper.Tipper`
+        :return: Column name and 1-D array of values.
+        :rtype: dict
         """
-        self.dataframe.loc[self.dataframe.station == self.station, "period"] = (
-            t_object.period
-        )
+
+        columns = {"period": t_object.period}
 
         for error in ["", "_error", "_model_error"]:
             if getattr(t_object, f"_has_tf{error}")():
                 obj_key = self._key_dict["t"]
-                for comp in ["zx", "zy"]:
-                    index = self._get_index(comp)
-                    data_array = self._get_data_array(
-                        t_object, f"{obj_key}{error}"
-                    )
-                    self._fill_data(data_array, f"t_{comp}{error}", index)
+                data_array = self._get_data_array(
+                    t_object, f"{obj_key}{error}"
+                )
+                if data_array is not None:
+                    for comp in ["zx", "zy"]:
+                        index = self._get_index(comp)
+                        columns[f"t_{comp}{error}"] = data_array[
+                            :, index["ii"], index["jj"]
+                        ]
 
                 if error in [""]:
                     for t_attr in [
@@ -719,7 +735,94 @@ class MTDataFrame:
                         "angle_imag",
                     ]:
                         data_array = self._get_data_array(t_object, t_attr)
-                        self._fill_data(data_array, f"t_{t_attr}", None)
+                        if data_array is not None:
+                            columns[f"t_{t_attr}"] = data_array[:]
+        return columns
+
+    def from_z_object(self, z_object):
+        """Fill impedance, resistivity, phase and phase tensor columns.
+
+        :param z_object: Impedance object.
+        :type z_object: :class:`mtpy.core.transfer_function.z.Z`
+        """
+
+        self._fill_columns(self._z_object_columns(z_object))
+
+    def from_t_object(self, t_object):
+        """Fill tipper columns.
+
+        :param t_object: Tipper object.
+        :type t_object: :class:`mtpy.core.transfer_function.tipper.Tipper`
+        """
+
+        self._fill_columns(self._t_object_columns(t_object))
+
+    def get_station_block(
+        self,
+        period,
+        location=None,
+        z_object=None,
+        t_object=None,
+        phase_tensor=None,
+    ):
+        """Build a dataframe for a single station directly from arrays.
+
+        All columns of `_dtype_list` are filled in a structured array and
+        the dataframe is created once, which avoids a boolean station mask
+        scan for every column.  Concatenate blocks of several stations with
+        :func:`pandas.concat` to build a survey dataframe.
+
+        :param period: Periods of the station.
+        :type period: np.ndarray
+        :param location: Station location attributes, keys from
+         `_station_location_attrs`, defaults to None.
+        :type location: dict, optional
+        :param z_object: Impedance object, defaults to None.
+        :type z_object: :class:`mtpy.core.transfer_function.z.Z`, optional
+        :param t_object: Tipper object, defaults to None.
+        :type t_object: :class:`mtpy.core.transfer_function.tipper.Tipper`,
+         optional
+        :param phase_tensor: Precomputed phase tensor arrays for this
+         station, for example a slice of `MTData.compute_phase_tensor`,
+         defaults to None.
+        :type phase_tensor: dict, optional
+        :return: Dataframe with all columns for the station.
+        :rtype: :class:`pandas.DataFrame`
+        """
+
+        if location is None:
+            location = {}
+
+        period = np.asarray(period)
+        block = np.zeros(period.size, dtype=np.dtype(self._dtype_list))
+        block["period"] = period
+
+        columns = {}
+        if z_object is not None:
+            columns.update(
+                self._z_object_columns(z_object, phase_tensor=phase_tensor)
+            )
+        if t_object is not None:
+            columns.update(self._t_object_columns(t_object))
+        for column, data_array in columns.items():
+            block[column] = data_array
+
+        # string columns are object columns in pandas so set them after
+        # the dataframe is made to keep the input type.
+        string_columns = {}
+        for key, value in location.items():
+            if block.dtype[key].kind == "U":
+                string_columns[key] = value
+            elif value is None:
+                block[key] = np.nan
+            else:
+                block[key] = value
+
+        df = pd.DataFrame(block)
+        for key, value in string_columns.items():
+            df[key] = np.full(period.size, value, dtype=object)
+
+        return df
 
     def to_z_object(self, units="mt"):
         """Fill z_object from dataframe
@@ -841,9 +944,73 @@ class MTDataFrame:
             .reset_index()
         )
 
+    def compute_phase_tensor(self):
+        """Fill the phase tensor columns from the impedance columns of all
+        stations in one batched pass.
+
+        Useful for dataframes made from impedances only, for example read
+        from a file.  Rows with an impedance or error of all zeros get zeros.
+        """
+
+        if not self._has_data():
+            return
+
+        n_rows = self.dataframe.shape[0]
+        z = {}
+        for error, dtype in [
+            ("", complex),
+            ("_error", float),
+            ("_model_error", float),
+        ]:
+            z[error] = np.zeros((n_rows, 1, 2, 2), dtype=dtype)
+            for comp in ["xx", "xy", "yx", "yy"]:
+                index = self._get_index(comp)
+                z[error][:, 0, index["ii"], index["jj"]] = self.dataframe[
+                    f"z_{comp}{error}"
+                ].values
+
+        pt_dict = compute_phase_tensor(z[""], z["_error"], z["_model_error"])
+        for error in ["", "_error", "_model_error"]:
+            for comp in ["xx", "xy", "yx", "yy"]:
+                index = self._get_index(comp)
+                self.dataframe[f"pt_{comp}{error}"] = pt_dict[f"pt{error}"][
+                    :, 0, index["ii"], index["jj"]
+                ]
+            for pt_attr in [
+                "phimin",
+                "phimax",
+                "azimuth",
+                "skew",
+                "ellipticity",
+                "det",
+            ]:
+                self.dataframe[f"pt_{pt_attr}{error}"] = pt_dict[
+                    f"{pt_attr}{error}"
+                ][:, 0]
+
+    def _has_phase_tensor(self):
+        """Check if phase tensor columns have been filled."""
+        return (self.dataframe[["pt_xx", "pt_xy", "pt_yx", "pt_yy"]] != 0).any(
+            axis=None
+        )
+
+    def _has_impedance(self):
+        """Check if impedance columns have been filled."""
+        return (self.dataframe[["z_xx", "z_xy", "z_yx", "z_yy"]] != 0).any(
+            axis=None
+        )
+
     @property
     def phase_tensor(self):
-        """Phase tensor information."""
+        """Phase tensor information.
+
+        If the phase tensor columns are empty but there are impedances, the
+        phase tensor is computed first with :meth:`compute_phase_tensor`.
+        """
+
+        if self._has_data():
+            if self._has_impedance() and not self._has_phase_tensor():
+                self.compute_phase_tensor()
 
         return self.dataframe[
             self._station_location_attrs + self._pt_attrs
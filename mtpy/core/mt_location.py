@@ -188,7 +188,10 @@ class MTLocation:
     @datum_crs.setter
     def datum_crs(self, value):
         """Datum crs."""
-        if value in [None, "None", "none", "null", ""]:
+        # check the type first, comparing a CRS to a string builds a new CRS
+        if value is None or (
+            isinstance(value, str) and value in ["None", "none", "null", ""]
+        ):
             return
 
         new_crs = CRS.from_user_input(value)
@@ -261,7 +264,10 @@ class MTLocation:
     @utm_crs.setter
     def utm_crs(self, value):
         """Utm crs."""
-        if value in [None, "None", "none", "null", ""]:
+        # check the type first, comparing a CRS to a string builds a new CRS
+        if value is None or (
+            isinstance(value, str) and value in ["None", "none", "null", ""]
+        ):
             return
 
         new_crs = CRS.from_user_input(value)
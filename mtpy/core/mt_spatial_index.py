@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 16:05:48 2026
+
+@author: jpeacock
+
+Spatial index of station locations for :class:`mtpy.MTData`.
+
+Station locations are pulled off the MT objects once and put into
+:class:`scipy.spatial.cKDTree` objects, one in UTM east/north (meters) and
+one in longitude/latitude (degrees), so neighbour queries do not have to
+loop over every station.  :class:`mtpy.MTData` drops the index when
+stations are added or removed.
+"""
+
+# =============================================================================
+# Imports
+# =============================================================================
+import numpy as np
+from scipy.spatial import cKDTree
+
+# =============================================================================
+
+
+class MTSpatialIndex:
+    """KD-tree index of station locations.
+
+    :Build from an MTData object: ::
+
+        >>> index = MTSpatialIndex(md)
+        >>> index.query_radius("survey.mt01", 1000, units="m")
+        ['survey.mt02', 'survey.mt03']
+
+    """
+
+    _meter_units = ["m", "meters", "metres"]
+    _degree_units = ["deg", "degrees"]
+
+    def __init__(self, mt_data):
+        self.station_keys = list(mt_data.keys())
+        self.utm_epsg = mt_data.utm_epsg
+
+        n_stations = len(self.station_keys)
+        self.east = np.zeros(n_stations)
+        self.north = np.zeros(n_stations)
+        self.longitude = np.zeros(n_stations)
+        self.latitude = np.zeros(n_stations)
+        for ii, mt_obj in enumerate(mt_data.values()):
+            self.longitude[ii] = mt_obj.longitude
+            self.latitude[ii] = mt_obj.latitude
+            self.east[ii] = mt_obj.east
+            self.north[ii] = mt_obj.north
+
+        self._key_index = dict(
+            (key, ii) for ii, key in enumerate(self.station_keys)
+        )
+        self._trees = {}
+
+    def __len__(self):
+        return len(self.station_keys)
+
+    def is_current(self, mt_data):
+        """Check the index was built from the stations and UTM CRS of
+        `mt_data`.
+
+        :param mt_data: Data to check against.
+        :type mt_data: :class:`mtpy.MTData`
+        :return: True if the index can be used for `mt_data`.
+        :rtype: bool
+        """
+        return (
+            self.utm_epsg == mt_data.utm_epsg
+            and len(self.station_keys) == len(mt_data)
+            and all(
+                key == index_key
+                for key, index_key in zip(mt_data.keys(), self.station_keys)
+            )
+        )
+
+    def _validate_units(self, units):
+        """Get the units key, "m" or "deg"."""
+        if units in self._meter_units:
+            if self.utm_epsg is None:
+                raise ValueError(
+                    "Cannot estimate distances in meters without a UTM CRS. "
+                    "Set 'utm_crs' first."
+                )
+            return "m"
+        elif units in self._degree_units:
+            return "deg"
+        raise ValueError(
+            f"Units {units} not understood, options are "
+            f"{self._meter_units + self._degree_units}"
+        )
+
+    def points(self, units="m"):
+        """Station coordinates.
+
+        :param units: [ "m" | "deg" ], defaults to "m".
+        :type units: str, optional
+        :return: (n_stations, 2) array of east, north or longitude,
+         latitude.
+        :rtype: np.ndarray
+        """
+        if self._validate_units(units) == "m":
+            return np.column_stack((self.east, self.north))
+        return np.column_stack((self.longitude, self.latitude))
+
+    def tree(self, units="m"):
+        """KD-tree of the station coordinates, built on first use.
+
+        :param units: [ "m" | "deg" ], defaults to "m".
+        :type units: str, optional
+        :return: KD-tree.
+        :rtype: :class:`scipy.spatial.cKDTree`
+        """
+        units = self._validate_units(units)
+        if units not in self._trees:
+            self._trees[units] = cKDTree(self.points(units))
+        return self._trees[units]
+
+    def get_index(self, station_key):
+        """Get the index of a station key.
+
+        :param station_key: Station key as {survey}.{station}.
+        :type station_key: str
+        :return: Index of the station.
+        :rtype: int
+        """
+        try:
+            return self._key_index[station_key]
+        except KeyError:
+            raise KeyError(f"Could not find {station_key} in spatial index.")
+
+    def query_radius_all(self, radius, units="m"):
+        """Get the neighbours of every station within `radius` in one
+        query.
+
+        Stations at zero distance, including the station itself, are not
+        neighbours.
+
+        :param radius: Search radius.
+        :type radius: float
+        :param units: [ "m" | "deg" ], defaults to "m".
+        :type units: str, optional
+        :return: Indices of neighbours for each station sorted by index.
+        :rtype: list of np.ndarray
+        """
+        tree = self.tree(units)
+        points = self.points(units)
+        neighbours = []
+        for ii, index in enumerate(tree.query_ball_point(points, radius)):
+            index = np.array(sorted(index), dtype=int)
+            distance = np.linalg.norm(points[index] - points[ii], axis=1)
+            neighbours.append(index[distance > 0])
+        return neighbours
+
+    def query_radius(self, station_key, radius, units="m"):
+        """Get the station keys within `radius` of a station.
+
+        :param station_key: Station key as {survey}.{station}.
+        :type station_key: str
+        :param radius: Search radius.
+        :type radius: float
+        :param units: [ "m" | "deg" ], defaults to "m".
+        :type units: str, optional
+        :return: Station keys of neighbours in station order.
+        :rtype: list
+        """
+        points = self.points(units)
+        point = points[self.get_index(station_key)]
+        index = np.array(
+            sorted(self.tree(units).query_ball_point(point, radius)),
+            dtype=int,
+        )
+        distance = np.linalg.norm(points[index] - point, axis=1)
+        return [self.station_keys[ii] for ii in index[distance > 0]]
+
+    def distance_to_line(self, x1, y1, x2, y2):
+        """Perpendicular distance of each station to the line through
+        (x1, y1) and (x2, y2) in east, north.
+
+        :param x1: East of first point.
+        :type x1: float
+        :param y1: North of first point.
+        :type y1: float
+        :param x2: East of second point.
+        :type x2: float
+        :param y2: North of second point.
+        :type y2: float
+        :return: Distance of each station in meters.
+        :rtype: np.ndarray
+        """
+        return np.abs(
+            (x2 - x1) * (y1 - self.north) - (x1 - self.east) * (y2 - y1)
+        ) / np.sqrt((x2 - x1) ** 2 + (y2 - y1) ** 2)
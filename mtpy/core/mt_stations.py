@@ -931,6 +931,28 @@ class MTStations:
 
         return x1, y1, x2, y2, profile_line
 
+    def _distance_to_line(self, x1, y1, x2, y2):
+        """Perpendicular distance of each station to the line through
+        (x1, y1) and (x2, y2) in east, north.
+
+        Parameters
+        ----------
+        x1, y1 : float
+            East and north of the first point.
+        x2, y2 : float
+            East and north of the second point.
+
+        Returns
+        -------
+        np.ndarray
+            Distance of each station in meters.
+        """
+        east = np.array([mt_obj.east for mt_obj in self.mt_list])
+        north = np.array([mt_obj.north for mt_obj in self.mt_list])
+        return np.abs(
+            (x2 - x1) * (y1 - north) - (x1 - east) * (y2 - y1)
+        ) / np.sqrt((x2 - x1) ** 2 + (y2 - y1) ** 2)
+
     def _extract_profile(self, x1, y1, x2, y2, radius):
         """Extract stations along a profile line that lie with in the given
         radius
@@ -971,20 +993,14 @@ class MTStations:
         if radius is None:
             radius = 1e12
 
-        def distance(x, y):
-            """Distance function."""
-            return np.abs(
-                (x2 - x1) * (y1 - y) - (x1 - x) * (y2 - y1)
-            ) / np.sqrt((x2 - x1) ** 2 + (y2 - y1) ** 2)
-
         slope = (y2 - y1) / (x2 - x1)
         intersection = y1 - slope * x1
 
         profile_list = []
         offsets = []
-        for mt_obj in self.mt_list:
-            d = distance(mt_obj.east, mt_obj.north)
-
+        for mt_obj, d in zip(
+            self.mt_list, self._distance_to_line(x1, y1, x2, y2)
+        ):
             if d <= radius:
                 mt_obj.project_onto_profile_line(slope, intersection)
                 profile_list.append(mt_obj)
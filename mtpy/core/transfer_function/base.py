@@ -14,17 +14,234 @@ Updated 11/2020 for logging and formating (J. Peacock).
 # Imports
 # =============================================================================
 from copy import deepcopy
+from functools import wraps
 
 import numpy as np
 import xarray as xr
 from loguru import logger
+from scipy import interpolate
 
 from mtpy.utils.calculator import (
-    rotate_matrix_with_errors,
-    rotate_vector_with_errors,
+    rotate_matrix_stack_with_errors,
+    rotate_vector_stack_with_errors,
 )
 
 
+# ==============================================================================
+def memoized_property(function):
+    """Read only property that is computed once per state of the transfer
+    function.
+
+    The value is stored in the cache of the :class:`TFBase` object and is
+    recomputed after the cache version changes, see
+    :meth:`TFBase._bump_version`.
+    """
+
+    @wraps(function)
+    def getter(self):
+        return self._get_cached(function.__name__, lambda: function(self))
+
+    return property(getter)
+
+
+INTERP1D_METHODS = (
+    "linear",
+    "nearest",
+    "nearest-up",
+    "zero",
+    "slinear",
+    "quadratic",
+    "cubic",
+    "previous",
+    "next",
+)
+PPOLY_METHODS = {
+    "pchip": interpolate.PchipInterpolator,
+    "akima": interpolate.Akima1DInterpolator,
+}
+
+
+def _get_interpolator(x, y, method, **kwargs):
+    """Get a scipy interpolator along the first axis of `y`.
+
+    :param x: Sorted abscissa.
+    :type x: np.ndarray
+    :param y: Values with shape (x.size, n_columns).
+    :type y: np.ndarray
+    :param method: Interpolation method.
+    :type method: string
+    :param **kwargs: Keyword arguments passed to
+        :class:`scipy.interpolate.interp1d`.
+    :type **kwargs: dict
+    :raises ValueError: If the method is not supported.
+    :return: Interpolator.
+    :rtype: callable
+    """
+
+    if method in PPOLY_METHODS:
+        return PPOLY_METHODS[method](x, y, axis=0)
+    if method in INTERP1D_METHODS:
+        interp_kwargs = {"bounds_error": False, "fill_value": np.nan}
+        interp_kwargs.update(kwargs)
+        return interpolate.interp1d(
+            x, y, kind=method, axis=0, assume_sorted=True, **interp_kwargs
+        )
+    raise ValueError(
+        f"Interpolation method {method} not supported, options are "
+        f"{list(INTERP1D_METHODS) + list(PPOLY_METHODS)}"
+    )
+
+
+def _fill_nans(x, y, method):
+    """Interpolate over NaNs in each column of `y`.
+
+    Columns that share the same NaN pattern are filled together so the
+    number of interpolator calls scales with the number of distinct gaps
+    rather than the number of columns.
+
+    :param x: Sorted abscissa.
+    :type x: np.ndarray
+    :param y: Real values with shape (x.size, n_columns).
+    :type y: np.ndarray
+    :param method: Interpolation method.
+    :type method: string
+    :return: Array with NaNs filled where possible.
+    :rtype: np.ndarray
+    """
+
+    nan_mask = np.isnan(y)
+    fill_columns = np.where(nan_mask.any(axis=0))[0]
+    if fill_columns.size == 0:
+        return y
+
+    y = y.copy()
+    patterns, inverse = np.unique(
+        nan_mask[:, fill_columns], axis=1, return_inverse=True
+    )
+    for index, pattern in enumerate(patterns.T):
+        good = ~pattern
+        if good.sum() < 2:
+            continue
+        columns = fill_columns[inverse.ravel() == index]
+        interpolator = _get_interpolator(
+            x[good], y[np.ix_(good, columns)], method
+        )
+        y[np.ix_(pattern, columns)] = interpolator(x[pattern])
+    return y
+
+
+def interpolate_arrays(
+    period,
+    arrays,
+    new_period,
+    method="slinear",
+    na_method="pchip",
+    log_space=False,
+    extrapolate=False,
+    **kwargs,
+):
+    """Interpolate arrays onto new periods in a single pass.
+
+    All arrays are flattened into one real valued matrix of shape
+    (n_periods, n_columns), complex arrays are split into real and
+    imaginary parts which are interpolated separately.  NaNs along the original periods are filled using
+    `na_method`, then every column is interpolated onto `new_period`
+    using `method`.
+
+    Unless `extrapolate` is True, components that start or end with NaNs or
+    zeros keep NaNs at new periods outside of their valid period range.
+
+    :param period: Original periods.
+    :type period: np.ndarray
+    :param arrays: Arrays with shape (n_periods, ...).
+    :type arrays: list of np.ndarray
+    :param new_period: New periods to interpolate on to.
+    :type new_period: np.ndarray
+    :param method: Method for interpolating onto the new periods,
+        defaults to "slinear".
+    :type method: string, optional
+    :param na_method: Method to interpolate NaNs along the original periods,
+        defaults to "pchip".
+    :type na_method: string, optional
+    :param log_space: Interpolate the natural log of the arrays,
+        defaults to False.
+    :type log_space: bool, optional
+    :param extrapolate: Keep values outside the valid period range,
+        defaults to False.
+    :type extrapolate: bool, optional
+    :param **kwargs: Keyword arguments passed to
+        :class:`scipy.interpolate.interp1d`.
+    :type **kwargs: dict
+    :return: Interpolated arrays with shape (n_new_periods, ...).
+    :rtype: list of np.ndarray
+    """
+
+    period = np.asarray(period, dtype=float)
+    new_period = np.atleast_1d(np.asarray(new_period, dtype=float))
+    order = np.argsort(period)
+    period = period[order]
+    n_periods = period.size
+
+    columns = []
+    missing = []
+    for array in arrays:
+        array = np.asarray(array)[order]
+        missing.append((np.nan_to_num(array) == 0).reshape((n_periods, -1)))
+        if log_space:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                array = np.log(array)
+        array = array.reshape((n_periods, -1))
+        if np.iscomplexobj(array):
+            nan_index = np.isnan(array)
+            columns += [
+                np.where(nan_index, np.nan, array.real),
+                np.where(nan_index, np.nan, array.imag),
+            ]
+        else:
+            columns.append(array)
+
+    data = np.hstack(columns).astype(float)
+    data = _fill_nans(period, data, na_method)
+    data = _get_interpolator(period, data, method, **kwargs)(new_period)
+
+    interpolated = []
+    index = 0
+    for array, array_missing in zip(arrays, missing):
+        n_columns = array_missing.shape[1]
+        new_shape = (new_period.size,) + np.shape(array)[1:]
+        if np.iscomplexobj(array):
+            new_array = data[:, index : index + n_columns] + 1j * (
+                data[:, index + n_columns : index + 2 * n_columns]
+            )
+            index += 2 * n_columns
+        else:
+            new_array = data[:, index : index + n_columns]
+            index += n_columns
+        if log_space:
+            new_array = np.exp(new_array)
+
+        if not extrapolate:
+            valid = ~array_missing
+            first = np.argmax(valid, axis=0)
+            last = n_periods - 1 - np.argmax(valid[::-1], axis=0)
+            period_min = np.where(first > 0, period[first], -np.inf)
+            period_max = np.where(last < n_periods - 1, period[last], np.inf)
+            period_min[~valid.any(axis=0)] = np.inf
+            outside = (new_period[:, np.newaxis] < period_min) | (
+                new_period[:, np.newaxis] > period_max
+            )
+            if np.iscomplexobj(new_array):
+                new_array = np.where(outside, np.nan + 1j * np.nan, new_array)
+            else:
+                new_array = np.where(outside, np.nan, new_array)
+
+        interpolated.append(
+            new_array.reshape(new_shape).astype(np.asarray(array).dtype)
+        )
+
+    return interpolated
+
+
 # ==============================================================================
 # Impedance Tensor Class
 # ==============================================================================
@@ -47,6 +264,8 @@ class TFBase:
         self.outputs = ["x", "y"]
         self._expected_shape = (2, 2)
         self._name = "base transfer function"
+        self._version = 0
+        self._cache = {}
         self._dataset = None
         self._tf_dtypes = {
             "tf": complex,
@@ -120,16 +339,85 @@ class TFBase:
         result = cls.__new__(cls)
         memo[id(self)] = result
         for k, v in self.__dict__.items():
-            if k in ["logger"]:
+            if k in ["logger", "_cache"]:
                 continue
 
             setattr(result, k, deepcopy(v, memo))
+        result._cache = {}
         return result
 
+    def __getstate__(self):
+        """Pickle only the data and attributes, not the logger or cache."""
+        state = {
+            k: v
+            for k, v in self.__dict__.items()
+            if k not in ["logger", "_cache"]
+        }
+        return state
+
+    def __setstate__(self, state):
+        """Restore from a pickled state."""
+        self.__dict__.update(state)
+        self.logger = logger
+        self._cache = {}
+
     def copy(self):
         """Copy function."""
         return deepcopy(self)
 
+    @property
+    def _dataset(self):
+        """xarray.Dataset holding the transfer function.
+
+        Setting the dataset invalidates memoized derived quantities.
+        """
+        return self._tf_dataset
+
+    @_dataset.setter
+    def _dataset(self, dataset):
+        """Set the dataset and invalidate memoized derived quantities."""
+        self._tf_dataset = dataset
+        self._bump_version()
+
+    def _bump_version(self):
+        """Invalidate memoized derived quantities.
+
+        Called whenever the underlying dataset is set or changed in place
+        through a setter, rotated, interpolated or has static shift removed.
+        If the dataset is changed directly, for example through the array
+        returned by `to_xarray`, call this method to clear the cache.
+        """
+        self._version = getattr(self, "_version", 0) + 1
+        self._cache = {}
+
+    def _cache_key(self):
+        """Key that memoized derived quantities are valid for."""
+        return self._version
+
+    def _get_cached(self, name, function):
+        """Get a memoized derived quantity, compute it if needed.
+
+        A copy is returned so callers can not change the cached value.
+
+        :param name: Name of the quantity.
+        :type name: str
+        :param function: Function to compute the quantity.
+        :type function: callable
+        :return: Derived quantity.
+        """
+        key = self._cache_key()
+        entry = self._cache.get(name)
+        if entry is None or entry[0] != key:
+            entry = (key, function())
+            self._cache[name] = entry
+
+        value = entry[1]
+        if value is None:
+            return None
+        if hasattr(value, "copy"):
+            return value.copy()
+        return deepcopy(value)
+
     def _initialize(
         self, periods=[1], tf=None, tf_error=None, tf_model_error=None
     ):
@@ -520,9 +808,9 @@ class TFBase:
         def get_rotate_function(shape):
             """Get rotate function."""
             if shape[0] == 2:
-                return rotate_matrix_with_errors
+                return rotate_matrix_stack_with_errors
             elif shape[0] == 1:
-                return rotate_vector_with_errors
+                return rotate_vector_stack_with_errors
 
         def validate_angle(self, angle):
             """Validate angle to be a valid float."""
@@ -566,48 +854,24 @@ class TFBase:
         self.rotation_angle = self.rotation_angle + degree_angle
 
         ds = self._dataset.copy()
-        rot_tf = np.zeros_like(
-            self._dataset.transfer_function.values, dtype=complex
-        )
-        rot_tf_error = np.zeros_like(
-            self._dataset.transfer_function.values, dtype=float
-        )
-        rot_tf_model_error = np.zeros_like(
-            self._dataset.transfer_function.values, dtype=float
-        )
 
         rotate_func = get_rotate_function(self._expected_shape)
         clockwise = get_clockwise(coordinate_reference_frame)
 
-        for index, angle in enumerate(degree_angle):
-            if self._has_tf():
-                if self._has_tf_error():
-                    (
-                        rot_tf[index, :, :],
-                        rot_tf_error[index, :, :],
-                    ) = rotate_func(
-                        ds.transfer_function[index].values,
-                        angle,
-                        ds.transfer_function_error[index].values,
-                        clockwise=clockwise,
-                    )
-                if self._has_tf_model_error():
-                    (
-                        rot_tf[index, :, :],
-                        rot_tf_model_error[index, :, :],
-                    ) = rotate_func(
-                        ds.transfer_function[index].values,
-                        angle,
-                        ds.transfer_function_model_error[index].values,
-                        clockwise=clockwise,
-                    )
-                if not self._has_tf_error() and not self._has_tf_model_error():
-                    (rot_tf[index, :, :], _) = rotate_func(
-                        ds.transfer_function[index].values,
-                        angle,
-                        clockwise=clockwise,
-                    )
-        ds.transfer_function.values = rot_tf
+        # rotate all periods, errors and model errors in one pass, errors
+        # that are all zeros stay zeros.
+        rot_tf, (rot_tf_error, rot_tf_model_error) = rotate_func(
+            ds.transfer_function.values,
+            degree_angle,
+            np.stack(
+                [
+                    ds.transfer_function_error.values,
+                    ds.transfer_function_model_error.values,
+                ]
+            ),
+            clockwise=clockwise,
+        )
+        ds.transfer_function.values = rot_tf.astype(complex)
         ds.transfer_function_error.values = rot_tf_error
         ds.transfer_function_model_error.values = rot_tf_model_error
 
@@ -626,6 +890,7 @@ class TFBase:
         na_method="pchip",
         log_space=False,
         extrapolate=False,
+        engine="xarray",
         **kwargs,
     ):
         """Interpolate onto a new period range.
@@ -661,12 +926,38 @@ class TFBase:
                 :param extrapolate: Extrapolate past original period range, default is
                     False. If set to True be careful cause the values are not great, defaults to False.
                 :type extrapolate: bool, optional
+                :param engine: Interpolation engine, "xarray" interpolates each
+                    data variable with xarray, "numpy" interpolates all
+                    components of the transfer function, error and model error
+                    in one array pass with :func:`interpolate_arrays`, which is
+                    much faster, defaults to "xarray".
+                :type engine: string, optional
                 :param **kwargs: Keyword args passed to interpolation methods.
                 :type **kwargs: dict
                 :return: Interpolated object.
                 :rtype: :class:`mtpy.core.transfer_fuction.base.TFBase`
         """
 
+        if engine == "numpy":
+            ds = self._interpolate_numpy(
+                new_periods,
+                method=method,
+                na_method=na_method,
+                log_space=log_space,
+                extrapolate=extrapolate,
+                **kwargs,
+            )
+            if inplace:
+                self._dataset = ds
+                return
+            tb = self.copy()
+            tb._dataset = ds
+            return tb
+        elif engine != "xarray":
+            raise ValueError(
+                f"engine must be 'xarray' or 'numpy' not {engine}"
+            )
+
         da_dict = {}
         for key in self._dataset.data_vars:
             # need to interpolate over nans first, if use dropna loose a lot
@@ -707,6 +998,46 @@ class TFBase:
             tb._dataset = ds
             return tb
 
+    def _interpolate_numpy(self, new_periods, **kwargs):
+        """Interpolate all data variables in one pass with
+        :func:`interpolate_arrays`.
+
+        :param new_periods: New periods to interpolate on to.
+        :type new_periods: np.ndarray, list
+        :param **kwargs: Keyword arguments for :func:`interpolate_arrays`.
+        :type **kwargs: dict
+        :return: Interpolated dataset.
+        :rtype: xarray.Dataset
+        """
+
+        new_periods = np.atleast_1d(np.asarray(new_periods, dtype=float))
+        keys = list(self._dataset.data_vars)
+        arrays = interpolate_arrays(
+            self._dataset.period.values,
+            [self._dataset[key].values for key in keys],
+            new_periods,
+            **kwargs,
+        )
+
+        coords = {
+            "period": new_periods,
+            "output": self._dataset.output.values,
+            "input": self._dataset.input.values,
+        }
+        return xr.Dataset(
+            {
+                key: xr.DataArray(
+                    data=array,
+                    dims=["period", "output", "input"],
+                    coords=coords,
+                    name=key,
+                    attrs=self._dataset[key].attrs,
+                )
+                for key, array in zip(keys, arrays)
+            },
+            coords=coords,
+        )
+
     @staticmethod
     def _find_nans_index(data_array):
         """Find nans at beginning and end of xarray.
@@ -20,11 +20,381 @@ Revised by J. Peacock 2022 to fit with version 2.
 import copy
 import numpy as np
 
-from .base import TFBase
+from .base import TFBase, memoized_property
 
+
+# =============================================================================
+# Array functions
+#
+# These work on any stack of 2 x 2 tensors (..., 2, 2), so a single station
+# (n_periods, 2, 2) and a whole survey (n_stations, n_periods, 2, 2) use the
+# same code.
 # =============================================================================
+def pt_from_z(z):
+    """Calculate the phase tensor from impedance.
+
+    :param z: Impedance tensor (..., 2, 2).
+    :type z: np.ndarray
+    :return: Phase tensor (..., 2, 2).
+    :rtype: np.ndarray
+    """
+    z_real = np.real(z)
+    z_imag = np.imag(z)
+
+    pt_array = np.zeros(z_real.shape, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        det_real = np.linalg.det(z_real)
+
+        pt_array[..., 0, 0] = (
+            z_real[..., 1, 1] * z_imag[..., 0, 0]
+            - z_real[..., 0, 1] * z_imag[..., 1, 0]
+        )
+        pt_array[..., 0, 1] = (
+            z_real[..., 1, 1] * z_imag[..., 0, 1]
+            - z_real[..., 0, 1] * z_imag[..., 1, 1]
+        )
+        pt_array[..., 1, 0] = (
+            z_real[..., 0, 0] * z_imag[..., 1, 0]
+            - z_real[..., 1, 0] * z_imag[..., 0, 0]
+        )
+        pt_array[..., 1, 1] = (
+            z_real[..., 0, 0] * z_imag[..., 1, 1]
+            - z_real[..., 1, 0] * z_imag[..., 0, 1]
+        )
+
+        pt_array /= det_real[..., np.newaxis, np.newaxis]
+
+    return pt_array
+
+
+def pt_error_from_z(z, z_error, pt_array=None):
+    """Calculate the phase tensor error from impedance error.
+
+    :param z: Impedance tensor (..., 2, 2).
+    :type z: np.ndarray
+    :param z_error: Impedance tensor error (..., 2, 2).
+    :type z_error: np.ndarray
+    :param pt_array: Phase tensor if already calculated, defaults to None.
+    :type pt_array: np.ndarray, optional
+    :return: Phase tensor error (..., 2, 2).
+    :rtype: np.ndarray
+    """
+    if pt_array is None:
+        pt_array = pt_from_z(z)
+
+    z_real = np.real(z)
+    z_imag = np.imag(z)
+    pt = pt_array
+    ze = z_error
+
+    pt_error = np.zeros_like(pt_array)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        det_real = np.abs(np.linalg.det(z_real))
+        pt_error[..., 0, 0] = (
+            np.abs(-pt[..., 0, 0] * z_real[..., 1, 1] * ze[..., 0, 0])
+            + np.abs(pt[..., 0, 0] * z_real[..., 0, 1] * ze[..., 1, 0])
+            + np.abs(
+                (z_imag[..., 0, 0] - pt[..., 0, 0] * z_real[..., 0, 0])
+                * ze[..., 1, 1]
+            )
+            + np.abs(
+                (-z_imag[..., 1, 0] + pt[..., 0, 0] * z_real[..., 1, 0])
+                * ze[..., 0, 1]
+            )
+            + np.abs(z_real[..., 1, 1] * ze[..., 0, 0])
+            + np.abs(z_real[..., 0, 1] * ze[..., 1, 0])
+        ) / det_real
+
+        pt_error[..., 0, 1] = (
+            np.abs(-pt[..., 0, 1] * z_real[..., 1, 1] * ze[..., 0, 0])
+            + np.abs(pt[..., 0, 1] * z_real[..., 0, 1] * ze[..., 1, 0])
+            + np.abs(
+                (z_imag[..., 0, 1] - pt[..., 0, 1] * z_real[..., 0, 0])
+                * ze[..., 1, 1]
+            )
+            + np.abs(
+                (-z_imag[..., 1, 1] + pt[..., 0, 1] * z_real[..., 1, 0])
+                * ze[..., 0, 1]
+            )
+            + np.abs(z_real[..., 1, 1] * ze[..., 0, 1])
+            + np.abs(z_real[..., 0, 1] * ze[..., 1, 1])
+        ) / det_real
+
+        pt_error[..., 1, 0] = (
+            np.abs(
+                (z_imag[..., 1, 0] - pt[..., 1, 0] * z_real[..., 1, 1])
+                * ze[..., 0, 0]
+            )
+            + np.abs(pt[..., 1, 0] * z_real[..., 1, 0] * ze[..., 0, 1])
+            + np.abs(
+                (-z_imag[..., 0, 0] + pt[..., 1, 0] * z_real[..., 0, 1])
+                * ze[..., 1, 0]
+            )
+            + np.abs(-pt[..., 1, 0] * z_real[..., 0, 0] * ze[..., 1, 1])
+            + np.abs(z_real[..., 0, 0] * ze[..., 1, 0])
+            + np.abs(-z_real[..., 1, 0] * ze[..., 0, 0])
+        ) / det_real
+
+        pt_error[..., 1, 1] = (
+            np.abs(
+                (z_imag[..., 1, 1] - pt[..., 1, 1] * z_real[..., 1, 1])
+                * ze[..., 0, 0]
+            )
+            + np.abs(pt[..., 1, 1] * z_real[..., 1, 0] * ze[..., 0, 1])
+            + np.abs(
+                (-z_imag[..., 0, 1] + pt[..., 1, 1] * z_real[..., 0, 1])
+                * ze[..., 1, 0]
+            )
+            + np.abs(-pt[..., 1, 1] * z_real[..., 0, 0] * ze[..., 1, 1])
+            + np.abs(z_real[..., 0, 0] * ze[..., 1, 1])
+            + np.abs(-z_real[..., 1, 0] * ze[..., 0, 1])
+        ) / det_real
+
+    return pt_error
+
+
+def _angle_error(x, y, x_error, y_error):
+    """Error of 0.5 * arctan2(y, x) in degrees."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.degrees(
+            0.5
+            / (x**2 + y**2)
+            * np.sqrt(y**2 * x_error**2 + x**2 * y_error**2)
+        )
+
+
+def _alpha(pt):
+    """Principal axis angle (strike) in degrees."""
+    return np.degrees(
+        0.5
+        * np.arctan2(
+            pt[..., 0, 1] + pt[..., 1, 0],
+            pt[..., 0, 0] - pt[..., 1, 1],
+        )
+    )
+
+
+def _alpha_error(pt, pt_error):
+    """Principal axis angle error in degrees."""
+    return _angle_error(
+        pt[..., 0, 0] - pt[..., 1, 1],
+        pt[..., 0, 1] + pt[..., 1, 0],
+        np.sqrt(pt_error[..., 0, 0] ** 2 + pt_error[..., 1, 1] ** 2),
+        np.sqrt(pt_error[..., 0, 1] ** 2 + pt_error[..., 1, 0] ** 2),
+    )
+
+
+def _beta(pt):
+    """3D-dimensionality angle Beta in degrees."""
+    return np.degrees(
+        0.5
+        * np.arctan2(
+            pt[..., 0, 1] - pt[..., 1, 0],
+            pt[..., 0, 0] + pt[..., 1, 1],
+        )
+    )
+
+
+def _beta_error(pt, pt_error):
+    """3D-dimensionality angle Beta error in degrees."""
+    return _angle_error(
+        pt[..., 0, 0] + pt[..., 1, 1],
+        pt[..., 0, 1] - pt[..., 1, 0],
+        np.sqrt(pt_error[..., 0, 0] ** 2 + pt_error[..., 1, 1] ** 2),
+        np.sqrt(pt_error[..., 0, 1] ** 2 + pt_error[..., 1, 0] ** 2),
+    )
+
+
+def _azimuth(pt):
+    """Azimuth angle related to geoelectric strike in degrees."""
+    return (_alpha(pt) - _beta(pt)) % 360
+
+
+def _azimuth_error(pt, pt_error):
+    """Azimuth angle error in degrees."""
+    return np.sqrt(abs(_alpha_error(pt, pt_error) + _beta_error(pt, pt_error)))
+
+
+def _pi1(pt):
+    """Pi1 after Bibby et al. 2005."""
+    return 0.5 * np.sqrt(
+        (pt[..., 0, 0] - pt[..., 1, 1]) ** 2
+        + (pt[..., 0, 1] + pt[..., 1, 0]) ** 2
+    )
 
 
+def _pi1_error(pt, pt_error):
+    """Pi1 error."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (
+            1.0
+            / (4 * _pi1(pt))
+            * np.sqrt(
+                (pt[..., 0, 0] - pt[..., 1, 1]) ** 2
+                * (pt_error[..., 0, 0] ** 2 + pt_error[..., 1, 1] ** 2)
+                + (pt[..., 0, 1] + pt[..., 1, 0]) ** 2
+                * (pt_error[..., 0, 1] ** 2 + pt_error[..., 1, 0] ** 2)
+            )
+        )
+
+
+def _pi2(pt):
+    """Pi2 after Bibby et al. 2005."""
+    return 0.5 * np.sqrt(
+        (pt[..., 0, 0] + pt[..., 1, 1]) ** 2
+        + (pt[..., 0, 1] - pt[..., 1, 0]) ** 2
+    )
+
+
+def _pi2_error(pt, pt_error):
+    """Pi2 error."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (
+            1.0
+            / (4 * _pi2(pt))
+            * np.sqrt(
+                (pt[..., 0, 0] + pt[..., 1, 1]) ** 2
+                * (pt_error[..., 0, 0] ** 2 + pt_error[..., 1, 1] ** 2)
+                + (pt[..., 0, 1] - pt[..., 1, 0]) ** 2
+                * (pt_error[..., 0, 1] ** 2 + pt_error[..., 1, 0] ** 2)
+            )
+        )
+
+
+def _phimin(pt):
+    """Minimum phase in degrees."""
+    return np.degrees(np.arctan(_pi2(pt) - _pi1(pt)))
+
+
+def _phimax(pt):
+    """Maximum phase in degrees."""
+    return np.degrees(np.arctan(_pi2(pt) + _pi1(pt)))
+
+
+def _phi_error(pt, pt_error):
+    """Minimum and maximum phase error in degrees."""
+    return np.degrees(
+        np.arctan(
+            np.sqrt(
+                _pi2_error(pt, pt_error) ** 2 + _pi1_error(pt, pt_error) ** 2
+            )
+        )
+    )
+
+
+def _ellipticity(pt):
+    """Ellipticity of the phase tensor."""
+    phimin = _phimin(pt)
+    phimax = _phimax(pt)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (phimax - phimin) / (phimax + phimin)
+
+
+def _ellipticity_error(pt, pt_error):
+    """Ellipticity error of the phase tensor."""
+    phimin = _phimin(pt)
+    phimax = _phimax(pt)
+    phi_error = _phi_error(pt, pt_error)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (
+            _ellipticity(pt)
+            * np.sqrt(phi_error + phi_error)
+            * np.sqrt(
+                (1 / (phimax - phimin)) ** 2 + (1 / (phimax + phimin)) ** 2
+            )
+        )
+
+
+def _det(pt):
+    """Determinant of the phase tensor."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.linalg.det(pt)
+
+
+def _det_error(pt, pt_error):
+    """Determinant error of the phase tensor."""
+    return (
+        np.abs(pt[..., 1, 1] * pt_error[..., 0, 0])
+        + np.abs(pt[..., 0, 0] * pt_error[..., 1, 1])
+        + np.abs(pt[..., 0, 1] * pt_error[..., 1, 0])
+        + np.abs(pt[..., 1, 0] * pt_error[..., 0, 1])
+    )
+
+
+PT_ATTRIBUTES = {
+    "phimin": (_phimin, _phi_error),
+    "phimax": (_phimax, _phi_error),
+    "azimuth": (_azimuth, _azimuth_error),
+    "skew": (_beta, _beta_error),
+    "ellipticity": (_ellipticity, _ellipticity_error),
+    "det": (_det, _det_error),
+}
+
+
+def compute_phase_tensor(z, z_error=None, z_model_error=None):
+    """Compute the phase tensor, its errors and invariants in one pass.
+
+    Works on a single station (n_periods, 2, 2) or a stack of stations
+    (n_stations, n_periods, 2, 2).  Each station is treated like
+    :class:`PhaseTensor`: a station with an impedance or error that is all
+    zeros gets zeros for the corresponding outputs.
+
+    :param z: Impedance tensor (..., n_periods, 2, 2).
+    :type z: np.ndarray
+    :param z_error: Impedance error, defaults to None.
+    :type z_error: np.ndarray, optional
+    :param z_model_error: Impedance model error, defaults to None.
+    :type z_model_error: np.ndarray, optional
+    :return: Dictionary with keys 'pt', 'pt_error', 'pt_model_error' and
+     '{attr}', '{attr}_error', '{attr}_model_error' for attr in
+     [ phimin | phimax | azimuth | skew | ellipticity | det ].  Errors are
+     None if the corresponding input error is None.
+    :rtype: dict
+
+    :Example: ::
+
+        >>> pt_dict = compute_phase_tensor(
+        ...     cube.impedance, cube.impedance_error
+        ... )
+        >>> pt_dict["phimin"].shape
+        (n_stations, n_periods)
+
+    """
+    z = np.asarray(z)
+    has_z = (z != 0).any(axis=(-3, -2, -1))
+    pt = pt_from_z(z)
+    pt[~has_z] = 0
+
+    pt_dict = {"pt": pt}
+    for attr, (func, _) in PT_ATTRIBUTES.items():
+        pt_dict[attr] = func(pt)
+        pt_dict[attr][~has_z] = 0
+
+    for error, error_array in [
+        ("_error", z_error),
+        ("_model_error", z_model_error),
+    ]:
+        if error_array is None:
+            pt_dict[f"pt{error}"] = None
+            for attr in PT_ATTRIBUTES.keys():
+                pt_dict[f"{attr}{error}"] = None
+            continue
+
+        error_array = np.asarray(error_array)
+        has_error = (error_array != 0).any(axis=(-3, -2, -1)) & has_z
+        pt_error = pt_error_from_z(z, error_array, pt_array=pt)
+        pt_error[~has_error] = 0
+        pt_dict[f"pt{error}"] = pt_error
+        for attr, (_, error_func) in PT_ATTRIBUTES.items():
+            pt_dict[f"{attr}{error}"] = error_func(pt, pt_error)
+            pt_dict[f"{attr}{error}"][~has_error] = 0
+
+    return pt_dict
+
+
+# =============================================================================
+# Phase Tensor Class
+# =============================================================================
 class PhaseTensor(TFBase):
     """PhaseTensor class - generates a Phase Tensor (phase tensor) object.
 
@@ -99,40 +469,15 @@ class PhaseTensor(TFBase):
         if z is None:
             return
 
-        pt_array = np.zeros_like(z, dtype=float)
-
-        z_real = np.real(z)
-        z_imag = np.imag(z)
-
         with np.errstate(divide="ignore", invalid="ignore"):
-            det_real = np.linalg.det(z_real)
-            det_zero = np.where(det_real == 0)[0]
-            if det_zero.shape[0] > 0:
-                self.logger.debug(
-                    f"z at index {det_zero} contains a singular matrix,"
-                    " thus it cannot be converted into a phase tensor, setting to 0."
-                )
-
-            pt_array[:, 0, 0] = (
-                z_real[:, 1, 1] * z_imag[:, 0, 0]
-                - z_real[:, 0, 1] * z_imag[:, 1, 0]
-            )
-            pt_array[:, 0, 1] = (
-                z_real[:, 1, 1] * z_imag[:, 0, 1]
-                - z_real[:, 0, 1] * z_imag[:, 1, 1]
-            )
-            pt_array[:, 1, 0] = (
-                z_real[:, 0, 0] * z_imag[:, 1, 0]
-                - z_real[:, 1, 0] * z_imag[:, 0, 0]
-            )
-            pt_array[:, 1, 1] = (
-                z_real[:, 0, 0] * z_imag[:, 1, 1]
-                - z_real[:, 1, 0] * z_imag[:, 0, 1]
+            det_zero = np.where(np.linalg.det(np.real(z)) == 0)[0]
+        if det_zero.shape[0] > 0:
+            self.logger.debug(
+                f"z at index {det_zero} contains a singular matrix,"
+                " thus it cannot be converted into a phase tensor, setting to 0."
             )
 
-            pt_array = np.apply_along_axis(lambda x: x / det_real, 0, pt_array)
-
-        return pt_array
+        return pt_from_z(z)
 
     def _pt_error_from_z(self, z, z_error):
         """Calculate phase tensor error from impedance error.
@@ -159,86 +504,7 @@ class PhaseTensor(TFBase):
         if z_error is None:
             return
 
-        pt_error = np.zeros_like(pt_array)
-
-        z_real = np.real(z)
-        z_imag = np.imag(z)
-
-        with np.errstate(divide="ignore", invalid="ignore"):
-            det_real = np.abs(np.linalg.det(z_real))
-            pt_error[:, 0, 0] = (
-                np.abs(-pt_array[:, 0, 0] * z_real[:, 1, 1] * z_error[:, 0, 0])
-                + np.abs(
-                    pt_array[:, 0, 0] * z_real[:, 0, 1] * z_error[:, 1, 0]
-                )
-                + np.abs(
-                    (z_imag[:, 0, 0] - pt_array[:, 0, 0] * z_real[:, 0, 0])
-                    * z_error[:, 1, 1]
-                )
-                + np.abs(
-                    (-z_imag[:, 1, 0] + pt_array[:, 0, 0] * z_real[:, 1, 0])
-                    * z_error[:, 0, 1]
-                )
-                + np.abs(z_real[:, 1, 1] * z_error[:, 0, 0])
-                + np.abs(z_real[:, 0, 1] * z_error[:, 1, 0])
-            ) / det_real
-
-            pt_error[:, 0, 1] = (
-                np.abs(-pt_array[:, 0, 1] * z_real[:, 1, 1] * z_error[:, 0, 0])
-                + np.abs(
-                    pt_array[:, 0, 1] * z_real[:, 0, 1] * z_error[:, 1, 0]
-                )
-                + np.abs(
-                    (z_imag[:, 0, 1] - pt_array[:, 0, 1] * z_real[:, 0, 0])
-                    * z_error[:, 1, 1]
-                )
-                + np.abs(
-                    (-z_imag[:, 1, 1] + pt_array[:, 0, 1] * z_real[:, 1, 0])
-                    * z_error[:, 0, 1]
-                )
-                + np.abs(z_real[:, 1, 1] * z_error[:, 0, 1])
-                + np.abs(z_real[:, 0, 1] * z_error[:, 1, 1])
-            ) / det_real
-
-            pt_error[:, 1, 0] = (
-                np.abs(
-                    (z_imag[:, 1, 0] - pt_array[:, 1, 0] * z_real[:, 1, 1])
-                    * z_error[:, 0, 0]
-                )
-                + np.abs(
-                    pt_array[:, 1, 0] * z_real[:, 1, 0] * z_error[:, 0, 1]
-                )
-                + np.abs(
-                    (-z_imag[:, 0, 0] + pt_array[:, 1, 0] * z_real[:, 0, 1])
-                    * z_error[:, 1, 0]
-                )
-                + np.abs(
-                    -pt_array[:, 1, 0] * z_real[:, 0, 0] * z_error[:, 1, 1]
-                )
-                + np.abs(z_real[:, 0, 0] * z_error[:, 1, 0])
-                + np.abs(-z_real[:, 1, 0] * z_error[:, 0, 0])
-            ) / det_real
-
-            pt_error[:, 1, 1] = (
-                np.abs(
-                    (z_imag[:, 1, 1] - pt_array[:, 1, 1] * z_real[:, 1, 1])
-                    * z_error[:, 0, 0]
-                )
-                + np.abs(
-                    pt_array[:, 1, 1] * z_real[:, 1, 0] * z_error[:, 0, 1]
-                )
-                + np.abs(
-                    (-z_imag[:, 0, 1] + pt_array[:, 1, 1] * z_real[:, 0, 1])
-                    * z_error[:, 1, 0]
-                )
-                + np.abs(
-                    -pt_array[:, 1, 1] * z_real[:, 0, 0] * z_error[:, 1, 1]
-                )
-                + np.abs(z_real[:, 0, 0] * z_error[:, 1, 1])
-                + np.abs(-z_real[:, 1, 0] * z_error[:, 0, 1])
-            ) / det_real
-
-        return pt_error
+        return pt_error_from_z(z, z_error, pt_array=pt_array)
 
     @property
     def pt(self):
@@ -269,6 +535,7 @@ class PhaseTensor(TFBase):
             self._dataset = self._initialize(tf=pt)
         else:
             self._dataset["transfer_function"].loc[self.comps] = pt
+            self._bump_version()
 
     @property
     def pt_error(self):
@@ -300,6 +567,7 @@ class PhaseTensor(TFBase):
             self._dataset = self._initialize(tf_error=pt_error)
         else:
             self._dataset["transfer_function_error"].loc[self.comps] = pt_error
+            self._bump_version()
 
     @property
     def pt_model_error(self):
@@ -331,6 +599,7 @@ class PhaseTensor(TFBase):
             self._dataset["transfer_function_model_error"].loc[
                 self.comps
             ] = pt_model_error
+            self._bump_version()
 
     # ==========================================================================
     #  define get methods for read only properties
@@ -361,124 +630,50 @@ class PhaseTensor(TFBase):
             return tr_model_error
 
     # ---alpha-------------------------------------------------------------
-    @property
+    @memoized_property
     def alpha(self):
         """Principal axis angle (strike) of phase tensor in degrees."""
 
         if self.pt is None:
             return None
-        return np.degrees(
-            0.5
-            * np.arctan2(
-                self.pt[:, 0, 1] + self.pt[:, 1, 0],
-                self.pt[:, 0, 0] - self.pt[:, 1, 1],
-            )
-        )
+        return _alpha(self.pt)
 
-    @property
+    @memoized_property
     def alpha_error(self):
         """Principal axis angle error of phase tensor in degrees."""
 
         if self._has_tf_error():
-            with np.errstate(divide="ignore", invalid="ignore"):
-                y = self.pt[:, 0, 1] + self.pt[:, 1, 0]
-                yerr = np.sqrt(
-                    self.pt_error[:, 0, 1] ** 2 + self.pt_error[:, 1, 0] ** 2
-                )
-                x = self.pt[:, 0, 0] - self.pt[:, 1, 1]
-                xerr = np.sqrt(
-                    self.pt_error[:, 0, 0] ** 2 + self.pt_error[:, 1, 1] ** 2
-                )
-
-                alpha_error = np.degrees(
-                    0.5
-                    / (x**2 + y**2)
-                    * np.sqrt(y**2 * xerr**2 + x**2 * yerr**2)
-                )
-                return alpha_error
+            return _alpha_error(self.pt, self.pt_error)
 
-    @property
+    @memoized_property
     def alpha_model_error(self):
         """Principal axis angle model error of phase tensor in degrees."""
 
         if self._has_tf_model_error():
-            with np.errstate(divide="ignore", invalid="ignore"):
-                y = self.pt[:, 0, 1] + self.pt[:, 1, 0]
-                yerr = np.sqrt(
-                    self.pt_model_error[:, 0, 1] ** 2
-                    + self.pt_model_error[:, 1, 0] ** 2
-                )
-                x = self.pt[:, 0, 0] - self.pt[:, 1, 1]
-                xerr = np.sqrt(
-                    self.pt_model_error[:, 0, 0] ** 2
-                    + self.pt_model_error[:, 1, 1] ** 2
-                )
-
-                alpha_model_error = np.degrees(
-                    0.5
-                    / (x**2 + y**2)
-                    * np.sqrt(y**2 * xerr**2 + x**2 * yerr**2)
-                )
-                return alpha_model_error
+            return _alpha_error(self.pt, self.pt_model_error)
 
     # ---beta-------------------------------------------------------------
-    @property
+    @memoized_property
     def beta(self):
         """3D-dimensionality angle Beta (invariant) of phase tensor in degrees."""
 
         if self.pt is None:
             return None
-        return np.degrees(
-            0.5
-            * np.arctan2(
-                self.pt[:, 0, 1] - self.pt[:, 1, 0],
-                self.pt[:, 0, 0] + self.pt[:, 1, 1],
-            )
-        )
+        return _beta(self.pt)
 
-    @property
+    @memoized_property
     def beta_error(self):
         """3D-dimensionality angle error Beta of phase tensor in degrees."""
 
         if self._has_tf_error():
-            y = self.pt[:, 0, 1] - self.pt[:, 1, 0]
-            yerr = np.sqrt(
-                self.pt_error[:, 0, 1] ** 2 + self.pt_error[:, 1, 0] ** 2
-            )
-            x = self.pt[:, 0, 0] + self.pt[:, 1, 1]
-            xerr = np.sqrt(
-                self.pt_error[:, 0, 0] ** 2 + self.pt_error[:, 1, 1] ** 2
-            )
-
-            beta_error = np.degrees(
-                0.5
-                / (x**2 + y**2)
-                * np.sqrt(y**2 * xerr**2 + x**2 * yerr**2)
-            )
-            return beta_error
+            return _beta_error(self.pt, self.pt_error)
 
-    @property
+    @memoized_property
     def beta_model_error(self):
         """3D-dimensionality angle model error Beta of phase tensor in degrees."""
 
-        if self._has_tf_error():
-            y = self.pt[:, 0, 1] - self.pt[:, 1, 0]
-            yerr = np.sqrt(
-                self.pt_model_error[:, 0, 1] ** 2
-                + self.pt_model_error[:, 1, 0] ** 2
-            )
-            x = self.pt[:, 0, 0] + self.pt[:, 1, 1]
-            xerr = np.sqrt(
-                self.pt_model_error[:, 0, 0] ** 2
-                + self.pt_model_error[:, 1, 1] ** 2
-            )
-
-            beta_model_error = np.degrees(
-                0.5
-                / (x**2 + y**2)
-                * np.sqrt(y**2 * xerr**2 + x**2 * yerr**2)
-            )
-            return beta_model_error
+        if self._has_tf_model_error():
+            return _beta_error(self.pt, self.pt_model_error)
 
     # ---skew-------------------------------------------------------------
     @property
@@ -497,95 +692,66 @@ class PhaseTensor(TFBase):
         return self.beta_model_error
 
     # ---azimuth (strike angle)-------------------------------------------------
-    @property
+    @memoized_property
     def azimuth(self):
         """Azimuth angle related to geoelectric strike in degrees."""
 
         if self.pt is None:
             return None
-        return (self.alpha - self.beta) % 360
+        return _azimuth(self.pt)
 
-    @property
+    @memoized_property
     def azimuth_error(self):
         """Azimuth angle error related to geoelectric strike in degrees."""
         if self._has_tf_error():
-            return np.sqrt(abs(self.alpha_error + self.beta_error))
+            return _azimuth_error(self.pt, self.pt_error)
 
-    @property
+    @memoized_property
     def azimuth_model_error(self):
         """Azimuth angle model error related to geoelectric strike in degrees."""
         if self._has_tf_model_error():
-            return np.sqrt(abs(self.alpha_model_error + self.beta_model_error))
+            return _azimuth_error(self.pt, self.pt_model_error)
 
     # ---ellipticity----------------------------------------------------
-    @property
+    @memoized_property
     def ellipticity(self):
         """Ellipticity of the phase tensor, related to dimesionality."""
 
         if self.pt is None:
             return None
-        result = None
-        with np.errstate(divide="ignore", invalid="ignore"):
-            result = (self.phimax - self.phimin) / (self.phimax + self.phimin)
-        return result
+        return _ellipticity(self.pt)
 
-    @property
+    @memoized_property
     def ellipticity_error(self):
         """Ellipticity error of the phase tensor, related to dimesionality."""
         if self._has_tf_error():
-            with np.errstate(divide="ignore", invalid="ignore"):
-                return (
-                    self.ellipticity
-                    * np.sqrt(self.phimax_error + self.phimin_error)
-                    * np.sqrt(
-                        (1 / (self.phimax - self.phimin)) ** 2
-                        + (1 / (self.phimax + self.phimin)) ** 2
-                    )
-                )
+            return _ellipticity_error(self.pt, self.pt_error)
 
-    @property
+    @memoized_property
     def ellipticity_model_error(self):
         """Ellipticity model error of the phase tensor, related to dimesionality."""
         if self._has_tf_model_error():
-            return (
-                self.ellipticity
-                * np.sqrt(self.phimax_model_error + self.phimin_model_error)
-                * np.sqrt(
-                    (1 / (self.phimax - self.phimin)) ** 2
-                    + (1 / (self.phimax + self.phimin)) ** 2
-                )
-            )
+            return _ellipticity_error(self.pt, self.pt_model_error)
 
     # ---det-------------------------------------------------------------
-    @property
+    @memoized_property
     def det(self):
         r"""Determinant of phase tenso."""
         if self.pt is None:
             return None
-        with np.errstate(divide="ignore", invalid="ignore"):
-            return np.array([np.linalg.det(pt_arr) for pt_arr in self.pt])
+        return _det(self.pt)
 
-    @property
+    @memoized_property
     def det_error(self):
         r"""Determinant error of phase tenso."""
         if self._has_tf_error():
-            return (
-                np.abs(self.pt[:, 1, 1] * self.pt_error[:, 0, 0])
-                + np.abs(self.pt[:, 0, 0] * self.pt_error[:, 1, 1])
-                + np.abs(self.pt[:, 0, 1] * self.pt_error[:, 1, 0])
-                + np.abs(self.pt[:, 1, 0] * self.pt_error[:, 0, 1])
-            )
+            return _det_error(self.pt, self.pt_error)
 
-    @property
+    @memoized_property
     def det_model_error(self):
         r"""Determinant model erro of phase tenso."""
         if self._has_tf_model_error():
-            return (
-                np.abs(self.pt[:, 1, 1] * self.pt_model_error[:, 0, 0])
-                + np.abs(self.pt[:, 0, 0] * self.pt_model_error[:, 1, 1])
-                + np.abs(self.pt[:, 0, 1] * self.pt_model_error[:, 1, 0])
-                + np.abs(self.pt[:, 1, 0] * self.pt_model_error[:, 0, 1])
-            )
+            return _det_error(self.pt, self.pt_model_error)
 
     # ---principle component 1----------------------------------------------
     @property
@@ -595,55 +761,19 @@ class PhaseTensor(TFBase):
             Pi1 = 0.5 * sqrt(PT[0,0] - PT[1,1])**2 + (PT[0,1] + PT[1,0])**2).
         """
         # after bibby et al. 2005
-
-        return 0.5 * np.sqrt(
-            (self.pt[:, 0, 0] - self.pt[:, 1, 1]) ** 2
-            + (self.pt[:, 0, 1] + self.pt[:, 1, 0]) ** 2
-        )
+        return _pi1(self.pt)
 
     @property
     def _pi1_error(self):
         r"""Pi1 erro."""
         if self._has_tf_error():
-            with np.errstate(divide="ignore", invalid="ignore"):
-                return (
-                    1.0
-                    / (4 * self._pi1)
-                    * np.sqrt(
-                        (self.pt[:, 0, 0] - self.pt[:, 1, 1]) ** 2
-                        * (
-                            self.pt_error[:, 0, 0] ** 2
-                            + self.pt_error[:, 1, 1] ** 2
-                        )
-                        + (self.pt[:, 0, 1] + self.pt[:, 1, 0]) ** 2
-                        * (
-                            self.pt_error[:, 0, 1] ** 2
-                            + self.pt_error[:, 1, 0] ** 2
-                        )
-                    )
-                )
+            return _pi1_error(self.pt, self.pt_error)
 
     @property
     def _pi1_model_error(self):
         r"""Pi1 model erro."""
         if self._has_tf_model_error():
-            with np.errstate(divide="ignore", invalid="ignore"):
-                return (
-                    1.0
-                    / (4 * self._pi1)
-                    * np.sqrt(
-                        (self.pt[:, 0, 0] - self.pt[:, 1, 1]) ** 2
-                        * (
-                            self.pt_error[:, 0, 0] ** 2
-                            + self.pt_error[:, 1, 1] ** 2
-                        )
-                        + (self.pt[:, 0, 1] + self.pt[:, 1, 0]) ** 2
-                        * (
-                            self.pt_model_error[:, 0, 1] ** 2
-                            + self.pt_model_error[:, 1, 0] ** 2
-                        )
-                    )
-                )
+            return _pi1_error(self.pt, self.pt_model_error)
 
     # ---principle component 2----------------------------------------------
     @property
@@ -653,60 +783,22 @@ class PhaseTensor(TFBase):
             Pi2 = 0.5 * sqrt(PT[0,0] + PT[1,1])**2 + (PT[0,1] - PT[1,0])**2).
         """
         # after bibby et al. 2005
-
-        return 0.5 * np.sqrt(
-            (self.pt[:, 0, 0] + self.pt[:, 1, 1]) ** 2
-            + (self.pt[:, 0, 1] - self.pt[:, 1, 0]) ** 2
-        )
+        return _pi2(self.pt)
 
     @property
     def _pi2_error(self):
         r"""Pi2 erro."""
-
         if self._has_tf_error():
-            with np.errstate(divide="ignore", invalid="ignore"):
-                return (
-                    1.0
-                    / (4 * self._pi2)
-                    * np.sqrt(
-                        (self.pt[:, 0, 0] + self.pt[:, 1, 1]) ** 2
-                        * (
-                            self.pt_error[:, 0, 0] ** 2
-                            + self.pt_error[:, 1, 1] ** 2
-                        )
-                        + (self.pt[:, 0, 1] - self.pt[:, 1, 0]) ** 2
-                        * (
-                            self.pt_error[:, 0, 1] ** 2
-                            + self.pt_error[:, 1, 0] ** 2
-                        )
-                    )
-                )
+            return _pi2_error(self.pt, self.pt_error)
 
     @property
     def _pi2_model_error(self):
         r"""Pi2 model erro."""
-
         if self._has_tf_model_error():
-            with np.errstate(divide="ignore", invalid="ignore"):
-                return (
-                    1.0
-                    / (4 * self._pi2)
-                    * np.sqrt(
-                        (self.pt[:, 0, 0] + self.pt[:, 1, 1]) ** 2
-                        * (
-                            self.pt_model_error[:, 0, 0] ** 2
-                            + self.pt_model_error[:, 1, 1] ** 2
-                        )
-                        + (self.pt[:, 0, 1] - self.pt[:, 1, 0]) ** 2
-                        * (
-                            self.pt_model_error[:, 0, 1] ** 2
-                            + self.pt_model_error[:, 1, 0] ** 2
-                        )
-                    )
-                )
+            return _pi2_error(self.pt, self.pt_model_error)
 
     # ---phimin----------------------------------------------
-    @property
+    @memoized_property
     def phimin(self):
         """Minimum phase calculated according to Bibby et al. 2005:
 
@@ -714,30 +806,22 @@ class PhaseTensor(TFBase):
         """
 
         if self._has_tf():
-            return np.degrees(np.arctan(self._pi2 - self._pi1))
+            return _phimin(self.pt)
 
-    @property
+    @memoized_property
     def phimin_error(self):
         r"""Minimum phase erro."""
         if self._has_tf_error():
-            return np.degrees(
-                np.arctan(np.sqrt(self._pi2_error**2 + self._pi1_error**2))
-            )
+            return _phi_error(self.pt, self.pt_error)
 
-    @property
+    @memoized_property
     def phimin_model_error(self):
         r"""Minimum phase model erro."""
         if self._has_tf_model_error():
-            return np.degrees(
-                np.arctan(
-                    np.sqrt(
-                        self._pi2_model_error**2 + self._pi1_model_error**2
-                    )
-                )
-            )
+            return _phi_error(self.pt, self.pt_model_error)
 
     # ---phimax----------------------------------------------
-    @property
+    @memoized_property
     def phimax(self):
         """Maximum phase calculated according to Bibby et al. 2005:
 
@@ -745,27 +829,19 @@ class PhaseTensor(TFBase):
         """
 
         if self._has_tf():
-            return np.degrees(np.arctan(self._pi2 + self._pi1))
+            return _phimax(self.pt)
 
-    @property
+    @memoized_property
     def phimax_error(self):
         r"""Maximum phase erro."""
         if self._has_tf_error():
-            return np.degrees(
-                np.arctan(np.sqrt(self._pi2_error**2 + self._pi1_error**2))
-            )
+            return _phi_error(self.pt, self.pt_error)
 
-    @property
+    @memoized_property
     def phimax_model_error(self):
         r"""Maximum phase model erro."""
         if self._has_tf_model_error():
-            return np.degrees(
-                np.arctan(
-                    np.sqrt(
-                        self._pi2_model_error**2 + self._pi1_model_error**2
-                    )
-                )
-            )
+            return _phi_error(self.pt, self.pt_model_error)
 
     # ---only 1d----------------------------------------------
     @property
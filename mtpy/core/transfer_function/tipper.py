@@ -15,7 +15,7 @@ import math
 import numpy as np
 
 import mtpy.utils.calculator as MTcc
-from .base import TFBase
+from .base import TFBase, memoized_property
 
 # =============================================================================
 
@@ -90,6 +90,7 @@ class Tipper(TFBase):
             self._dataset = self._initialize(tf=tipper)
         else:
             self._dataset["transfer_function"].loc[self.comps] = tipper
+            self._bump_version()
 
     # ----tipper error---------------
     @property
@@ -130,6 +131,7 @@ class Tipper(TFBase):
             self._dataset["transfer_function_error"].loc[
                 self.comps
             ] = tipper_error
+            self._bump_version()
 
     # ----tipper model error---------------------------------------------------------
     @property
@@ -169,6 +171,7 @@ class Tipper(TFBase):
             self._dataset["transfer_function_model_error"].loc[
                 self.comps
             ] = tipper_model_error
+            self._bump_version()
 
     # ----amplitude and phase
     def _compute_amp_phase_error(self, error):
@@ -255,37 +258,37 @@ class Tipper(TFBase):
 
     # ---------------------------------
     # properties
-    @property
+    @memoized_property
     def amplitude(self):
         """Amplitude function."""
         if self._has_tf():
             return np.abs(self.tipper)
 
-    @property
+    @memoized_property
     def phase(self):
         """Phase function."""
         if self._has_tf():
             return np.rad2deg(np.angle(self.tipper))
 
-    @property
+    @memoized_property
     def amplitude_error(self):
         """Amplitude error."""
         if self._has_tf_error():
             return self._compute_amp_phase_error(self.tipper_error)[0]
 
-    @property
+    @memoized_property
     def phase_error(self):
         """Phase error."""
         if self._has_tf_error():
             return self._compute_amp_phase_error(self.tipper_error)[1]
 
-    @property
+    @memoized_property
     def amplitude_model_error(self):
         """Amplitude model error."""
         if self._has_tf_model_error():
             return self._compute_amp_phase_error(self.tipper_model_error)[0]
 
-    @property
+    @memoized_property
     def phase_model_error(self):
         """Phase model error."""
         if self._has_tf_model_error():
@@ -319,11 +322,12 @@ class Tipper(TFBase):
         self.tipper[:, 0, 1].imag = np.sqrt(
             mag_imag**2 / (1 - np.arctan(ang_imag) ** 2)
         )
+        self._bump_version()
         # for consistency recalculate mag and angle
         self.compute_mag_direction()
         self.compute_amp_phase()
 
-    @property
+    @memoized_property
     def mag_real(self):
         """Mag real."""
         if self._has_tf():
@@ -331,7 +335,7 @@ class Tipper(TFBase):
                 self.tipper[:, 0, 0].real ** 2 + self.tipper[:, 0, 1].real ** 2
             )
 
-    @property
+    @memoized_property
     def mag_imag(self):
         """Mag imag."""
         if self._has_tf():
@@ -339,7 +343,7 @@ class Tipper(TFBase):
                 self.tipper[:, 0, 0].imag ** 2 + self.tipper[:, 0, 1].imag ** 2
             )
 
-    @property
+    @memoized_property
     def angle_real(self):
         """Angle real."""
         if self._has_tf():
@@ -349,7 +353,7 @@ class Tipper(TFBase):
                 )
             )
 
-    @property
+    @memoized_property
     def angle_imag(self):
         """Angle imag."""
         if self._has_tf():
@@ -359,7 +363,7 @@ class Tipper(TFBase):
                 )
             )
 
-    @property
+    @memoized_property
     def mag_error(self):
         """Mag error."""
         if self._has_tf_error():
@@ -368,7 +372,7 @@ class Tipper(TFBase):
                 + self.tipper_error[:, 0, 1] ** 2
             )
 
-    @property
+    @memoized_property
     def angle_error(self):
         """Angle error."""
         if self._has_tf_error():
@@ -381,7 +385,7 @@ class Tipper(TFBase):
                 - 45
             )
 
-    @property
+    @memoized_property
     def mag_model_error(self):
         """Mag model error."""
         if self._has_tf_model_error():
@@ -390,7 +394,7 @@ class Tipper(TFBase):
                 + self.tipper_model_error[:, 0, 1] ** 2
             )
 
-    @property
+    @memoized_property
     def angle_model_error(self):
         """Angle model error."""
         if self._has_tf_model_error():
@@ -17,7 +17,7 @@ Updated 2022 by J. Peacock to work with new framework
 import copy
 import numpy as np
 
-from .base import TFBase
+from .base import TFBase, memoized_property
 from . import MT_TO_OHM_FACTOR, IMPEDANCE_UNITS
 from .pt import PhaseTensor
 from .z_analysis import (
@@ -115,6 +115,10 @@ class Z(TFBase):
 
         self._units = value
 
+    def _cache_key(self):
+        """Derived quantities depend on the units as well as the data."""
+        return (self._version, self._units)
+
     @property
     def _scale_factor(self):
         """unit scale factor"""
@@ -153,6 +157,7 @@ class Z(TFBase):
             self._dataset = self._initialize(tf=z)
         else:
             self._dataset["transfer_function"].loc[self.comps] = z
+            self._bump_version()
 
     # ----impedance error-----------------------------------------------------
     @property
@@ -188,6 +193,7 @@ class Z(TFBase):
             self._dataset = self._initialize(tf_error=z_error)
         else:
             self._dataset["transfer_function_error"].loc[self.comps] = z_error
+            self._bump_version()
 
     # ----impedance model error-----------------------------------------------------
     @property
@@ -231,6 +237,7 @@ class Z(TFBase):
             self._dataset["transfer_function_model_error"].loc[
                 self.comps
             ] = z_model_error
+            self._bump_version()
 
     def remove_ss(
         self, reduce_res_factor_x=1.0, reduce_res_factor_y=1.0, inplace=False
@@ -384,7 +391,7 @@ class Z(TFBase):
             z_object.units = self.units
             return z_object
 
-    @property
+    @memoized_property
     def resistivity(self):
         """Resistivity of impedance."""
         if self.z is not None:
@@ -394,13 +401,13 @@ class Z(TFBase):
                 self.z * self._scale_factor,
             )
 
-    @property
+    @memoized_property
     def phase(self):
         """Phase of impedance."""
         if self.z is not None:
             return np.rad2deg(np.angle(self.z * self._scale_factor))
 
-    @property
+    @memoized_property
     def resistivity_error(self):
         """Resistivity error of impedance
 
@@ -417,7 +424,7 @@ class Z(TFBase):
                     * np.abs(self.z * self._scale_factor),
                 )
 
-    @property
+    @memoized_property
     def phase_error(self):
         """Phase error of impedance
 
@@ -430,7 +437,7 @@ class Z(TFBase):
             with np.errstate(divide="ignore", invalid="ignore"):
                 return np.degrees(np.arctan(self.z_error / np.abs(self.z)))
 
-    @property
+    @memoized_property
     def resistivity_model_error(self):
         """Resistivity model error of impedance."""
         if self.z is not None and self.z_model_error is not None:
@@ -443,7 +450,7 @@ class Z(TFBase):
                     * np.abs(self.z * self._scale_factor),
                 )
 
-    @property
+    @memoized_property
     def phase_model_error(self):
         """Phase model error of impedance."""
         if self.z is not None and self.z_model_error is not None:
@@ -527,7 +534,7 @@ class Z(TFBase):
             res_model_error, phase_model_error
         )
 
-    @property
+    @memoized_property
     def det(self):
         """Determinant of impedance."""
         if self.z is not None:
@@ -537,7 +544,7 @@ class Z(TFBase):
 
             return det_z
 
-    @property
+    @memoized_property
     def det_error(self):
         """Return the determinant of impedance error."""
         det_z_error = None
@@ -561,7 +568,7 @@ class Z(TFBase):
                 )
         return det_z_error
 
-    @property
+    @memoized_property
     def det_model_error(self):
         """Return the determinant of impedance model error."""
         det_z_error = None
@@ -599,7 +606,7 @@ class Z(TFBase):
         if self.det is not None:
             return np.rad2deg(np.arcsin(self.det_model_error / abs(self.det)))
 
-    @property
+    @memoized_property
     def res_det(self):
         """Resistivity determinant."""
         if self.det is not None:
@@ -763,7 +770,7 @@ class Z(TFBase):
         """Phase model error of yy component."""
         return self._get_component("yy", self.phase_model_error)
 
-    @property
+    @memoized_property
     def phase_tensor(self):
         """Phase tensor object based on impedance."""
         return PhaseTensor(
@@ -773,7 +780,7 @@ class Z(TFBase):
             frequency=self.frequency,
         )
 
-    @property
+    @memoized_property
     def invariants(self):
         """Weaver Invariants."""
         return ZInvariants(z=self.z)
@@ -11,6 +11,7 @@ Created on Sun May 11 12:15:37 2014
 from pathlib import Path
 import numpy as np
 import rasterio
+import rasterio.shutil
 from rasterio.transform import Affine
 
 from mtpy.core.mt_location import MTLocation
@@ -18,6 +19,33 @@ from mtpy.core.mt_location import MTLocation
 # =============================================================================
 
 
+def get_transform(
+    lower_left, cell_size_north, cell_size_east, rotation_angle=0
+):
+    """Get the affine transform of a raster.
+
+    :param lower_left: Lower left corner of the raster.
+    :type lower_left: :class:`mtpy.core.MTLocation`
+    :param cell_size_north: Cell size in the north direction.
+    :type cell_size_north: float
+    :param cell_size_east: Cell size in the east direction.
+    :type cell_size_east: float
+    :param rotation_angle: Angle (degrees) to rotate the raster, defaults
+     to 0.
+    :type rotation_angle: float, optional
+    :return: Affine transform.
+    :rtype: :class:`rasterio.transform.Affine`
+    """
+    return (
+        Affine.translation(
+            lower_left.east,
+            lower_left.north,
+        )
+        * Affine.scale(cell_size_east, cell_size_north)
+        * Affine.rotation(rotation_angle)
+    )
+
+
 def array2raster(
     raster_fn,
     array,
@@ -53,13 +81,8 @@ def array2raster(
     if not isinstance(array, np.ndarray):
         raise TypeError(f"array must be a numpy array not {type(array)}.")
 
-    transform = (
-        Affine.translation(
-            lower_left.east,
-            lower_left.north,
-        )
-        * Affine.scale(cell_size_east, cell_size_north)
-        * Affine.rotation(rotation_angle)
+    transform = get_transform(
+        lower_left, cell_size_north, cell_size_east, rotation_angle
     )
 
     with rasterio.open(
@@ -76,4 +99,123 @@ def array2raster(
         dataset.write(array, 1)
 
 
+def array2multiband_raster(
+    raster_fn,
+    array,
+    lower_left,
+    cell_size_north,
+    cell_size_east,
+    crs,
+    rotation_angle=0,
+    band_descriptions=None,
+    band_tags=None,
+    driver="GTiff",
+    compress="deflate",
+    block_size=256,
+):
+    """Use rasterio to write a 3D array as one multi-band raster file.
+
+    The file is tiled and compressed so GIS programs can read a window of
+    one band without reading the whole file.  Use driver="COG" to write a
+    cloud optimized GeoTIFF.
+
+    :param raster_fn: Raster file name.
+    :type raster_fn: string or Path
+    :param array: Array with shape (n_north, n_east, n_bands), each band
+     is written like :func:`array2raster`.
+    :type array: np.ndarray
+    :param lower_left: Lower left corner of the raster.
+    :type lower_left: :class:`mtpy.core.MTLocation`
+    :param cell_size_north: Cell size in the north direction.
+    :type cell_size_north: float
+    :param cell_size_east: Cell size in the east direction.
+    :type cell_size_east: float
+    :param crs: Coordinate reference system.
+    :type crs: int, string or :class:`pyproj.CRS`
+    :param rotation_angle: Angle (degrees) to rotate the raster, defaults
+     to 0.
+    :type rotation_angle: float, optional
+    :param band_descriptions: Description of each band, defaults to None.
+    :type band_descriptions: list of str, optional
+    :param band_tags: Metadata tags of each band, defaults to None.
+    :type band_tags: list of dict, optional
+    :param driver: [ "GTiff" | "COG" ], defaults to "GTiff".
+    :type driver: str, optional
+    :param compress: Compression, defaults to "deflate".
+    :type compress: str, optional
+    :param block_size: Tile size in pixels, multiple of 16, defaults to 256.
+    :type block_size: int, optional
+    :return: Raster file name.
+    :rtype: Path
+    """
+
+    if not isinstance(lower_left, MTLocation):
+        raise TypeError(
+            f"lower_left must be a MTLocation object not {type(lower_left)}."
+        )
+
+    if not isinstance(array, np.ndarray) or array.ndim != 3:
+        raise TypeError("array must be a 3D numpy array.")
+
+    n_bands = array.shape[2]
+    for name, value in [
+        ("band_descriptions", band_descriptions),
+        ("band_tags", band_tags),
+    ]:
+        if value is not None and len(value) != n_bands:
+            raise ValueError(
+                f"{name} has {len(value)} entries, array has {n_bands} bands."
+            )
+
+    if driver in ["COG"]:
+        options = {"compress": compress, "blocksize": block_size}
+    else:
+        options = {
+            "tiled": True,
+            "blockxsize": block_size,
+            "blockysize": block_size,
+            "compress": compress,
+        }
+
+    profile = {
+        "driver": driver,
+        "height": array.shape[0],
+        "width": array.shape[1],
+        "count": n_bands,
+        "dtype": array.dtype,
+        "crs": crs,
+        "transform": get_transform(
+            lower_left, cell_size_north, cell_size_east, rotation_angle
+        ),
+    }
+
+    # the COG driver can only copy an existing dataset, so build it in
+    # memory first
+    if driver in ["COG"]:
+        memory_profile = dict(profile, driver="MEM")
+        with rasterio.MemoryFile() as memory_file:
+            with memory_file.open(**memory_profile) as dataset:
+                _write_bands(dataset, array, band_descriptions, band_tags)
+                rasterio.shutil.copy(
+                    dataset, raster_fn, driver="COG", **options
+                )
+    else:
+        with rasterio.open(raster_fn, "w", **profile, **options) as dataset:
+            _write_bands(dataset, array, band_descriptions, band_tags)
+
+    return Path(raster_fn)
+
+
+def _write_bands(dataset, array, band_descriptions=None, band_tags=None):
+    """Write the bands of a (n_north, n_east, n_bands) array to an open
+    dataset with descriptions and tags.
+    """
+    dataset.write(np.moveaxis(array, 2, 0))
+    for band in range(1, array.shape[2] + 1):
+        if band_descriptions is not None:
+            dataset.set_band_description(band, band_descriptions[band - 1])
+        if band_tags is not None:
+            dataset.update_tags(band, **band_tags[band - 1])
+
+
 # def dem_to_ply(geotiff_file, save_path=None):
@@ -15,6 +15,8 @@ import numpy as np
 import mtpy.utils.filehandling as mtfh
 from mtpy.utils.gis_tools import project_point
 import scipy.interpolate as spi
+from scipy import sparse
+from scipy.spatial import cKDTree, Delaunay
 
 # import rasterio
 # from rasterio.warp import calculate_default_transform, reproject, Resampling
@@ -412,15 +414,151 @@ def get_station_buffer(
 ):
     """Get cells within a specified distance (buf) of the stations
     returns a 2D boolean (True/False) array
+
+    The nearest station to each cell is found with a KD-tree of the
+    station locations, so the distance field is not built for every
+    station.
+
+    :param grid_east: Cell locations east.
+    :type grid_east: np.ndarray
+    :param grid_north: Cell locations north.
+    :type grid_north: np.ndarray
+    :param station_east: Station locations east.
+    :type station_east: np.ndarray
+    :param station_north: Station locations north.
+    :type station_north: np.ndarray
+    :param buf: Buffer distance, defaults to 10e3.
+    :type buf: float, optional
+    :return: True for cells within `buf` of a station, shape
+     (n_north, n_east).
+    :rtype: np.ndarray
     """
-    first = True
-    for xs, ys in np.vstack([station_east, station_north]).T:
-        xgrid, ygrid = np.meshgrid(grid_east, grid_north)
-        station_distance = ((xs - xgrid) ** 2 + (ys - ygrid) ** 2) ** 0.5
-        if first:
-            where = station_distance < buf
-            first = False
-        else:
-            where = np.any([where, station_distance < buf], axis=0)
+    xgrid, ygrid = np.meshgrid(grid_east, grid_north)
+    stations = np.column_stack(
+        [
+            np.asarray(station_east, dtype=float),
+            np.asarray(station_north, dtype=float),
+        ]
+    )
+    if stations.shape[0] == 0:
+        return np.zeros(xgrid.shape, dtype=bool)
 
-    return where
+    _, nearest = cKDTree(stations).query(
+        np.column_stack([xgrid.ravel(), ygrid.ravel()])
+    )
+    nearest = nearest.reshape(xgrid.shape)
+
+    # distance to the nearest station computed the same way as a brute
+    # force search so cells right on the buffer are treated the same
+    station_distance = (
+        (stations[nearest, 0] - xgrid) ** 2
+        + (stations[nearest, 1] - ygrid) ** 2
+    ) ** 0.5
+
+    return station_distance < buf
+
+
+def get_linear_interpolation_weights(points, xi):
+    """Get the weights of a linear interpolation from scattered `points` to
+    `xi` as a sparse matrix.
+
+    The weights are the barycentric coordinates of `xi` in the Delaunay
+    triangulation of `points`, the same as
+    :func:`scipy.interpolate.griddata` with method="linear", so they can be
+    computed once and applied to many value arrays on the same points.
+
+    :param points: Data point coordinates, shape (n_points, n_dim).
+    :type points: np.ndarray
+    :param xi: Points to interpolate to, shape (n_xi, n_dim).
+    :type xi: np.ndarray
+    :return: Weights, shape (n_xi, n_points), and a boolean array of the
+     `xi` outside the convex hull of `points` which get no weights.
+    :rtype: tuple of (scipy.sparse.csr_matrix, np.ndarray)
+    """
+    points = np.asarray(points, dtype=float)
+    xi = np.asarray(xi, dtype=float)
+    n_dim = points.shape[1]
+
+    tri = Delaunay(points)
+    simplex = tri.find_simplex(xi)
+    outside = simplex == -1
+    simplex[outside] = 0
+
+    transform = tri.transform[simplex]
+    barycentric = np.einsum(
+        "ijk,ik->ij", transform[:, :n_dim, :], xi - transform[:, n_dim, :]
+    )
+    weights = np.column_stack([barycentric, 1 - barycentric.sum(axis=1)])
+    weights[outside] = 0
+
+    rows = np.repeat(np.arange(xi.shape[0]), n_dim + 1)
+    weight_matrix = sparse.csr_matrix(
+        (weights.ravel(), (rows, tri.simplices[simplex].ravel())),
+        shape=(xi.shape[0], points.shape[0]),
+    )
+
+    return weight_matrix, outside
+
+
+def format_modem_resistivity(res_model):
+    """Format the resistivity block of a ModEM model file.
+
+    Each depth slice is a block with one line per east cell holding the
+    north values, each formatted as `{:>13.5E}`.  A whole line is formatted
+    with one format string instead of one write per cell.
+
+    :param res_model: Resistivity in the scale to write with the first
+     index going north to south, shape (n_north, n_east, n_z).
+    :type res_model: np.ndarray
+    :return: Lines of each depth slice.
+    :rtype: list of list of str
+    """
+    line_format = "%13.5E" * res_model.shape[0]
+    return [
+        [line_format % tuple(line) for line in res_model[:, :, zz].T.tolist()]
+        for zz in range(res_model.shape[2])
+    ]
+
+
+def read_modem_resistivity(lines, n_north, n_east, n_z, line_index=6):
+    """Read the resistivity block of a ModEM model file.
+
+    Each depth slice is read as one block of `n_east` lines, the depth
+    slices are split by a blank line which can be missing after the last
+    one.
+
+    :param lines: Lines of the model file.
+    :type lines: list of str
+    :param n_north: Number of cells north.
+    :type n_north: int
+    :param n_east: Number of cells east.
+    :type n_east: int
+    :param n_z: Number of cells vertically.
+    :type n_z: int
+    :param line_index: Index of the first line of the first depth slice,
+     defaults to 6.
+    :type line_index: int, optional
+    :raises ValueError: If a depth slice does not have n_north x n_east
+     values.
+    :return: Resistivity with the first index going south to north,
+     shape (n_north, n_east, n_z), and the index of the first line after
+     the resistivity block.
+    :rtype: tuple
+    """
+    res_model = np.zeros((n_north, n_east, n_z))
+    for zz in range(n_z):
+        layer = np.fromstring(
+            " ".join(lines[line_index : line_index + n_east]), sep=" "
+        )
+        if layer.size != n_north * n_east:
+            raise ValueError(
+                f"Depth slice {zz} has {layer.size} values, expected "
+                f"{n_north * n_east}."
+            )
+        # each line is N --> S for an east value, first index is south
+        res_model[:, :, zz] = layer.reshape(n_east, n_north).T[::-1]
+        line_index += n_east
+        if line_index < len(lines) and lines[line_index].strip() == "":
+            line_index += 1
+
+    return res_model, line_index
@@ -4,13 +4,14 @@ from .exception import ModEMError, DataError
 from .data import Data
 from .model import Model
 
-from .residual import Residual
+from .residual import Residual, rms_summary
 from .control_inv import ControlInv
 from .control_fwd import ControlFwd
 
 from .convariance import Covariance
 
 from .config import ModEMConfig
+from .cache import ModEMCache
 
 
 __all__ = [
@@ -19,9 +20,11 @@ __all__ = [
     "Data",
     "Model",
     "Residual",
+    "rms_summary",
     "ControlInv",
     "ControlFwd",
     "Covariance",
     "ModEMConfig",
+    "ModEMCache",
 
 ]
@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 09:02:37 2026
+
+@author: jpeacock
+
+Binary sidecar cache for parsed ModEM files.
+
+The first time a model, data, response or residual file is read with a cache
+attached, the parsed arrays are saved to an uncompressed .npz file in the
+cache directory.  The entry is keyed on the resolved file path, modification
+time and size, so editing or overwriting the ASCII file makes a new entry and
+the old one is removed.  The least recently used entries are removed once
+the cache gets bigger than `max_size` bytes.
+"""
+
+# =============================================================================
+# Imports
+# =============================================================================
+import os
+import hashlib
+import tempfile
+import zipfile
+from pathlib import Path
+
+import numpy as np
+from loguru import logger
+
+# =============================================================================
+
+
+class ModEMCache:
+    """Cache of parsed ModEM files stored as .npz files.
+
+    :Attach to a reader: ::
+
+        >>> from mtpy.modeling.modem import Data, Model, ModEMCache
+        >>> cache = ModEMCache(max_size=2 * 1024**3)
+        >>> data = Data(cache=cache)
+        >>> mdf = data.read_data_file("ModEM_Data.dat")
+        >>> model = Model(cache=cache)
+        >>> model.read_model_file("ModEM_NLCG_100.rho")
+
+    """
+
+    # bump if the layout of the cached arrays changes
+    cache_version = 1
+
+    def __init__(self, cache_dir=None, max_size=1024**3):
+        self.logger = logger
+        if cache_dir is None:
+            cache_dir = Path.home().joinpath(".cache", "mtpy", "modem")
+        self.cache_dir = Path(cache_dir)
+        self.max_size = max_size
+
+    def __str__(self):
+        return "\n".join(
+            [
+                "ModEM Cache",
+                f"\tdirectory: {self.cache_dir}",
+                f"\tentries:   {len(self._entries())}",
+                f"\tsize:      {self.size} / {self.max_size} bytes",
+            ]
+        )
+
+    def __repr__(self):
+        return self.__str__()
+
+    def _path_key(self, fn):
+        """Hash of the resolved file path."""
+        return hashlib.sha1(str(Path(fn).resolve()).encode()).hexdigest()[:16]
+
+    def _stat_key(self, fn):
+        """Hash of the modification time, size and cache version."""
+        stat = Path(fn).stat()
+        return hashlib.sha1(
+            f"{stat.st_mtime_ns}|{stat.st_size}|{self.cache_version}".encode()
+        ).hexdigest()[:16]
+
+    def get_cache_fn(self, fn):
+        """Get the cache file name for a file.
+
+        :param fn: File that was parsed.
+        :type fn: str or Path
+        :return: Cache file name.
+        :rtype: Path
+        """
+        return self.cache_dir.joinpath(
+            f"{self._path_key(fn)}_{self._stat_key(fn)}.npz"
+        )
+
+    def _entries(self):
+        """Cache files in the cache directory."""
+        if not self.cache_dir.is_dir():
+            return []
+        return list(self.cache_dir.glob("*.npz"))
+
+    @property
+    def size(self):
+        """Total size of the cache files in bytes."""
+        size = 0
+        for entry in self._entries():
+            try:
+                size += entry.stat().st_size
+            except FileNotFoundError:
+                continue
+        return size
+
+    def get(self, fn):
+        """Get the cached arrays of a file.
+
+        :param fn: File that was parsed.
+        :type fn: str or Path
+        :return: Arrays saved with :meth:`put`, None if the file has not been
+         cached or changed since it was cached.
+        :rtype: dict or None
+        """
+        cache_fn = self.get_cache_fn(fn)
+        if not cache_fn.is_file():
+            return None
+
+        try:
+            with np.load(cache_fn, allow_pickle=False) as npz:
+                arrays = dict((key, npz[key]) for key in npz.files)
+        except (OSError, ValueError, zipfile.BadZipFile) as error:
+            self.logger.warning(
+                f"Could not read cache file {cache_fn}, removing. {error}"
+            )
+            self._remove(cache_fn)
+            return None
+
+        # mark as recently used for eviction
+        try:
+            os.utime(cache_fn)
+        except OSError:
+            pass
+        self.logger.debug(f"Read {fn} from cache file {cache_fn}")
+        return arrays
+
+    def put(self, fn, arrays):
+        """Save the parsed arrays of a file.
+
+        Older entries for the same file are removed and the cache is evicted
+        down to `max_size`.
+
+        :param fn: File that was parsed.
+        :type fn: str or Path
+        :param arrays: Arrays to save, keys are array names.  Object arrays
+         are not allowed, string columns should be unicode arrays.
+        :type arrays: dict
+        :return: Cache file name.
+        :rtype: Path
+        """
+        cache_fn = self.get_cache_fn(fn)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        # write to a temporary file then move so a half written file is
+        # never read
+        with tempfile.NamedTemporaryFile(
+            dir=self.cache_dir, suffix=".tmp", delete=False
+        ) as tmp:
+            try:
+                np.savez(tmp, **arrays)
+            except Exception:
+                tmp.close()
+                self._remove(Path(tmp.name))
+                raise
+        os.replace(tmp.name, cache_fn)
+
+        for entry in self.cache_dir.glob(f"{self._path_key(fn)}_*.npz"):
+            if entry != cache_fn:
+                self._remove(entry)
+
+        self.evict()
+        self.logger.debug(f"Cached {fn} to {cache_fn}")
+        return cache_fn
+
+    def evict(self, max_size=None):
+        """Remove the least recently used entries until the cache is smaller
+        than `max_size`.
+
+        :param max_size: Maximum size in bytes, defaults to `self.max_size`.
+        :type max_size: int, optional
+        """
+        if max_size is None:
+            max_size = self.max_size
+
+        entries = []
+        for entry in self._entries():
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, entry))
+
+        size = sum(entry[1] for entry in entries)
+        for _, entry_size, entry in sorted(entries, key=lambda x: x[0]):
+            if size <= max_size:
+                break
+            self._remove(entry)
+            size -= entry_size
+
+    def clear(self):
+        """Remove all entries."""
+        self.evict(max_size=0)
+
+    def _remove(self, cache_fn):
+        """Remove a cache file if it exists."""
+        try:
+            cache_fn.unlink()
+        except FileNotFoundError:
+            pass
@@ -14,6 +14,7 @@ ModEM
 # =============================================================================
 # Imports
 # =============================================================================
+import io
 import numpy as np
 from pathlib import Path
 import pandas as pd
@@ -78,6 +79,9 @@ class Data:
 
         self.topography = True
 
+        # optional ModEMCache of parsed files
+        self.cache = None
+
         self.inv_mode_dict = {
             "1": ["Full_Impedance", "Full_Vertical_Components"],
             "2": ["Full_Impedance"],
@@ -500,6 +504,128 @@ class Data:
                 ]
             )
 
+    def _get_line_format(self):
+        """Get the format of a data line for `formatting`, same as
+        :meth:`_write_comp`.
+        """
+        if self.formatting == "1":
+            return (
+                "%-12.5e%7s% 9.3f% 9.3f% 12.3f% 12.3f% 12.3f%8s"
+                "% 14.6e% 14.6e% 14.6e"
+            )
+        elif self.formatting == "2":
+            return (
+                "%-14.6e%10s% 14.6f% 14.6f% 15.3f% 15.3f% 10.3f%8s"
+                "% 17.6e% 17.6e% 14.6e"
+            )
+        raise NotImplementedError(
+            f"format {self.formatting} ({type(self.formatting)}) is "
+            "not supported."
+        )
+
+    def _get_data_lines(self, comps):
+        """Format the data lines of the given components for all stations.
+
+        Gives the same lines as calling :meth:`_write_comp` for each
+        component of each row, station by station in the order they appear
+        in the dataframe, but masks and formats whole columns at once.
+
+        :param comps: Components to write, e.g. ["z_xx", "z_xy"].
+        :type comps: list
+        :return: Data lines.
+        :rtype: list of str
+        """
+        if len(comps) == 0:
+            return []
+
+        # station by station in order of appearance, rows in order
+        codes = pd.factorize(self.dataframe.station)[0]
+        df = self.dataframe.iloc[np.argsort(codes, kind="stable")]
+        n_rows = len(df)
+        n_comps = len(comps)
+
+        # (n_rows, n_comps) flattened row by row
+        value = np.nan_to_num(
+            np.column_stack([df[comp].to_numpy() for comp in comps])
+        ).ravel()
+        err = (
+            np.column_stack(
+                [df[f"{comp}_model_error"].to_numpy() for comp in comps]
+            )
+            .astype(float)
+            .ravel()
+        )
+        valid = (
+            (value.real != 0.0)
+            & (value.imag != 0.0)
+            & (value.real != 1e32)
+            & (value.imag != 1e32)
+        )
+        if not valid.any():
+            return []
+
+        line_format = self._get_line_format()
+
+        real = value.real
+        imag = value.imag
+        if self.z_units.lower() == "ohm":
+            real = real / 796.0
+            imag = imag / 796.0
+        elif self.z_units.lower() not in ("[v/m]/[t]", "[mv/km]/[nt]"):
+            raise ValueError(f"Unsupported unit '{self.z_units}'")
+
+        com = []
+        for comp in comps:
+            # need zxx instead of z_xx
+            inv_comp = comp.replace("_", "", 1)
+            if inv_comp[1].lower() == "z":
+                inv_comp = inv_comp.replace("z", "")
+            com.append(inv_comp.upper())
+
+        def repeat(column):
+            return np.repeat(df[column].to_numpy(), n_comps)[valid]
+
+        if self.topography:
+            elevation = repeat("model_elevation")
+        else:
+            elevation = np.zeros(valid.sum())
+
+        real = real[valid]
+        imag = imag[valid]
+        err = err[valid]
+
+        # errors that are not finite are set from the written values
+        bad_err = np.isinf(err) | np.isnan(err)
+        if bad_err.any():
+            # both formats write values with 6 decimals
+            written = np.array(
+                [
+                    [float(f"{r:.6e}"), float(f"{i:.6e}")]
+                    for r, i in zip(real[bad_err], imag[bad_err])
+                ]
+            )
+            with np.errstate(divide="ignore"):
+                err[bad_err] = 10 ** (
+                    np.floor(np.log10(np.abs(written.max(axis=1))))
+                )
+
+        return [
+            line_format % line
+            for line in zip(
+                repeat("period"),
+                repeat("station"),
+                repeat("latitude"),
+                repeat("longitude"),
+                repeat("model_north"),
+                repeat("model_east"),
+                elevation,
+                np.tile(com, n_rows)[valid],
+                real,
+                imag,
+                err,
+            )
+        ]
+
     def _check_for_errors_of_zero(self):
         """Need to check for any zeros in the error values which can prevent
         ModEM from running.
@@ -658,21 +784,12 @@ class Data:
                 )
 
         comps = self._get_components()
-        # Iterate over stations and sort by period
-        for station in self.dataframe.station.unique():
-            sdf = self.dataframe.loc[self.dataframe.station == station]
-            sdf.sort_values("period")
-
-            for row in sdf.itertuples():
-                for comp in comps:
-                    d_line = self._write_comp(row, comp)
-                    if d_line is None:
-                        continue
-
-                    if comp.startswith("z"):
-                        z_lines.append(d_line)
-                    elif comp.startswith("t"):
-                        t_lines.append(d_line)
+        z_lines += self._get_data_lines(
+            [comp for comp in comps if comp.startswith("z")]
+        )
+        t_lines += self._get_data_lines(
+            [comp for comp in comps if comp.startswith("t")]
+        )
 
         with open(self.data_filename, "w") as dfid:
             dfid.write("\n".join(z_lines + t_lines))
@@ -898,6 +1015,56 @@ class Data:
 
         return line_dict
 
+    def _read_data_lines(self, data_lines):
+        """Read data lines into a dataframe in one pass.
+
+        Has the same columns as a dataframe made from :meth:`_read_line` of
+        each line, one row per line with the real, imaginary and error of
+        the component of that line.  Lines that do not have one value for
+        each of `_df_keys` are skipped.
+
+        :param data_lines: Data lines of a ModEM file.
+        :type data_lines: list of str
+        :return: One row per line.
+        :rtype: :class:`pandas.DataFrame`
+        """
+        dtype = dict((key, float) for key in self._df_keys)
+        dtype.update({"station": str, "comp": str})
+        df = pd.read_csv(
+            io.StringIO("\n".join(data_lines)),
+            sep=r"\s+",
+            header=None,
+            names=self._df_keys,
+            dtype=dtype,
+            on_bad_lines="skip",
+        )
+        df = df.loc[df.error.notna()]
+
+        # rename the few unique components instead of every line
+        codes, comps = pd.factorize(df.comp)
+        names = {}
+        for code, comp in enumerate(comps):
+            comp = comp.lower()
+            if comp.startswith("t"):
+                comp = comp.replace("t", "tz")
+            names.setdefault(comp, []).append(code)
+        values = {
+            "real": df.real.to_numpy(),
+            "imag": df.imag.to_numpy(),
+            "model_error": np.where(df.error > 1e10, np.nan, df.error),
+        }
+
+        full_df = df[self._df_keys[0:7]].reset_index(drop=True)
+        columns = {}
+        for name, name_codes in names.items():
+            index = np.isin(codes, name_codes)
+            for key, value in values.items():
+                columns[f"{name}_{key}"] = np.where(index, value, np.nan)
+
+        return pd.concat(
+            [full_df, pd.DataFrame(columns, index=full_df.index)], axis=1
+        )
+
     def _change_comp(self, comp):
         """Change to z_, t_, pt_."""
         if comp.startswith("z"):
@@ -910,6 +1077,11 @@ class Data:
 
     def read_data_file(self, data_fn):
         """Read data file.
+
+        If `cache` is set to a :class:`mtpy.modeling.modem.ModEMCache` the
+        parsed data are read from the cache when the file has not changed
+        since it was cached, otherwise the file is parsed and cached.
+
         :param data_fn: Full path to data file name.
         :type data_fn: string or Path
         :raises ValueError: If cannot compute component.
@@ -926,26 +1098,27 @@ class Data:
 
         self.center_point = MTLocation()
 
+        if self.cache is not None:
+            cached = self.cache.get(self.data_filename)
+            if cached is not None:
+                self._read_header(cached.pop("header_lines").tolist())
+                return MTDataFrame(pd.DataFrame(cached))
+
         # open file get lines
         with open(self.data_filename, "r") as dfid:
-            dlines = dfid.readlines()
+            dlines = dfid.read().splitlines()
 
         # read header information
-        n_periods, n_stations = self._read_header(
-            [line for line in dlines if ">" in line or "#" in line]
-        )
-
-        # create a list of dictionaries to make into a pandas dataframe
-        entries = []
+        header_lines = []
+        data_lines = []
         for dline in dlines:
             if "#" in dline or ">" in dline:
-                continue
-
-            elif len(dline.split()) == len(self._df_keys):
-                line_dict = self._read_line(dline)
-                entries.append(line_dict)
+                header_lines.append(dline)
+            else:
+                data_lines.append(dline)
+        n_periods, n_stations = self._read_header(header_lines)
 
-        full_df = pd.DataFrame(entries)
+        full_df = self._read_data_lines(data_lines)
 
         # group by period and station so that there is 1 row per period per station
         combined_df = full_df.groupby(
@@ -966,6 +1139,15 @@ class Data:
 
         combined_df = self._rename_columns(combined_df)
 
+        if self.cache is not None:
+            arrays = {"header_lines": np.array(header_lines, dtype=str)}
+            for col in combined_df.columns:
+                values = combined_df[col].to_numpy()
+                if values.dtype == object:
+                    values = values.astype(str)
+                arrays[col] = values
+            self.cache.put(self.data_filename, arrays)
+
         return MTDataFrame(combined_df)
 
     def _rename_columns(self, df):
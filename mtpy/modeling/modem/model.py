@@ -244,6 +244,9 @@ class Model:
         self.title = "Model File written by MTpy.modeling.modem"
         self.res_scale = "loge"
 
+        # optional ModEMCache of parsed files
+        self.cache = None
+
         for key, value in kwargs.items():
             if hasattr(self, key):
                 setattr(self, key, value)
@@ -730,13 +733,14 @@ class Model:
             "gcz is the cells centre coordinates: %s, %s" % (len(gcz), gcz)
         )
 
-        # assign resistivity value
-        for j in range(len(self.res_model)):
-            for i in range(len(self.res_model[j])):
-                ii = np.where(
-                    (gcz > top_surface[j, i]) & (gcz <= bottom_surface[j, i])
-                )[0]
-                self.res_model[j, i, ii] = resistivity_value
+        # assign resistivity value to cells with a centre between the
+        # surfaces, (n_north, n_east, 1) surfaces against (n_z) centres
+        n_north, n_east = self.res_model.shape[0:2]
+        top_surface = np.asarray(top_surface)[0:n_north, 0:n_east, None]
+        bottom_surface = np.asarray(bottom_surface)[0:n_north, 0:n_east, None]
+        self.res_model[(gcz > top_surface) & (gcz <= bottom_surface)] = (
+            resistivity_value
+        )
 
     def write_model_file(self, **kwargs):
         """Will write an initial file for ModEM.
@@ -871,14 +875,11 @@ class Model:
                 )
 
             # write out the layers from resmodel
-            for zz in range(self.nodes_z.size):
+            for layer_lines in mtmesh.format_modem_resistivity(
+                write_res_model
+            ):
                 ifid.write("\n")
-                for ee in range(self.nodes_east.size):
-                    for nn in range(self.nodes_north.size):
-                        ifid.write(
-                            "{0:>13.5E}".format(write_res_model[nn, ee, zz])
-                        )
-                    ifid.write("\n")
+                ifid.write("".join([f"{line}\n" for line in layer_lines]))
 
             if self.grid_center is None:
                 # compute grid center
@@ -955,10 +956,69 @@ class Model:
         if not self.model_fn.exists():
             raise ModelError(f"Cannot find {self.model_fn}, check path")
 
+        model_dict = None
+        if self.cache is not None:
+            model_dict = self.cache.get(self.model_fn)
+        if model_dict is None:
+            model_dict = self._read_model_arrays()
+            if self.cache is not None:
+                self.cache.put(self.model_fn, model_dict)
+
+        self.title = str(model_dict["title"])
+        self.nodes_north = model_dict["nodes_north"]
+        self.nodes_east = model_dict["nodes_east"]
+        self.nodes_z = model_dict["nodes_z"]
+        self.res_model = model_dict["res_model"]
+        if "grid_center" in model_dict:
+            self.grid_center = model_dict["grid_center"]
+        if "mesh_rotation_angle" in model_dict:
+            self.mesh_rotation_angle = float(
+                model_dict["mesh_rotation_angle"]
+            )
+
+        # center the grids
+        if self.grid_center is None:
+            self.grid_center = np.array(
+                [-self.nodes_north.sum() / 2, -self.nodes_east.sum() / 2, 0.0]
+            )
+
+        # need to shift the grid if the center is not symmetric
+        # use the grid centre from the model file
+        shift_north = self.grid_center[0]  # + self.nodes_north.sum() / 2
+        shift_east = self.grid_center[1]  # + self.nodes_east.sum() / 2
+        shift_z = self.grid_center[2]
+
+        # shift the grid.  if shift is + then that means the center is
+        self.grid_north += shift_north
+        self.grid_east += shift_east
+        self.grid_z += shift_z
+
+        # get cell size
+        self.cell_size_east = stats.mode(self.nodes_east, axis=None, keepdims=True)[0][0]
+        self.cell_size_north = stats.mode(self.nodes_north, axis=None, keepdims=True)[0][0]
+
+        # get number of padding cells
+        self.pad_east = np.where(
+            self.nodes_east[0 : int(self.nodes_east.size / 2)]
+            != self.cell_size_east
+        )[0].size
+        self.pad_north = np.where(
+            self.nodes_north[0 : int(self.nodes_north.size / 2)]
+            != self.cell_size_north
+        )[0].size
+
+    def _read_model_arrays(self):
+        """Parse `model_fn` into arrays.
+
+        :return: Dictionary with keys title, nodes_north, nodes_east,
+         nodes_z, res_model in linear Ohm-m and grid_center and
+         mesh_rotation_angle if they are in the file.
+        :rtype: dict
+        """
         with open(self.model_fn, "r") as ifid:
             ilines = ifid.readlines()
 
-        self.title = ilines[0].strip()
+        model_dict = {"title": np.array(ilines[0].strip())}
 
         # get size of dimensions, remembering that x is N-S, y is E-W, z is + down
         nsize = ilines[1].strip().split()
@@ -968,47 +1028,20 @@ class Model:
         log_yn = nsize[4]
 
         # get nodes
-        self.nodes_north = np.array(
+        model_dict["nodes_north"] = np.array(
             [float(nn) for nn in ilines[2].strip().split()]
         )
-        self.nodes_east = np.array(
+        model_dict["nodes_east"] = np.array(
             [float(nn) for nn in ilines[3].strip().split()]
         )
-        self.nodes_z = np.array(
+        model_dict["nodes_z"] = np.array(
             [float(nn) for nn in ilines[4].strip().split()]
         )
 
-        self.res_model = np.zeros((n_north, n_east, n_z))
-
         # get model
-        count_z = 0
-        line_index = 6
-        count_e = 0
-        while count_z < n_z:
-            iline = ilines[line_index].strip().split()
-            # blank lines spit the depth blocks, use those as a marker to
-            # set the layer number and start a new block
-            if len(iline) == 0:
-                count_z += 1
-                count_e = 0
-                line_index += 1
-            # 3D grid model files don't have a space at the end
-            # additional condition to account for this.
-            elif (len(iline) == 3) & (count_z == n_z - 1):
-                count_z += 1
-                count_e = 0
-                line_index += 1
-            # each line in the block is a line of N-->S values for an east value
-            else:
-                north_line = np.array([float(nres) for nres in iline])
-
-                # Need to be sure that the resistivity array matches
-                # with the grids, such that the first index is the
-                # furthest south
-                self.res_model[:, count_e, count_z] = north_line[::-1]
-
-                count_e += 1
-                line_index += 1
+        res_model, line_index = mtmesh.read_modem_resistivity(
+            ilines, n_north, n_east, n_z
+        )
 
         # --> get grid center and rotation angle
         if len(ilines) > line_index:
@@ -1016,49 +1049,23 @@ class Model:
                 ilist = iline.strip().split()
                 # grid center
                 if len(ilist) == 3:
-                    self.grid_center = np.array(ilist, dtype=float)
+                    model_dict["grid_center"] = np.array(ilist, dtype=float)
                 # rotation angle
                 elif len(ilist) == 1:
-                    self.mesh_rotation_angle = float(ilist[0])
+                    model_dict["mesh_rotation_angle"] = np.array(
+                        float(ilist[0])
+                    )
                 else:
                     pass
 
         # --> make sure the resistivity units are in linear Ohm-m
         if log_yn.lower() == "loge":
-            self.res_model = np.e**self.res_model
+            res_model = np.e**res_model
         elif log_yn.lower() == "log" or log_yn.lower() == "log10":
-            self.res_model = 10**self.res_model
-
-        # center the grids
-        if self.grid_center is None:
-            self.grid_center = np.array(
-                [-self.nodes_north.sum() / 2, -self.nodes_east.sum() / 2, 0.0]
-            )
+            res_model = 10**res_model
+        model_dict["res_model"] = res_model
 
-        # need to shift the grid if the center is not symmetric
-        # use the grid centre from the model file
-        shift_north = self.grid_center[0]  # + self.nodes_north.sum() / 2
-        shift_east = self.grid_center[1]  # + self.nodes_east.sum() / 2
-        shift_z = self.grid_center[2]
-
-        # shift the grid.  if shift is + then that means the center is
-        self.grid_north += shift_north
-        self.grid_east += shift_east
-        self.grid_z += shift_z
-
-        # get cell size
-        self.cell_size_east = stats.mode(self.nodes_east, axis=None, keepdims=True)[0][0]
-        self.cell_size_north = stats.mode(self.nodes_north, axis=None, keepdims=True)[0][0]
-
-        # get number of padding cells
-        self.pad_east = np.where(
-            self.nodes_east[0 : int(self.nodes_east.size / 2)]
-            != self.cell_size_east
-        )[0].size
-        self.pad_north = np.where(
-            self.nodes_north[0 : int(self.nodes_north.size / 2)]
-            != self.cell_size_north
-        )[0].size
+        return model_dict
 
     def plot_mesh(self, **kwargs):
         """Plot model mesh.
@@ -98,6 +98,15 @@ class Residual(Data):
             "rms_tzy": (215 / 255, 154 / 255, 84 / 255),
         }
 
+        self.rms_components = [
+            "rms_zxx",
+            "rms_zxy",
+            "rms_zyx",
+            "rms_zyy",
+            "rms_tzx",
+            "rms_tzy",
+        ]
+
         for key, value in kwargs.items():
             setattr(self, key, value)
 
@@ -130,28 +139,7 @@ class Residual(Data):
         """RMS per period."""
 
         if self.dataframe is not None:
-            rms_list = []
-            for period in self.dataframe.period.unique():
-                z_df = self.dataframe.loc[
-                    self.dataframe.period == period,
-                    ["rms_zxx", "rms_zxy", "rms_zyx", "rms_zyy"],
-                ]
-                t_df = self.dataframe.loc[
-                    self.dataframe.period == period, ["rms_tzx", "rms_tzy"]
-                ]
-
-                rms_list.append(
-                    {
-                        "period": period,
-                        "rms_z": z_df.mean().mean(),
-                        "rms_t": t_df.mean().mean(),
-                    }
-                )
-
-            df = pd.DataFrame(rms_list)
-            df = df.set_index("period")
-
-            return df
+            return self._rms_groupby("period")[["rms_z", "rms_t"]]
 
     @property
     def rms_per_period_per_component(self):
@@ -160,31 +148,59 @@ class Residual(Data):
         :rtype: TYPE
         """
 
-        rms_list = []
-        for period in self.dataframe.period.unique():
-            comp_df = self.dataframe.loc[
-                self.dataframe.period == period,
-                [
-                    "rms_zxx",
-                    "rms_zxy",
-                    "rms_zyx",
-                    "rms_zyy",
-                    "rms_tzx",
-                    "rms_tzy",
-                ],
-            ]
-
-            mean_dict = {"period": period}
-            for comp in comp_df.columns:
-                mean_dict[comp] = comp_df.loc[:, comp].mean()
-
-            rms_list.append(mean_dict)
-
-        df = pd.DataFrame(rms_list)
-        df = df.set_index("period")
+        return self._rms_groupby("period")[self.rms_components]
 
+    def _rms_groupby(self, key):
+        """Mean RMS of each component grouped by `key` in order of
+        appearance, with rms_z, rms_t and rms as the mean of the component
+        means.
+        """
+        df = self.dataframe.groupby(key, sort=False)[
+            self.rms_components
+        ].mean()
+        return self._add_rms_totals(df)
+
+    def _add_rms_totals(self, df):
+        """Add rms_z, rms_t and rms columns as the mean of the component
+        means, NaN components are skipped.
+        """
+        df["rms_z"] = df[self.rms_components[0:4]].mean(axis=1)
+        df["rms_t"] = df[self.rms_components[4:]].mean(axis=1)
+        df["rms"] = df[self.rms_components].mean(axis=1)
         return df
 
+    def rms_summary(self):
+        """Summarize the RMS in one set of tables.
+
+        Each table has the mean RMS of each component, rms_z and rms_t as
+        the mean of the impedance and tipper component means and rms as the
+        mean of all component means.
+
+        :return: Dictionary of tables
+
+            - "station": indexed by station
+            - "period": indexed by period, sorted
+            - "component": indexed by component with column rms, no totals
+            - "total": one row indexed by "total"
+
+        :rtype: dict of pd.DataFrame
+        """
+
+        if "rms_zxx" not in self.dataframe.columns:
+            self.calculate_rms()
+
+        component = self.dataframe[self.rms_components].mean()
+        total = self._add_rms_totals(component.to_frame("total").T)
+        component = component.to_frame("rms")
+        component.index.name = "component"
+
+        return {
+            "station": self._rms_groupby("station"),
+            "period": self._rms_groupby("period").sort_index(),
+            "component": component,
+            "total": total,
+        }
+
     def plot_rms_per_period(self, plot_type="all", **kwargs):
         """Plot rms per period.
         :param plot_type:
@@ -230,3 +246,62 @@ class Residual(Data):
         plot_rms.plot()
 
         return plot_rms
+
+
+def rms_summary(residuals, names=None):
+    """Summarize the RMS of several inversion runs.
+
+    :Compare runs: ::
+
+        >>> from mtpy.modeling.modem import rms_summary
+        >>> summary = rms_summary(
+        ...     ["run_01/ModEM_NLCG_080.res", "run_02/ModEM_NLCG_120.res"],
+        ...     names=["run_01", "run_02"],
+        ...     )
+        >>> summary["total"]
+
+    :param residuals: Residual files or :class:`Residual` objects.
+    :type residuals: list
+    :param names: Name of each run, defaults to the file stem or the index
+     in the list.
+    :type names: list, optional
+    :return: Tables from :meth:`Residual.rms_summary` stacked with an outer
+     index level "run".
+    :rtype: dict of pd.DataFrame
+    """
+
+    if isinstance(residuals, (str, Path, Residual)):
+        residuals = [residuals]
+
+    if names is None:
+        names = []
+        for ii, residual in enumerate(residuals):
+            if isinstance(residual, Residual):
+                names.append(ii)
+            else:
+                names.append(Path(residual).stem)
+    elif len(names) != len(residuals):
+        raise ValueError(
+            f"Number of names {len(names)} does not match number of "
+            f"residuals {len(residuals)}"
+        )
+
+    summary_list = []
+    for residual in residuals:
+        if not isinstance(residual, Residual):
+            residual_fn = residual
+            residual = Residual()
+            residual.read_residual_file(residual_fn)
+        summary_list.append(residual.rms_summary())
+
+    return dict(
+        (
+            key,
+            pd.concat(
+                [summary[key] for summary in summary_list],
+                keys=names,
+                names=["run"],
+            ),
+        )
+        for key in summary_list[0].keys()
+    )
@@ -17,7 +17,6 @@ import pandas as pd
 import matplotlib.pyplot as plt
 from matplotlib import colors as colors
 from matplotlib import colorbar as mcb
-from matplotlib import cm
 from matplotlib import gridspec
 from matplotlib import ticker
 
@@ -138,13 +137,13 @@ class PlotRMS(PlotBaseMaps):
     def rms_cmap(self, value):
         """Rms cmap."""
         if isinstance(value, str):
-            self._rms_cmap = cm.get_cmap(value)
+            self._rms_cmap = plt.get_cmap(value)
 
         elif isinstance(value, colors.LinearSegmentedColormap):
             self._rms_cmap = value
 
         else:
-            self._rms_cmap = cm.get_cmap("jet")
+            self._rms_cmap = plt.get_cmap("jet")
 
     def _plot_rms_map(self):
         """Plot rms map.
@@ -207,28 +206,7 @@ class PlotRMS(PlotBaseMaps):
         """RMS per period."""
 
         if self.dataframe is not None:
-            rms_list = []
-            for period in self.dataframe.period.unique():
-                comp_df = self.dataframe.loc[
-                    self.dataframe.period == period,
-                    [
-                        "rms_zxx",
-                        "rms_zxy",
-                        "rms_zyx",
-                        "rms_zyy",
-                        "rms_tzx",
-                        "rms_tzy",
-                    ],
-                ]
-
-                mean_dict = {"period": period}
-                for comp in comp_df.columns:
-                    mean_dict[comp] = comp_df.loc[:, comp].mean()
-
-                rms_list.append(mean_dict)
-
-            df = pd.DataFrame(rms_list)
-            df = df.set_index("period")
+            df = self.dataframe.groupby("period")[self.comp_list].mean()
             df = df.sort_index()
 
             return df
@@ -238,26 +216,13 @@ class PlotRMS(PlotBaseMaps):
         """RMS per period."""
 
         if self.dataframe is not None:
-            rms_list = []
-            for station in self.dataframe.station.unique():
-                z_df = self.dataframe.loc[
-                    self.dataframe.station == station,
-                    ["rms_zxx", "rms_zxy", "rms_zyx", "rms_zyy"],
-                ]
-                t_df = self.dataframe.loc[
-                    self.dataframe.station == station, ["rms_tzx", "rms_tzy"]
-                ]
-
-                rms_list.append(
-                    {
-                        "station": station,
-                        "rms_z": z_df.mean().mean(),
-                        "rms_t": t_df.mean().mean(),
-                    }
-                )
-
-            df = pd.DataFrame(rms_list)
-            df = df.set_index("station")
+            df = self.dataframe.groupby("station")[self.comp_list].mean()
+            df = pd.DataFrame(
+                {
+                    "rms_z": df[self.comp_list[0:4]].mean(axis=1),
+                    "rms_t": df[self.comp_list[4:]].mean(axis=1),
+                }
+            )
             df = df.sort_index()
 
             return df
@@ -269,33 +234,21 @@ class PlotRMS(PlotBaseMaps):
         :rtype: TYPE
         """
 
+        # periods that are the same to 4 significant figures share a column
+        period_codes, periods = pd.factorize(self.dataframe.period)
         period_dict = dict(
-            [
-                (f"{ff:.4g}", ii)
-                for ii, ff in enumerate(self.dataframe.period.unique())
-            ]
-        )
-
-        station_dict = dict(
-            [(ss, ii) for ii, ss in enumerate(self.dataframe.station.unique())]
-        )
-
-        rms_array = np.zeros(
-            (
-                self.dataframe.station.unique().size,
-                self.dataframe.period.unique().size,
-                6,
-            )
+            [(f"{ff:.4g}", ii) for ii, ff in enumerate(periods)]
         )
+        p_index = np.array(
+            [period_dict[f"{ff:.4g}"] for ff in periods], dtype=int
+        )[period_codes]
 
-        for row in self.dataframe.itertuples():
-            p_index = period_dict[f"{row.period:.4g}"]
-            s_index = station_dict[row.station]
+        s_index, stations = pd.factorize(self.dataframe.station)
 
-            for ii, comp in enumerate(
-                ["zxx", "zxy", "zyx", "zyy", "tzx", "tzy"]
-            ):
-                rms_array[s_index, p_index, ii] = getattr(row, f"rms_{comp}")
+        rms_array = np.zeros((stations.size, periods.size, 6))
+        rms_array[s_index, p_index, :] = self.dataframe[
+            self.comp_list
+        ].to_numpy(dtype=float)
 
         return rms_array
 
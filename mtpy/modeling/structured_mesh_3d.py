@@ -15,10 +15,11 @@ ModEM
 # Imports
 # =============================================================================
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+import importlib.util
 import numpy as np
 import xarray as xr
 from scipy import stats as stats
-from scipy import interpolate
 from loguru import logger
 
 import mtpy.modeling.mesh_tools as mtmesh
@@ -29,7 +30,8 @@ import mtpy.utils.filehandling as mtfh
 from mtpy.utils.gis_tools import project_point
 from mtpy.modeling.plots.plot_mesh import PlotMesh
 from mtpy.core.mt_location import MTLocation
-from mtpy.gis.raster_tools import array2raster
+from mtpy.gis.raster_tools import array2raster, array2multiband_raster
+from mtpy.core.mt_data_parallel import get_n_jobs
 
 from pyevtk.hl import gridToVTK
 
@@ -742,13 +744,14 @@ class StructuredGrid3D:
             f"gcz is the cells centre coordinates: {len(gcz)}, {gcz}"
         )
 
-        # assign resistivity value
-        for j in range(len(self.res_model)):
-            for i in range(len(self.res_model[j])):
-                ii = np.where(
-                    (gcz > top_surface[j, i]) & (gcz <= bottom_surface[j, i])
-                )[0]
-                self.res_model[j, i, ii] = resistivity_value
+        # assign resistivity value to cells with a centre between the
+        # surfaces, (n_north, n_east, 1) surfaces against (n_z) centres
+        n_north, n_east = self.res_model.shape[0:2]
+        top_surface = np.asarray(top_surface)[0:n_north, 0:n_east, None]
+        bottom_surface = np.asarray(bottom_surface)[0:n_north, 0:n_east, None]
+        self.res_model[(gcz > top_surface) & (gcz <= bottom_surface)] = (
+            resistivity_value
+        )
 
     def to_modem(self, model_fn=None, **kwargs):
         """Will write an initial file for ModEM.
@@ -839,13 +842,9 @@ class StructuredGrid3D:
             )
 
         # write out the layers from resmodel
-        for zz in range(self.nodes_z.size):
+        for layer_lines in mtmesh.format_modem_resistivity(write_res_model):
             lines.append("")
-            for ee in range(self.nodes_east.size):
-                line = []
-                for nn in range(self.nodes_north.size):
-                    line.append(f"{write_res_model[nn, ee, zz]:>13.5E}")
-                lines.append("".join(line))
+            lines += layer_lines
 
         if self.grid_center is None:
             # compute grid center
@@ -944,37 +943,10 @@ class StructuredGrid3D:
             [float(nn) for nn in ilines[4].strip().split()]
         )
 
-        self.res_model = np.zeros((n_north, n_east, n_z))
-
         # get model
-        count_z = 0
-        line_index = 6
-        count_e = 0
-        while count_z < n_z:
-            iline = ilines[line_index].strip().split()
-            # blank lines spit the depth blocks, use those as a marker to
-            # set the layer number and start a new block
-            if len(iline) == 0:
-                count_z += 1
-                count_e = 0
-                line_index += 1
-            # 3D grid model files don't have a space at the end
-            # additional condition to account for this.
-            elif (len(iline) == 3) & (count_z == n_z - 1):
-                count_z += 1
-                count_e = 0
-                line_index += 1
-            # each line in the block is a line of N-->S values for an east value
-            else:
-                north_line = np.array([float(nres) for nres in iline])
-
-                # Need to be sure that the resistivity array matches
-                # with the grids, such that the first index is the
-                # furthest south
-                self.res_model[:, count_e, count_z] = north_line[::-1]
-
-                count_e += 1
-                line_index += 1
+        self.res_model, line_index = mtmesh.read_modem_resistivity(
+            ilines, n_north, n_east, n_z
+        )
 
         # --> get grid center and rotation angle
         if len(ilines) > line_index:
@@ -1139,14 +1111,146 @@ class StructuredGrid3D:
             },
         )
 
-    def to_netcdf(self, fn, pad_east=None, pad_north=None, metadata={}):
+    def to_netcdf(
+        self,
+        fn,
+        pad_east=None,
+        pad_north=None,
+        metadata={},
+        cell_size=None,
+        complevel=4,
+        engine=None,
+    ):
         """Create a netCDF file to read into GIS software
 
         works about 50% of the time..
+
+        The resistivity is chunked by depth slice and compressed with zlib
+        if the netCDF4 or h5netcdf engine is available, the scipy engine
+        writes uncompressed netCDF3.
+
+        If `cell_size` is given the model is interpolated onto an even grid
+        in UTM coordinates and written one depth slice at a time so the
+        interpolated model never has to fit in memory, this needs netCDF4.
+
+        :param fn: File name to write to.
+        :type fn: string or Path
+        :param pad_east: Number of padding cells to skip from outside in,
+         defaults to None which uses self.pad_east.
+        :type pad_east: int, optional
+        :param pad_north: Number of padding cells to skip from outside in,
+         defaults to None which uses self.pad_north.
+        :type pad_north: int, optional
+        :param metadata: Global attributes to add, defaults to {}.
+        :type metadata: dict, optional
+        :param cell_size: Cell size in meters of an even grid to interpolate
+         onto, defaults to None which writes the model cells.
+        :type cell_size: float, optional
+        :param complevel: zlib compression level 1-9, defaults to 4.
+        :type complevel: int, optional
+        :param engine: [ "netcdf4" | "h5netcdf" | "scipy" ], defaults to None
+         which uses the first one installed.
+        :type engine: str, optional
+        :return: Dataset written, or the file name if streamed on an even
+         grid.
+        :rtype: :class:`xarray.Dataset` or Path
+        """
+        if self.center_point.utm_epsg is None:
+            raise ValueError("Must input UTM CRS or EPSG")
+
+        if cell_size is not None:
+            return self._stream_even_grid(
+                fn,
+                cell_size,
+                pad_east=pad_east,
+                pad_north=pad_north,
+                metadata=metadata,
+                complevel=complevel,
+                file_format="netcdf",
+            )
+
+        ds = self._get_netcdf_dataset(
+            pad_east=pad_east, pad_north=pad_north, metadata=metadata
+        )
+
+        engine = self._get_netcdf_engine(engine)
+        encoding = {}
+        if engine in ["netcdf4", "h5netcdf"]:
+            encoding = {
+                "resistivity": {
+                    "zlib": True,
+                    "complevel": complevel,
+                    "chunksizes": (1,) + ds.resistivity.shape[1:],
+                }
+            }
+        else:
+            self._logger.info(
+                "Install netCDF4 or h5netcdf to write a compressed file."
+            )
+
+        # write to netcdf
+        ds.to_netcdf(path=fn, engine=engine, encoding=encoding)
+
+        return ds
+
+    def to_zarr(
+        self, fn, pad_east=None, pad_north=None, metadata={}, cell_size=None
+    ):
+        """Write the model to a Zarr store chunked by depth slice.
+
+        Same layout as :meth:`to_netcdf`, compressed with the default Zarr
+        compressor.  If `cell_size` is given the model is interpolated onto
+        an even grid in UTM coordinates and appended one depth slice at a
+        time.
+
+        :param fn: Path of the Zarr store.
+        :type fn: string or Path
+        :param pad_east: Number of padding cells to skip from outside in,
+         defaults to None which uses self.pad_east.
+        :type pad_east: int, optional
+        :param pad_north: Number of padding cells to skip from outside in,
+         defaults to None which uses self.pad_north.
+        :type pad_north: int, optional
+        :param metadata: Global attributes to add, defaults to {}.
+        :type metadata: dict, optional
+        :param cell_size: Cell size in meters of an even grid to interpolate
+         onto, defaults to None which writes the model cells.
+        :type cell_size: float, optional
+        :return: Dataset written, or the store path if streamed on an even
+         grid.
+        :rtype: :class:`xarray.Dataset` or Path
         """
         if self.center_point.utm_epsg is None:
             raise ValueError("Must input UTM CRS or EPSG")
 
+        if cell_size is not None:
+            return self._stream_even_grid(
+                fn,
+                cell_size,
+                pad_east=pad_east,
+                pad_north=pad_north,
+                metadata=metadata,
+                file_format="zarr",
+            )
+
+        ds = self._get_netcdf_dataset(
+            pad_east=pad_east, pad_north=pad_north, metadata=metadata
+        )
+        ds.to_zarr(
+            fn,
+            mode="w",
+            encoding={
+                "resistivity": {"chunks": (1,) + ds.resistivity.shape[1:]}
+            },
+        )
+
+        return ds
+
+    def _get_netcdf_dataset(self, pad_east=None, pad_north=None, metadata={}):
+        """Make the dataset written by :meth:`to_netcdf`, log10 resistivity
+        on (depth, latitude, longitude).
+        """
+
         pad_east = self._validate_pad_east(pad_east)
         pad_north = self._validate_pad_north(pad_north)
 
@@ -1237,11 +1341,156 @@ class StructuredGrid3D:
         ds.attrs["geospatial_vertical_units"] = "km"
         ds.attrs["geospatial_vertical_positive"] = "down"
 
-        # write to netcdf
-        ds.to_netcdf(path=fn)
+        return ds
+
+    @staticmethod
+    def _get_netcdf_engine(engine=None):
+        """Get the netCDF engine, the first installed of netcdf4, h5netcdf
+        and scipy if `engine` is None.
+        """
+        if engine is not None:
+            return engine
+        for engine, module in [
+            ("netcdf4", "netCDF4"),
+            ("h5netcdf", "h5netcdf"),
+        ]:
+            if importlib.util.find_spec(module) is not None:
+                return engine
+        return "scipy"
+
+    def _get_even_grid_dataset(self, new_north, new_east, depth, metadata={}):
+        """Make an empty dataset with the coordinates and attributes of an
+        even grid in UTM coordinates, depth in km.
+        """
+
+        ds = xr.Dataset(
+            coords={
+                "depth": ("depth", depth),
+                "north": ("north", new_north + self.center_point.north),
+                "east": ("east", new_east + self.center_point.east),
+            }
+        )
+        ds.north.attrs.update(
+            {
+                "long_name": "northing; positive_north",
+                "units": "m",
+                "standard_name": "projection_y_coordinate",
+            }
+        )
+        ds.east.attrs.update(
+            {
+                "long_name": "easting; positive_east",
+                "units": "m",
+                "standard_name": "projection_x_coordinate",
+            }
+        )
+        ds.depth.attrs.update(
+            {
+                "long_name": "depth; positive_down",
+                "units": "km",
+                "standard_name": "depth",
+            }
+        )
+
+        ds.attrs["Conventions"] = "CF-1.0"
+        ds.attrs["utm_epsg"] = self.center_point.utm_epsg
+        ds.attrs["utm_wkt"] = self.center_point.utm_crs.to_wkt()
+        ds.attrs["geospatial_vertical_min"] = depth.min()
+        ds.attrs["geospatial_vertical_max"] = depth.max()
+        ds.attrs["geospatial_vertical_units"] = "km"
+        ds.attrs["geospatial_vertical_positive"] = "down"
+        for key, value in metadata.items():
+            ds.attrs[key] = value
 
         return ds
 
+    def _stream_even_grid(
+        self,
+        fn,
+        cell_size,
+        pad_east=None,
+        pad_north=None,
+        metadata={},
+        complevel=4,
+        file_format="netcdf",
+    ):
+        """Interpolate the model onto an even grid and write log10
+        resistivity one depth slice at a time.
+
+        :param file_format: [ "netcdf" | "zarr" ], defaults to "netcdf".
+        :type file_format: str, optional
+        :return: File name.
+        :rtype: Path
+        """
+
+        new_north, new_east, weights, outside = self._get_even_grid_weights(
+            cell_size, pad_north=pad_north, pad_east=pad_east
+        )
+        depth = (self.grid_z[:-1] + self.center_point.elevation) / 1000
+        ds = self._get_even_grid_dataset(
+            new_north, new_east, depth, metadata=metadata
+        )
+        slices = self._iter_even_grid_slices(
+            new_north, new_east, weights, outside
+        )
+        resistivity_attrs = {
+            "long_name": "electrical resistivity",
+            "units": "Ohm-m",
+            "standard_name": "resistivity",
+            "display_name": "log10(resistivity)",
+        }
+        chunks = (1, new_north.size, new_east.size)
+
+        if file_format in ["zarr"]:
+            for z_index, res in slices:
+                slice_ds = ds.isel(depth=[z_index])
+                slice_ds["resistivity"] = (
+                    ("depth", "north", "east"),
+                    np.log10(res)[None],
+                    resistivity_attrs,
+                )
+                if z_index == 0:
+                    slice_ds.to_zarr(
+                        fn,
+                        mode="w",
+                        encoding={"resistivity": {"chunks": chunks}},
+                    )
+                else:
+                    slice_ds.to_zarr(fn, append_dim="depth")
+
+        elif file_format in ["netcdf"]:
+            try:
+                import netCDF4
+            except ImportError:
+                raise ImportError(
+                    "netCDF4 is needed to write an even grid one depth "
+                    "slice at a time."
+                )
+
+            # write coordinates and attributes, then fill in the slices
+            ds.to_netcdf(path=fn, engine="netcdf4")
+            with netCDF4.Dataset(fn, "a") as nc:
+                variable = nc.createVariable(
+                    "resistivity",
+                    "f8",
+                    ("depth", "north", "east"),
+                    zlib=True,
+                    complevel=complevel,
+                    chunksizes=chunks,
+                    fill_value=np.nan,
+                )
+                variable.setncatts(resistivity_attrs)
+                for z_index, res in slices:
+                    variable[z_index, :, :] = np.log10(res)
+        else:
+            raise ValueError(
+                f"file_format {file_format} not understood, options are "
+                "['netcdf', 'zarr']"
+            )
+
+        self._logger.info(f"Wrote even grid model to {fn}")
+        return Path(fn)
+
     def to_gocad_sgrid(
         self, fn=None, origin=[0, 0, 0], clip=0, no_data_value=-99999
     ):
@@ -1770,6 +2019,63 @@ class StructuredGrid3D:
         :rtype: TYPE
         """
 
+        new_north, new_east, weights, outside = self._get_even_grid_weights(
+            cell_size, pad_north=pad_north, pad_east=pad_east
+        )
+        new_res_arr = weights @ self.res_model.reshape((-1, self.nodes_z.size))
+        new_res_arr[outside] = np.nan
+
+        return (
+            new_north,
+            new_east,
+            new_res_arr.reshape(
+                (new_north.size, new_east.size, self.nodes_z.size)
+            ),
+        )
+
+    def iter_even_grid_slices(self, cell_size, pad_north=None, pad_east=None):
+        """Interpolate the model onto an even grid one depth slice at a time.
+
+        Same as :meth:`interpolate_to_even_grid` but only one slice of the
+        even grid is in memory at a time.
+
+        :param cell_size: Square cell size (cell_size x cell_size) in meters.
+        :type cell_size: float
+        :param pad_north: Number of padding cells to skip from outside in,
+         defaults to None which uses self.pad_north.
+        :type pad_north: int, optional
+        :param pad_east: Number of padding cells to skip from outside in,
+         defaults to None which uses self.pad_east.
+        :type pad_east: int, optional
+        :return: Generator of (z_index, slice) where slice has shape
+         (n_north, n_east) of the even grid.
+        :rtype: generator
+        """
+
+        return self._iter_even_grid_slices(
+            *self._get_even_grid_weights(
+                cell_size, pad_north=pad_north, pad_east=pad_east
+            )
+        )
+
+    def _iter_even_grid_slices(self, new_north, new_east, weights, outside):
+        """Apply weights from :meth:`_get_even_grid_weights` one depth slice
+        at a time.
+        """
+
+        for z_index in range(self.nodes_z.size):
+            res = weights @ self.res_model[:, :, z_index].ravel()
+            res[outside] = np.nan
+            yield z_index, res.reshape((new_north.size, new_east.size))
+
+    def _get_even_grid_weights(self, cell_size, pad_north=None, pad_east=None):
+        """Get the even grid and the weights to interpolate the model onto it.
+
+        :return: new_north, new_east, sparse weights and the even grid
+         points outside of the model.
+        :rtype: tuple
+        """
+
         pad_east = self._validate_pad_east(pad_east)
         pad_north = self._validate_pad_north(pad_north)
 
@@ -1792,19 +2098,18 @@ class StructuredGrid3D:
             self.grid_east[None, :-1],
         )
 
-        new_res_arr = np.zeros(
-            (new_north.size, new_east.size, self.nodes_z.size)
+        new_n, new_e = np.broadcast_arrays(
+            new_north[:, None], new_east[None, :]
         )
 
-        for z_index in range(self.grid_z.shape[0] - 1):
-            res = self.res_model[:, :, z_index]
-            new_res_arr[:, :, z_index] = interpolate.griddata(
-                (model_n.ravel(), model_e.ravel()),
-                res.ravel(),
-                (new_north[:, None], new_east[None, :]),
-            )
+        # the horizontal grid is the same for every depth slice so compute
+        # the interpolation weights once and apply them to all slices
+        weights, outside = mtmesh.get_linear_interpolation_weights(
+            np.column_stack((model_n.ravel(), model_e.ravel())),
+            np.column_stack((new_n.ravel(), new_e.ravel())),
+        )
 
-        return new_north, new_east, new_res_arr
+        return new_north, new_east, weights, outside
 
     def get_lower_left_corner(
         self, pad_east, pad_north, shift_east=0, shift_north=0
@@ -1937,6 +2242,8 @@ class StructuredGrid3D:
         shift_east=0,
         log10=True,
         verbose=True,
+        multiband=False,
+        n_jobs=None,
     ):
         """Write out each depth slice as a raster in UTM coordinates.
 
@@ -1968,7 +2275,16 @@ class StructuredGrid3D:
                 :param rotation_angle: Angle (degrees) to rotate the raster assuming
                     clockwise positive rotation where North = 0, East = 90, defaults to 0.
                 :type rotation_angle: float, optional
-                :raises ValueError: If utm_epsg is not input.
+                :param multiband: Write all depth slices to one tiled and
+                    compressed multi-band GeoTIFF with the depth of each slice
+                    in the band description and tags, defaults to False.
+                :type multiband: bool, optional
+                :param n_jobs: Number of threads to write the depth slices
+                    with when `multiband` is False, -1 uses all CPUs, defaults
+                    to None which is serial.
+                :type n_jobs: int, optional
+                :raises ValueError: If utm_epsg is not input or no depth
+                    slices are between `depth_min` and `depth_max`.
                 :return: List of file paths to rasters.
                 :rtype: TYPE
         """
@@ -2006,36 +2322,79 @@ class StructuredGrid3D:
             )
         ]
 
-        initial_index = np.where(self.grid_z == raster_depths.min())[0][0]
+        # grid_z are the cell edges so the last depth can be past the
+        # last slice
+        depth_list = []
+        if raster_depths.size > 0:
+            initial_index = np.where(self.grid_z == raster_depths.min())[0][0]
+            depth_list = [
+                (ii, d)
+                for ii, d in enumerate(raster_depths, initial_index)
+                if ii < raster_array.shape[2]
+            ]
+        if len(depth_list) == 0:
+            raise ValueError(
+                f"No depth slices between depth_min={depth_min} and "
+                f"depth_max={depth_max}."
+            )
 
         lower_left = self.get_lower_left_corner(
             pad_east, pad_north, shift_east=shift_east, shift_north=shift_north
         )
 
-        raster_fn_list = []
-        for ii, d in enumerate(raster_depths, initial_index):
-            try:
-                raster_fn = save_path.joinpath(
-                    f"{ii:02}_depth_{d:.2f}m_utm_{self.center_point.utm_epsg}.tif".replace(
-                        "-", "m"
-                    )
+        if multiband:
+            index = [ii for ii, _ in depth_list]
+            raster_fn = save_path.joinpath(
+                f"depth_{depth_list[0][1]:.2f}m_to_{depth_list[-1][1]:.2f}m_"
+                f"utm_{self.center_point.utm_epsg}.tif".replace("-", "m")
+            )
+            array2multiband_raster(
+                raster_fn,
+                raster_array[:, :, index],
+                lower_left,
+                cell_size,
+                cell_size,
+                self.center_point.utm_epsg,
+                rotation_angle=rotation_angle,
+                band_descriptions=[
+                    f"{ii:02}_depth_{d:.2f}m" for ii, d in depth_list
+                ],
+                band_tags=[
+                    {"depth_index": ii, "depth": d, "depth_units": "m"}
+                    for ii, d in depth_list
+                ],
+            )
+            if verbose:
+                self._logger.info(
+                    f"Wrote {len(depth_list)} depth slices to {raster_fn}"
                 )
-                array2raster(
-                    raster_fn,
-                    raster_array[:, :, ii],
-                    lower_left,
-                    cell_size,
-                    cell_size,
-                    self.center_point.utm_epsg,
-                    rotation_angle=rotation_angle,
+            return [raster_fn]
+
+        def write_depth(ii, d):
+            raster_fn = save_path.joinpath(
+                f"{ii:02}_depth_{d:.2f}m_utm_{self.center_point.utm_epsg}.tif".replace(
+                    "-", "m"
                 )
-                raster_fn_list.append(raster_fn)
-                if verbose:
-                    self._logger.info(f"Wrote depth index {ii} to {raster_fn}")
-            except IndexError:
-                break
+            )
+            array2raster(
+                raster_fn,
+                raster_array[:, :, ii],
+                lower_left,
+                cell_size,
+                cell_size,
+                self.center_point.utm_epsg,
+                rotation_angle=rotation_angle,
+            )
+            if verbose:
+                self._logger.info(f"Wrote depth index {ii} to {raster_fn}")
+            return raster_fn
 
-        return raster_fn_list
+        n_workers = min(get_n_jobs(n_jobs), len(depth_list))
+        if n_workers > 1:
+            with ThreadPoolExecutor(max_workers=n_workers) as executor:
+                return list(executor.map(write_depth, *zip(*depth_list)))
+
+        return [write_depth(ii, d) for ii, d in depth_list]
 
     def to_conductance_raster(
         self,
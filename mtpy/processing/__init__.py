@@ -24,7 +24,15 @@ MINI_SUMMARY_COLUMNS = [
 ]
 
 from .run_summary import RunSummary
+from .run_summary_cache import RunSummaryCache
 from .kernel_dataset import KernelDataset
 from .aurora.process_aurora import AuroraProcessing
+from .aurora.batch_aurora import AuroraBatchProcessing
 
-__all__ = ["RunSummary", "KernelDataset", "AuroraProcessing"]
+__all__ = [
+    "RunSummary",
+    "RunSummaryCache",
+    "KernelDataset",
+    "AuroraProcessing",
+    "AuroraBatchProcessing",
+]
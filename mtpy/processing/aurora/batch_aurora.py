@@ -0,0 +1,607 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 11:24:52 2026
+
+@author: jpeacock
+
+Batch process a survey with Aurora.
+
+Each job is a local station, an optional remote station and a sample rate.
+Jobs are processed in worker processes with
+:class:`mtpy.processing.aurora.process_aurora.AuroraProcessing`, each worker
+makes its own kernel dataset and config and opens its own read-only MTH5
+handles.  Finished transfer functions are checkpointed to a directory so a
+batch that crashed can be resumed, then merged and saved to the local MTH5
+by the calling process.
+"""
+
+# =============================================================================
+# Imports
+# =============================================================================
+import multiprocessing
+import os
+import pickle
+import sys
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from mth5.helpers import close_open_files
+
+from mtpy.core.mt_data_parallel import dumps, get_n_jobs, use_pool
+from mtpy.processing.run_summary import RunSummary
+from mtpy.processing.kernel_dataset import intersect_intervals
+from mtpy.processing.aurora.process_aurora import (
+    AuroraProcessing,
+    process_kernel_dataset,
+)
+
+try:
+    import resource
+
+    has_resource = True
+except ImportError:
+    has_resource = False
+
+# =============================================================================
+
+JOB_COLUMNS = [
+    "job_id",
+    "local_station_id",
+    "remote_station_id",
+    "sample_rate",
+    "local_mth5_path",
+    "remote_mth5_path",
+]
+
+
+def get_pair_id(local_station_id, remote_station_id):
+    """Get the ID of a local/remote station pair.
+
+    :param local_station_id: Local station.
+    :type local_station_id: str
+    :param remote_station_id: Remote station, can be None.
+    :type remote_station_id: str
+    :return: Pair ID.
+    :rtype: str
+    """
+    if remote_station_id is not None:
+        return f"{local_station_id}_rr_{remote_station_id}"
+    return local_station_id
+
+
+def get_job_id(local_station_id, remote_station_id, sample_rate):
+    """Get the ID of a job, used for the report and checkpoint file names.
+
+    Unlike the processing ID of the kernel dataset the sample rate is not
+    rounded to an integer, so sub-Hz sample rates get their own ID, a
+    sample rate of 0.5 is ``sr0p5``.
+
+    :param local_station_id: Local station.
+    :type local_station_id: str
+    :param remote_station_id: Remote station, can be None.
+    :type remote_station_id: str
+    :param sample_rate: Sample rate.
+    :type sample_rate: float
+    :return: Job ID.
+    :rtype: str
+    """
+    sample_rate = f"{sample_rate:g}".replace(".", "p").replace("-", "m")
+    return (
+        f"{get_pair_id(local_station_id, remote_station_id)}"
+        f"_sr{sample_rate}"
+    )
+
+
+def _get_max_rss():
+    """Peak resident memory of this process in MB, None if not available."""
+    if not has_resource:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, kilobytes everywhere else
+    if sys.platform == "darwin":
+        return max_rss / 1024**2
+    return max_rss / 1024
+
+
+def _process_job(run_summary_df, job):
+    """Process a job in a worker process.
+
+    :param run_summary_df: Run summary without HDF5 references.
+    :type run_summary_df: pd.DataFrame
+    :param job: Row of :meth:`AuroraBatchProcessing.get_jobs`.
+    :type job: dict
+    :return: Pickled transfer function, None if processing failed, and a
+     report with the error, time and peak memory.
+    :rtype: tuple
+    """
+    start = time.perf_counter()
+    mt_obj = None
+    error = None
+    try:
+        ap = AuroraProcessing()
+        ap.local_station_id = job["local_station_id"]
+        ap.local_mth5_path = job["local_mth5_path"]
+        ap.remote_station_id = job["remote_station_id"]
+        ap.remote_mth5_path = job["remote_mth5_path"]
+        ap.run_summary = RunSummary(df=run_summary_df)
+
+        config, kernel_dataset, tf_id = ap._get_processing_job(
+            job["sample_rate"]
+        )
+        mt_obj = dumps(process_kernel_dataset(config, kernel_dataset, tf_id))
+    except Exception as processing_error:
+        error = f"{type(processing_error).__name__}: {processing_error}"
+    finally:
+        close_open_files()
+
+    return mt_obj, {
+        "error": error,
+        "elapsed": time.perf_counter() - start,
+        "max_rss_mb": _get_max_rss(),
+    }
+
+
+def _iter_job_results(run_summary_df, jobs, max_workers):
+    """Process jobs in spawned worker processes that each run one job.
+
+    Each job gets its own single worker :class:`ProcessPoolExecutor` with at
+    most `max_workers` running at once.  The worker exits once its job is
+    done, and a worker that is killed, for example by the out of memory
+    killer, raises :class:`BrokenProcessPool` for its own job only.
+
+    :param run_summary_df: Run summary without HDF5 references.
+    :type run_summary_df: pd.DataFrame
+    :param jobs: Rows of :meth:`AuroraBatchProcessing.get_jobs`.
+    :type jobs: list
+    :param max_workers: Number of worker processes.
+    :type max_workers: int
+    :return: Generator of (job, result) as jobs finish, result is from
+     :func:`_process_job`.
+    :rtype: generator
+    """
+    mp_context = multiprocessing.get_context("spawn")
+    pending = deque(jobs)
+    running = {}
+    try:
+        while pending or running:
+            while pending and len(running) < max_workers:
+                job = pending.popleft()
+                pool = ProcessPoolExecutor(
+                    max_workers=1, mp_context=mp_context
+                )
+                future = pool.submit(_process_job, run_summary_df, job)
+                running[future] = (job, pool)
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                job, pool = running.pop(future)
+                pool.shutdown()
+                try:
+                    result = future.result()
+                except Exception as error:
+                    result = (
+                        None,
+                        {"error": f"{type(error).__name__}: {error}"},
+                    )
+                yield job, result
+    finally:
+        for future, (job, pool) in running.items():
+            future.cancel()
+            pool.shutdown()
+
+
+class AuroraBatchProcessing:
+    """Process every station of a survey with Aurora.
+
+    .. code-block:: python
+
+        from mtpy.processing import RunSummary
+        from mtpy.processing.aurora.batch_aurora import AuroraBatchProcessing
+
+        run_summary = RunSummary()
+        run_summary.from_mth5s(["/path/to/survey.h5"])
+
+        batch = AuroraBatchProcessing(
+            run_summary, checkpoint_dir="/path/to/checkpoints"
+        )
+
+        # each station with the remote it overlaps most, at every sample rate
+        jobs = batch.get_jobs()
+
+        # 8 jobs at a time, run again with the same checkpoint_dir to resume
+        processed = batch.process(jobs, n_jobs=8)
+        batch.report
+
+    """
+
+    def __init__(self, run_summary=None, checkpoint_dir=None):
+        self.logger = logger
+        self.run_summary = run_summary
+        self.checkpoint_dir = checkpoint_dir
+        self.report = None
+
+    def __str__(self):
+        lines = ["Aurora Batch Processing"]
+        if self.run_summary is not None:
+            lines.append(
+                f"\tstations:     {self.run_summary.df.station.nunique()}"
+            )
+            lines.append(
+                f"\tsample rates: {self.run_summary.df.sample_rate.unique()}"
+            )
+        lines.append(f"\tcheckpoints:  {self.checkpoint_dir}")
+        return "\n".join(lines)
+
+    def __repr__(self):
+        return self.__str__()
+
+    @property
+    def run_summary(self):
+        """Run summary of the survey.
+
+        :return: Run summary.
+        :rtype: :class:`mtpy.processing.RunSummary`
+        """
+        return self._run_summary
+
+    @run_summary.setter
+    def run_summary(self, value):
+        """Set run summary from a RunSummary or data frame."""
+        if value is None:
+            self._run_summary = None
+        elif isinstance(value, pd.DataFrame):
+            self._run_summary = RunSummary(df=value)
+        else:
+            self._run_summary = RunSummary(df=value.df)
+
+    @property
+    def checkpoint_dir(self):
+        """Directory to save finished transfer functions to, None to not
+        checkpoint.
+        """
+        return self._checkpoint_dir
+
+    @checkpoint_dir.setter
+    def checkpoint_dir(self, value):
+        """Set checkpoint directory."""
+        if value is None:
+            self._checkpoint_dir = None
+        else:
+            self._checkpoint_dir = Path(value)
+
+    def _get_run_summary_df(self):
+        """Run summary data frame without HDF5 references, which cannot be
+        pickled and are only valid for the file handle that made them.
+        """
+        if self.run_summary is None:
+            raise ValueError("run_summary has not been set.")
+        df = self.run_summary.df.copy()
+        for column in ["run_hdf5_reference", "station_hdf5_reference"]:
+            if column in df.columns:
+                df[column] = None
+        return df
+
+    def get_remote_station(self, local_station_id, sample_rate):
+        """Get the station that is recording at the same time as the local
+        station for the longest.
+
+        :param local_station_id: Local station.
+        :type local_station_id: str
+        :param sample_rate: Sample rate.
+        :type sample_rate: float
+        :return: Remote station, None if no station overlaps.
+        :rtype: str or None
+        """
+        df = self.run_summary.df.loc[
+            self.run_summary.df.sample_rate == sample_rate
+        ]
+        start = pd.to_datetime(df.start).values
+        end = pd.to_datetime(df.end).values
+        is_local = (df.station == local_station_id).to_numpy()
+
+        remote_station_id = None
+        max_overlap = np.timedelta64(0, "ns")
+        for station_id in sorted(df.station.unique()):
+            if station_id == local_station_id:
+                continue
+            is_remote = (df.station == station_id).to_numpy()
+            _, olap_start, olap_end = intersect_intervals(
+                [start[is_local], start[is_remote]],
+                [end[is_local], end[is_remote]],
+            )
+            overlap = (olap_end - olap_start).sum()
+            if overlap > max_overlap:
+                max_overlap = overlap
+                remote_station_id = station_id
+        return remote_station_id
+
+    def get_jobs(
+        self, station_pairs=None, sample_rates=None, remote_reference=True
+    ):
+        """Get the jobs to process.
+
+        :param station_pairs: List of (local, remote) station pairs, remote
+         can be None, defaults to None which is every station in the run
+         summary.
+        :type station_pairs: list of tuple, optional
+        :param sample_rates: Sample rates to process, defaults to None which
+         is every sample rate in the run summary.
+        :type sample_rates: float or list, optional
+        :param remote_reference: If station_pairs is None, use the station
+         that overlaps each local station the most as the remote, defaults
+         to True.
+        :type remote_reference: bool, optional
+        :return: One row per job with columns `JOB_COLUMNS`.
+        :rtype: pd.DataFrame
+        """
+        if self.run_summary is None:
+            raise ValueError("run_summary has not been set.")
+        df = self.run_summary.df
+
+        if sample_rates is None:
+            sample_rates = sorted(df.sample_rate.unique())
+        elif isinstance(sample_rates, (int, float)):
+            sample_rates = [sample_rates]
+
+        mth5_paths = dict(
+            df.groupby("station").mth5_path.first().astype(str).items()
+        )
+
+        jobs = []
+        for sample_rate in sample_rates:
+            stations = df.loc[df.sample_rate == sample_rate].station.unique()
+            if station_pairs is None:
+                pairs = []
+                for station_id in sorted(stations):
+                    remote_station_id = None
+                    if remote_reference:
+                        remote_station_id = self.get_remote_station(
+                            station_id, sample_rate
+                        )
+                    pairs.append((station_id, remote_station_id))
+            else:
+                pairs = station_pairs
+
+            for local_station_id, remote_station_id in pairs:
+                if local_station_id not in stations or (
+                    remote_station_id is not None
+                    and remote_station_id not in stations
+                ):
+                    self.logger.debug(
+                        f"Skipping {local_station_id}, {remote_station_id} "
+                        f"no data at sample rate {sample_rate}"
+                    )
+                    continue
+                jobs.append(
+                    {
+                        "job_id": get_job_id(
+                            local_station_id, remote_station_id, sample_rate
+                        ),
+                        "local_station_id": local_station_id,
+                        "remote_station_id": remote_station_id,
+                        "sample_rate": sample_rate,
+                        "local_mth5_path": mth5_paths[local_station_id],
+                        "remote_mth5_path": mth5_paths.get(remote_station_id),
+                    }
+                )
+
+        return pd.DataFrame(jobs, columns=JOB_COLUMNS)
+
+    def get_checkpoint_fn(self, job_id):
+        """Get the checkpoint file of a job.
+
+        :param job_id: Job ID.
+        :type job_id: str
+        :return: Checkpoint file, None if checkpoint_dir is not set.
+        :rtype: Path or None
+        """
+        if self.checkpoint_dir is None:
+            return None
+        return self.checkpoint_dir.joinpath(f"{job_id}.pkl")
+
+    def _write_checkpoint(self, job_id, mt_obj):
+        """Write a pickled transfer function to the checkpoint directory."""
+        checkpoint_fn = self.get_checkpoint_fn(job_id)
+        if checkpoint_fn is None:
+            return
+        self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
+
+        # write to a temporary file then move so a half written file is
+        # never read when resuming
+        with tempfile.NamedTemporaryFile(
+            dir=self.checkpoint_dir, suffix=".tmp", delete=False
+        ) as tmp:
+            tmp.write(mt_obj)
+        os.replace(tmp.name, checkpoint_fn)
+
+    def _read_checkpoint(self, job_id):
+        """Read a transfer function from the checkpoint directory, None if
+        there is not one.
+        """
+        checkpoint_fn = self.get_checkpoint_fn(job_id)
+        if checkpoint_fn is None or not checkpoint_fn.is_file():
+            return None
+        try:
+            with open(checkpoint_fn, "rb") as fid:
+                return pickle.load(fid)
+        except Exception as error:
+            self.logger.warning(
+                f"Could not read checkpoint {checkpoint_fn}, reprocessing. "
+                f"{error}"
+            )
+            return None
+
+    def process(
+        self,
+        jobs=None,
+        n_jobs=None,
+        merge=True,
+        save_to_mth5=True,
+        resume=True,
+    ):
+        """Process jobs.
+
+        Jobs are sent to a process pool with at most `n_jobs` workers.  Each
+        worker process only runs one job so the peak memory in the report is
+        for that job, a worker that dies is reported as a failed job, see
+        :func:`_iter_job_results`.  Workers are started with the spawn
+        method, so scripts that call this need an
+        ``if __name__ == "__main__":`` guard.  With
+        `n_jobs=None` jobs are processed in this process and the peak memory
+        is for this process.
+
+        Once all jobs are finished the sample rates of each local/remote pair
+        are merged and saved to the local MTH5, see
+        :meth:`AuroraProcessing.process`.
+
+        :param jobs: Jobs from :meth:`get_jobs`, defaults to None which is
+         :meth:`get_jobs` with default arguments.
+        :type jobs: pd.DataFrame, optional
+        :param n_jobs: Number of worker processes, -1 uses all CPUs,
+         defaults to None.
+        :type n_jobs: int, optional
+        :param merge: [ True | False ] merge the sample rates of each pair,
+         defaults to True
+        :type merge: bool, optional
+        :param save_to_mth5: [ True | False ] save transfer functions to the
+         local MTH5, defaults to True
+        :type save_to_mth5: bool, optional
+        :param resume: [ True | False ] use transfer functions in the
+         checkpoint directory instead of processing again, defaults to True
+        :type resume: bool, optional
+        :return: Processed dictionary of each pair, keyed by the job ID
+         without the sample rate, see :meth:`AuroraProcessing.process`.
+        :rtype: dict
+        """
+        if jobs is None:
+            jobs = self.get_jobs()
+        job_list = jobs[JOB_COLUMNS].to_dict("records")
+        for job in job_list:
+            for key in ["remote_station_id", "remote_mth5_path"]:
+                if pd.isna(job[key]):
+                    job[key] = None
+
+        mt_objs = {}
+        report = dict(
+            [
+                (
+                    job["job_id"],
+                    {
+                        "status": "pending",
+                        "error": None,
+                        "elapsed": np.nan,
+                        "max_rss_mb": np.nan,
+                    },
+                )
+                for job in job_list
+            ]
+        )
+
+        to_process = []
+        for job in job_list:
+            mt_obj = None
+            if resume:
+                mt_obj = self._read_checkpoint(job["job_id"])
+            if mt_obj is not None:
+                mt_objs[job["job_id"]] = mt_obj
+                report[job["job_id"]]["status"] = "checkpoint"
+            else:
+                to_process.append(job)
+
+        self.logger.info(
+            f"Processing {len(to_process)} of {len(job_list)} jobs, "
+            f"{len(job_list) - len(to_process)} from checkpoints"
+        )
+
+        def finish(job, result):
+            """Record the result of a job."""
+            pickled_mt_obj, job_report = result
+            report[job["job_id"]].update(job_report)
+            if pickled_mt_obj is None:
+                report[job["job_id"]]["status"] = "failed"
+                self.logger.error(
+                    f"Job {job['job_id']} failed: {job_report['error']}"
+                )
+                return
+            report[job["job_id"]]["status"] = "processed"
+            self._write_checkpoint(job["job_id"], pickled_mt_obj)
+            mt_objs[job["job_id"]] = pickle.loads(pickled_mt_obj)
+            self.logger.info(
+                f"Processed {job['job_id']} in {job_report['elapsed']:.1f} s"
+            )
+
+        if len(to_process) > 0:
+            run_summary_df = self._get_run_summary_df()
+            if use_pool(n_jobs):
+                for job, result in _iter_job_results(
+                    run_summary_df,
+                    to_process,
+                    min(get_n_jobs(n_jobs), len(to_process)),
+                ):
+                    finish(job, result)
+            else:
+                for job in to_process:
+                    finish(job, _process_job(run_summary_df, job))
+
+        self.report = pd.DataFrame(
+            [dict(job, **report[job["job_id"]]) for job in job_list]
+        )
+        if self.checkpoint_dir is not None:
+            self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
+            self.report.to_csv(
+                self.checkpoint_dir.joinpath("batch_report.csv"), index=False
+            )
+
+        return self._merge_and_save(
+            job_list, mt_objs, merge=merge, save_to_mth5=save_to_mth5
+        )
+
+    def _merge_and_save(
+        self, job_list, mt_objs, merge=True, save_to_mth5=True
+    ):
+        """Merge the sample rates of each local/remote pair and save to the
+        local MTH5 with :meth:`AuroraProcessing._merge_and_save`.
+        """
+        pairs = {}
+        for job in job_list:
+            pair_id = get_pair_id(
+                job["local_station_id"], job["remote_station_id"]
+            )
+            if pair_id not in pairs:
+                pairs[pair_id] = {"job": job, "tf_processed": {}}
+            mt_obj = mt_objs.get(job["job_id"])
+            pairs[pair_id]["tf_processed"][job["sample_rate"]] = {
+                "processed": mt_obj is not None,
+                "tf": mt_obj,
+            }
+
+        processed = {}
+        for pair_id, pair in pairs.items():
+            if not any(
+                p_dict["processed"] for p_dict in pair["tf_processed"].values()
+            ):
+                self.logger.error(
+                    f"No transfer functions processed for {pair_id}"
+                )
+                continue
+            job = pair["job"]
+            try:
+                ap = AuroraProcessing()
+                ap.local_station_id = job["local_station_id"]
+                ap.local_mth5_path = job["local_mth5_path"]
+                ap.remote_station_id = job["remote_station_id"]
+                ap.remote_mth5_path = job["remote_mth5_path"]
+                processed[pair_id] = ap._merge_and_save(
+                    pair["tf_processed"],
+                    merge=merge,
+                    save_to_mth5=save_to_mth5,
+                )
+            except (OSError, ValueError) as error:
+                self.logger.error(f"Could not merge {pair_id}: {error}")
+        return processed
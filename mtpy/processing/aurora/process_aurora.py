@@ -8,7 +8,9 @@ Created on Tue Jul 30 17:11:42 2024
 # =============================================================================
 # Imports
 # =============================================================================
+import pickle
 import warnings
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from loguru import logger
 import pandas as pd
@@ -24,6 +26,7 @@ from mth5.mth5 import MTH5
 from mt_metadata.utils.mttime import MTime
 
 from mtpy import MT
+from mtpy.core.mt_data_parallel import dumps, get_n_jobs, use_pool
 from mtpy.processing.kernel_dataset import KernelDataset
 from mtpy.processing.base import BaseProcessing
 
@@ -31,6 +34,74 @@ warnings.filterwarnings("ignore")
 # =============================================================================
 
 
+def process_kernel_dataset(config, kernel_dataset, tf_id=None):
+    """Process a kernel dataset with Aurora.
+
+    :param config: Aurora configuration.
+    :type config: aurora.config.metadata.Processing
+    :param kernel_dataset: Kernel dataset to define what data to process.
+    :type kernel_dataset: mtpy.processing.KernelDataset
+    :param tf_id: Transfer function ID, defaults to None.
+    :type tf_id: str, optional
+    :return: transfer function
+    :rtype: mtpy.MT
+
+    """
+    tf_obj = process_mth5(config, kernel_dataset)
+    tf_obj.tf_id = tf_id
+
+    # copy to an MT object
+    mt_obj = MT(survey_metadata=tf_obj.survey_metadata)
+    mt_obj.channel_nomenclature = tf_obj.channel_nomenclature
+    mt_obj._transfer_function = tf_obj._transfer_function
+
+    return mt_obj
+
+
+def _drop_hdf5_references(kernel_dataset):
+    """Copy a kernel dataset without HDF5 references.
+
+    References are only valid for the file handle that made them and cannot
+    be pickled, run references are filled in again when a worker initializes
+    the dataframe for processing.
+
+    :param kernel_dataset: Kernel dataset.
+    :type kernel_dataset: mtpy.processing.KernelDataset
+    :return: Copy of the kernel dataset with references set to None.
+    :rtype: mtpy.processing.KernelDataset
+    """
+    kernel_dataset = kernel_dataset.clone()
+    for column in ["run_hdf5_reference", "station_hdf5_reference"]:
+        if column in kernel_dataset.df.columns:
+            kernel_dataset.df[column] = None
+    return kernel_dataset
+
+
+def _process_kernel_dataset_worker(config, kernel_dataset, tf_id):
+    """Process a kernel dataset in a worker process.
+
+    The worker opens its own MTH5 handles, the configuration and transfer
+    function are sent as pickles made with
+    :func:`mtpy.core.mt_data_parallel.dumps`.
+
+    :param config: Pickled Aurora configuration.
+    :type config: bytes
+    :param kernel_dataset: Kernel dataset to define what data to process.
+    :type kernel_dataset: mtpy.processing.KernelDataset
+    :param tf_id: Transfer function ID.
+    :type tf_id: str
+    :return: Pickled transfer function.
+    :rtype: bytes
+    """
+    try:
+        mt_obj = process_kernel_dataset(
+            pickle.loads(config), kernel_dataset, tf_id
+        )
+    finally:
+        close_open_files()
+    return dumps(mt_obj)
+
+
 class AuroraProcessing(BaseProcessing):
     """Convenience class to process with Aurora
 
@@ -204,11 +275,11 @@ class AuroraProcessing(BaseProcessing):
         )
         return self.clone()
 
-    def process_single_sample_rate(
+    def _get_processing_job(
         self, sample_rate, config=None, kernel_dataset=None
     ):
-        """
-        Process a single sample rate
+        """Get the configuration, kernel dataset and transfer function ID
+        to process a single sample rate.
 
         :param sample_rate: sample rate of time series data
         :type sample_rate: float
@@ -217,11 +288,10 @@ class AuroraProcessing(BaseProcessing):
         :param kernel_dataset: Kerenel dataset to define what data to process,
           defaults to None
         :type kernel_dataset: mtpy.processing.KernelDataset, optional
-        :return: transfer function
-        :rtype: mtpy.MT
+        :return: config, kernel dataset and transfer function ID
+        :rtype: tuple
 
         """
-
         if kernel_dataset is None:
             kernel_dataset = self.create_kernel_dataset(
                 local_station_id=self.local_station_id,
@@ -231,22 +301,115 @@ class AuroraProcessing(BaseProcessing):
         if config is None:
             config = self.create_config(kernel_dataset=kernel_dataset)
 
+        return config, kernel_dataset, self.processing_id
+
+    def _run_processing_job(self, sample_rate, config, kernel_dataset, tf_id):
+        """Process a job from `_get_processing_job`, returns None if
+        processing fails.
+        """
         try:
-            tf_obj = process_mth5(config, kernel_dataset)
+            return process_kernel_dataset(config, kernel_dataset, tf_id)
         except Exception as error:
             close_open_files()
             logger.exception(error)
             logger.error(f"Skipping sample_rate {sample_rate}")
             return
 
-        tf_obj.tf_id = self.processing_id
+    def _run_processing_jobs_in_pool(self, jobs, n_jobs=None, executor=None):
+        """Process jobs from `_get_processing_job` in worker processes.
+
+        Each worker opens its own read-only MTH5 handles.  Jobs that save
+        Fourier coefficients open the MTH5 in append mode, so they are
+        processed in this process before any jobs are submitted to the
+        workers.
+
+        :param jobs: Jobs keyed by sample rate.
+        :type jobs: dict
+        :param n_jobs: Number of workers, defaults to None.
+        :type n_jobs: int, optional
+        :param executor: Executor to use, it is left open, defaults to None.
+        :type executor: :class:`concurrent.futures.Executor`, optional
+        :return: Transfer function for each sample rate, None if processing
+         failed.
+        :rtype: dict
+
+        """
+        pool_jobs = dict(
+            [
+                (key, job)
+                for key, job in jobs.items()
+                if not job[0].decimations[0].save_fcs
+            ]
+        )
 
-        # copy to an MT object
-        mt_obj = MT(survey_metadata=tf_obj.survey_metadata)
-        mt_obj.channel_nomenclature = tf_obj.channel_nomenclature
-        mt_obj._transfer_function = tf_obj._transfer_function
+        mt_objs = dict([(key, None) for key in jobs.keys()])
+        # append mode cannot be opened while workers hold read handles
+        for key, job in jobs.items():
+            if key not in pool_jobs:
+                logger.info(
+                    f"Sample rate {key} saves FCs to the MTH5, "
+                    "processing in this process."
+                )
+                mt_objs[key] = self._run_processing_job(key, *job)
 
-        return mt_obj
+        if len(pool_jobs) == 0:
+            return mt_objs
+
+        pool = executor
+        if pool is None:
+            pool = ProcessPoolExecutor(
+                max_workers=min(get_n_jobs(n_jobs), len(pool_jobs))
+            )
+        futures = {}
+        try:
+            for key, (config, kernel_dataset, tf_id) in pool_jobs.items():
+                futures[key] = pool.submit(
+                    _process_kernel_dataset_worker,
+                    dumps(config),
+                    _drop_hdf5_references(kernel_dataset),
+                    tf_id,
+                )
+
+            for key, future in futures.items():
+                try:
+                    mt_objs[key] = pickle.loads(future.result())
+                except Exception as error:
+                    logger.exception(error)
+                    logger.error(f"Skipping sample_rate {key}")
+        finally:
+            if executor is None:
+                # cancel by hand, shutdown(cancel_futures=True) needs
+                # python >= 3.9
+                for future in futures.values():
+                    future.cancel()
+                pool.shutdown()
+
+        return mt_objs
+
+    def process_single_sample_rate(
+        self, sample_rate, config=None, kernel_dataset=None
+    ):
+        """
+        Process a single sample rate
+
+        :param sample_rate: sample rate of time series data
+        :type sample_rate: float
+        :param config: configuration file, defaults to None
+        :type config: aurora.config, optional
+        :param kernel_dataset: Kerenel dataset to define what data to process,
+          defaults to None
+        :type kernel_dataset: mtpy.processing.KernelDataset, optional
+        :return: transfer function
+        :rtype: mtpy.MT
+
+        """
+
+        return self._run_processing_job(
+            sample_rate,
+            *self._get_processing_job(
+                sample_rate, config=config, kernel_dataset=kernel_dataset
+            ),
+        )
 
     def process(
         self,
@@ -254,6 +417,8 @@ class AuroraProcessing(BaseProcessing):
         processing_dict=None,
         merge=True,
         save_to_mth5=True,
+        n_jobs=None,
+        executor=None,
     ):
         """
         Need to either provide a list of sample rates to process or
@@ -281,6 +446,11 @@ class AuroraProcessing(BaseProcessing):
         If `save_to_mth5` is True then the transfer functions are saved to
         the local MTH5.
 
+        If `n_jobs` or `executor` is set each sample rate is processed in a
+        worker process.  Kernel datasets and configs are made first in this
+        process, the workers open their own read-only MTH5 handles and the
+        transfer functions are merged and saved to the local MTH5 here.
+
 
         :param sample_rates: list of sample rates to process, defaults to None
         :type sample_rates: float or list, optional
@@ -293,6 +463,12 @@ class AuroraProcessing(BaseProcessing):
         :param save_to_mth5: [ True | False ] save transfer functions to the
          local MTH5, defaults to True
         :type save_to_mth5: TYPE, optional
+        :param n_jobs: number of worker processes, -1 uses all CPUs,
+         defaults to None which processes each sample rate in turn
+        :type n_jobs: int, optional
+        :param executor: executor to submit sample rates to, it is left open,
+         defaults to None
+        :type executor: :class:`concurrent.futures.Executor`, optional
         :raises ValueError: If neither sample rates nor processing dict are
          provided
         :raises TypeError: If the provided processing dictionary is not
@@ -323,8 +499,21 @@ class AuroraProcessing(BaseProcessing):
                 [(sr, {"processed": False, "tf": None}) for sr in sample_rates]
             )
 
-            for sr in sample_rates:
-                mt_obj = self.process_single_sample_rate(sr)
+            if use_pool(n_jobs, executor):
+                jobs = dict(
+                    [(sr, self._get_processing_job(sr)) for sr in sample_rates]
+                )
+                mt_objs = self._run_processing_jobs_in_pool(
+                    jobs, n_jobs=n_jobs, executor=executor
+                )
+            else:
+                mt_objs = dict(
+                    [
+                        (sr, self.process_single_sample_rate(sr))
+                        for sr in sample_rates
+                    ]
+                )
+            for sr, mt_obj in mt_objs.items():
                 if mt_obj is not None:
                     tf_processed[sr]["processed"] = True
                     tf_processed[sr]["tf"] = mt_obj
@@ -337,18 +526,58 @@ class AuroraProcessing(BaseProcessing):
                     for sr in processing_dict.keys()
                 ]
             )
-            for key, pdict in processing_dict.items():
-                mt_obj = self.process_single_sample_rate(
-                    key,
-                    config=pdict["config"],
-                    kernel_dataset=pdict["kernel_dataset"],
+            jobs = dict(
+                [
+                    (
+                        key,
+                        self._get_processing_job(
+                            key,
+                            config=pdict["config"],
+                            kernel_dataset=pdict["kernel_dataset"],
+                        ),
+                    )
+                    for key, pdict in processing_dict.items()
+                ]
+            )
+            if use_pool(n_jobs, executor):
+                mt_objs = self._run_processing_jobs_in_pool(
+                    jobs, n_jobs=n_jobs, executor=executor
                 )
+            else:
+                mt_objs = dict(
+                    [
+                        (key, self._run_processing_job(key, *job))
+                        for key, job in jobs.items()
+                    ]
+                )
+            for key, mt_obj in mt_objs.items():
                 if mt_obj is not None:
                     tf_processed[key][
                         "processed"
                     ] = mt_obj.has_transfer_function()
                     tf_processed[key]["tf"] = mt_obj
 
+        return self._merge_and_save(
+            tf_processed, merge=merge, save_to_mth5=save_to_mth5
+        )
+
+    def _merge_and_save(self, tf_processed, merge=True, save_to_mth5=True):
+        """Merge processed sample rates and save them to the local MTH5.
+
+        :param tf_processed: dictionary of each sample rate processed in the
+         form of {sample_rate: {'processed': bool, 'tf': MT}}
+        :type tf_processed: dict
+        :param merge: [ True | False ] True merges all sample rates into a
+         single transfer function according to the merge_dict, defaults to True
+        :type merge: bool, optional
+        :param save_to_mth5: [ True | False ] save transfer functions to the
+         local MTH5, defaults to True
+        :type save_to_mth5: bool, optional
+        :return: dictionary of processed sample rates, with 'combined' if
+         merged
+        :rtype: dict
+
+        """
         processed = self._validate_tf_processed_dict(tf_processed)
         if len(processed.keys()) > 1:
             if merge:
@@ -19,6 +19,8 @@ class BaseProcessing(KernelDataset):
     """Base processing class contains path to various files."""
 
     def __init__(self, **kwargs):
+        # RunSummaryCache used when getting the run summary
+        self.summary_cache = None
         super().__init__(**kwargs)
 
         self.config = None
@@ -73,7 +75,7 @@ class BaseProcessing(KernelDataset):
         """
 
         run_summary = RunSummary()
-        run_summary.from_mth5s(self.mth5_list)
+        run_summary.from_mth5s(self.mth5_list, cache=self.summary_cache)
         return run_summary
 
     def has_run_summary(self):
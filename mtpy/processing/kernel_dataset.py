@@ -55,6 +55,7 @@ from pathlib import Path
 import copy
 from typing import Optional, Union
 
+import numpy as np
 import pandas as pd
 from loguru import logger
 
@@ -669,47 +670,27 @@ class KernelDataset:
     def restrict_run_intervals_to_simultaneous(self, df: pd.DataFrame) -> None:
         """For each run in local_station_id check if it has overlap with other runs
 
-        There is room for optimization here
+        The overlaps are found with :func:`intersect_intervals` on the start
+        and end columns, rows are ordered by local run then remote run.
 
         Note that you can wind up splitting runs here.  For example, in that case where
         local is running continuously, but remote is intermittent.  Then the local
         run may break into several chunks..
         :rtype: None
         """
-        local_df = df[df.station == self.local_station_id]
-        remote_df = df[df.station == self.remote_station_id]
-        output_sub_runs = []
-        for i_local, local_row in local_df.iterrows():
-            for i_remote, remote_row in remote_df.iterrows():
-                if intervals_overlap(
-                    local_row.start,
-                    local_row.end,
-                    remote_row.start,
-                    remote_row.end,
-                ):
-                    # print(f"OVERLAP {i_local}, {i_remote}")
-                    olap_start, olap_end = overlap(
-                        local_row.start,
-                        local_row.end,
-                        remote_row.start,
-                        remote_row.end,
-                    )
+        station_ids = [self.local_station_id, self.remote_station_id]
+        station_index = [
+            np.flatnonzero((df.station == station_id).to_numpy())
+            for station_id in station_ids
+        ]
+        start = df.start.values
+        end = df.end.values
+        index, olap_start, olap_end = intersect_intervals(
+            [start[s_index] for s_index in station_index],
+            [end[s_index] for s_index in station_index],
+        )
 
-                    local_sub_run = local_row.copy(deep=True)
-                    remote_sub_run = remote_row.copy(deep=True)
-                    local_sub_run.start = olap_start
-                    local_sub_run.end = olap_end
-                    remote_sub_run.start = olap_start
-                    remote_sub_run.end = olap_end
-                    output_sub_runs.append(local_sub_run)
-                    output_sub_runs.append(remote_sub_run)
-                else:
-                    pass
-                    # print(f"NOVERLAP {i_local}, {i_remote}")
-        new_df = pd.DataFrame(output_sub_runs)
-        new_df = new_df.reset_index(drop=True)
-
-        if new_df.empty:
+        if index.size == 0:
             msg = (
                 f"Local: {self.local_station_id} and "
                 f"remote: {self.remote_station_id} do "
@@ -718,6 +699,18 @@ class KernelDataset:
             logger.error(msg)
             raise ValueError(msg)
 
+        # one row per station for each overlap, local first
+        rows = np.column_stack(
+            [s_index[index[:, ii]] for ii, s_index in enumerate(station_index)]
+        ).ravel()
+        new_df = df.iloc[rows].reset_index(drop=True)
+        new_df["start"] = _from_datetime64(
+            np.repeat(olap_start, len(station_ids)), df.start.dt.tz
+        )
+        new_df["end"] = _from_datetime64(
+            np.repeat(olap_end, len(station_ids)), df.end.dt.tz
+        )
+
         return new_df
 
     def get_station_metadata(
@@ -730,6 +723,10 @@ class KernelDataset:
           update_survey_metadata() method. Delete if unused. If used fill out doc:
         "Helper function for archiving the TF -- returns an object we can use to populate
         station metadata in the _____"
+
+        Needs the HDF5 references, which are filled in by
+        :meth:`initialize_dataframe_for_processing` if the run summary came
+        from a :class:`mtpy.processing.RunSummaryCache`.
         :param local_station_id: The name of the local station.
         :type local_station_id: str
         :rtype: mt_metadata.timeseries.Station
@@ -743,8 +740,10 @@ class KernelDataset:
         run_ids = sub_df.run.unique()
         assert len(run_ids) == len(sub_df)
 
-        station_metadata = sub_df.mth5_obj[0].from_reference(
-            sub_df.station_hdf5_reference[0]
+        station_metadata = (
+            sub_df.mth5_obj.iloc[0]
+            .from_reference(sub_df.station_hdf5_reference.iloc[0])
+            .metadata
         )
         station_metadata.runs = ListDict()
         for i, row in sub_df.iterrows():
@@ -859,7 +858,8 @@ class KernelDataset:
     def initialize_dataframe_for_processing(self) -> None:
         """Adds extra columns needed for processing to the dataframe.
 
-        Populates them with mth5 objects, run_hdf5_reference, and xr.Datasets.
+        Populates them with mth5 objects, run_hdf5_reference,
+        station_hdf5_reference, and xr.Datasets.
 
         Development Notes:
         Note #1: When assigning xarrays to dataframe cells, df dislikes xr.Dataset,
@@ -884,6 +884,11 @@ class KernelDataset:
                 row.station, row.run, survey=row.survey
             )
             self.df["run_hdf5_reference"].at[i] = run_obj.hdf5_group.ref
+            # summaries from a RunSummaryCache have no references, the run
+            # group is in the station group
+            if "station_hdf5_reference" in self.df.columns:
+                station_group = run_obj.hdf5_group.parent
+                self.df["station_hdf5_reference"].at[i] = station_group.ref
 
             if row.fc:
                 msg = f"row {row} already has fcs prescribed by processing config"
@@ -1068,3 +1073,97 @@ def overlap(
         return t1_start, t1_end
     else:
         return None, None
+
+
+def _intersect_interval_pairs(
+    start1: np.ndarray,
+    end1: np.ndarray,
+    start2: np.ndarray,
+    end2: np.ndarray,
+) -> tuple:
+    """Find all pairs of overlapping intervals between two sets of intervals.
+
+    Intervals are closed, touching intervals overlap, same as
+    :func:`intervals_overlap`.  Set 2 is sorted by start time and for each
+    interval in set 1 the candidates are found with a binary search,
+    everything before the first candidate ends before the interval starts
+    and everything after the last candidate starts after the interval ends.
+
+    :param start1: Start times of set 1.
+    :type start1: np.ndarray
+    :param end1: End times of set 1.
+    :type end1: np.ndarray
+    :param start2: Start times of set 2.
+    :type start2: np.ndarray
+    :param end2: End times of set 2.
+    :type end2: np.ndarray
+    :return: Index into set 1 and index into set 2 of each overlapping pair,
+     sorted by index 1 then index 2.
+    :rtype: tuple
+    """
+    order = np.argsort(start2, kind="stable")
+    # running maximum of the end times is sorted, so intervals before `lo`
+    # all end before the start of the interval in set 1.
+    lo = np.searchsorted(
+        np.maximum.accumulate(end2[order]), start1, side="left"
+    )
+    hi = np.searchsorted(start2[order], end1, side="right")
+    counts = np.clip(hi - lo, 0, None)
+
+    index1 = np.repeat(np.arange(start1.size), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(
+        np.cumsum(counts) - counts, counts
+    )
+    index2 = order[np.repeat(lo, counts) + offsets]
+
+    keep = end2[index2] >= start1[index1]
+    index1 = index1[keep]
+    index2 = index2[keep]
+    pair_order = np.lexsort((index2, index1))
+    return index1[pair_order], index2[pair_order]
+
+
+def intersect_intervals(starts: list, ends: list) -> tuple:
+    """Intersect N sets of time intervals.
+
+    Finds every combination of one interval from each set where all of the
+    intervals overlap, for example the runs of a local station and the runs
+    of one or more remote stations.  Intervals are closed, same as
+    :func:`intervals_overlap`.
+
+    :param starts: Start times for each set of intervals.
+    :type starts: list of np.ndarray of datetime64
+    :param ends: End times for each set of intervals.
+    :type ends: list of np.ndarray of datetime64
+    :return index, start, end: Array of shape (n_overlaps, n_sets) of the
+     index into each set, and start and end times of each overlap.  Rows are
+     sorted by the index of the first set, then the second set, etc.
+    :rtype index, start, end: tuple
+    """
+    if len(starts) != len(ends):
+        raise ValueError("starts and ends must have the same length")
+    if len(starts) == 0:
+        raise ValueError("Need at least one set of intervals")
+
+    start = np.asarray(starts[0])
+    end = np.asarray(ends[0])
+    index = np.arange(start.size)[:, np.newaxis]
+    for set_start, set_end in zip(starts[1:], ends[1:]):
+        set_start = np.asarray(set_start)
+        set_end = np.asarray(set_end)
+        index1, index2 = _intersect_interval_pairs(
+            start, end, set_start, set_end
+        )
+        index = np.column_stack([index[index1], index2])
+        start = np.maximum(start[index1], set_start[index2])
+        end = np.minimum(end[index1], set_end[index2])
+
+    return index, start, end
+
+
+def _from_datetime64(values: np.ndarray, tz=None) -> pd.DatetimeIndex:
+    """Convert datetime64 values (UTC if tz is set) to a DatetimeIndex."""
+    values = pd.DatetimeIndex(values)
+    if tz is not None:
+        values = values.tz_localize("UTC").tz_convert(tz)
+    return values
@@ -40,11 +40,13 @@ Development Notes:
 # Imports
 # =============================================================================
 import copy
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Union
 
 import pandas as pd
 from loguru import logger
 
+from mtpy.core.mt_data_parallel import get_n_jobs
 from mtpy.processing import RUN_SUMMARY_COLUMNS, MINI_SUMMARY_COLUMNS
 
 import mth5
@@ -133,11 +135,23 @@ class RunSummary:
         """
         return copy.deepcopy(self)
 
-    def from_mth5s(self, mth5_list) -> list:
+    def from_mth5s(self, mth5_list, cache=None, n_jobs=None) -> list:
         """Iterates over mth5s in list and creates one big dataframe
         summarizing the runs
+
+        Parameters
+        ----------
+        mth5_list : list
+            Paths, strings or mth5 objects.
+        cache : RunSummaryCache, optional
+            Index of summaries, only files that changed are opened.
+            By default, None.
+        n_jobs : int, optional
+            Number of threads to open files with. By default, None.
         """
-        run_summary_df = extract_run_summaries_from_mth5s(mth5_list)
+        run_summary_df = extract_run_summaries_from_mth5s(
+            mth5_list, cache=cache, n_jobs=n_jobs
+        )
         self.df = run_summary_df
 
     def _warn_no_data_runs(self):
@@ -226,8 +240,32 @@ def extract_run_summary_from_mth5(
     return out_df
 
 
+def _extract_run_summary_from_file(mth5_path, summary_type="run"):
+    """Open an mth5 file, extract the summary and close it.
+
+    Parameters
+    ----------
+    mth5_path : str or pathlib.Path
+        Path to the mth5.
+    summary_type : string, optional
+        One of ["channel", "run"]. By default, "run".
+
+    Returns
+    -------
+    out_df : pd.Dataframe
+        Table summarizing the available runs in the mth5.
+    """
+    mth5_obj = initialize_mth5(mth5_path, mode="r")
+    try:
+        return extract_run_summary_from_mth5(
+            mth5_obj, summary_type=summary_type
+        )
+    finally:
+        mth5_obj.close_mth5()
+
+
 def extract_run_summaries_from_mth5s(
-    mth5_list, summary_type="run", deduplicate=True
+    mth5_list, summary_type="run", deduplicate=True, cache=None, n_jobs=None
 ):
     """Given a list of mth5's, iterate over them, extracting run_summaries and
     merging into one big table.
@@ -245,6 +283,10 @@ def extract_run_summaries_from_mth5s(
     In order to drop duplicates I used the solution here:
     https://stackoverflow.com/questions/43855462/pandas-drop-duplicates-method-not-working-on-dataframe-containing-lists
 
+    If a cache is given, summaries of files that have not changed since they
+    were indexed are read from the cache and only the other files are
+    opened, in `n_jobs` threads.  mth5 objects are never cached.
+
     Parameters
     ----------
     deduplicate :
@@ -257,6 +299,12 @@ def extract_run_summaries_from_mth5s(
         "channel" returns concatenated channel summary,
         "run" returns concatenated run summary,. By default, "run".
     deduplicate:, defaults to True. : bool, optional
+    cache : RunSummaryCache, optional
+        Index of summaries keyed on file path and modification time.
+        By default, None.
+    n_jobs : int, optional
+        Number of threads to open files with, -1 uses all CPUs.
+        By default, None.
 
     Returns
     -------
@@ -265,18 +313,42 @@ def extract_run_summaries_from_mth5s(
     """
     dfs = len(mth5_list) * [None]
 
+    stale = []
     for i, mth5_elt in enumerate(mth5_list):
         if isinstance(mth5_elt, mth5.mth5.MTH5):
-            mth5_obj = mth5_elt
-        else:  # mth5_elt is a path or a string
-            mth5_obj = initialize_mth5(mth5_elt, mode="a")
-
-        df = extract_run_summary_from_mth5(mth5_obj, summary_type=summary_type)
+            dfs[i] = extract_run_summary_from_mth5(
+                mth5_elt, summary_type=summary_type
+            )
+            continue
+        # mth5_elt is a path or a string
+        if cache is not None:
+            dfs[i] = cache.get(mth5_elt, summary_type=summary_type)
+        if dfs[i] is None:
+            stale.append(i)
+
+    n_workers = min(get_n_jobs(n_jobs), len(stale))
+    if n_workers > 1:
+        with ThreadPoolExecutor(max_workers=n_workers) as executor:
+            stale_dfs = list(
+                executor.map(
+                    lambda i: _extract_run_summary_from_file(
+                        mth5_list[i], summary_type=summary_type
+                    ),
+                    stale,
+                )
+            )
+    else:
+        stale_dfs = [
+            _extract_run_summary_from_file(
+                mth5_list[i], summary_type=summary_type
+            )
+            for i in stale
+        ]
 
-        # close it back up if you opened it
-        if not isinstance(mth5_elt, mth5.mth5.MTH5):
-            mth5_obj.close_mth5()
+    for i, df in zip(stale, stale_dfs):
         dfs[i] = df
+        if cache is not None:
+            cache.put(mth5_list[i], df, summary_type=summary_type)
 
     # merge all summaries into a super_summary
     super_summary = pd.concat(dfs)
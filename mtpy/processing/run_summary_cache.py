@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 12:48:19 2026
+
+@author: jpeacock
+
+Persistent index of MTH5 run and channel summaries.
+
+Getting the run summary of an MTH5 means opening the file and walking all of
+its groups, which adds up for an archive of many station files.  The
+summaries are saved as JSON in an SQLite database, by default one next to
+the MTH5 files in each directory, keyed on the resolved file path.  The
+modification time and size of the file are saved with each summary, if the
+file has changed the summary is stale and is extracted again.
+
+HDF5 references are only valid for the file handle that made them, so they
+are not saved and summaries from the index have None in the reference
+columns.  Processing fills in the run and station references when the
+files are opened.
+"""
+
+# =============================================================================
+# Imports
+# =============================================================================
+import io
+import json
+import sqlite3
+from pathlib import Path
+
+import pandas as pd
+from loguru import logger
+
+# =============================================================================
+
+REFERENCE_COLUMNS = [
+    "hdf5_reference",
+    "run_hdf5_reference",
+    "station_hdf5_reference",
+]
+
+
+class RunSummaryCache:
+    """SQLite index of MTH5 run and channel summaries.
+
+    :Use with a run summary: ::
+
+        >>> from mtpy.processing import RunSummary
+        >>> from mtpy.processing.run_summary_cache import RunSummaryCache
+        >>> run_summary = RunSummary()
+        >>> run_summary.from_mth5s(
+        ...     mth5_list, cache=RunSummaryCache(), n_jobs=8
+        ... )
+
+    """
+
+    # bump if the layout of the saved summaries changes
+    cache_version = 1
+    cache_name = ".mtpy_summary_cache.sqlite"
+
+    def __init__(self, cache_fn=None):
+        self.logger = logger
+        self.cache_fn = cache_fn
+
+    def __str__(self):
+        if self.cache_fn is None:
+            return f"Run Summary Cache: {self.cache_name} next to MTH5 files"
+        return f"Run Summary Cache: {self.cache_fn}"
+
+    def __repr__(self):
+        return self.__str__()
+
+    @property
+    def cache_fn(self):
+        """SQLite file for all MTH5 files, None to use one in the directory
+        of each MTH5 file.
+        """
+        return self._cache_fn
+
+    @cache_fn.setter
+    def cache_fn(self, value):
+        """Set cache file name."""
+        if value is None:
+            self._cache_fn = None
+        else:
+            self._cache_fn = Path(value)
+
+    def get_cache_fn(self, fn):
+        """Get the SQLite file that indexes an MTH5 file.
+
+        :param fn: MTH5 file.
+        :type fn: str or Path
+        :return: SQLite file.
+        :rtype: Path
+        """
+        if self.cache_fn is not None:
+            return self.cache_fn
+        return Path(fn).resolve().parent.joinpath(self.cache_name)
+
+    def _connect(self, cache_fn):
+        """Connect to an SQLite file and make the table if needed."""
+        connection = sqlite3.connect(cache_fn, timeout=30)
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS summaries ("
+            "mth5_path TEXT, summary_type TEXT, mtime_ns INTEGER, "
+            "size INTEGER, version INTEGER, columns TEXT, summary TEXT, "
+            "PRIMARY KEY (mth5_path, summary_type))"
+        )
+        return connection
+
+    @staticmethod
+    def _stat(fn):
+        """Modification time and size of a file."""
+        stat = Path(fn).stat()
+        return stat.st_mtime_ns, stat.st_size
+
+    def get(self, fn, summary_type="run"):
+        """Get the summary of an MTH5 file.
+
+        :param fn: MTH5 file.
+        :type fn: str or Path
+        :param summary_type: One of ["run", "channel"], defaults to "run".
+        :type summary_type: str, optional
+        :return: Summary, None if the file is not in the index or has
+         changed since it was indexed.
+        :rtype: pd.DataFrame or None
+        """
+        cache_fn = self.get_cache_fn(fn)
+        if not cache_fn.is_file():
+            return None
+
+        try:
+            with self._connect(cache_fn) as connection:
+                row = connection.execute(
+                    "SELECT mtime_ns, size, version, columns, summary "
+                    "FROM summaries WHERE mth5_path=? AND summary_type=?",
+                    (str(Path(fn).resolve()), summary_type),
+                ).fetchone()
+            connection.close()
+        except sqlite3.Error as error:
+            self.logger.warning(f"Could not read {cache_fn}. {error}")
+            return None
+
+        if row is None:
+            return None
+        mtime_ns, size, version, columns, summary = row
+        if (mtime_ns, size) != self._stat(fn) or version != self.cache_version:
+            self.logger.debug(f"Summary of {fn} is stale")
+            return None
+
+        df = pd.read_json(io.StringIO(summary), orient="table")
+        df = df.reindex(columns=json.loads(columns))
+        for column in REFERENCE_COLUMNS:
+            if column in df.columns:
+                df[column] = None
+        self.logger.debug(f"Read summary of {fn} from {cache_fn}")
+        return df
+
+    def put(self, fn, df, summary_type="run"):
+        """Save the summary of an MTH5 file.
+
+        Call this after the file is closed, the modification time and size
+        saved are those of the file now.
+
+        :param fn: MTH5 file.
+        :type fn: str or Path
+        :param df: Summary.
+        :type df: pd.DataFrame
+        :param summary_type: One of ["run", "channel"], defaults to "run".
+        :type summary_type: str, optional
+        """
+        cache_fn = self.get_cache_fn(fn)
+        mtime_ns, size = self._stat(fn)
+        summary = df.drop(
+            columns=[col for col in REFERENCE_COLUMNS if col in df.columns]
+        ).reset_index(drop=True)
+
+        try:
+            with self._connect(cache_fn) as connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO summaries VALUES "
+                    "(?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        str(Path(fn).resolve()),
+                        summary_type,
+                        mtime_ns,
+                        size,
+                        self.cache_version,
+                        json.dumps(df.columns.tolist()),
+                        summary.to_json(orient="table", date_unit="ns"),
+                    ),
+                )
+            connection.close()
+        except sqlite3.Error as error:
+            self.logger.warning(
+                f"Could not write summary of {fn} to {cache_fn}. {error}"
+            )
+            return
+        self.logger.debug(f"Saved summary of {fn} to {cache_fn}")
+
+    def remove(self, fn, summary_type=None):
+        """Remove the summaries of an MTH5 file.
+
+        :param fn: MTH5 file.
+        :type fn: str or Path
+        :param summary_type: One of ["run", "channel"], defaults to None
+         which removes both.
+        :type summary_type: str, optional
+        """
+        cache_fn = self.get_cache_fn(fn)
+        if not cache_fn.is_file():
+            return
+
+        query = "DELETE FROM summaries WHERE mth5_path=?"
+        values = [str(Path(fn).resolve())]
+        if summary_type is not None:
+            query += " AND summary_type=?"
+            values.append(summary_type)
+        with self._connect(cache_fn) as connection:
+            connection.execute(query, values)
+        connection.close()
@@ -305,6 +305,32 @@ def wvd_analytic_signal(fx):
     return fxa
 
 
+def sliding_windows(fx, nh, tstep=1):
+    """
+    Returns the short time windows of fx as a strided view without copying
+    the data.  Window ii starts at sample ii*tstep, windows that would run
+    past the end of fx are left out.
+
+    Arguments:
+    ----------
+        **fx** : np.ndarray(n)
+                 time series
+
+        **nh** : int
+                 window length
+
+        **tstep** : int
+                    number of samples between windows
+
+    Returns:
+    --------
+        **windows** : np.ndarray((n-nh)/tstep+1, nh)
+                      read only view of the windows of fx
+    """
+
+    return np.lib.stride_tricks.sliding_window_view(fx, nh)[::tstep]
+
+
 def stft(fx, nh=2 ** 8, tstep=2 ** 7, ng=1, df=1.0, nfbins=2 ** 10):
     """
     calculate the spectrogam of the given function by calculating the fft of
@@ -394,21 +420,27 @@ def stft(fx, nh=2 ** 8, tstep=2 ** 7, ng=1, df=1.0, nfbins=2 ** 10):
     # positive ones
     fa = sps.hilbert(dctrend(fx))
 
-    # compute the fft at each window instance
-    for place, ii in enumerate(tlst):
-        fxwin = fa[ii : ii + nh] * h
-
+    # compute the fft of a chunk of windows at once, small chunks keep the
+    # arrays in cache
+    windows = sliding_windows(fa, nh, tstep)
+    nchunk = 2 ** 8
+    for ii in range(0, len(tlst), nchunk):
         # get only positive frequencies
-        FXwin = np.fft.fft(padzeros(fxwin, npad=nfbins))[: int(nfbins / 2)]
+        FXwin = np.fft.fft(windows[ii : ii + nchunk] * h, n=nfbins, axis=-1)[
+            :, : int(nfbins / 2)
+        ]
 
-        # smooth in frequency plane
+        # smooth in frequency plane, same as convolving each window with g
+        # after padding it with ng-1 zeros
         if ng != 1:
-            FXwin = np.convolve(padzeros(FXwin, npad=len(FXwin) + ng - 1), g, "valid")
-        else:
-            pass
+            FXwin = np.pad(FXwin, ((0, 0), (0, ng - 1)))
+            FXwin = (
+                np.lib.stride_tricks.sliding_window_view(FXwin, ng, axis=-1)
+                @ g[::-1]
+            )
 
         # pull out only positive quadrant, flip array for plotting
-        tfarray[:, place] = FXwin[::-1]
+        tfarray[:, ii : ii + nchunk] = FXwin[:, ::-1].T
 
     return tfarray, tlst, flst
 
@@ -480,7 +512,7 @@ def reassigned_stft(
 
     # compute gaussian window
     h = gausswin(nh, alpha=alpha)
-    lh = (nh - 1) / 2
+    lh = (nh - 1) // 2
 
     # compute ramp window
     th = h * np.arange(start=-lh, stop=lh + 1, step=1)
@@ -493,45 +525,38 @@ def reassigned_stft(
     nt = len(tlst)
 
     # make a frequency list
-    flst = np.fft.fftfreq(nfbins, 1.0 / df)[nfbins / 2 :]
-    return_flst = np.fft.fftfreq(nfbins, 1.0 / df)[0 : nfbins / 2]
-
-    # initialize some time-frequency arrays
-    tfr = np.zeros((nfbins, nt), dtype="complex")
-    tf2 = np.zeros((nfbins, nt), dtype="complex")
-    tf3 = np.zeros((nfbins, nt), dtype="complex")
-
-    # compute components for reassignment
-    for ii, tt in enumerate(tlst):
-        # create a time shift list
-        tau = np.arange(
-            start=-min([np.round(nx / 2.0), lh, tt - 1]),
-            stop=min([np.round(nx / 2.0), lh, nx - tt - 1]) + 1,
-        )
-        # compute the frequency spots to be calculated
-        ff = np.remainder(nfbins + tau, nfbins)
-        xlst = tt + tau
-        hlst = lh + tau
-        normh = np.sqrt(np.sum(abs(h[hlst]) ** 2))
-        tfr[ff, ii] = fx[xlst] * h[hlst].conj() / normh
-        tf2[ff, ii] = fx[xlst] * th[hlst].conj() / normh
-        tf3[ff, ii] = fx[xlst] * dh[hlst].conj() / normh
-
-    # compute Fourier Transform
-    spec = np.fft.fft(tfr, axis=0)
-    spect = np.fft.fft(tf2, axis=0)
-    specd = np.fft.fft(tf3, axis=0)
-
-    # get only positive frequencies
-    spec = spec[nfbins / 2 :, :]
-    spect = spect[nfbins / 2 :, :]
-    specd = specd[nfbins / 2 :, :]
+    return_flst = np.fft.fftfreq(nfbins, 1.0 / df)[0 : nfbins // 2]
+
+    # the time shifts of each window are limited by the ends of fx, mask out
+    # the shifts that fall outside of fx
+    tau = np.arange(start=-lh, stop=lh + 1)
+    tmin = np.minimum(np.minimum(np.round(nx / 2.0), lh), tlst - 1)
+    tmax = np.minimum(np.minimum(np.round(nx / 2.0), lh), nx - tlst - 1)
+    mask = (tau[None, :] >= -tmin[:, None]) & (tau[None, :] <= tmax[:, None])
+    xlst = np.clip(tlst[:, None] + tau[None, :], 0, nx - 1)
+    fxwin = np.where(mask, fx[xlst], 0)
+    normh = np.sqrt(np.sum(mask * abs(h) ** 2, axis=1))[:, None]
+
+    # compute the components for reassignment, each window is padded to
+    # nfbins with the zero shift at the first frequency bin
+    tfr = np.zeros((nt, nfbins), dtype="complex")
+    tf2 = np.zeros((nt, nfbins), dtype="complex")
+    tf3 = np.zeros((nt, nfbins), dtype="complex")
+    ff = np.remainder(nfbins + tau, nfbins)
+    tfr[:, ff] = fxwin * h.conj() / normh
+    tf2[:, ff] = fxwin * th.conj() / normh
+    tf3[:, ff] = fxwin * dh.conj() / normh
+
+    # compute Fourier Transform, only positive frequencies
+    spec = np.fft.fft(tfr, axis=1)[:, nfbins // 2 :].T
+    spect = np.fft.fft(tf2, axis=1)[:, nfbins // 2 :].T
+    specd = np.fft.fft(tf3, axis=1)[:, nfbins // 2 :].T
 
     # check to make sure no spurious zeros floating around
     spec[np.where(abs(spec) < 1.0e-6)] = 0.0
     zerofind = np.nonzero(abs(spec))
-    twspec = np.zeros((nfbins / 2, nt), dtype="float")
-    dwspec = np.zeros((nfbins / 2, nt), dtype="float")
+    twspec = np.zeros((nfbins // 2, nt), dtype="float")
+    dwspec = np.zeros((nfbins // 2, nt), dtype="float")
     twspec[zerofind] = np.round(np.real(spect[zerofind] / spec[zerofind]) / 1)
     dwspec[zerofind] = np.round(
         np.imag((nfbins / 2.0) * specd[zerofind] / spec[zerofind]) / (np.pi)
@@ -543,25 +568,22 @@ def reassigned_stft(
     if threshold is None:
         threshold = 1.0e-4 * np.mean(fx[tlst])
 
-    for nn in range(nt):
-        for kk in range(nfbins / 2):
-            if abs(spec[kk, nn]) > threshold:
-                # get center of gravity index in time direction
-                nhat = int(nn + twspec[kk, nn])
-                nhat = int(min([max([nhat, 1]), nt - 1]))
-                # get center of gravity index in frequency direction
-                khat = int(kk - dwspec[kk, nn])
-                khat = int(
-                    np.remainder(
-                        np.remainder(khat - 1, nfbins / 2) + nfbins / 2, nfbins / 2
-                    )
-                )
-                # reassign energy
-                rtfarray[khat, nhat] = rtfarray[khat, nhat] + spec[kk, nn]
-                spect[kk, nn] = khat + 1j * nhat
-            else:
-                spect[kk, nn] = np.inf * (1 + 1j)
-                rtfarray[kk, nn] = rtfarray[kk, nn] + spec[kk, nn]
+    kk, nn = np.indices(spec.shape)
+    reassign = abs(spec) > threshold
+    # get center of gravity index in time direction
+    nhat = (nn + twspec).astype(int)
+    nhat = np.minimum(np.maximum(nhat, 1), nt - 1)
+    # get center of gravity index in frequency direction
+    khat = (kk - dwspec).astype(int)
+    khat = np.remainder(
+        np.remainder(khat - 1, nfbins // 2) + nfbins // 2, nfbins // 2
+    )
+    # reassign energy, energy below the threshold stays in place
+    np.add.at(
+        rtfarray,
+        (np.where(reassign, khat, kk), np.where(reassign, nhat, nn)),
+        spec,
+    )
 
     return rtfarray, tlst, return_flst, spec
 
@@ -617,7 +639,6 @@ def wvd(fx, nh=2 ** 8 - 1, tstep=2 ** 5, nfbins=2 ** 10, df=1.0):
         fm = 1
 
     if fm > 1:
-        fn = fn[0]
         print("computing cross spectra")
         # compute the analytic signal of function f and dctrend
         fa = wvd_analytic_signal(fx[0])
@@ -633,32 +654,36 @@ def wvd(fx, nh=2 ** 8 - 1, tstep=2 ** 5, nfbins=2 ** 10, df=1.0):
     df = float(df)
     dt = 1.0 / df
     # time shift
-    tau = (nh - 1) / 2
+    tau = (nh - 1) // 2
 
     # create a time array such that the first point is centered on time window
     tlst = np.arange(start=0, stop=fn - 1, step=tstep, dtype="int")
-
-    # create an empty array to put the tf in
-    tfarray = np.zeros((nfbins, len(tlst)), dtype="complex")
+    nt = len(tlst)
 
     # create a frequency array with just positive frequencies
-    flst = np.fft.fftfreq(nfbins, dt)[0 : nfbins / 2]
-
-    # calculate pseudo WV
-    for point, nn in enumerate(tlst):
-        # calculate the smallest timeshift possible
-        tau_min = min(nn, tau, fn - nn - 1)
-        # make a timeshift array
-        tau_lst = np.arange(start=-tau_min, stop=tau_min + 1, step=1, dtype="int")
-        # calculate rectangular windowed correlation function of analytic
-        # signal
-        Rnn = 4 * np.conjugate(fa[nn - tau_lst]) * fb[nn + tau_lst]
-        # calculate fft of windowed correlation function
-        # put into tfarray
-        tfarray[:, point] = padzeros(Rnn, npad=nfbins)[::-1]
+    flst = np.fft.fftfreq(nfbins, dt)[0 : nfbins // 2]
+
+    # calculate the smallest timeshift possible for each time
+    tau_min = np.minimum(np.minimum(tlst, tau), fn - tlst - 1)
+    # make a timeshift array for all times, mask out shifts past tau_min
+    tau_lst = np.arange(start=-tau, stop=tau + 1, step=1, dtype="int")
+    mask = abs(tau_lst)[None, :] <= tau_min[:, None]
+    # calculate rectangular windowed correlation function of analytic
+    # signal for all times at once
+    Rnn = (
+        4
+        * np.conjugate(fa[np.clip(tlst[:, None] - tau_lst, 0, fn - 1)])
+        * fb[np.clip(tlst[:, None] + tau_lst, 0, fn - 1)]
+    )
+    # put the correlation functions into tfarray padded with zeros to
+    # nfbins and flipped
+    rows = np.broadcast_to(np.arange(nt)[:, None], mask.shape)
+    cols = nfbins - 1 - (tau_lst[None, :] + tau_min[:, None])
+    tfarray = np.zeros((nt, nfbins), dtype="complex")
+    tfarray[rows[mask], cols[mask]] = Rnn[mask]
 
     # compute Fourier Transform of array along the time axis
-    tfarray = np.fft.fft(tfarray, axis=0)
+    tfarray = np.fft.fft(tfarray, axis=1).T
     # normalize
     tfarray = tfarray / nh
 
@@ -777,8 +802,8 @@ def spwvd(
     g = sps.gaussian(ng, sigmag)
     g /= sum(g)
 
-    Lh = (nh - 1) / 2  # midpoint index of window h
-    Lg = (ng - 1) / 2  # midpoint index of window g
+    Lh = (nh - 1) // 2  # midpoint index of window h
+    Lg = (ng - 1) // 2  # midpoint index of window g
 
     # create a time array such that the first point is centered on time window
     tlst = np.arange(start=0, stop=fn + 1, step=tstep, dtype="int")
@@ -788,62 +813,73 @@ def spwvd(
     tfarray = np.zeros((nfbins, len(tlst)), dtype="complex")
 
     # create a frequency array with just positive frequencies
-    flst = np.fft.fftfreq(nfbins, dt)[0 : nfbins / 2]
+    flst = np.fft.fftfreq(nfbins, dt)[0 : nfbins // 2]
+
+    # all times are computed at once, t is a column of times and taulst a row
+    # of all the time lags of window g
+    t = tlst[:, None]
+    taulst = np.arange(start=-Lg, stop=Lg + 1, step=1, dtype="int")
+
+    def lag_window(start, stop):
+        # window g cut to the time lags start to stop at each time and
+        # normalized, zero where there are no time lags
+        gm = np.where((taulst >= start) & (taulst <= stop), g, 0)
+        gsum = gm.sum(axis=1, keepdims=True)
+        return np.divide(gm, gsum, out=np.zeros_like(gm), where=gsum != 0)
+
+    def lag_product(ia, ib):
+        # correlation function of the analytic functions, negative indices
+        # wrap around as for list indexing
+        return np.take(fa, ia, mode="wrap") * np.conjugate(
+            np.take(fb, ib, mode="wrap")
+        )
 
-    # calculate pseudo WV
-    for point, t in enumerate(tlst):
-        # find the smallest possible time shift
-        tau_max = min(t + Lg - 1, fn - t + Lg, round(nfbins / 2), Lh)
-        # create time lag list
-        taulst = np.arange(
-            start=-min(Lg, fn - t), stop=min(Lg, t - 1) + 1, step=1, dtype="int"
+    # calculate windowed correlation function of analytic function for
+    # zero frequency
+    gm = 2 * lag_window(-np.minimum(Lg, fn - t), np.minimum(Lg, t - 1))
+    tfarray[0] = np.sum(gm * lag_product(t - taulst - 1, t - taulst - 1), axis=1)
+
+    # find the smallest possible time shift
+    tau_max = np.minimum(
+        np.minimum(tlst + Lg - 1, fn - tlst + Lg), min(round(nfbins / 2), Lh)
+    )
+    # calculate tfd by calculating convolution of window and correlation
+    # function as sum of correlation function over the lag period times the
+    # window at that point. Calculate symmetrical segments for FFT later
+    for mm in range(max(tau_max.max(initial=0), 0)):
+        points = mm < tau_max
+        gm = 2 * lag_window(
+            -np.minimum(Lg, fn - t - mm - 1), np.minimum(Lg, t - mm - 1)
         )
-        # calculate windowed correlation function of analytic function for
-        # zero frequency
-        tfarray[0, point] = sum(
-            2
-            * (g[Lg + taulst] / sum(g[Lg + taulst]))
-            * fa[t - taulst - 1]
-            * np.conjugate(fb[t - taulst - 1])
+        # compute positive half
+        Rmm = np.sum(
+            gm * lag_product(t + mm - taulst - 1, t - mm - taulst), axis=1
         )
-        # calculate tfd by calculating convolution of window and correlation
-        # function as sum of correlation function over the lag period times the
-        # window at that point. Calculate symmetrical segments for FFT later
-        for mm in range(tau_max):
-            taulst = np.arange(
-                start=-min(Lg, fn - t - mm - 1),
-                stop=min(Lg, t - mm - 1) + 1,
-                step=1,
-                dtype="int",
-            )
-            # compute positive half
-            gm = 2 * (g[Lg + taulst] / sum(g[Lg + taulst]))
-            Rmm = sum(gm * fa[t + mm - taulst - 1] * np.conjugate(fb[t - mm - taulst]))
-            tfarray[mm, point] = h[Lh + mm - 1] * Rmm
-            # compute negative half
-            Rmm = sum(gm * fa[t - mm - taulst] * np.conjugate(fb[t + mm - taulst - 1]))
-            tfarray[nfbins - mm - 1, point] = h[Lh - mm] * Rmm
-        mm = round(nfbins / 2)
-
-        if t <= fn - mm and t >= mm and mm <= Lh:
-            print("doing weird thing")
-            taulst = np.arange(
-                start=-min(Lg, fn - t - mm),
-                stop=min(Lg, fn - t, mm) + 1,
-                step=1,
-                dtype="int",
+        tfarray[mm, points] = h[Lh + mm - 1] * Rmm[points]
+        # compute negative half
+        Rmm = np.sum(
+            gm * lag_product(t - mm - taulst, t + mm - taulst - 1), axis=1
+        )
+        tfarray[nfbins - mm - 1, points] = h[Lh - mm] * Rmm[points]
+
+    mm = round(nfbins / 2)
+    if mm <= Lh:
+        points = (tlst <= fn - mm) & (tlst >= mm)
+        gm = lag_window(
+            -np.minimum(Lg, fn - t - mm), np.minimum(np.minimum(Lg, fn - t), mm)
+        )
+        tfarray[mm - 1, points] = 0.5 * (
+            np.sum(
+                h[Lh + mm]
+                * (gm * lag_product(t + mm - taulst - 1, t - mm - taulst)),
+                axis=1,
             )
-            gm = g[Lg + taulst] / sum(g[Lg + taulst])
-            tfarray[mm - 1, point] = 0.5 * (
-                sum(
-                    h[Lh + mm]
-                    * (gm * fa[t + mm - taulst - 1] * np.conjugate(fb[t - mm - taulst]))
-                )
-                + sum(
-                    h[Lh - mm]
-                    * (gm * fa[t - mm - taulst] * np.conjugate(fb[t + mm - taulst - 1]))
-                )
+            + np.sum(
+                h[Lh - mm]
+                * (gm * lag_product(t - mm - taulst, t + mm - taulst - 1)),
+                axis=1,
             )
+        )[points]
 
     tfarray = np.fft.fft(tfarray, axis=0)
     # rotate for plotting purposes so that (t=0,f=0) is at the lower left
@@ -1215,10 +1251,10 @@ def robust_stft_median(fx, nh=2 ** 8, tstep=2 ** 5, df=1.0, nfbins=2 ** 10):
 
     # make a frequency list for plotting exporting only positive frequencies
     flst = np.fft.fftfreq(nfbins, 1 / df)
-    flstc = flst[nfbins / 2 :]
+    flstc = flst[nfbins // 2 :]
     # Note: these are actually the negative frequencies but works better for
     # calculations
-    flstp = flst[0 : nfbins / 2]
+    flstp = flst[0 : nfbins // 2]
 
     # make time window and normalize
     sigmanh = nh / (6 * np.sqrt(2 * np.log(2)))
@@ -1226,28 +1262,27 @@ def robust_stft_median(fx, nh=2 ** 8, tstep=2 ** 5, df=1.0, nfbins=2 ** 10):
     h = h / sum(h)
 
     # create an empty array to put the tf in and initialize a complex value
-    tfarray = np.zeros((nfbins / 2, len(tlst)), dtype="complex")
+    tfarray = np.zeros((nfbins // 2, len(tlst)), dtype="complex")
 
     # take the hilbert transform of the signal to make complex and remove
     # negative frequencies
     fa = sps.hilbert(dctrend(fx))
     fa = fa / fa.std()
 
-    # make a frequency list for plotting exporting only positive frequencies
-    # get only positive frequencies
-    flst = np.fft.fftfreq(nfbins, 1 / df)[nfbins / 2 :]
-
-    for tpoint, nn in enumerate(tlst):
-        # calculate windowed correlation function of analytic function
-        fxwin = h * fa[nn : nn + nh]
-        for fpoint, mm in enumerate(flstc):
-            fxmed = fxwin * np.exp(1j * 2 * np.pi * mlst * mm / df)
-            fxmedreal = np.median(fxmed.real)
-            fxmedimag = np.median(fxmed.imag)
-            if fxmedreal + 1j * fxmedimag == 0.0:
-                tfarray[fpoint, tpoint] = 1e-10
-            else:
-                tfarray[fpoint, tpoint] = fxmedreal + 1j * fxmedimag
+    # complex exponential of each frequency along the rows
+    expf = np.exp(1j * 2 * np.pi * np.outer(flstc, mlst) / df)
+
+    # calculate windowed correlation function of analytic function for a
+    # chunk of windows at a time, the median is not linear so all the
+    # frequencies of each window are held in memory
+    fxwins = h * sliding_windows(fa, nh, tstep)
+    nchunk = max(1, 2 ** 22 // expf.size)
+    for ii in range(0, len(tlst), nchunk):
+        fxmed = fxwins[ii : ii + nchunk, None, :] * expf
+        tfarray[:, ii : ii + nchunk] = (
+            np.median(fxmed.real, axis=-1) + 1j * np.median(fxmed.imag, axis=-1)
+        ).T
+    tfarray[tfarray == 0.0] = 1e-10
     # normalize tfarray
     tfarray = (4.0 * nh * df) * tfarray
 
@@ -1449,12 +1484,11 @@ def smethod(
     if sigmaL is None:
         sigmaL = L / (1 * np.sqrt(2 * np.log(2)))
     p = sps.gaussian(L, sigmaL)
-    # make a matrix of windows
-    pm = np.zeros((L, nt))
-    for kk in range(nt):
-        pm[:, kk] = p
+    # make a column of windows to broadcast over time
+    pm = p[:, None]
 
-    # loop over frequency and calculate the s-method
+    # loop over frequency and calculate the s-method, each frequency is
+    # computed for all times at once
     for ff in range(int(L / 2), nf - int(L / 2) - 1):
         tfarray[ff, :] = tfarray[ff, :] + 2 * np.real(
             np.sum(pm * pxx[ff + Llst, :] * pxx[ff - Llst, :].conj(), axis=0)
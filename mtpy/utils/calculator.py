@@ -601,6 +601,183 @@ def rotate_vector_with_errors(in_vector, angle, error=None, clockwise=True):
     return rotated_vector, err_vector
 
 
+def get_rotation_matrices(angles, clockwise=False):
+    """
+    get a stack of rotation matrices, one for each angle
+
+    :param angles: angles in degrees to rotate by
+    :type angles: np.ndarray (n)
+    :param clockwise: [ True | False ] if False counterclockwise rotation
+     matrices are returned
+    :type clockwise: bool
+    :return: rotation matrices
+    :rtype: np.ndarray (n, 2, 2)
+    """
+    angles = np.deg2rad(np.atleast_1d(np.asarray(angles, dtype=float)))
+    cphi = np.cos(angles)
+    sphi = np.sin(angles)
+
+    rot_mat = np.empty((angles.size, 2, 2), dtype=float)
+    rot_mat[:, 0, 0] = cphi
+    rot_mat[:, 1, 1] = cphi
+    if clockwise:
+        rot_mat[:, 0, 1] = sphi
+        rot_mat[:, 1, 0] = -sphi
+    else:
+        rot_mat[:, 0, 1] = -sphi
+        rot_mat[:, 1, 0] = sphi
+    return rot_mat
+
+
+def rotate_matrix_stack_errors(error, angles):
+    """
+    Rotate errors of a stack of matrices, one angle per matrix.
+
+    Same propagation of errors as :func:`rotate_matrix_errors` applied to
+    every matrix at once.
+
+    :param error: error matrices (n x 2 x 2), extra leading dimensions are
+     broadcast (... x n x 2 x 2)
+    :type error: np.ndarray
+    :param angles: rotation angles in degrees
+    :type angles: np.ndarray (n)
+    :return: propogated errors
+    :rtype: None or np.ndarray
+
+    """
+    if error is None:
+        return None
+
+    phi = np.deg2rad(np.asarray(angles, dtype=float) % 360)
+    c2 = np.cos(phi) ** 2
+    s2 = np.sin(phi) ** 2
+    cs = np.cos(phi) * np.sin(phi)
+
+    err_orig = np.real(error)
+    e00 = err_orig[..., 0, 0]
+    e01 = err_orig[..., 0, 1]
+    e10 = err_orig[..., 1, 0]
+    e11 = err_orig[..., 1, 1]
+
+    error_matrix = np.zeros_like(error)
+    error_matrix[..., 0, 0] = np.sqrt(
+        (c2 * e00) ** 2 + (cs * e01) ** 2 + (cs * e10) ** 2 + (s2 * e11) ** 2
+    )
+    error_matrix[..., 0, 1] = np.sqrt(
+        (c2 * e01) ** 2 + (cs * e11) ** 2 + (cs * e00) ** 2 + (s2 * e10) ** 2
+    )
+    error_matrix[..., 1, 0] = np.sqrt(
+        (c2 * e10) ** 2 + (cs * e11) ** 2 + (cs * e00) ** 2 + (s2 * e01) ** 2
+    )
+    error_matrix[..., 1, 1] = np.sqrt(
+        (c2 * e11) ** 2 + (cs * e01) ** 2 + (cs * e10) ** 2 + (s2 * e00) ** 2
+    )
+
+    return error_matrix
+
+
+def rotate_matrix_stack_with_errors(
+    in_matrix, angles, error=None, clockwise=True
+):
+    """Rotate a stack of matrices including errors, one angle per matrix.
+
+    The rotation matrices are built once and applied with a single batched
+    product R A R^T, which is the vectorized version of
+    :func:`rotate_matrix_with_errors`.
+
+    :param in_matrix: A n x 2 x 2  matrix to rotate.
+    :type in_matrix: np.ndarray
+    :param angles: Angles to rotate by assuming clockwise positive from
+        0 = north, one for each matrix.
+    :type angles: np.ndarray (n)
+    :param error: A n x 2 x 2 matrix of associated errors, extra leading
+     dimensions are broadcast so errors and model errors can be rotated
+     together as a (2 x n x 2 x 2) array, defaults to None.
+    :type error: np.ndarray, optional
+    :param clockwise: rotate clockwise [True] or counter-clockwise [False]
+    :type clockwise: bool
+    :raises MTex: If input array is incorrect.
+    :return: Rotated matrix.
+    :rtype: np.ndarray
+    :return: Rotated matrix errors.
+    :rtype: np.ndarray
+    """
+
+    if in_matrix is None:
+        raise MTex.MTpyError_input_arguments("Matrix must be defined")
+
+    if (error is not None) and (in_matrix.shape != error.shape[-3:]):
+        msg = "matricies are not the same shape in_matrix={0}, err={1}".format(
+            in_matrix.shape, error.shape
+        )
+        raise MTex.MTpyError_input_arguments(msg)
+
+    rot_mat = get_rotation_matrices(angles, clockwise)
+
+    # jacobian rotation or similarity transformation is R A RT
+    rotated_matrix = np.einsum(
+        "nij,njk,nlk->nil", rot_mat, in_matrix, rot_mat, optimize=True
+    )
+
+    error_matrix = rotate_matrix_stack_errors(error, angles)
+
+    return rotated_matrix, error_matrix
+
+
+def rotate_vector_stack_with_errors(
+    in_vector, angles, error=None, clockwise=True
+):
+    """Rotate a stack of vectors including errors, one angle per vector.
+
+    Vectorized version of :func:`rotate_vector_with_errors`.
+
+    :param in_vector: A n x 1 x 2  vector to rotate.
+    :type in_vector: np.ndarray
+    :param angles: Angles to rotate by assuming clockwise positive from
+        0 = north, one for each vector.
+    :type angles: np.ndarray (n)
+    :param error: A n x 1 x 2 vector of associated errors, extra leading
+     dimensions are broadcast so errors and model errors can be rotated
+     together as a (2 x n x 1 x 2) array, defaults to None.
+    :type error: np.ndarray, optional
+    :param clockwise: rotate clockwise [True] or counter-clockwise [False]
+    :type clockwise: bool
+    :raises MTex: If input array is incorrect.
+    :return: Rotated vector.
+    :rtype: np.ndarray
+    :return: Rotated vector errors.
+    :rtype: np.ndarray
+    """
+
+    if in_vector is None:
+        raise MTex.MTpyError_input_arguments(
+            "Vector AND error-vector must" + " be defined"
+        )
+
+    if (error is not None) and (in_vector.shape != error.shape[-3:]):
+        msg = "matricies are not the same shape in_vector={0}, err={1}".format(
+            in_vector.shape, error.shape
+        )
+        raise MTex.MTpyError_input_arguments(msg)
+
+    rot_mat = get_rotation_matrices(angles, clockwise)
+    inv_rot_mat = np.linalg.inv(rot_mat)
+
+    if in_vector.shape[1:] == (1, 2):
+        rotated_vector = np.matmul(in_vector, inv_rot_mat)
+    else:
+        rotated_vector = np.matmul(rot_mat, in_vector)
+
+    err_vector = None
+    if error is not None:
+        if error.shape[-2:] == (1, 2):
+            err_vector = np.matmul(error, np.abs(inv_rot_mat))
+        else:
+            err_vector = np.matmul(np.abs(rot_mat), error)
+
+    return rotated_vector, err_vector
+
+
 def multiplymatrices_incl_errors(
     inmatrix1, inmatrix2, inmatrix1_error=None, inmatrix2_error=None
 ):
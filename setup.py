@@ -29,6 +29,15 @@ requirements = [
     "aurora",
 ]
 
+# compressed netCDF and Zarr output of 3D models
+extras_requirements = {
+    "netcdf": [
+        "netCDF4",
+        "h5netcdf",
+        "zarr",
+    ],
+}
+
 setup_requirements = [
     "pytest-runner",
 ]
@@ -55,6 +64,7 @@ setup(
     ],
     description="Python toolkit for standard magnetotelluric data processing.",
     install_requires=requirements,
+    extras_require=extras_requirements,
     license="MIT",
     long_description=readme + "\n\n" + history,
     long_description_content_type="text/markdown",
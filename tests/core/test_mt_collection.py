@@ -628,6 +628,131 @@ class TestMTCollectionFromMTData03(unittest.TestCase):
         self.mc.mth5_filename.unlink()
 
 
+class TestMTCollectionAddTFParallel(unittest.TestCase):
+    @classmethod
+    def setUpClass(self):
+        self.fn_list = [
+            mt_metadata.TF_EDI_CGG,
+            mt_metadata.TF_XML,
+            mt_metadata.TF_ZMM,
+        ]
+        self.bad_fn = "does_not_exist.edi"
+        self.progress = []
+
+        self.mc = MTCollection()
+        self.mc.open_collection("test_collection_parallel")
+        self.mc.add_tf(
+            self.fn_list[0:1] + [self.bad_fn] + self.fn_list[1:],
+            n_jobs=2,
+            queue_size=1,
+            progress=lambda *args: self.progress.append(args),
+        )
+
+    def test_dataframe_len(self):
+        self.assertEqual(len(self.fn_list), len(self.mc.dataframe))
+
+    def test_stations(self):
+        self.assertListEqual(
+            sorted(self.mc.dataframe.station.tolist()),
+            sorted(["TEST01", "NMX20", "300"]),
+        )
+
+    def test_failed_tfs(self):
+        self.assertListEqual(list(self.mc.failed_tfs.keys()), [self.bad_fn])
+
+    def test_progress(self):
+        with self.subTest("count"):
+            self.assertEqual(len(self.progress), len(self.fn_list) + 1)
+        with self.subTest("last"):
+            self.assertEqual(
+                self.progress[-1][0:2],
+                (len(self.fn_list) + 1, len(self.fn_list) + 1),
+            )
+
+    def test_get_tf(self):
+        original = MT(mt_metadata.TF_XML)
+        original.read()
+        h5_tf = self.mc.get_tf(
+            validate_name(original.tf_id),
+            survey=validate_name(original.survey_metadata.id),
+        )
+        self.assertTrue(
+            (original.impedance.values == h5_tf.impedance.values).all()
+        )
+
+    @classmethod
+    def tearDownClass(self):
+        self.mc.mth5_collection.close_mth5()
+        self.mc.mth5_filename.unlink()
+
+
+class TestMTCollectionGetTFs(unittest.TestCase):
+    @classmethod
+    def setUpClass(self):
+        self.mc = MTCollection()
+        self.mc.open_collection("test_collection_get_tfs")
+        self.mc.add_tf(
+            [mt_metadata.TF_EDI_CGG, mt_metadata.TF_XML, mt_metadata.TF_ZMM]
+        )
+        self.tf_list = [
+            self.mc.get_tf(row.tf_id, survey=row.survey)
+            for row in self.mc.dataframe.itertuples()
+        ]
+
+    def test_get_tfs(self):
+        for tf, mt_object in zip(self.tf_list, self.mc.get_tfs()):
+            with self.subTest(f"{tf.station} transfer function"):
+                self.assertTrue(
+                    tf._transfer_function.equals(mt_object._transfer_function)
+                )
+            with self.subTest(f"{tf.station} station metadata"):
+                self.assertDictEqual(
+                    tf.station_metadata.to_dict(),
+                    mt_object.station_metadata.to_dict(),
+                )
+            with self.subTest(f"{tf.station} survey metadata"):
+                self.assertDictEqual(
+                    tf.survey_metadata.to_dict(),
+                    mt_object.survey_metadata.to_dict(),
+                )
+
+    def test_get_tfs_arrays_only(self):
+        for tf, mt_object in zip(
+            self.tf_list, self.mc.get_tfs(arrays_only=True)
+        ):
+            with self.subTest(f"{tf.station} transfer function"):
+                self.assertTrue(
+                    tf._transfer_function.equals(mt_object._transfer_function)
+                )
+            for attr in ["survey", "station", "tf_id", "latitude"]:
+                with self.subTest(f"{tf.station} {attr}"):
+                    self.assertEqual(
+                        getattr(tf, attr), getattr(mt_object, attr)
+                    )
+
+    def test_load_metadata(self):
+        mt_list = self.mc.get_tfs(arrays_only=True)
+        self.mc.load_metadata(mt_list)
+        for tf, mt_object in zip(self.tf_list, mt_list):
+            with self.subTest(f"{tf.station} station metadata"):
+                self.assertDictEqual(
+                    tf.station_metadata.to_dict(),
+                    mt_object.station_metadata.to_dict(),
+                )
+
+    def test_to_mt_data_arrays_only(self):
+        md = self.mc.to_mt_data(arrays_only=True)
+        self.assertListEqual(
+            sorted(md.keys()),
+            sorted(f"{tf.survey}.{tf.station}" for tf in self.tf_list),
+        )
+
+    @classmethod
+    def tearDownClass(self):
+        self.mc.mth5_collection.close_mth5()
+        self.mc.mth5_filename.unlink()
+
+
 # =============================================================================
 # run
 # =============================================================================
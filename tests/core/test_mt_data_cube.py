@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 10:02:11 2026
+
+@author: jpeacock
+"""
+# =============================================================================
+# Imports
+# =============================================================================
+import unittest
+
+import numpy as np
+
+from mtpy import MT, MTData
+from mtpy.core import MTDataCube
+
+# =============================================================================
+
+
+def make_mt_list(n_stations=4, n_periods=6):
+    """Make a list of MT objects with random impedance and tipper."""
+    rng = np.random.default_rng(0)
+    period = np.logspace(-2, 2, n_periods)
+    mt_list = []
+    for ii in range(n_stations):
+        mt_obj = MT(
+            survey="a",
+            station=f"mt{ii:02}",
+            latitude=40 + ii * 0.01,
+            longitude=-118,
+        )
+        mt_obj.period = period
+        mt_obj.impedance = rng.normal(size=(n_periods, 2, 2)) + 1j * (
+            rng.normal(size=(n_periods, 2, 2))
+        )
+        mt_obj.impedance_error = np.abs(rng.normal(size=(n_periods, 2, 2)))
+        mt_obj.tipper = rng.normal(size=(n_periods, 1, 2)) + 1j * (
+            rng.normal(size=(n_periods, 1, 2))
+        )
+        mt_obj.tipper_error = np.abs(rng.normal(size=(n_periods, 1, 2)))
+        mt_list.append(mt_obj)
+    return mt_list
+
+
+class TestMTDataCube(unittest.TestCase):
+    def setUp(self):
+        self.md = MTData(mt_list=make_mt_list(), utm_epsg=32611)
+        self.cube = self.md.build_cube()
+
+    def test_type(self):
+        self.assertIsInstance(self.md.cube, MTDataCube)
+
+    def test_shapes(self):
+        with self.subTest("impedance"):
+            self.assertEqual(self.cube.impedance.shape, (4, 6, 2, 2))
+        with self.subTest("tipper"):
+            self.assertEqual(self.cube.tipper.shape, (4, 6, 1, 2))
+        with self.subTest("latitude"):
+            self.assertEqual(self.cube.latitude.shape, (4,))
+
+    def test_station_keys(self):
+        self.assertListEqual(list(self.md.keys()), self.cube.station_keys)
+
+    def test_values(self):
+        for index, mt_obj in enumerate(self.md.values()):
+            with self.subTest(mt_obj.station):
+                self.assertTrue(
+                    np.all(
+                        mt_obj.impedance.values == self.cube.impedance[index]
+                    )
+                )
+
+    def test_mt_views_cube(self):
+        self.cube.impedance[1] *= 2
+        self.assertTrue(
+            np.all(
+                self.md["a.mt01"].impedance.values == self.cube.impedance[1]
+            )
+        )
+
+    def test_cube_views_mt(self):
+        mt_obj = self.md["a.mt02"]
+        mt_obj.impedance = np.ones((6, 2, 2))
+        self.assertTrue(np.all(self.cube.impedance[2] == 1))
+
+    def test_is_attached(self):
+        self.assertTrue(self.cube.is_attached(self.md))
+
+    def test_add_station_drops_cube(self):
+        md = MTData(mt_list=make_mt_list(), utm_epsg=32611)
+        md.build_cube()
+        md.add_station(MT(survey="a", station="mt10"))
+        self.assertIsNone(md.cube)
+
+    def test_remove_station_drops_cube(self):
+        md = MTData(mt_list=make_mt_list(), utm_epsg=32611)
+        md.build_cube()
+        md.remove_station("mt01", "a")
+        self.assertIsNone(md.cube)
+
+    def test_release_cube(self):
+        md = MTData(mt_list=make_mt_list(), utm_epsg=32611)
+        cube = md.build_cube()
+        md.release_cube()
+        cube.impedance[0] = 0
+        with self.subTest("cube"):
+            self.assertIsNone(md.cube)
+        with self.subTest("data kept"):
+            self.assertTrue(md["a.mt00"].has_impedance())
+
+    def test_different_periods_fail(self):
+        mt_list = make_mt_list()
+        mt_list[0].period = mt_list[0].period * 2
+        md = MTData(mt_list=mt_list, utm_epsg=32611)
+        self.assertRaises(ValueError, md.build_cube)
+
+    def test_different_channels_fail(self):
+        mt_list = make_mt_list()
+        ds = mt_list[0]._transfer_function
+        mt_list[0]._transfer_function = ds.reindex(
+            output=ds.output.values[::-1]
+        )
+        md = MTData(mt_list=mt_list, utm_epsg=32611)
+        self.assertRaises(ValueError, md.build_cube)
+
+    def test_empty_fail(self):
+        self.assertRaises(ValueError, MTData().build_cube)
+
+    def test_rotate(self):
+        md_cube = MTData(mt_list=make_mt_list(), utm_epsg=32611)
+        md_loop = MTData(mt_list=make_mt_list(), utm_epsg=32611)
+        md_cube.build_cube()
+        md_cube.rotate(30)
+        md_loop.rotate(30)
+        with self.subTest("attached"):
+            self.assertIsNotNone(md_cube.cube)
+        for key in md_loop.keys():
+            with self.subTest(f"rotation angle {key}"):
+                self.assertEqual(30, md_cube[key].rotation_angle)
+            for attr in [
+                "impedance",
+                "impedance_error",
+                "tipper",
+                "tipper_error",
+            ]:
+                with self.subTest(f"{attr} {key}"):
+                    self.assertTrue(
+                        np.allclose(
+                            getattr(md_cube[key], attr).values,
+                            getattr(md_loop[key], attr).values,
+                        )
+                    )
+
+    def test_compute_model_errors(self):
+        md = MTData(mt_list=make_mt_list(), utm_epsg=32611)
+        md.compute_model_errors()
+
+        for error_type in ["geometric_mean", "row", "percent"]:
+            md_cube = MTData(mt_list=make_mt_list(), utm_epsg=32611)
+            md_loop = MTData(mt_list=make_mt_list(), utm_epsg=32611)
+            md_cube.build_cube()
+            md_cube.compute_model_errors(z_error_type=error_type)
+            md_loop.compute_model_errors(z_error_type=error_type)
+            for key in md_loop.keys():
+                with self.subTest(f"{error_type} {key}"):
+                    self.assertTrue(
+                        np.allclose(
+                            md_cube[key].impedance_model_error.values,
+                            md_loop[key].impedance_model_error.values,
+                        )
+                    )
+                    self.assertTrue(
+                        np.allclose(
+                            md_cube[key].tipper_model_error.values,
+                            md_loop[key].tipper_model_error.values,
+                        )
+                    )
+
+    def test_compute_phase_tensor(self):
+        pt_dict = self.md.compute_phase_tensor()
+        for index, mt_obj in enumerate(self.md.values()):
+            with self.subTest(mt_obj.station):
+                self.assertTrue(
+                    np.allclose(pt_dict["phimin"][index], mt_obj.pt.phimin)
+                )
+
+    def test_check_mt_data(self):
+        with self.subTest("stackable"):
+            self.assertIsNone(MTDataCube.check_mt_data(self.md))
+        with self.subTest("different periods"):
+            mt_list = make_mt_list()
+            mt_list[0].period = mt_list[0].period * 2
+            md = MTData(mt_list=mt_list, utm_epsg=32611)
+            self.assertIsInstance(MTDataCube.check_mt_data(md), str)
+
+    def test_stack_impedance(self):
+        md = MTData(mt_list=make_mt_list(), utm_epsg=32611)
+        z, z_error, z_model_error = MTDataCube.stack_impedance(md)
+        with self.subTest("impedance"):
+            self.assertTrue(np.all(z == self.cube.impedance))
+        with self.subTest("impedance error"):
+            self.assertTrue(np.all(z_error == self.cube.impedance_error))
+        with self.subTest("no cube"):
+            self.assertIsNone(md.cube)
+
+    def test_to_dataframe_different_periods(self):
+        mt_list = make_mt_list()
+        mt_list[0].period = mt_list[0].period * 2
+        md = MTData(mt_list=mt_list, utm_epsg=32611)
+        df = md.to_dataframe()
+        self.assertEqual(4 * 6, len(df))
+
+    def test_compute_phase_tensor_no_cube(self):
+        md = MTData(mt_list=make_mt_list(), utm_epsg=32611)
+        pt_dict = md.compute_phase_tensor()
+        self.assertEqual(pt_dict["pt"].shape, (4, 6, 2, 2))
+
+    def test_to_xarray(self):
+        ds = self.cube.to_xarray()
+        with self.subTest("dims"):
+            self.assertEqual(
+                ds.transfer_function.dims,
+                ("station", "period", "output", "input"),
+            )
+        with self.subTest("shared memory"):
+            self.assertTrue(
+                np.shares_memory(
+                    ds.transfer_function.values, self.cube.transfer_function
+                )
+            )
+
+
+# =============================================================================
+#
+# =============================================================================
+if __name__ == "__main__":
+    unittest.main()
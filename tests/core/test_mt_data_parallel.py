@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 14:52:31 2026
+
+@author: jpeacock
+"""
+# =============================================================================
+# Imports
+# =============================================================================
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from mtpy import MTData
+from mtpy.core.mt_data_parallel import get_n_jobs, map_stations
+
+from tests.core.test_mt_data_cube import make_mt_list
+
+# =============================================================================
+
+
+def add(a, b):
+    return a + b
+
+
+class TestMapStations(unittest.TestCase):
+    def test_n_jobs(self):
+        with self.subTest("None"):
+            self.assertEqual(get_n_jobs(None), 1)
+        with self.subTest("2"):
+            self.assertEqual(get_n_jobs(2), 2)
+        with self.subTest("-1"):
+            self.assertGreaterEqual(get_n_jobs(-1), 1)
+
+    def test_serial(self):
+        self.assertListEqual(map_stations(add, [(1, 2), (3, 4)]), [3, 7])
+
+    def test_process_pool(self):
+        self.assertListEqual(
+            map_stations(add, [(ii, 1) for ii in range(10)], n_jobs=2),
+            list(range(1, 11)),
+        )
+
+    def test_executor(self):
+        with ThreadPoolExecutor(2) as executor:
+            self.assertListEqual(
+                map_stations(add, [(1, 2), (3, 4)], executor=executor),
+                [3, 7],
+            )
+
+    def test_empty(self):
+        self.assertListEqual(map_stations(add, [], n_jobs=2), [])
+
+
+class TestMTDataParallel(unittest.TestCase):
+    def setUp(self):
+        self.md = MTData(mt_list=make_mt_list(), utm_epsg=32611)
+        self.md_parallel = MTData(mt_list=make_mt_list(), utm_epsg=32611)
+        self.executor = ThreadPoolExecutor(2)
+
+    def tearDown(self):
+        self.executor.shutdown()
+
+    def assert_attribute_close(self, md_01, md_02, attribute):
+        self.assertListEqual(list(md_01.keys()), list(md_02.keys()))
+        for key in md_01.keys():
+            with self.subTest(f"{key} {attribute}"):
+                self.assertTrue(
+                    np.allclose(
+                        getattr(md_01[key], attribute),
+                        getattr(md_02[key], attribute),
+                    )
+                )
+
+    def test_interpolate(self):
+        new_periods = np.logspace(-2, 2, 11)
+        md = self.md.interpolate(new_periods, inplace=False)
+        md_parallel = self.md_parallel.interpolate(
+            new_periods, inplace=False, n_jobs=2
+        )
+        self.assert_attribute_close(md, md_parallel, "impedance")
+        self.assert_attribute_close(md, md_parallel, "tipper_error")
+
+    def test_interpolate_inplace(self):
+        new_periods = np.logspace(-2, 2, 11)
+        self.md.interpolate(new_periods)
+        self.md_parallel.interpolate(new_periods, executor=self.executor)
+        self.assert_attribute_close(self.md, self.md_parallel, "impedance")
+
+    def test_rotate(self):
+        self.md.rotate(30)
+        self.md_parallel.rotate(30, executor=self.executor)
+        self.assert_attribute_close(self.md, self.md_parallel, "impedance")
+        self.assert_attribute_close(self.md, self.md_parallel, "tipper")
+        self.assert_attribute_close(
+            self.md, self.md_parallel, "rotation_angle"
+        )
+
+    def test_rotate_process_pool(self):
+        self.md.rotate(30)
+        self.md_parallel.rotate(30, n_jobs=2)
+        self.assert_attribute_close(self.md, self.md_parallel, "impedance")
+        self.assert_attribute_close(
+            self.md, self.md_parallel, "impedance_error"
+        )
+        self.assert_attribute_close(self.md, self.md_parallel, "tipper")
+        self.assert_attribute_close(
+            self.md, self.md_parallel, "rotation_angle"
+        )
+
+    def test_compute_model_errors_process_pool(self):
+        self.md.compute_model_errors()
+        self.md_parallel.compute_model_errors(n_jobs=2)
+        self.assert_attribute_close(
+            self.md, self.md_parallel, "impedance_model_error"
+        )
+        self.assert_attribute_close(
+            self.md, self.md_parallel, "tipper_model_error"
+        )
+
+    def test_add_white_noise_process_pool(self):
+        md = self.md.add_white_noise(5, inplace=False, n_jobs=2)
+        self.assertListEqual(list(self.md.keys()), list(md.keys()))
+        for key, mt_obj in self.md.items():
+            ratio = np.abs(
+                md[key].impedance.values.real / mt_obj.impedance.values.real
+            )
+            with self.subTest(f"{key} noise level"):
+                self.assertTrue(np.all(np.abs(ratio - 1) <= 0.05 + 1e-12))
+
+    def test_estimate_spatial_static_shift_process_pool(self):
+        for key in self.md.keys():
+            with self.subTest(key):
+                self.assertTrue(
+                    np.allclose(
+                        self.md.estimate_spatial_static_shift(
+                            key, 3000, 0.01, 10
+                        ),
+                        self.md_parallel.estimate_spatial_static_shift(
+                            key, 3000, 0.01, 10, n_jobs=2
+                        ),
+                    )
+                )
+
+    def test_compute_model_errors(self):
+        self.md.compute_model_errors()
+        self.md_parallel.compute_model_errors(executor=self.executor)
+        self.assert_attribute_close(
+            self.md, self.md_parallel, "impedance_model_error"
+        )
+        self.assert_attribute_close(
+            self.md, self.md_parallel, "tipper_model_error"
+        )
+
+    def test_add_white_noise(self):
+        md = self.md.add_white_noise(5, inplace=False, executor=self.executor)
+        for key, mt_obj in self.md.items():
+            ratio = np.abs(
+                md[key].impedance.values.real / mt_obj.impedance.values.real
+            )
+            with self.subTest(f"{key} noise level"):
+                self.assertTrue(np.all(np.abs(ratio - 1) <= 0.05 + 1e-12))
+            with self.subTest(f"{key} original"):
+                self.assertTrue(
+                    np.allclose(
+                        mt_obj.impedance_error,
+                        self.md_parallel[key].impedance_error,
+                    )
+                )
+
+
+# =============================================================================
+#
+# =============================================================================
+if __name__ == "__main__":
+    unittest.main()
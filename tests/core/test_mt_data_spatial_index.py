@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 16:40:12 2026
+
+@author: jpeacock
+"""
+# =============================================================================
+# Imports
+# =============================================================================
+import unittest
+
+import numpy as np
+
+from mtpy import MT, MTData
+from mtpy.core.mt_spatial_index import MTSpatialIndex
+from mtpy.core.mt_stations import MTStations
+
+from tests.core.test_mt_data_cube import make_mt_list
+
+# =============================================================================
+
+
+def make_mt_data(n_stations=12):
+    """Make MTData with stations scattered over ~10 km."""
+    rng = np.random.default_rng(1)
+    mt_list = make_mt_list(n_stations=n_stations)
+    for mt_obj in mt_list:
+        mt_obj.latitude = 40 + rng.random() * 0.1
+        mt_obj.longitude = -118 + rng.random() * 0.1
+    return MTData(mt_list=mt_list, utm_epsg=32611)
+
+
+class TestMTSpatialIndex(unittest.TestCase):
+    def setUp(self):
+        self.md = make_mt_data()
+
+    def brute_force(self, station_key, radius):
+        sdf = self.md.station_locations
+        local = self.md[station_key]
+        distance = np.sqrt(
+            (local.east - sdf.east) ** 2 + (local.north - sdf.north) ** 2
+        )
+        return [
+            f"{row.survey}.{row.station}"
+            for row in sdf.loc[
+                (distance <= radius) & (distance > 0)
+            ].itertuples()
+        ]
+
+    def test_type(self):
+        self.assertIsInstance(self.md.spatial_index, MTSpatialIndex)
+
+    def test_cached(self):
+        self.assertIs(self.md.spatial_index, self.md.spatial_index)
+
+    def test_get_nearby_stations(self):
+        for station_key in self.md.keys():
+            with self.subTest(station_key):
+                self.assertListEqual(
+                    self.md.get_nearby_stations(station_key, 3000),
+                    self.brute_force(station_key, 3000),
+                )
+
+    def test_get_nearby_stations_degrees(self):
+        nearby = self.md.get_nearby_stations("a.mt00", 0.05, "deg")
+        local = self.md["a.mt00"]
+        for station_key in nearby:
+            with self.subTest(station_key):
+                self.assertLessEqual(
+                    np.hypot(
+                        local.longitude - self.md[station_key].longitude,
+                        local.latitude - self.md[station_key].latitude,
+                    ),
+                    0.05,
+                )
+
+    def test_get_nearby_stations_fail(self):
+        self.assertRaises(
+            KeyError, self.md.get_nearby_stations, "a.mt99", 3000
+        )
+
+    def test_add_station_drops_index(self):
+        self.md.spatial_index
+        self.md.add_station(
+            MT(survey="a", station="mt99", latitude=40, longitude=-118)
+        )
+        self.assertIsNone(self.md._spatial_index)
+        self.assertIn("a.mt99", self.md.spatial_index.station_keys)
+
+    def test_remove_station_drops_index(self):
+        self.md.spatial_index
+        self.md.remove_station("mt01", "a")
+        self.assertIsNone(self.md._spatial_index)
+        self.assertNotIn("a.mt01", self.md.spatial_index.station_keys)
+
+    def test_distance_to_line(self):
+        self.assertTrue(
+            np.allclose(
+                self.md._distance_to_line(4e5, 4.4e6, 4.1e5, 4.5e6),
+                MTStations._distance_to_line(
+                    self.md, 4e5, 4.4e6, 4.1e5, 4.5e6
+                ),
+            )
+        )
+
+    def test_get_profile(self):
+        profile = self.md.get_profile(-118, 40, -117.9, 40.1, 2000)
+        self.assertGreater(len(profile), 0)
+        offsets = [mt_obj.profile_offset for mt_obj in profile.values()]
+        self.assertListEqual(offsets, sorted(offsets))
+
+    def test_estimate_spatial_static_shift_all(self):
+        static_shifts = self.md.estimate_spatial_static_shift_all(
+            3000, 0.01, 10
+        )
+        self.assertListEqual(list(static_shifts.keys()), list(self.md.keys()))
+        for station_key in self.md.keys():
+            with self.subTest(station_key):
+                self.assertTrue(
+                    np.allclose(
+                        static_shifts[station_key],
+                        self.md.estimate_spatial_static_shift(
+                            station_key, 3000, 0.01, 10
+                        ),
+                    )
+                )
+
+
+# =============================================================================
+#
+# =============================================================================
+if __name__ == "__main__":
+    unittest.main()
@@ -102,6 +102,49 @@ class TestMTDataFrame(unittest.TestCase):
         new_t = new_df.to_t_object()
         self.assertTrue(self.m1.Tipper == new_t)
 
+    def test_get_station_block(self):
+        new_df = MTDataFrame(n_entries=self.sdf.size)
+        new_df.station = self.m1.station
+        new_df.from_z_object(self.m1.Z)
+        new_df.from_t_object(self.m1.Tipper)
+
+        block = MTDataFrame().get_station_block(
+            self.m1.period, z_object=self.m1.Z, t_object=self.m1.Tipper
+        )
+        block["station"] = new_df.dataframe.station
+
+        self.assertTrue(new_df.dataframe.equals(block))
+
+    def test_from_z_object_multiple_stations(self):
+        n = self.sdf.size
+        new_df = MTDataFrame(n_entries=2 * n)
+        new_df.dataframe.loc[n:, "station"] = "other"
+        new_df.working_station = ""
+        new_df.from_z_object(self.m1.Z)
+
+        with self.subTest("filled"):
+            self.assertTrue(
+                np.all(
+                    new_df.dataframe.z_xy.values[:n] == self.m1.Z.z[:, 0, 1]
+                )
+            )
+        with self.subTest("other station untouched"):
+            self.assertTrue(np.all(new_df.dataframe.z_xy.values[n:] == 0))
+
+    def test_compute_phase_tensor(self):
+        new_df = MTDataFrame(self.sdf.dataframe.copy())
+        pt_cols = [col for col in new_df._pt_attrs]
+        new_df.dataframe.loc[:, pt_cols] = 0
+        pt_df = new_df.phase_tensor
+
+        self.assertTrue(
+            np.allclose(
+                pt_df.pt_phimin.values,
+                self.sdf.dataframe.pt_phimin.values,
+                equal_nan=True,
+            )
+        )
+
     def test_pt_df(self):
         pt_df = self.sdf.phase_tensor
 
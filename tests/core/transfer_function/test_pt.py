@@ -10,7 +10,10 @@ Created on Tue Nov  8 13:04:38 2022
 import unittest
 import numpy as np
 
-from mtpy.core.transfer_function.pt import PhaseTensor
+from mtpy.core.transfer_function.pt import (
+    PhaseTensor,
+    compute_phase_tensor,
+)
 
 # =============================================================================
 
@@ -147,6 +150,74 @@ class TestZSetResPhase(unittest.TestCase):
         self.assertTrue(np.all(np.isnan(self.pt.eccentricity_error)))
 
 
+class TestComputePhaseTensorStack(unittest.TestCase):
+    @classmethod
+    def setUpClass(self):
+        rng = np.random.default_rng(1)
+        self.z = rng.normal(size=(3, 5, 2, 2)) + 1j * rng.normal(
+            size=(3, 5, 2, 2)
+        )
+        self.z_error = np.abs(rng.normal(size=(3, 5, 2, 2)))
+        self.z_model_error = np.abs(rng.normal(size=(3, 5, 2, 2)))
+        # station without errors
+        self.z_error[2] = 0
+        self.pt_dict = compute_phase_tensor(
+            self.z, self.z_error, self.z_model_error
+        )
+        self.attrs = [
+            "phimin",
+            "phimax",
+            "azimuth",
+            "skew",
+            "ellipticity",
+            "det",
+        ]
+
+    def test_shapes(self):
+        with self.subTest("pt"):
+            self.assertEqual(self.pt_dict["pt"].shape, (3, 5, 2, 2))
+        for attr in self.attrs:
+            with self.subTest(attr):
+                self.assertEqual(self.pt_dict[attr].shape, (3, 5))
+
+    def test_match_phase_tensor(self):
+        for ii in range(2):
+            pt = PhaseTensor(
+                z=self.z[ii],
+                z_error=self.z_error[ii],
+                z_model_error=self.z_model_error[ii],
+            )
+            for error in ["", "_error", "_model_error"]:
+                with self.subTest(f"{ii} pt{error}"):
+                    self.assertTrue(
+                        np.allclose(
+                            self.pt_dict[f"pt{error}"][ii],
+                            getattr(pt, f"pt{error}"),
+                            equal_nan=True,
+                        )
+                    )
+                for attr in self.attrs:
+                    with self.subTest(f"{ii} {attr}{error}"):
+                        self.assertTrue(
+                            np.allclose(
+                                self.pt_dict[f"{attr}{error}"][ii],
+                                getattr(pt, f"{attr}{error}"),
+                                equal_nan=True,
+                            )
+                        )
+
+    def test_no_error_station_is_zero(self):
+        with self.subTest("pt_error"):
+            self.assertTrue(np.all(self.pt_dict["pt_error"][2] == 0))
+        for attr in self.attrs:
+            with self.subTest(attr):
+                self.assertTrue(np.all(self.pt_dict[f"{attr}_error"][2] == 0))
+
+    def test_no_input_error(self):
+        pt_dict = compute_phase_tensor(self.z)
+        self.assertIsNone(pt_dict["phimin_error"])
+
+
 # =============================================================================
 # Run
 # =============================================================================
@@ -543,6 +543,106 @@ class TestTFInterpolationFillNans(unittest.TestCase):
                 )
 
 
+class TestTFInterpolationNumpyEngine(unittest.TestCase):
+    @classmethod
+    def setUpClass(self):
+        self.n = 12
+        self.period = np.logspace(-3, 3, self.n)
+        self.t = np.linspace(0, 24, 4 * self.n) * 0.1
+        self.tf = np.array(
+            [
+                np.cos(pp * np.pi * 2 * 10 * self.t)
+                + 1j * np.sin(pp * np.pi * 2 * 10 * self.t)
+                for pp in self.period
+            ]
+        ).sum(axis=0)
+
+        self.tf = self.tf.reshape((self.n, 2, 2))
+        self.tf[0:1] = np.nan + 1j * np.nan
+        self.tf[5, 0, 1] = np.nan + 1j * np.nan
+        self.tf[-2:] = np.nan + 1j * np.nan
+
+        self.tf_base = TFBase(
+            tf=self.tf,
+            tf_error=np.abs(self.tf) * 0.05,
+            tf_model_error=np.abs(self.tf) * 0.10,
+            frequency=1.0 / self.period,
+        )
+        self.new_period = np.logspace(-4, 4, 24)
+
+    def compare(self, **kwargs):
+        # xarray applies pchip to complex values directly, the numpy engine
+        # interpolates real and imaginary parts separately
+        kwargs.setdefault("na_method", "slinear")
+        tf_xarray = self.tf_base.interpolate(self.new_period, **kwargs)
+        tf_numpy = self.tf_base.interpolate(
+            self.new_period, engine="numpy", **kwargs
+        )
+        for key in tf_xarray._dataset.data_vars:
+            with self.subTest(key):
+                self.assertTrue(
+                    np.allclose(
+                        tf_xarray._dataset[key].values,
+                        tf_numpy._dataset[key].values,
+                        equal_nan=True,
+                    )
+                )
+
+    def test_default(self):
+        self.compare()
+
+    def test_cubic(self):
+        self.compare(method="cubic", na_method="linear")
+
+    def test_log_space(self):
+        self.compare(log_space=True)
+
+    def test_extrapolate(self):
+        self.compare(extrapolate=True)
+
+    def test_dtype(self):
+        tf_numpy = self.tf_base.interpolate(self.new_period, engine="numpy")
+        self.assertEqual(
+            tf_numpy._dataset.transfer_function.dtype,
+            self.tf_base._dataset.transfer_function.dtype,
+        )
+
+    def test_inplace(self):
+        tf_base = self.tf_base.copy()
+        tf_base.interpolate(self.new_period, inplace=True, engine="numpy")
+        self.assertTrue(np.allclose(tf_base.period, self.new_period))
+
+    def test_single_edge_nan(self):
+        tf = np.ones((6, 2, 2), dtype=complex)
+        tf[0, 0, 0] = np.nan
+        tf_base = TFBase(tf=tf, frequency=np.logspace(0, -2, 6))
+        new_tf = tf_base.interpolate(
+            np.array([1.2, 50]), engine="numpy", na_method="linear"
+        )
+        with self.subTest("edge"):
+            self.assertTrue(
+                np.isnan(new_tf._dataset.transfer_function.values[0, 0, 0])
+            )
+        with self.subTest("inside"):
+            self.assertEqual(
+                new_tf._dataset.transfer_function.values[1, 0, 0], 1
+            )
+
+    def test_bad_engine(self):
+        self.assertRaises(
+            ValueError, self.tf_base.interpolate, self.period, engine="fail"
+        )
+
+    def test_bad_method(self):
+        self.assertRaises(
+            ValueError,
+            self.tf_base.interpolate,
+            self.period,
+            method="fail",
+            engine="numpy",
+        )
+
+
 # =============================================================================
 # Run
 # =============================================================================
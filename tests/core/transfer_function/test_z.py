@@ -605,6 +605,57 @@ class TestUnits(unittest.TestCase):
             self.assertTrue(np.allclose(z_ohm.phase, z_mt.phase))
 
 
+class TestZCache(unittest.TestCase):
+    def setUp(self):
+        self.z = Z(
+            z=np.array([[[0.1 - 0.1j, 10 + 10j], [-10 - 10j, -0.1 + 0.1j]]]),
+            z_error=np.array([[[0.1, 0.05], [0.05, 0.1]]]),
+            frequency=np.array([1]),
+        )
+
+    def test_cached(self):
+        self.z.resistivity
+        self.assertIn("resistivity", self.z._cache)
+
+    def test_returns_copy(self):
+        res = self.z.resistivity
+        res[:] = 0
+        self.assertFalse(np.all(self.z.resistivity == 0))
+
+    def test_setter_invalidates(self):
+        res = self.z.resistivity
+        self.z.z = self.z.z * 2
+        self.assertTrue(np.allclose(self.z.resistivity, 4 * res))
+
+    def test_rotate_invalidates(self):
+        self.z.phase_tensor
+        self.z.rotate(30, inplace=True)
+        self.assertTrue(
+            np.allclose(
+                self.z.phase_tensor.pt,
+                self.z.rotate(0).phase_tensor.pt,
+            )
+        )
+
+    def test_remove_ss_invalidates(self):
+        res = self.z.resistivity
+        self.z.remove_ss(
+            reduce_res_factor_x=2, reduce_res_factor_y=2, inplace=True
+        )
+        self.assertTrue(np.allclose(self.z.resistivity, res / 2))
+
+    def test_units_invalidate(self):
+        self.z.resistivity
+        self.z.units = "ohm"
+        self.assertNotEqual(
+            self.z._cache["resistivity"][0], self.z._cache_key()
+        )
+
+    def test_copy_has_empty_cache(self):
+        self.z.resistivity
+        self.assertDictEqual(self.z.copy()._cache, {})
+
+
 # =============================================================================
 # Run
 # =============================================================================
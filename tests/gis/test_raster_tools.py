@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 10:58:16 2026
+
+@author: jpeacock
+"""
+
+# =============================================================================
+# Imports
+# =============================================================================
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import rasterio
+from rasterio.transform import Affine
+
+from mtpy.core.mt_location import MTLocation
+from mtpy.gis.raster_tools import array2multiband_raster
+
+# =============================================================================
+
+# some versions of affine and python cannot multiply transforms
+try:
+    Affine.translation(0, 0) * Affine.scale(1, 1)
+    has_affine = True
+except TypeError:
+    has_affine = False
+
+
+class TestArray2MultibandRaster(unittest.TestCase):
+    def setUp(self):
+        self.lower_left = MTLocation(
+            latitude=40, longitude=-118, utm_epsg=32611
+        )
+        self.array = np.ones((10, 12, 3))
+
+    def test_lower_left_fail(self):
+        self.assertRaises(
+            TypeError,
+            array2multiband_raster,
+            "test.tif",
+            self.array,
+            (0, 0),
+            10,
+            10,
+            32611,
+        )
+
+    def test_2d_array_fail(self):
+        self.assertRaises(
+            TypeError,
+            array2multiband_raster,
+            "test.tif",
+            self.array[:, :, 0],
+            self.lower_left,
+            10,
+            10,
+            32611,
+        )
+
+    def test_band_descriptions_fail(self):
+        self.assertRaises(
+            ValueError,
+            array2multiband_raster,
+            "test.tif",
+            self.array,
+            self.lower_left,
+            10,
+            10,
+            32611,
+            band_descriptions=["a", "b"],
+        )
+
+    def test_band_tags_fail(self):
+        self.assertRaises(
+            ValueError,
+            array2multiband_raster,
+            "test.tif",
+            self.array,
+            self.lower_left,
+            10,
+            10,
+            32611,
+            band_tags=[{"depth": 0}],
+        )
+
+
+@unittest.skipIf(not has_affine, "Affine transforms cannot be composed")
+class TestArray2MultibandRasterRoundTrip(unittest.TestCase):
+    @classmethod
+    def setUpClass(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.save_path = Path(self.temp_dir.name)
+        self.lower_left = MTLocation(
+            latitude=40, longitude=-118, utm_epsg=32611
+        )
+        self.array = np.random.default_rng(0).normal(size=(40, 36, 3))
+        self.band_descriptions = [
+            f"{ii:02}_depth_{ii * 10:.2f}m" for ii in range(3)
+        ]
+        self.band_tags = [
+            {"depth_index": ii, "depth": ii * 10.0, "depth_units": "m"}
+            for ii in range(3)
+        ]
+
+    @classmethod
+    def tearDownClass(self):
+        self.temp_dir.cleanup()
+
+    def check_round_trip(self, driver):
+        raster_fn = array2multiband_raster(
+            self.save_path.joinpath(f"test_{driver}.tif"),
+            self.array,
+            self.lower_left,
+            10,
+            10,
+            32611,
+            band_descriptions=self.band_descriptions,
+            band_tags=self.band_tags,
+            driver=driver,
+            block_size=16,
+        )
+        with rasterio.open(raster_fn) as dataset:
+            with self.subTest("count"):
+                self.assertEqual(3, dataset.count)
+            with self.subTest("data"):
+                self.assertTrue(
+                    np.allclose(
+                        np.moveaxis(dataset.read(), 0, 2), self.array
+                    )
+                )
+            with self.subTest("descriptions"):
+                self.assertListEqual(
+                    self.band_descriptions, list(dataset.descriptions)
+                )
+            for band, tags in enumerate(self.band_tags, 1):
+                with self.subTest(f"tags {band}"):
+                    self.assertDictEqual(
+                        dict([(k, str(v)) for k, v in tags.items()]),
+                        dataset.tags(band),
+                    )
+            with self.subTest("tiled"):
+                self.assertTupleEqual((16, 16), dataset.block_shapes[0])
+            with self.subTest("compression"):
+                self.assertEqual("deflate", dataset.compression.value.lower())
+
+    def test_gtiff(self):
+        self.check_round_trip("GTiff")
+
+    def test_cog(self):
+        self.check_round_trip("COG")
+
+
+# =============================================================================
+#
+# =============================================================================
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 09:31:18 2026
+
+@author: jpeacock
+"""
+# =============================================================================
+# Imports
+# =============================================================================
+from pathlib import Path
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from mtpy import MT, MTData
+from mtpy.modeling.modem import Data, Model, ModEMCache
+
+# =============================================================================
+
+
+class TestModEMCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache = ModEMCache(
+            cache_dir=Path(self.temp_dir.name).joinpath("cache")
+        )
+        self.fn = Path(self.temp_dir.name).joinpath("file.txt")
+        self.fn.write_text("a")
+        self.arrays = {"a": np.arange(5.0), "b": np.array(["x", "y"])}
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_miss(self):
+        self.assertIsNone(self.cache.get(self.fn))
+
+    def test_put_get(self):
+        self.cache.put(self.fn, self.arrays)
+        arrays = self.cache.get(self.fn)
+        self.assertListEqual(list(arrays.keys()), ["a", "b"])
+        for key, value in self.arrays.items():
+            with self.subTest(key):
+                self.assertTrue(np.array_equal(arrays[key], value))
+
+    def test_file_changed(self):
+        self.cache.put(self.fn, self.arrays)
+        self.fn.write_text("ab")
+        self.assertIsNone(self.cache.get(self.fn))
+        self.cache.put(self.fn, self.arrays)
+        self.assertEqual(len(list(self.cache.cache_dir.glob("*.npz"))), 1)
+
+    def test_corrupt(self):
+        self.cache.put(self.fn, self.arrays).write_bytes(b"not a zip")
+        self.assertIsNone(self.cache.get(self.fn))
+        self.assertFalse(self.cache.get_cache_fn(self.fn).exists())
+
+    def test_evict(self):
+        fn_list = []
+        for ii in range(3):
+            fn = Path(self.temp_dir.name).joinpath(f"file_{ii}.txt")
+            fn.write_text(f"{ii}")
+            cache_fn = self.cache.put(fn, {"a": np.arange(1000.0)})
+            os.utime(cache_fn, ns=(ii * 10**9, ii * 10**9))
+            fn_list.append(fn)
+        entry_size = self.cache.get_cache_fn(fn_list[0]).stat().st_size
+
+        self.cache.evict(max_size=2 * entry_size)
+        self.assertIsNone(self.cache.get(fn_list[0]))
+        self.assertIsNotNone(self.cache.get(fn_list[1]))
+        self.assertIsNotNone(self.cache.get(fn_list[2]))
+
+        self.cache.clear()
+        self.assertEqual(self.cache.size, 0)
+
+
+class TestDataCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(self):
+        rng = np.random.default_rng(0)
+        mt_list = []
+        for ii in range(3):
+            mt_obj = MT(
+                survey="a",
+                station=f"mt{ii:02}",
+                latitude=40 + ii * 0.01,
+                longitude=-118 + ii * 0.01,
+            )
+            mt_obj.period = np.logspace(-2, 2, 5)
+            mt_obj.impedance = rng.normal(size=(5, 2, 2)) + 1j * rng.normal(
+                size=(5, 2, 2)
+            )
+            mt_obj.impedance_error = np.abs(rng.normal(size=(5, 2, 2)))
+            mt_list.append(mt_obj)
+        md = MTData(mt_list=mt_list, utm_epsg=32611)
+        md.compute_model_errors()
+
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_fn = Path(self.temp_dir.name).joinpath("ModEM_Data.dat")
+        md.to_modem(self.data_fn)
+        self.cache = ModEMCache(
+            cache_dir=Path(self.temp_dir.name).joinpath("cache")
+        )
+
+        self.d = Data()
+        self.mdf = self.d.read_data_file(self.data_fn)
+        Data(cache=self.cache).read_data_file(self.data_fn)
+        self.d_cache = Data(cache=self.cache)
+        self.mdf_cache = self.d_cache.read_data_file(self.data_fn)
+
+    @classmethod
+    def tearDownClass(self):
+        self.temp_dir.cleanup()
+
+    def test_cached(self):
+        self.assertIsNotNone(self.cache.get(self.data_fn))
+
+    def test_dataframe(self):
+        pd.testing.assert_frame_equal(
+            self.mdf.dataframe, self.mdf_cache.dataframe
+        )
+
+    def test_header(self):
+        for attr in ["inv_mode", "rotation_angle", "z_units"]:
+            with self.subTest(attr):
+                self.assertEqual(
+                    getattr(self.d, attr), getattr(self.d_cache, attr)
+                )
+        self.assertEqual(self.d.center_point, self.d_cache.center_point)
+
+
+class TestModelCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache = ModEMCache(
+            cache_dir=Path(self.temp_dir.name).joinpath("cache")
+        )
+
+        rng = np.random.default_rng(0)
+        m = Model()
+        m.nodes_north = np.full(15, 100.0)
+        m.nodes_east = np.full(12, 100.0)
+        m.nodes_z = np.linspace(10, 100, 8)
+        m.res_model = 10 ** rng.uniform(-1, 4, (15, 12, 8))
+        m.model_fn = Path(self.temp_dir.name).joinpath("ModEM_Model.rho")
+        m.write_model_file()
+        self.model_fn = m.model_fn
+
+        self.m = Model()
+        self.m.read_model_file(self.model_fn)
+        Model(cache=self.cache).read_model_file(self.model_fn)
+        self.m_cache = Model(cache=self.cache)
+        self.m_cache.read_model_file(self.model_fn)
+
+    @classmethod
+    def tearDownClass(self):
+        self.temp_dir.cleanup()
+
+    def test_cached(self):
+        self.assertIsNotNone(self.cache.get(self.model_fn))
+
+    def test_arrays(self):
+        for attr in [
+            "nodes_north",
+            "nodes_east",
+            "nodes_z",
+            "grid_north",
+            "grid_east",
+            "grid_z",
+            "grid_center",
+            "res_model",
+        ]:
+            with self.subTest(attr):
+                self.assertTrue(
+                    np.array_equal(
+                        getattr(self.m, attr), getattr(self.m_cache, attr)
+                    )
+                )
+
+    def test_attributes(self):
+        for attr in [
+            "title",
+            "mesh_rotation_angle",
+            "cell_size_east",
+            "pad_east",
+        ]:
+            with self.subTest(attr):
+                self.assertEqual(
+                    getattr(self.m, attr), getattr(self.m_cache, attr)
+                )
+
+
+# =============================================================================
+#
+# =============================================================================
+if __name__ == "__main__":
+    unittest.main()
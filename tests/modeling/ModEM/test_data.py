@@ -8,9 +8,14 @@ Created on Thu Apr 18 12:39:47 2024
 # Imports
 # =============================================================================
 from pathlib import Path
+import tempfile
 import unittest
 
-from mtpy.modeling.modem import Data
+import numpy as np
+import pandas as pd
+
+from mtpy import MT, MTData
+from mtpy.modeling.modem import Data, Residual
 
 # =============================================================================
 
@@ -39,6 +44,117 @@ class TestData(unittest.TestCase):
                 self.assertEqual(new, self.d._change_comp(og))
 
 
+class TestReadDataFile(unittest.TestCase):
+    @classmethod
+    def setUpClass(self):
+        rng = np.random.default_rng(0)
+        self.period = np.logspace(-2, 2, 5)
+        mt_list = []
+        for ii in range(3):
+            mt_obj = MT(
+                survey="a",
+                station=f"mt{ii:02}",
+                latitude=40 + ii * 0.01,
+                longitude=-118 + ii * 0.01,
+            )
+            mt_obj.period = self.period
+            mt_obj.impedance = rng.normal(size=(5, 2, 2)) + 1j * rng.normal(
+                size=(5, 2, 2)
+            )
+            mt_obj.impedance_error = np.abs(rng.normal(size=(5, 2, 2)))
+            mt_obj.tipper = rng.normal(size=(5, 1, 2)) + 1j * rng.normal(
+                size=(5, 1, 2)
+            )
+            mt_obj.tipper_error = np.abs(rng.normal(size=(5, 1, 2)))
+            mt_list.append(mt_obj)
+        self.md = MTData(mt_list=mt_list, utm_epsg=32611)
+        self.md.compute_model_errors()
+
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_fn = Path(self.temp_dir.name).joinpath("ModEM_Data.dat")
+        self.md.to_modem(self.data_fn)
+
+        with open(self.data_fn) as fid:
+            self.data_lines = [
+                line
+                for line in fid.read().splitlines()
+                if "#" not in line and ">" not in line
+            ]
+
+        self.d = Data()
+        self.mdf = self.d.read_data_file(self.data_fn)
+
+    def test_read_data_lines(self):
+        pd.testing.assert_frame_equal(
+            pd.DataFrame(
+                [self.d._read_line(line) for line in self.data_lines]
+            ),
+            self.d._read_data_lines(self.data_lines),
+        )
+
+    def test_skip_bad_lines(self):
+        df = self.d._read_data_lines(
+            self.data_lines[0:2] + ["1 2 3", self.data_lines[2] + " 4"]
+        )
+        self.assertEqual(len(df), 2)
+
+    def test_n_rows(self):
+        self.assertEqual(len(self.mdf.dataframe), 15)
+
+    def test_impedance(self):
+        for mt_obj in self.md.values():
+            with self.subTest(mt_obj.station):
+                df = self.mdf.dataframe.loc[
+                    self.mdf.dataframe.station == mt_obj.station
+                ]
+                self.assertTrue(
+                    np.allclose(
+                        df.z_xy.to_numpy(),
+                        mt_obj.impedance.values[:, 0, 1],
+                        rtol=1e-4,
+                    )
+                )
+
+    def write_comp_lines(self, d, comps):
+        lines = []
+        for station in d.dataframe.station.unique():
+            sdf = d.dataframe.loc[d.dataframe.station == station]
+            for row in sdf.itertuples():
+                for comp in comps:
+                    line = d._write_comp(row, comp)
+                    if line is not None:
+                        lines.append(line)
+        return lines
+
+    def test_get_data_lines(self):
+        df = self.md.to_dataframe()
+        df.loc[1, "z_xx"] = np.nan + 1j * np.nan
+        df.loc[2, "z_xy_model_error"] = np.nan
+        df.loc[3, "t_zx"] = 1 + 0j
+        comps = ["z_xx", "z_xy", "z_yx", "z_yy", "t_zx", "t_zy"]
+        for formatting in ["1", "2"]:
+            for z_units in ["[mV/km]/[nT]", "ohm"]:
+                d = Data(
+                    dataframe=df.copy(),
+                    formatting=formatting,
+                    z_units=z_units,
+                )
+                with self.subTest(f"{formatting} {z_units}"):
+                    self.assertListEqual(
+                        self.write_comp_lines(d, comps),
+                        d._get_data_lines(comps),
+                    )
+
+    def test_residual(self):
+        residual = Residual()
+        residual.read_residual_file(self.data_fn)
+        self.assertIn("rms_zxy", residual.dataframe.columns)
+
+    @classmethod
+    def tearDownClass(self):
+        self.temp_dir.cleanup()
+
+
 # =============================================================================
 # run
 # =============================================================================
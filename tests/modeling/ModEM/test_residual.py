@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 09:52:44 2026
+
+@author: jpeacock
+"""
+# =============================================================================
+# Imports
+# =============================================================================
+from pathlib import Path
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from mtpy import MT, MTData
+from mtpy.modeling.modem import Residual, rms_summary
+from mtpy.modeling.plots import PlotRMS
+
+# =============================================================================
+
+
+class TestResidualRMS(unittest.TestCase):
+    @classmethod
+    def setUpClass(self):
+        rng = np.random.default_rng(0)
+        self.period = np.logspace(-2, 2, 5)
+        mt_list = []
+        for ii in range(4):
+            mt_obj = MT(
+                survey="a",
+                station=f"mt{ii:02}",
+                latitude=40 + ii * 0.01,
+                longitude=-118 + ii * 0.01,
+            )
+            mt_obj.period = self.period
+            mt_obj.impedance = rng.normal(size=(5, 2, 2)) + 1j * rng.normal(
+                size=(5, 2, 2)
+            )
+            mt_obj.impedance_error = np.abs(rng.normal(size=(5, 2, 2)))
+            # leave the tipper off one station
+            if ii > 0:
+                mt_obj.tipper = rng.normal(size=(5, 1, 2)) + 1j * rng.normal(
+                    size=(5, 1, 2)
+                )
+                mt_obj.tipper_error = np.abs(rng.normal(size=(5, 1, 2)))
+            mt_list.append(mt_obj)
+        md = MTData(mt_list=mt_list, utm_epsg=32611)
+        md.compute_model_errors()
+
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.residual_fn = Path(self.temp_dir.name).joinpath("ModEM.res")
+        md.to_modem(self.residual_fn)
+
+        self.residual = Residual()
+        self.residual.read_residual_file(self.residual_fn)
+        self.df = self.residual.dataframe
+        self.comps = self.residual.rms_components
+        self.plot_rms = PlotRMS(self.df)
+
+    @classmethod
+    def tearDownClass(self):
+        self.temp_dir.cleanup()
+
+    def loop_mean(self, key, comps):
+        """Mean of the component means for each unique value of key."""
+        means = {}
+        for value in self.df[key].unique():
+            means[value] = (
+                self.df.loc[self.df[key] == value, comps].mean().mean()
+            )
+        return pd.Series(means)
+
+    def test_rms_per_period_all(self):
+        df = self.residual.rms_per_period_all
+        self.assertListEqual(list(df.columns), ["rms_z", "rms_t"])
+        self.assertTrue(
+            np.allclose(df.rms_z, self.loop_mean("period", self.comps[0:4]))
+        )
+        self.assertTrue(
+            np.allclose(df.rms_t, self.loop_mean("period", self.comps[4:]))
+        )
+
+    def test_rms_per_period_per_component(self):
+        df = self.residual.rms_per_period_per_component
+        self.assertListEqual(list(df.columns), self.comps)
+        for comp in self.comps:
+            with self.subTest(comp):
+                self.assertTrue(
+                    np.allclose(df[comp], self.loop_mean("period", [comp]))
+                )
+
+    def test_rms_summary(self):
+        summary = self.residual.rms_summary()
+        self.assertListEqual(
+            list(summary.keys()), ["station", "period", "component", "total"]
+        )
+        self.assertTrue(
+            np.allclose(
+                summary["station"].rms_z,
+                self.loop_mean("station", self.comps[0:4]),
+            )
+        )
+        self.assertTrue(
+            np.allclose(
+                summary["station"].rms_t,
+                self.loop_mean("station", self.comps[4:]),
+                equal_nan=True,
+            )
+        )
+        self.assertTrue(
+            np.allclose(summary["component"].rms, self.df[self.comps].mean())
+        )
+        self.assertAlmostEqual(
+            summary["total"].loc["total", "rms"],
+            self.df[self.comps].mean().mean(),
+        )
+        self.assertTrue(summary["period"].index.is_monotonic_increasing)
+
+    def test_rms_summary_stacked(self):
+        summary = rms_summary(
+            [self.residual_fn, self.residual], names=["fn", "obj"]
+        )
+        self.assertListEqual(
+            summary["station"].index.names, ["run", "station"]
+        )
+        pd.testing.assert_frame_equal(
+            summary["total"].loc["fn"], summary["total"].loc["obj"]
+        )
+
+    def test_rms_summary_names_fail(self):
+        self.assertRaises(
+            ValueError, rms_summary, [self.residual_fn], names=["a", "b"]
+        )
+
+    def test_plot_rms_per_station(self):
+        df = self.plot_rms.rms_per_station
+        self.assertTrue(
+            np.allclose(df.rms_z, self.loop_mean("station", self.comps[0:4]))
+        )
+
+    def test_plot_rms_array(self):
+        rms_array = self.plot_rms.rms_array
+        self.assertTupleEqual(rms_array.shape, (4, 5, 6))
+        for row in self.df.itertuples():
+            s_index = list(self.df.station.unique()).index(row.station)
+            p_index = list(self.df.period.unique()).index(row.period)
+            for ii, comp in enumerate(self.comps):
+                self.assertTrue(
+                    np.allclose(
+                        rms_array[s_index, p_index, ii],
+                        getattr(row, comp),
+                        equal_nan=True,
+                    )
+                )
+
+
+# =============================================================================
+#
+# =============================================================================
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 10:12:05 2026
+
+@author: jpeacock
+"""
+# =============================================================================
+# Imports
+# =============================================================================
+import unittest
+
+import numpy as np
+
+from mtpy.modeling.modem import Model
+from mtpy.modeling.structured_mesh_3d import StructuredGrid3D
+
+# =============================================================================
+
+
+def loop_assign(model, res_model, top, bottom, value):
+    """Assign resistivity one (north, east) column at a time."""
+    gcz = np.mean([model.grid_z[:-1], model.grid_z[1:]], axis=0)
+    for j in range(res_model.shape[0]):
+        for i in range(res_model.shape[1]):
+            ii = np.where((gcz > top[j, i]) & (gcz <= bottom[j, i]))[0]
+            res_model[j, i, ii] = value
+    return res_model
+
+
+class TestAssignResistivityFromSurfaceData(unittest.TestCase):
+    """Same tests for every model class that assigns resistivity from
+    surfaces."""
+
+    model_classes = [Model, StructuredGrid3D]
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.top = np.zeros((12, 10))
+        self.bottom = rng.uniform(-50, 1000, (12, 10))
+
+    def make_model(self, model_class):
+        model = model_class()
+        model.nodes_north = np.full(12, 100.0)
+        model.nodes_east = np.full(10, 100.0)
+        model.nodes_z = np.linspace(10, 200, 15)
+        model.res_model = np.full((12, 10, 15), 100.0)
+        return model
+
+    def test_assign_resistivity_from_surface_data(self):
+        for model_class in self.model_classes:
+            with self.subTest(model_class.__name__):
+                model = self.make_model(model_class)
+                top = self.top + model.grid_z[0]
+                res_model = loop_assign(
+                    model, model.res_model.copy(), top, self.bottom, 1e12
+                )
+                model.assign_resistivity_from_surface_data(
+                    top, self.bottom, 1e12
+                )
+                self.assertTrue(np.array_equal(model.res_model, res_model))
+
+    def test_assign_bathymetry(self):
+        bottom = self.bottom - 500
+        for model_class in self.model_classes:
+            with self.subTest(model_class.__name__):
+                model = self.make_model(model_class)
+                res_model = loop_assign(
+                    model, model.res_model.copy(), self.top, bottom, 0.3
+                )
+                model.assign_resistivity_from_surface_data(
+                    self.top, bottom, 0.3
+                )
+                self.assertTrue(np.array_equal(model.res_model, res_model))
+                self.assertGreater((model.res_model == 0.3).sum(), 0)
+
+
+# =============================================================================
+#
+# =============================================================================
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 08:35:21 2026
+
+@author: jpeacock
+"""
+# =============================================================================
+# Imports
+# =============================================================================
+import unittest
+
+import numpy as np
+from scipy.interpolate import griddata
+
+from mtpy.modeling import mesh_tools
+
+# =============================================================================
+
+
+class TestModEMResistivity(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.n_north, self.n_east, self.n_z = 7, 5, 4
+        self.res_model = np.log(
+            10 ** rng.uniform(-1, 4, (self.n_north, self.n_east, self.n_z))
+        )
+        self.layers = mesh_tools.format_modem_resistivity(self.res_model)
+
+    def make_lines(self, trailing_blank=True):
+        lines = ["# header"] + [""] * 5
+        for layer_lines in self.layers:
+            lines += layer_lines
+            lines.append("")
+        if not trailing_blank:
+            lines.pop()
+        lines.append("0 0 0")
+        return lines
+
+    def test_format(self):
+        for zz, layer_lines in enumerate(self.layers):
+            with self.subTest(zz):
+                self.assertListEqual(
+                    layer_lines,
+                    [
+                        "".join(
+                            [
+                                f"{self.res_model[nn, ee, zz]:>13.5E}"
+                                for nn in range(self.n_north)
+                            ]
+                        )
+                        for ee in range(self.n_east)
+                    ],
+                )
+
+    def test_read(self):
+        for trailing_blank in [True, False]:
+            with self.subTest(trailing_blank=trailing_blank):
+                lines = self.make_lines(trailing_blank)
+                res_model, line_index = mesh_tools.read_modem_resistivity(
+                    lines, self.n_north, self.n_east, self.n_z
+                )
+                self.assertTrue(
+                    np.allclose(res_model, self.res_model[::-1], rtol=1e-5)
+                )
+                self.assertEqual(lines[line_index], "0 0 0")
+
+    def test_read_fail(self):
+        lines = self.make_lines()
+        self.assertRaises(
+            ValueError,
+            mesh_tools.read_modem_resistivity,
+            lines,
+            self.n_north + 1,
+            self.n_east,
+            self.n_z,
+        )
+
+
+class TestGetStationBuffer(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.grid_east = np.linspace(-5000, 5000, 41)
+        self.grid_north = np.linspace(-6000, 6000, 47)
+        self.station_east = rng.uniform(-4000, 4000, 20)
+        self.station_north = rng.uniform(-4000, 4000, 20)
+        # station with cells exactly on the buffer
+        self.station_east[0] = self.grid_east[5] + 1000
+        self.station_north[0] = self.grid_north[5]
+
+    def test_same_as_brute_force(self):
+        xgrid, ygrid = np.meshgrid(self.grid_east, self.grid_north)
+        where = np.zeros(xgrid.shape, dtype=bool)
+        for xs, ys in zip(self.station_east, self.station_north):
+            where |= ((xs - xgrid) ** 2 + (ys - ygrid) ** 2) ** 0.5 < 1000
+
+        buffer = mesh_tools.get_station_buffer(
+            self.grid_east,
+            self.grid_north,
+            self.station_east,
+            self.station_north,
+            buf=1000,
+        )
+        self.assertTupleEqual(buffer.shape, (47, 41))
+        self.assertTrue(np.array_equal(buffer, where))
+
+    def test_no_stations(self):
+        buffer = mesh_tools.get_station_buffer(
+            self.grid_east, self.grid_north, [], [], buf=1000
+        )
+        self.assertFalse(buffer.any())
+
+
+class TestGetLinearInterpolationWeights(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.points = rng.uniform(0, 10, (50, 2))
+        self.values = rng.normal(size=(50, 3))
+        self.xi = rng.uniform(-1, 11, (200, 2))
+
+    def test_same_as_griddata(self):
+        weights, outside = mesh_tools.get_linear_interpolation_weights(
+            self.points, self.xi
+        )
+        self.assertTupleEqual(weights.shape, (200, 50))
+        for ii in range(self.values.shape[1]):
+            with self.subTest(ii):
+                values = griddata(self.points, self.values[:, ii], self.xi)
+                self.assertTrue(np.array_equal(np.isnan(values), outside))
+                self.assertTrue(
+                    np.allclose(
+                        (weights @ self.values[:, ii])[~outside],
+                        values[~outside],
+                    )
+                )
+
+
+# =============================================================================
+#
+# =============================================================================
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,333 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 10:12:05 2026
+
+@author: jpeacock
+"""
+# =============================================================================
+# Imports
+# =============================================================================
+import importlib.util
+from pathlib import Path
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+import rasterio
+import xarray as xr
+from rasterio.transform import Affine
+from scipy.interpolate import griddata
+
+from mtpy.core.mt_location import MTLocation
+from mtpy.modeling.structured_mesh_3d import StructuredGrid3D
+
+# =============================================================================
+
+has_netcdf4 = importlib.util.find_spec("netCDF4") is not None
+has_h5netcdf = importlib.util.find_spec("h5netcdf") is not None
+has_zarr = importlib.util.find_spec("zarr") is not None
+
+# some versions of affine and python cannot multiply transforms
+try:
+    Affine.translation(0, 0) * Affine.scale(1, 1)
+    has_affine = True
+except TypeError:
+    has_affine = False
+
+
+class TestStructuredGrid3DInterpolateToEvenGrid(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        pad = np.cumsum(100 * 1.3 ** np.arange(4))
+        self.model = StructuredGrid3D()
+        self.model.nodes_north = np.r_[pad[::-1], np.full(12, 100.0), pad]
+        self.model.nodes_east = np.r_[pad[::-1], np.full(10, 100.0), pad]
+        self.model.nodes_z = np.linspace(10, 200, 5)
+        self.model.res_model = 10 ** rng.uniform(0, 3, (20, 18, 5))
+
+    def test_same_as_griddata(self):
+        new_north, new_east, new_res = self.model.interpolate_to_even_grid(
+            70, pad_north=4, pad_east=4
+        )
+        self.assertTupleEqual(
+            new_res.shape, (new_north.size, new_east.size, 5)
+        )
+
+        model_n, model_e = np.broadcast_arrays(
+            self.model.grid_north[:-1, None], self.model.grid_east[None, :-1]
+        )
+        for z_index in range(5):
+            with self.subTest(z_index):
+                self.assertTrue(
+                    np.allclose(
+                        new_res[:, :, z_index],
+                        griddata(
+                            (model_n.ravel(), model_e.ravel()),
+                            self.model.res_model[:, :, z_index].ravel(),
+                            (new_north[:, None], new_east[None, :]),
+                        ),
+                    )
+                )
+
+
+class TestStructuredGrid3DToRaster(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.model = StructuredGrid3D()
+        self.model.nodes_north = np.full(12, 100.0)
+        self.model.nodes_east = np.full(10, 100.0)
+        self.model.nodes_z = np.linspace(10, 200, 5)
+        self.model.res_model = 10 ** rng.uniform(0, 3, (12, 10, 5))
+        self.model.center_point = MTLocation(
+            latitude=40, longitude=-118, utm_epsg=32611
+        )
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    @unittest.skipIf(not has_affine, "Affine transforms cannot be composed")
+    def test_multiband(self):
+        _, _, even_grid = self.model.interpolate_to_even_grid(
+            50, pad_north=1, pad_east=1
+        )
+        raster_list = self.model.to_raster(
+            50,
+            pad_north=1,
+            pad_east=1,
+            save_path=self.temp_dir.name,
+            depth_min=50,
+            multiband=True,
+        )
+        with self.subTest("one file"):
+            self.assertEqual(1, len(raster_list))
+        index = [2, 3, 4]
+        with rasterio.open(raster_list[0]) as dataset:
+            with self.subTest("data"):
+                self.assertTrue(
+                    np.allclose(
+                        np.moveaxis(dataset.read(), 0, 2),
+                        np.log10(even_grid[:, :, index]),
+                        equal_nan=True,
+                    )
+                )
+            with self.subTest("descriptions"):
+                self.assertListEqual(
+                    [
+                        f"{ii:02}_depth_{self.model.grid_z[ii]:.2f}m"
+                        for ii in index
+                    ],
+                    list(dataset.descriptions),
+                )
+            for band, ii in enumerate(index, 1):
+                with self.subTest(f"tags {band}"):
+                    tags = dataset.tags(band)
+                    self.assertEqual(str(ii), tags["depth_index"])
+                    self.assertEqual("m", tags["depth_units"])
+                    self.assertAlmostEqual(
+                        self.model.grid_z[ii], float(tags["depth"])
+                    )
+
+    def test_n_jobs(self):
+        def write_rasters(n_jobs):
+            with mock.patch(
+                "mtpy.modeling.structured_mesh_3d.array2raster"
+            ) as array2raster:
+                raster_list = self.model.to_raster(
+                    50,
+                    pad_north=1,
+                    pad_east=1,
+                    save_path=self.temp_dir.name,
+                    n_jobs=n_jobs,
+                )
+            return raster_list, dict(
+                [
+                    (call.args[0], call.args[1])
+                    for call in array2raster.call_args_list
+                ]
+            )
+
+        serial_list, serial_slices = write_rasters(None)
+        thread_list, thread_slices = write_rasters(2)
+        with self.subTest("files"):
+            self.assertListEqual(serial_list, thread_list)
+        with self.subTest("all depths"):
+            self.assertEqual(5, len(thread_slices))
+        for raster_fn, serial_slice in serial_slices.items():
+            with self.subTest(raster_fn.name):
+                self.assertTrue(
+                    np.array_equal(
+                        serial_slice,
+                        thread_slices[raster_fn],
+                        equal_nan=True,
+                    )
+                )
+
+    def test_no_depth_slices(self):
+        for multiband in [True, False]:
+            with self.subTest(multiband=multiband):
+                self.assertRaises(
+                    ValueError,
+                    self.model.to_raster,
+                    100,
+                    pad_north=0,
+                    pad_east=0,
+                    save_path=self.temp_dir.name,
+                    depth_min=20,
+                    depth_max=30,
+                    multiband=multiband,
+                )
+
+
+class TestStructuredGrid3DNetCDF(unittest.TestCase):
+    @classmethod
+    def setUpClass(self):
+        rng = np.random.default_rng(0)
+        pad = np.cumsum(100 * 1.3 ** np.arange(4))
+        self.model = StructuredGrid3D()
+        self.model.nodes_north = np.r_[pad[::-1], np.full(12, 100.0), pad]
+        self.model.nodes_east = np.r_[pad[::-1], np.full(10, 100.0), pad]
+        self.model.nodes_z = np.linspace(10, 200, 5)
+        self.model.res_model = 10 ** rng.uniform(0, 3, (20, 18, 5))
+        self.model.center_point = MTLocation(
+            latitude=40, longitude=-118, utm_epsg=32611
+        )
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.save_path = Path(self.temp_dir.name)
+        _, _, self.even_grid = self.model.interpolate_to_even_grid(
+            70, pad_north=4, pad_east=4
+        )
+
+    @classmethod
+    def tearDownClass(self):
+        self.temp_dir.cleanup()
+
+    def test_iter_even_grid_slices(self):
+        for z_index, res in self.model.iter_even_grid_slices(
+            70, pad_north=4, pad_east=4
+        ):
+            with self.subTest(z_index):
+                self.assertTrue(
+                    np.array_equal(
+                        res, self.even_grid[:, :, z_index], equal_nan=True
+                    )
+                )
+
+    def test_to_netcdf(self):
+        fn = self.save_path.joinpath("model.nc")
+        ds = self.model.to_netcdf(fn, pad_north=4, pad_east=4)
+        with xr.open_dataset(fn) as nc_ds:
+            self.assertTupleEqual(nc_ds.resistivity.shape, (5, 12, 10))
+            self.assertTrue(
+                np.allclose(nc_ds.resistivity.values, ds.resistivity.values)
+            )
+
+    def _check_compressed_netcdf(self, engine):
+        fn = self.save_path.joinpath(f"model_{engine}.nc")
+        ds = self.model.to_netcdf(
+            fn, pad_north=4, pad_east=4, complevel=6, engine=engine
+        )
+        with xr.open_dataset(fn, engine=engine) as nc_ds:
+            encoding = nc_ds.resistivity.encoding
+            with self.subTest("chunksizes"):
+                self.assertTupleEqual(encoding["chunksizes"], (1, 12, 10))
+            with self.subTest("zlib"):
+                self.assertTrue(encoding["zlib"])
+            with self.subTest("complevel"):
+                self.assertEqual(encoding["complevel"], 6)
+            with self.subTest("values"):
+                self.assertTrue(
+                    np.allclose(
+                        nc_ds.resistivity.values, ds.resistivity.values
+                    )
+                )
+
+    @unittest.skipIf(not has_netcdf4, "netCDF4 is not installed")
+    def test_to_netcdf_compressed_netcdf4(self):
+        self._check_compressed_netcdf("netcdf4")
+
+    @unittest.skipIf(not has_h5netcdf, "h5netcdf is not installed")
+    def test_to_netcdf_compressed_h5netcdf(self):
+        self._check_compressed_netcdf("h5netcdf")
+
+    @unittest.skipIf(not has_zarr, "zarr is not installed")
+    def test_to_zarr(self):
+        fn = self.save_path.joinpath("model.zarr")
+        ds = self.model.to_zarr(fn, pad_north=4, pad_east=4)
+        with xr.open_zarr(fn) as zarr_ds:
+            with self.subTest("chunks"):
+                self.assertTupleEqual(
+                    zarr_ds.resistivity.encoding["chunks"], (1, 12, 10)
+                )
+            with self.subTest("compressor"):
+                # zarr 3 has a tuple of compressors
+                encoding = zarr_ds.resistivity.encoding
+                self.assertTrue(
+                    encoding.get("compressor", encoding.get("compressors"))
+                )
+            with self.subTest("values"):
+                self.assertTrue(
+                    np.allclose(
+                        zarr_ds.resistivity.values, ds.resistivity.values
+                    )
+                )
+
+    @unittest.skipIf(not has_netcdf4, "netCDF4 is not installed")
+    def test_to_netcdf_even_grid(self):
+        with mock.patch.object(
+            self.model,
+            "_get_even_grid_weights",
+            wraps=self.model._get_even_grid_weights,
+        ) as get_weights:
+            fn = self.model.to_netcdf(
+                self.save_path.joinpath("model_even.nc"),
+                pad_north=4,
+                pad_east=4,
+                cell_size=70,
+            )
+        with self.subTest("weights computed once"):
+            self.assertEqual(1, get_weights.call_count)
+        with xr.open_dataset(fn) as nc_ds:
+            self.assertTupleEqual(
+                nc_ds.resistivity.encoding["chunksizes"],
+                (1,) + self.even_grid.shape[0:2],
+            )
+            self.assertTrue(
+                np.allclose(
+                    nc_ds.resistivity.values,
+                    np.log10(np.moveaxis(self.even_grid, 2, 0)),
+                    equal_nan=True,
+                )
+            )
+
+    @unittest.skipIf(not has_zarr, "zarr is not installed")
+    def test_to_zarr_even_grid(self):
+        with mock.patch.object(
+            self.model,
+            "_get_even_grid_weights",
+            wraps=self.model._get_even_grid_weights,
+        ) as get_weights:
+            fn = self.model.to_zarr(
+                self.save_path.joinpath("model_even.zarr"),
+                pad_north=4,
+                pad_east=4,
+                cell_size=70,
+            )
+        with self.subTest("weights computed once"):
+            self.assertEqual(1, get_weights.call_count)
+        with xr.open_zarr(fn) as zarr_ds:
+            self.assertTrue(
+                np.allclose(
+                    zarr_ds.resistivity.values,
+                    np.log10(np.moveaxis(self.even_grid, 2, 0)),
+                    equal_nan=True,
+                )
+            )
+
+
+# =============================================================================
+#
+# =============================================================================
+if __name__ == "__main__":
+    unittest.main()
@@ -7,7 +7,10 @@ Created on Thu Aug 15 16:09:12 2024
 # =============================================================================
 # Imports
 # =============================================================================
+from concurrent.futures import Future
+from types import SimpleNamespace
 import unittest
+from unittest import mock
 
 from mth5.data.make_mth5_from_asc import MTH5_PATH, create_test12rr_h5
 from mth5.utils.helpers import close_open_files
@@ -19,6 +22,7 @@ from mtpy import MT
 
 from aurora.config.config_creator import ConfigCreator
 from aurora.pipelines.process_mth5 import process_mth5
+from mtpy.core.mt_data_parallel import dumps
 from mtpy.processing.aurora.process_aurora import AuroraProcessing
 
 
@@ -157,6 +161,113 @@ class TestProcessRRCompare(unittest.TestCase):
         close_open_files()
 
 
+class TestProcessParallelCompare(unittest.TestCase):
+    @classmethod
+    def setUpClass(self):
+        self.mth5_path = MTH5_PATH.joinpath("test12rr.h5")
+        if not self.mth5_path.exists():
+            self.mth5_path = create_test12rr_h5()
+
+        self.ap = AuroraProcessing()
+        self.ap.local_station_id = "test1"
+        self.ap.local_mth5_path = self.mth5_path
+        self.ap.remote_station_id = "test2"
+        self.ap.remote_mth5_path = self.mth5_path
+        self.processed = self.ap.process(
+            sample_rates=1, merge=True, save_to_mth5=True, n_jobs=2
+        )
+        self.mt_obj_parallel = self.processed[1]["tf"]
+
+        self.ap_serial = self.ap.clone()
+        self.mt_obj_serial = self.ap_serial.process(
+            sample_rates=1, merge=True, save_to_mth5=True
+        )[1]["tf"]
+
+    def test_tfs_equal(self):
+        self.assertEqual(self.mt_obj_parallel, self.mt_obj_serial)
+
+    def test_tf_id(self):
+        self.assertEqual(self.mt_obj_parallel.tf_id, self.ap.processing_id)
+
+    def test_processed_dict(self):
+        self.assertTrue(self.processed[1]["processed"])
+
+    def test_processing_dict(self):
+        processing_dict = {
+            1: {
+                "config": self.ap.create_config(kernel_dataset=self.ap),
+                "kernel_dataset": self.ap.clone(),
+            }
+        }
+        processed = self.ap.process(
+            processing_dict=processing_dict,
+            merge=False,
+            save_to_mth5=False,
+            n_jobs=2,
+        )
+        self.assertTrue(
+            (
+                processed[1]["tf"].impedance.values
+                == self.mt_obj_serial.impedance.values
+            ).all()
+        )
+
+    def test_tf_in_mth5(self):
+        with MTH5() as m:
+            m.open_mth5(self.mth5_path)
+            tf = m.get_transfer_function("test1", self.ap.processing_id)
+            self.assertTrue(
+                (
+                    tf.impedance.values
+                    == self.mt_obj_parallel.impedance.values
+                ).all()
+            )
+
+    @classmethod
+    def tearDownClass(self):
+        close_open_files()
+
+
+class TestRunProcessingJobsInPool(unittest.TestCase):
+    def setUp(self):
+        self.ap = AuroraProcessing()
+        self.calls = []
+        self.jobs = {}
+        for sample_rate, save_fcs in [(1, False), (4, True), (8, False)]:
+            config = SimpleNamespace(
+                decimations=[SimpleNamespace(save_fcs=save_fcs)]
+            )
+            self.jobs[sample_rate] = (config, sample_rate, f"tf_{sample_rate}")
+
+    def run_processing_job(self, sample_rate, config, kernel_dataset, tf_id):
+        self.calls.append(("serial", sample_rate))
+        return tf_id
+
+    def submit(self, function, config, kernel_dataset, tf_id):
+        self.calls.append(("submit", kernel_dataset))
+        future = Future()
+        future.set_result(dumps(tf_id))
+        return future
+
+    def test_save_fcs_before_pool(self):
+        executor = SimpleNamespace(submit=self.submit)
+        with mock.patch.object(
+            self.ap, "_run_processing_job", self.run_processing_job
+        ), mock.patch(
+            "mtpy.processing.aurora.process_aurora._drop_hdf5_references",
+            lambda kernel_dataset: kernel_dataset,
+        ):
+            mt_objs = self.ap._run_processing_jobs_in_pool(
+                self.jobs, executor=executor
+            )
+        with self.subTest("order"):
+            self.assertListEqual(
+                [("serial", 4), ("submit", 1), ("submit", 8)], self.calls
+            )
+        with self.subTest("results"):
+            self.assertDictEqual({1: "tf_1", 4: "tf_4", 8: "tf_8"}, mt_objs)
+
+
 # =============================================================================
 # run
 # =============================================================================
@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 12:10:36 2026
+
+@author: jpeacock
+"""
+# =============================================================================
+# Imports
+# =============================================================================
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from mth5.data.make_mth5_from_asc import MTH5_PATH, create_test12rr_h5
+from mth5.utils.helpers import close_open_files
+
+from mtpy.processing.run_summary import RunSummary
+from mtpy.processing.aurora.process_aurora import AuroraProcessing
+from mtpy.processing.aurora.batch_aurora import (
+    AuroraBatchProcessing,
+    JOB_COLUMNS,
+    get_job_id,
+)
+
+# =============================================================================
+
+
+class KillWorker:
+    """Exits the worker process that unpickles it, like the out of memory
+    killer.
+    """
+
+    def __reduce__(self):
+        return os._exit, (1,)
+
+
+class TestGetJobId(unittest.TestCase):
+    def test_integer_sample_rate(self):
+        self.assertEqual("mt01_rr_mt02_sr1", get_job_id("mt01", "mt02", 1.0))
+
+    def test_sub_hz_sample_rates(self):
+        job_ids = [
+            get_job_id("mt01", "mt02", sample_rate)
+            for sample_rate in [0.5, 0.25, 1.0 / 32, 1e-5]
+        ]
+        with self.subTest("values"):
+            self.assertListEqual(
+                [
+                    "mt01_rr_mt02_sr0p5",
+                    "mt01_rr_mt02_sr0p25",
+                    "mt01_rr_mt02_sr0p03125",
+                    "mt01_rr_mt02_sr1em05",
+                ],
+                job_ids,
+            )
+        with self.subTest("unique"):
+            self.assertEqual(len(job_ids), len(set(job_ids)))
+
+
+class TestAuroraBatchProcessing(unittest.TestCase):
+    @classmethod
+    def setUpClass(self):
+        self.mth5_path = MTH5_PATH.joinpath("test12rr.h5")
+        if not self.mth5_path.exists():
+            self.mth5_path = create_test12rr_h5()
+
+        self.run_summary = RunSummary()
+        self.run_summary.from_mth5s([self.mth5_path])
+
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.checkpoint_dir = Path(self.temp_dir.name)
+        self.batch = AuroraBatchProcessing(
+            self.run_summary, checkpoint_dir=self.checkpoint_dir
+        )
+        self.jobs = self.batch.get_jobs()
+        self.processed = self.batch.process(
+            self.jobs, n_jobs=2, merge=True, save_to_mth5=False
+        )
+        self.report = self.batch.report
+
+        ap = AuroraProcessing()
+        ap.local_station_id = "test1"
+        ap.local_mth5_path = self.mth5_path
+        ap.remote_station_id = "test2"
+        ap.remote_mth5_path = self.mth5_path
+        self.mt_obj_serial = ap.process_single_sample_rate(1)
+
+    def test_jobs(self):
+        self.assertListEqual(JOB_COLUMNS, self.jobs.columns.tolist())
+        self.assertListEqual(
+            ["test1_rr_test2_sr1", "test2_rr_test1_sr1"],
+            self.jobs.job_id.tolist(),
+        )
+
+    def test_jobs_single_station(self):
+        jobs = self.batch.get_jobs(remote_reference=False)
+        self.assertListEqual(["test1_sr1", "test2_sr1"], jobs.job_id.tolist())
+
+    def test_jobs_station_pairs(self):
+        jobs = self.batch.get_jobs(
+            station_pairs=[("test1", None), ("test1", "test3")]
+        )
+        self.assertListEqual(["test1_sr1"], jobs.job_id.tolist())
+
+    def test_jobs_sub_hz(self):
+        df = self.run_summary.df.copy()
+        df = pd.concat(
+            [df.assign(sample_rate=0.5), df.assign(sample_rate=0.25)],
+            ignore_index=True,
+        )
+        jobs = AuroraBatchProcessing(df).get_jobs(remote_reference=False)
+        self.assertListEqual(
+            ["test1_sr0p25", "test2_sr0p25", "test1_sr0p5", "test2_sr0p5"],
+            jobs.job_id.tolist(),
+        )
+
+    def test_processed(self):
+        self.assertListEqual(
+            ["test1_rr_test2", "test2_rr_test1"],
+            sorted(self.processed.keys()),
+        )
+
+    def test_tf_equal_serial(self):
+        self.assertTrue(
+            np.all(
+                self.processed["test1_rr_test2"][1]["tf"].impedance.values
+                == self.mt_obj_serial.impedance.values
+            )
+        )
+
+    def test_report(self):
+        self.assertListEqual(
+            ["processed", "processed"], self.report.status.tolist()
+        )
+        self.assertTrue((self.report.elapsed > 0).all())
+        self.assertTrue(
+            self.checkpoint_dir.joinpath("batch_report.csv").is_file()
+        )
+
+    def test_checkpoints(self):
+        for job_id in self.jobs.job_id:
+            with self.subTest(job_id):
+                self.assertTrue(self.batch.get_checkpoint_fn(job_id).is_file())
+
+    def test_resume(self):
+        batch = AuroraBatchProcessing(
+            self.run_summary, checkpoint_dir=self.checkpoint_dir
+        )
+        processed = batch.process(self.jobs, merge=True, save_to_mth5=False)
+        self.assertListEqual(
+            ["checkpoint", "checkpoint"], batch.report.status.tolist()
+        )
+        self.assertTrue(
+            np.all(
+                processed["test1_rr_test2"][1]["tf"].impedance.values
+                == self.mt_obj_serial.impedance.values
+            )
+        )
+
+    def test_failed_job(self):
+        jobs = self.jobs.iloc[0:1].copy()
+        jobs["job_id"] = "bad_job"
+        jobs["local_mth5_path"] = "not_a_file.h5"
+        batch = AuroraBatchProcessing(self.run_summary)
+        processed = batch.process(jobs, merge=True, save_to_mth5=False)
+        self.assertDictEqual({}, processed)
+        self.assertEqual("failed", batch.report.status.iloc[0])
+        self.assertIsNotNone(batch.report.error.iloc[0])
+
+    def test_worker_killed(self):
+        jobs = self.jobs.copy()
+        jobs.loc[1, "job_id"] = "killed_job"
+        jobs.loc[1, "local_mth5_path"] = KillWorker()
+        batch = AuroraBatchProcessing(self.run_summary)
+        processed = batch.process(
+            jobs, n_jobs=2, merge=True, save_to_mth5=False
+        )
+        with self.subTest("status"):
+            self.assertListEqual(
+                ["processed", "failed"], batch.report.status.tolist()
+            )
+        with self.subTest("error"):
+            self.assertIn("BrokenProcessPool", batch.report.error.iloc[1])
+        with self.subTest("processed"):
+            self.assertListEqual(["test1_rr_test2"], list(processed.keys()))
+
+    def test_no_run_summary(self):
+        self.assertRaises(ValueError, AuroraBatchProcessing().get_jobs)
+
+    @classmethod
+    def tearDownClass(self):
+        close_open_files()
+        self.temp_dir.cleanup()
+
+
+# =============================================================================
+# run
+# =============================================================================
+if __name__ == "__main__":
+    unittest.main()
@@ -2,6 +2,7 @@
 # Imports
 # =============================================================================
 from pathlib import Path
+import numpy as np
 import pandas as pd
 import unittest
 
@@ -9,6 +10,7 @@ from mth5.data.make_mth5_from_asc import MTH5_PATH, create_test12rr_h5
 
 from mtpy.processing import KERNEL_DATASET_COLUMNS, KernelDataset, RunSummary
 from mtpy.processing.kernel_dataset import (
+    intersect_intervals,
     intervals_overlap,
     overlap,
 )
@@ -241,6 +243,92 @@ class TestOverlapFunctions(unittest.TestCase):
         # TODO To test first line, we need t1 to completely enclose t2
 
 
+class TestIntersectIntervals(unittest.TestCase):
+    @classmethod
+    def setUpClass(self):
+        rng = np.random.default_rng(0)
+        t0 = np.datetime64("2020-01-01T00:00:00", "ns")
+        self.starts = []
+        self.ends = []
+        for n in [20, 30, 25]:
+            start = t0 + rng.integers(0, 1000, n).astype("timedelta64[m]")
+            self.starts.append(start)
+            self.ends.append(
+                start + rng.integers(0, 60, n).astype("timedelta64[m]")
+            )
+
+    def brute_force(self, n_sets):
+        index = [[ii] for ii in range(self.starts[0].size)]
+        for jj in range(1, n_sets):
+            index = [
+                row + [kk]
+                for row in index
+                for kk in range(self.starts[jj].size)
+            ]
+        rows = []
+        for row in index:
+            start = max(self.starts[jj][kk] for jj, kk in enumerate(row))
+            end = min(self.ends[jj][kk] for jj, kk in enumerate(row))
+            if start <= end:
+                rows.append((row, start, end))
+        return rows
+
+    def test_two_sets(self):
+        index, start, end = intersect_intervals(
+            self.starts[0:2], self.ends[0:2]
+        )
+        for ii, row in enumerate(index):
+            with self.subTest(str(row)):
+                self.assertEqual(
+                    (start[ii], end[ii]),
+                    overlap(
+                        self.starts[0][row[0]],
+                        self.ends[0][row[0]],
+                        self.starts[1][row[1]],
+                        self.ends[1][row[1]],
+                    ),
+                )
+
+    def test_n_sets(self):
+        for n_sets in [1, 2, 3]:
+            index, start, end = intersect_intervals(
+                self.starts[0:n_sets], self.ends[0:n_sets]
+            )
+            with self.subTest(n_sets):
+                self.assertListEqual(
+                    [
+                        (list(row), s, e)
+                        for row, s, e in zip(index.tolist(), start, end)
+                    ],
+                    self.brute_force(n_sets),
+                )
+
+    def test_touching_intervals_overlap(self):
+        t0 = np.datetime64("2020-01-01T00:00:00", "ns")
+        t1 = t0 + np.timedelta64(1, "h")
+        t2 = t1 + np.timedelta64(1, "h")
+        index, start, end = intersect_intervals(
+            [np.array([t0]), np.array([t1])], [np.array([t1]), np.array([t2])]
+        )
+        self.assertEqual(index.tolist(), [[0, 0]])
+        self.assertEqual(start[0], t1)
+        self.assertEqual(end[0], t1)
+
+    def test_no_overlap(self):
+        index, start, end = intersect_intervals(
+            [self.starts[0], self.starts[0] + np.timedelta64(1, "D")],
+            [self.ends[0], self.ends[0] + np.timedelta64(1, "D")],
+        )
+        self.assertEqual(index.shape, (0, 2))
+        self.assertEqual(start.size, 0)
+
+    def test_fail(self):
+        self.assertRaises(ValueError, intersect_intervals, [], [])
+        self.assertRaises(
+            ValueError, intersect_intervals, self.starts, self.ends[0:2]
+        )
+
+
 class TestKernelDatasetMethods(unittest.TestCase):
     def setUp(self):
         self.local = "mt01"
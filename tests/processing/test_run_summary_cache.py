@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 13:15:02 2026
+
+@author: jpeacock
+"""
+# =============================================================================
+# Imports
+# =============================================================================
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+from mth5.data.make_mth5_from_asc import MTH5_PATH, create_test12rr_h5
+
+from mtpy.processing import KernelDataset, RunSummary, RunSummaryCache
+from mtpy.processing.run_summary import extract_run_summaries_from_mth5s
+from mtpy.processing.run_summary_cache import REFERENCE_COLUMNS
+
+# =============================================================================
+
+
+class TestRunSummaryCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(self):
+        mth5_path = MTH5_PATH.joinpath("test12rr.h5")
+        if not mth5_path.exists():
+            mth5_path = create_test12rr_h5()
+
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.mth5_list = []
+        for ii in range(3):
+            fn = Path(self.temp_dir.name).joinpath(f"test_{ii}.h5")
+            shutil.copy(mth5_path, fn)
+            self.mth5_list.append(fn)
+
+        self.fresh = dict(
+            [
+                (
+                    summary_type,
+                    extract_run_summaries_from_mth5s(
+                        self.mth5_list,
+                        summary_type=summary_type,
+                        deduplicate=False,
+                    ),
+                )
+                for summary_type in ["run", "channel"]
+            ]
+        )
+
+    def setUp(self):
+        self.cache = RunSummaryCache()
+        for fn in self.mth5_list:
+            self.cache.remove(fn)
+
+    def assert_summary_equal(self, df, summary_type):
+        fresh = self.fresh[summary_type]
+        self.assertListEqual(fresh.columns.tolist(), df.columns.tolist())
+        columns = [
+            col for col in fresh.columns if col not in REFERENCE_COLUMNS
+        ]
+        pd.testing.assert_frame_equal(fresh[columns], df[columns])
+
+    def test_cache_fn(self):
+        self.assertEqual(
+            self.cache.get_cache_fn(self.mth5_list[0]),
+            self.mth5_list[0]
+            .resolve()
+            .parent.joinpath(RunSummaryCache.cache_name),
+        )
+
+    def test_get_not_cached(self):
+        self.assertIsNone(self.cache.get(self.mth5_list[0]))
+
+    def test_cached(self):
+        for summary_type in ["run", "channel"]:
+            with self.subTest(summary_type):
+                extract_run_summaries_from_mth5s(
+                    self.mth5_list,
+                    summary_type=summary_type,
+                    deduplicate=False,
+                    cache=self.cache,
+                )
+                for fn in self.mth5_list:
+                    self.assertIsNotNone(
+                        self.cache.get(fn, summary_type=summary_type)
+                    )
+                df = extract_run_summaries_from_mth5s(
+                    self.mth5_list,
+                    summary_type=summary_type,
+                    deduplicate=False,
+                    cache=self.cache,
+                )
+                self.assert_summary_equal(df, summary_type)
+
+    def test_run_and_channel_cached(self):
+        """Extracting a summary must not change the file and make the other
+        summary stale.
+        """
+        fn = self.mth5_list[0]
+        for summary_type in ["run", "channel"]:
+            extract_run_summaries_from_mth5s(
+                [fn], summary_type=summary_type, cache=self.cache
+            )
+        for summary_type in ["run", "channel"]:
+            with self.subTest(summary_type):
+                self.assertIsNotNone(
+                    self.cache.get(fn, summary_type=summary_type)
+                )
+
+    def test_references_none(self):
+        self.cache.put(self.mth5_list[0], self.fresh["run"])
+        df = self.cache.get(self.mth5_list[0])
+        for column in ["run_hdf5_reference", "station_hdf5_reference"]:
+            with self.subTest(column):
+                self.assertTrue(df[column].isna().all())
+
+    def test_stale(self):
+        fn = self.mth5_list[0]
+        self.cache.put(fn, self.fresh["run"])
+        stat = fn.stat()
+        os.utime(fn, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        self.assertIsNone(self.cache.get(fn))
+
+    def test_threads(self):
+        for summary_type in ["run", "channel"]:
+            with self.subTest(summary_type):
+                df = extract_run_summaries_from_mth5s(
+                    self.mth5_list,
+                    summary_type=summary_type,
+                    deduplicate=False,
+                    cache=self.cache,
+                    n_jobs=2,
+                )
+                self.assert_summary_equal(df, summary_type)
+
+    def test_cache_file(self):
+        cache = RunSummaryCache(
+            cache_fn=Path(self.temp_dir.name).joinpath("index.sqlite")
+        )
+        rs = RunSummary()
+        rs.from_mth5s(self.mth5_list, cache=cache)
+        self.assertTrue(cache.cache_fn.is_file())
+        self.assertIsNotNone(cache.get(self.mth5_list[0]))
+        self.assertIsNone(self.cache.get(self.mth5_list[0]))
+
+        rs_cached = RunSummary()
+        rs_cached.from_mth5s(self.mth5_list, cache=cache)
+        self.assertEqual(len(rs.df), len(rs_cached.df))
+
+    def test_kernel_dataset_references(self):
+        rs = RunSummary()
+        rs.from_mth5s(self.mth5_list[0:1], cache=self.cache)
+        rs.from_mth5s(self.mth5_list[0:1], cache=self.cache)
+        kd = KernelDataset()
+        kd.from_run_summary(rs, "test1", "test2")
+        kd.initialize_mth5s()
+        try:
+            kd.df["fc"] = False
+            kd.initialize_dataframe_for_processing()
+            with self.subTest("references"):
+                self.assertTrue(kd.df.station_hdf5_reference.notna().all())
+            station_metadata = kd.get_station_metadata("test1")
+            with self.subTest("station"):
+                self.assertEqual("test1", station_metadata.id)
+            with self.subTest("runs"):
+                self.assertListEqual(
+                    kd.df.loc[kd.df.station == "test1", "run"].tolist(),
+                    station_metadata.run_list,
+                )
+        finally:
+            kd.close_mth5s()
+
+    def test_remove(self):
+        self.cache.put(self.mth5_list[0], self.fresh["run"])
+        self.cache.remove(self.mth5_list[0])
+        self.assertIsNone(self.cache.get(self.mth5_list[0]))
+
+    @classmethod
+    def tearDownClass(self):
+        self.temp_dir.cleanup()
+
+
+# =============================================================================
+# run
+# =============================================================================
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,283 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 14:02:47 2026
+
+@author: jpeacock
+"""
+# =============================================================================
+# Imports
+# =============================================================================
+import unittest
+
+import numpy as np
+import scipy.signal as sps
+
+from mtpy.processing import tf
+
+# =============================================================================
+
+
+class TestSlidingWindows(unittest.TestCase):
+    def setUp(self):
+        self.fx = np.arange(20)
+
+    def test_shape(self):
+        self.assertTupleEqual((4, 8), tf.sliding_windows(self.fx, 8, 4).shape)
+
+    def test_windows(self):
+        windows = tf.sliding_windows(self.fx, 8, 4)
+        for ii, window in enumerate(windows):
+            with self.subTest(ii):
+                self.assertTrue(np.all(window == self.fx[ii * 4 : ii * 4 + 8]))
+
+
+class TestSTFT(unittest.TestCase):
+    @classmethod
+    def setUpClass(self):
+        rng = np.random.default_rng(0)
+        self.fx = np.sin(np.arange(2048) * 0.1) + rng.normal(size=2048)
+        self.nh = 128
+        self.tstep = 32
+        self.nfbins = 256
+
+    def stft_loop(self, ng=1):
+        """STFT one window at a time."""
+        h = tf.normalize_L2(np.hanning(self.nh))
+        fa = sps.hilbert(tf.dctrend(self.fx))
+        tlst = np.arange(0, len(self.fx) - self.nh + 1, self.tstep)
+        tfarray = np.zeros((self.nfbins // 2, len(tlst)), dtype=complex)
+        for place, ii in enumerate(tlst):
+            FXwin = np.fft.fft(fa[ii : ii + self.nh] * h, n=self.nfbins)[
+                : self.nfbins // 2
+            ]
+            if ng != 1:
+                g = tf.normalize_L2(np.hanning(ng))
+                FXwin = np.convolve(
+                    np.pad(FXwin, (0, ng - 1)), g, mode="valid"
+                )
+            tfarray[:, place] = FXwin[::-1]
+        return tfarray, tlst
+
+    def test_stft(self):
+        tfarray, tlst, flst = tf.stft(
+            self.fx, nh=self.nh, tstep=self.tstep, nfbins=self.nfbins
+        )
+        tfarray_loop, tlst_loop = self.stft_loop()
+        self.assertTrue(np.all(tlst == tlst_loop))
+        self.assertEqual(self.nfbins // 2, flst.size)
+        self.assertTrue(np.allclose(tfarray, tfarray_loop))
+
+    def test_stft_smooth(self):
+        tfarray, tlst, flst = tf.stft(
+            self.fx, nh=self.nh, tstep=self.tstep, nfbins=self.nfbins, ng=5
+        )
+        tfarray_loop, tlst_loop = self.stft_loop(ng=5)
+        self.assertTrue(np.allclose(tfarray, tfarray_loop))
+
+    def test_smethod(self):
+        tfarray, tlst, flst, pxx = tf.smethod(
+            self.fx, nh=self.nh, tstep=self.tstep, nfbins=self.nfbins
+        )
+        tfarray_loop, tlst_loop = self.stft_loop()
+        self.assertTrue(np.allclose(pxx, tfarray_loop))
+        self.assertTupleEqual(pxx.shape, tfarray.shape)
+
+
+class TestTimeFrequency(unittest.TestCase):
+    @classmethod
+    def setUpClass(self):
+        rng = np.random.default_rng(1)
+        self.fx = np.sin(np.arange(512) * 0.2) + 0.1 * rng.normal(size=512)
+        self.nfbins = 128
+
+    def reassigned_stft_loop(self, nh, tstep, alpha=4):
+        """Reassigned STFT one window and one bin at a time."""
+        fx = self.fx
+        nfbins = self.nfbins
+        nx = len(fx)
+        h = tf.gausswin(nh, alpha=alpha)
+        lh = (nh - 1) // 2
+        th = h * np.arange(-lh, lh + 1)
+        dh = tf.dwindow(h)
+        tlst = np.arange(0, nx, tstep)
+        nt = len(tlst)
+
+        tfr = np.zeros((nfbins, nt), dtype=complex)
+        tf2 = np.zeros((nfbins, nt), dtype=complex)
+        tf3 = np.zeros((nfbins, nt), dtype=complex)
+        for ii, tt in enumerate(tlst):
+            tau = np.arange(
+                -min(nx // 2, lh, tt - 1), min(nx // 2, lh, nx - tt - 1) + 1
+            )
+            ff = np.remainder(nfbins + tau, nfbins)
+            normh = np.sqrt(np.sum(abs(h[lh + tau]) ** 2))
+            tfr[ff, ii] = fx[tt + tau] * h[lh + tau].conj() / normh
+            tf2[ff, ii] = fx[tt + tau] * th[lh + tau].conj() / normh
+            tf3[ff, ii] = fx[tt + tau] * dh[lh + tau].conj() / normh
+
+        spec = np.fft.fft(tfr, axis=0)[nfbins // 2 :]
+        spect = np.fft.fft(tf2, axis=0)[nfbins // 2 :]
+        specd = np.fft.fft(tf3, axis=0)[nfbins // 2 :]
+        spec[abs(spec) < 1.0e-6] = 0.0
+
+        rtfarray = np.zeros_like(spec)
+        threshold = 1.0e-4 * np.mean(fx[tlst])
+        for nn in range(nt):
+            for kk in range(nfbins // 2):
+                if abs(spec[kk, nn]) > threshold:
+                    nhat = int(
+                        nn + np.round(np.real(spect[kk, nn] / spec[kk, nn]))
+                    )
+                    nhat = min(max(nhat, 1), nt - 1)
+                    khat = int(
+                        kk
+                        - np.round(
+                            np.imag(
+                                nfbins / 2.0 * specd[kk, nn] / spec[kk, nn]
+                            )
+                            / np.pi
+                        )
+                    )
+                    khat = np.remainder(
+                        np.remainder(khat - 1, nfbins // 2) + nfbins // 2,
+                        nfbins // 2,
+                    )
+                    rtfarray[khat, nhat] += spec[kk, nn]
+                else:
+                    rtfarray[kk, nn] += spec[kk, nn]
+        return rtfarray, spec
+
+    def wvd_loop(self, nh, tstep):
+        """Pseudo Wigner-Ville distribution one time at a time."""
+        fa = sps.hilbert(tf.dctrend(self.fx))
+        fn = len(fa)
+        tau = (nh - 1) // 2
+        tlst = np.arange(0, fn - 1, tstep)
+        tfarray = np.zeros((self.nfbins, len(tlst)), dtype=complex)
+        for point, nn in enumerate(tlst):
+            tau_min = min(nn, tau, fn - nn - 1)
+            tau_lst = np.arange(-tau_min, tau_min + 1)
+            Rnn = 4 * np.conjugate(fa[nn - tau_lst]) * fa[nn + tau_lst]
+            tfarray[:, point] = tf.padzeros(Rnn, npad=self.nfbins)[::-1]
+        return np.fft.fft(tfarray, axis=0) / nh
+
+    def spwvd_loop(self, nh, ng, tstep):
+        """Smoothed pseudo Wigner-Ville distribution one time and one lag at
+        a time.
+        """
+        fa = sps.hilbert(tf.dctrend(self.fx))
+        fn = len(fa)
+        nfbins = self.nfbins
+        h = sps.windows.gaussian(nh, nh / (6 * np.sqrt(2 * np.log(2))))
+        h /= sum(h)
+        g = sps.windows.gaussian(ng, ng / (6 * np.sqrt(2 * np.log(2))))
+        g /= sum(g)
+        Lh = (nh - 1) // 2
+        Lg = (ng - 1) // 2
+
+        tlst = np.arange(0, fn + 1, tstep)
+        tfarray = np.zeros((nfbins, len(tlst)), dtype=complex)
+        for point, t in enumerate(tlst):
+            tau_max = min(t + Lg - 1, fn - t + Lg, nfbins // 2, Lh)
+            # zero lag, overwritten by the first lag below
+            taulst = np.arange(-min(Lg, fn - t), min(Lg, t - 1) + 1)
+            tfarray[0, point] = sum(
+                2
+                * (g[Lg + taulst] / sum(g[Lg + taulst]))
+                * fa[t - taulst - 1]
+                * np.conjugate(fa[t - taulst - 1])
+            )
+            for mm in range(tau_max):
+                taulst = np.arange(
+                    -min(Lg, fn - t - mm - 1), min(Lg, t - mm - 1) + 1
+                )
+                gm = 2 * (g[Lg + taulst] / sum(g[Lg + taulst]))
+                Rmm = sum(
+                    gm
+                    * fa[t + mm - taulst - 1]
+                    * np.conjugate(fa[t - mm - taulst])
+                )
+                tfarray[mm, point] = h[Lh + mm - 1] * Rmm
+                Rmm = sum(
+                    gm
+                    * fa[t - mm - taulst]
+                    * np.conjugate(fa[t + mm - taulst - 1])
+                )
+                tfarray[nfbins - mm - 1, point] = h[Lh - mm] * Rmm
+        return np.rot90(np.fft.fft(tfarray, axis=0).T, 1)
+
+    def robust_stft_median_loop(self, nh, tstep):
+        """Vector median STFT one window and one frequency at a time."""
+        mlst = np.arange(-nh / 2 + 1, nh / 2 + 1, dtype="int")
+        tlst = np.arange(0, len(self.fx) - nh + 1, tstep)
+        flstc = np.fft.fftfreq(self.nfbins)[self.nfbins // 2 :]
+        h = sps.windows.gaussian(nh, nh / (6 * np.sqrt(2 * np.log(2))))
+        h = h / sum(h)
+        fa = sps.hilbert(tf.dctrend(self.fx))
+        fa = fa / fa.std()
+
+        tfarray = np.zeros((self.nfbins // 2, len(tlst)), dtype=complex)
+        for tpoint, nn in enumerate(tlst):
+            fxwin = h * fa[nn : nn + nh]
+            for fpoint, mm in enumerate(flstc):
+                fxmed = fxwin * np.exp(1j * 2 * np.pi * mlst * mm)
+                value = np.median(fxmed.real) + 1j * np.median(fxmed.imag)
+                if value == 0.0:
+                    value = 1e-10
+                tfarray[fpoint, tpoint] = value
+        return 4.0 * nh * tfarray
+
+    def test_reassigned_stft(self):
+        rtfarray, tlst, flst, spec = tf.reassigned_stft(
+            self.fx, nh=31, tstep=16, nfbins=self.nfbins
+        )
+        rtfarray_loop, spec_loop = self.reassigned_stft_loop(31, 16)
+        with self.subTest("shape"):
+            self.assertTupleEqual(
+                (self.nfbins // 2, tlst.size), rtfarray.shape
+            )
+        with self.subTest("spectrogram"):
+            self.assertTrue(np.allclose(spec, spec_loop))
+        with self.subTest("reassigned"):
+            self.assertTrue(np.allclose(rtfarray, rtfarray_loop))
+        with self.subTest("energy"):
+            # reassignment moves energy but does not change the total
+            self.assertAlmostEqual(spec.sum(), rtfarray.sum())
+
+    def test_wvd(self):
+        tfarray, tlst, flst = tf.wvd(
+            self.fx, nh=63, tstep=16, nfbins=self.nfbins
+        )
+        with self.subTest("shape"):
+            self.assertTupleEqual((self.nfbins, tlst.size), tfarray.shape)
+        with self.subTest("frequency"):
+            self.assertEqual(self.nfbins // 2, flst.size)
+        with self.subTest("values"):
+            self.assertTrue(np.allclose(tfarray, self.wvd_loop(63, 16)))
+
+    def test_spwvd(self):
+        tfarray, tlst, flst = tf.spwvd(
+            self.fx, nh=63, ng=15, tstep=16, nfbins=self.nfbins
+        )
+        with self.subTest("shape"):
+            self.assertTupleEqual((self.nfbins, tlst.size), tfarray.shape)
+        with self.subTest("values"):
+            self.assertTrue(np.allclose(tfarray, self.spwvd_loop(63, 15, 16)))
+
+    def test_robust_stft_median(self):
+        tfarray, tlst, flst = tf.robust_stft_median(
+            self.fx, nh=32, tstep=16, nfbins=self.nfbins
+        )
+        with self.subTest("shape"):
+            self.assertTupleEqual((self.nfbins // 2, tlst.size), tfarray.shape)
+        with self.subTest("values"):
+            self.assertTrue(
+                np.allclose(tfarray, self.robust_stft_median_loop(32, 16))
+            )
+
+
+# =============================================================================
+# run
+# =============================================================================
+if __name__ == "__main__":
+    unittest.main()
@@ -9,6 +9,7 @@ import unittest
 import numpy as np
 
 from mtpy.utils import calculator
+import mtpy.utils.exceptions as MTex
 
 # =============================================================================
 
@@ -289,6 +290,77 @@ class TestRotation(unittest.TestCase):
             self.assertTrue(np.allclose(ar, b))
 
 
+class TestRotateStack(unittest.TestCase):
+    @classmethod
+    def setUpClass(self):
+        rng = np.random.default_rng(0)
+        self.n = 10
+        self.angles = np.linspace(-90, 270, self.n)
+        self.z = rng.normal(size=(self.n, 2, 2)) + 1j * rng.normal(
+            size=(self.n, 2, 2)
+        )
+        self.z_err = np.abs(rng.normal(size=(self.n, 2, 2)))
+        self.t = rng.normal(size=(self.n, 1, 2)) + 1j * rng.normal(
+            size=(self.n, 1, 2)
+        )
+        self.t_err = np.abs(rng.normal(size=(self.n, 1, 2)))
+
+    def test_get_rotation_matrices(self):
+        rot = calculator.get_rotation_matrices(self.angles, clockwise=True)
+        for ii, angle in enumerate(self.angles):
+            with self.subTest(angle):
+                self.assertTrue(
+                    np.allclose(
+                        rot[ii],
+                        calculator.get_rotation_matrix(angle, clockwise=True),
+                    )
+                )
+
+    def test_rotate_matrix_stack(self):
+        zr, zr_err = calculator.rotate_matrix_stack_with_errors(
+            self.z, self.angles, self.z_err
+        )
+        for ii, angle in enumerate(self.angles):
+            b, b_err = calculator.rotate_matrix_with_errors(
+                self.z[ii], angle, self.z_err[ii]
+            )
+            with self.subTest(f"matrix {angle}"):
+                self.assertTrue(np.allclose(zr[ii], b))
+            with self.subTest(f"error {angle}"):
+                self.assertTrue(np.allclose(zr_err[ii], b_err))
+
+    def test_rotate_matrix_stack_two_errors(self):
+        zr, zr_err = calculator.rotate_matrix_stack_with_errors(
+            self.z, self.angles, np.stack([self.z_err, 2 * self.z_err])
+        )
+        with self.subTest("shape"):
+            self.assertEqual(zr_err.shape, (2, self.n, 2, 2))
+        with self.subTest("values"):
+            self.assertTrue(np.allclose(zr_err[1], 2 * zr_err[0]))
+
+    def test_rotate_vector_stack(self):
+        tr, tr_err = calculator.rotate_vector_stack_with_errors(
+            self.t, self.angles, self.t_err
+        )
+        for ii, angle in enumerate(self.angles):
+            b, b_err = calculator.rotate_vector_with_errors(
+                self.t[ii], angle, self.t_err[ii]
+            )
+            with self.subTest(f"vector {angle}"):
+                self.assertTrue(np.allclose(tr[ii], b))
+            with self.subTest(f"error {angle}"):
+                self.assertTrue(np.allclose(tr_err[ii], b_err))
+
+    def test_bad_shape_fail(self):
+        self.assertRaises(
+            MTex.MTpyError_input_arguments,
+            calculator.rotate_matrix_stack_with_errors,
+            self.z,
+            self.angles,
+            self.z_err[:, 0:1, :],
+        )
+
+
 # =============================================================================
 # run
 # =============================================================================